@@ -205,3 +205,10 @@ class GamePhase(StrEnum):
 
     IN_PROGRESS = "in_progress"
     FINISHED = "finished"
+
+
+class StateEngine(StrEnum):
+    """How MahjongGameService holds game state between actions."""
+
+    FROZEN = "frozen"
+    MUTABLE = "mutable"
@@ -0,0 +1,137 @@
+"""
+Memoized hand value calculation.
+
+Wraps HandCalculator.estimate_hand_value in a bounded LRU cache keyed on a
+canonical hand signature: tile counts, red five count, melds, win tile,
+the HandConfig flags and optional rules, and the dora/ura dora indicator
+types. Equal signatures always produce equal results, so entries never need
+invalidating per game; the cache is shared by every game in the process and
+simply evicts the least recently used signature when full.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from mahjong.constants import AKA_DORAS
+from mahjong.hand_calculating.hand import HandCalculator
+
+from game.logic.meld_wrapper import frozen_melds_to_melds
+from game.logic.tiles import hand_to_34_array
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Sequence
+
+    from mahjong.hand_calculating.hand_config import HandConfig
+    from mahjong.hand_calculating.hand_response import HandResponse
+
+    from game.logic.meld_wrapper import FrozenMeld
+
+# entries kept by the process-wide cache
+HAND_VALUE_CACHE_SIZE = 4096
+
+# HandConfig attributes that are not scoring inputs
+_CONFIG_SKIP_ATTRS = frozenset({"yaku", "options"})
+
+
+def _indicator_types(indicators: Sequence[int] | None) -> tuple[int, ...]:
+    """Reduce dora indicators to their sorted tile types (the copy never matters)."""
+    return tuple(sorted(t // 4 for t in indicators)) if indicators else ()
+
+
+def _config_signature(config: HandConfig) -> tuple[object, ...]:
+    """Return every flag of a HandConfig and its optional rules as a hashable tuple."""
+    flags = tuple(value for name, value in vars(config).items() if name not in _CONFIG_SKIP_ATTRS)
+    return flags + tuple(vars(config.options).values())
+
+
+def hand_signature(  # noqa: PLR0913
+    tiles: Sequence[int],
+    win_tile: int,
+    melds: tuple[FrozenMeld, ...],
+    dora_indicators: Sequence[int] | None,
+    config: HandConfig,
+    ura_dora_indicators: Sequence[int] | None = None,
+) -> Hashable:
+    """
+    Build the cache key for a hand value calculation.
+
+    Tile IDs only matter to the calculator through red fives (counted when
+    aka dora is enabled) and the win tile being present in the hand, so both
+    are reduced to those facts; everything else is keyed by tile type.
+    """
+    aka_count = sum(t in AKA_DORAS for t in tiles) if config.options.has_aka_dora else 0
+    meld_signature = tuple((meld.type, meld.opened, tuple(t // 4 for t in meld.tiles)) for meld in melds)
+    return (
+        tuple(hand_to_34_array(tiles)),
+        aka_count,
+        meld_signature,
+        win_tile // 4,
+        win_tile in tiles,
+        _config_signature(config),
+        _indicator_types(dora_indicators),
+        _indicator_types(ura_dora_indicators),
+    )
+
+
+class HandValueCache:
+    """Bounded LRU cache of HandCalculator results with hit/miss counters."""
+
+    def __init__(self, maxsize: int = HAND_VALUE_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, HandResponse] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def estimate_hand_value(  # noqa: PLR0913
+        self,
+        tiles: Sequence[int],
+        win_tile: int,
+        melds: tuple[FrozenMeld, ...],
+        dora_indicators: Sequence[int] | None,
+        config: HandConfig,
+        ura_dora_indicators: Sequence[int] | None = None,
+    ) -> HandResponse:
+        """
+        Return the hand value, calculating it only for signatures not yet cached.
+
+        The returned HandResponse may be shared with earlier callers and must
+        be treated as read-only.
+        """
+        key = hand_signature(tiles, win_tile, melds, dora_indicators, config, ura_dora_indicators)
+        result = self._entries.get(key)
+        if result is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = HandCalculator.estimate_hand_value(
+            tiles=tiles,
+            win_tile=win_tile,
+            melds=frozen_melds_to_melds(melds),
+            dora_indicators=dora_indicators,
+            config=config,
+            ura_dora_indicators=ura_dora_indicators,
+        )
+        self._entries[key] = result
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return result
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and current size for monitoring."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+    def clear(self) -> None:
+        """Drop all cached entries and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+hand_value_cache = HandValueCache()
@@ -6,7 +6,7 @@ The service manages state transitions while action handlers are pure functions
 that return new state.
 """
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, cast
 
 import structlog
 from pydantic import ValidationError
@@ -26,7 +26,15 @@ from game.logic.action_handlers import (
 from game.logic.action_result import create_draw_event
 from game.logic.ai_player import AIPlayer, AIPlayerStrategy
 from game.logic.ai_player_controller import AIPlayerController
-from game.logic.enums import AIPlayerType, CallType, GameAction, GameErrorCode, RoundPhase, TimeoutType
+from game.logic.enums import (
+    AIPlayerType,
+    CallType,
+    GameAction,
+    GameErrorCode,
+    RoundPhase,
+    StateEngine,
+    TimeoutType,
+)
 from game.logic.events import (
     BroadcastTarget,
     CallPromptEvent,
@@ -52,6 +60,7 @@ from game.logic.game import (
 )
 from game.logic.matchmaker import fill_seats
 from game.logic.meld_compact import frozen_meld_to_compact
+from game.logic.mutable_state import MutableGameState, freeze_game_state, thaw_game_state
 from game.logic.rng import generate_seed
 from game.logic.round_advance import RoundAdvanceManager
 from game.logic.service import GameService
@@ -120,10 +129,23 @@ class MahjongGameService(GameService):
     Game service for Mahjong implementing the GameService interface.
 
     Maintains game states for multiple concurrent games.
+
+    With StateEngine.MUTABLE, stored state is kept as the __slots__ mirrors
+    from mutable_state and only frozen into MahjongGameState when it leaves
+    the service (get_game_state).
     """
 
-    def __init__(self, *, auto_cleanup: bool = True, settings: GameSettings | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        auto_cleanup: bool = True,
+        settings: GameSettings | None = None,
+        engine: StateEngine = StateEngine.FROZEN,
+    ) -> None:
         self._games: dict[str, MahjongGameState] = {}
+        self._engine = engine
+        # last (mirror, snapshot) per game under the mutable engine
+        self._snapshots: dict[str, tuple[MutableGameState, MahjongGameState]] = {}
         self._ai_player_controllers: dict[str, AIPlayerController] = {}
         self._furiten_tracker = FuritenTracker()
         self._round_advance = RoundAdvanceManager()
@@ -157,7 +179,7 @@ class MahjongGameService(GameService):
         except (UnsupportedSettingsError, ValueError, TypeError) as e:
             logger.warning("game start failed", error=str(e))
             return self._create_error_event(GameErrorCode.INVALID_ACTION, str(e))
-        self._games[game_id] = frozen_game
+        frozen_game = self._store_game_state(game_id, frozen_game)
 
         hands = {p.seat: list(p.tiles) for p in frozen_game.round_state.players}
         logger.debug("starting game", player_names=player_names, hands=hands)
@@ -187,7 +209,7 @@ class MahjongGameService(GameService):
             frozen_game.round_state,
             frozen_game,
         )
-        self._games[game_id] = new_game_state
+        self._store_game_state(game_id, new_game_state)
         events.extend(convert_events(draw_events))
 
         # process AI player turns if dealer is an AI player
@@ -388,10 +410,18 @@ class MahjongGameService(GameService):
 
         return None
 
+    def _store_game_state(self, game_id: str, game_state: MahjongGameState) -> MahjongGameState:
+        """Store the game state, thawing it into mutable mirrors under the mutable engine."""
+        if self._engine == StateEngine.MUTABLE:
+            # the mirrors expose the same attributes and model_copy as the frozen models
+            game_state = cast("MahjongGameState", thaw_game_state(game_state))
+        self._games[game_id] = game_state
+        return game_state
+
     def _update_state_from_result(self, game_id: str, result: ActionResult) -> None:
         """Update stored state from ActionResult if new state was returned."""
         if result.new_game_state is not None:
-            self._games[game_id] = result.new_game_state
+            self._store_game_state(game_id, result.new_game_state)
 
     async def _process_action_result_internal(self, game_id: str, result: ActionResult) -> list[ServiceEvent]:
         """
@@ -456,8 +486,14 @@ class MahjongGameService(GameService):
         return self._find_player_seat(game_id, player_name)
 
     def get_game_state(self, game_id: str) -> MahjongGameState | None:
-        """Return the current game state, or None if game doesn't exist."""
-        return self._games.get(game_id)
+        """Return a frozen snapshot of the current game state, or None if game doesn't exist."""
+        game_state = self._games.get(game_id)
+        if game_state is None or self._engine == StateEngine.FROZEN:
+            return game_state
+        mirror = cast("MutableGameState", game_state)
+        snapshot = freeze_game_state(mirror, self._snapshots.get(game_id))
+        self._snapshots[game_id] = (mirror, snapshot)
+        return snapshot
 
     def get_game_seed(self, game_id: str) -> str | None:
         """Return the seed for a game, or None if game doesn't exist."""
@@ -644,7 +680,7 @@ class MahjongGameService(GameService):
         elif round_state.phase == RoundPhase.PLAYING:
             # no callers - draw for next player (turn already advanced by process_discard_phase)
             _new_round_state, new_game_state, draw_events = process_draw_phase(round_state, game_state)
-            self._games[game_id] = new_game_state
+            self._store_game_state(game_id, new_game_state)
 
             events.extend(convert_events(draw_events))
 
@@ -773,7 +809,7 @@ class MahjongGameService(GameService):
                 standings=[{"seat": s.seat, "score": s.final_score} for s in game_result.standings],
             )
             # Always store finalized state before cleanup decision
-            self._games[game_id] = frozen_game
+            self._store_game_state(game_id, frozen_game)
 
             if self._auto_cleanup:
                 self.cleanup_game(game_id)
@@ -791,7 +827,7 @@ class MahjongGameService(GameService):
             ]
 
         # Store updated state
-        self._games[game_id] = frozen_game
+        self._store_game_state(game_id, frozen_game)
 
         # enter waiting state for round confirmation
         ai_player_controller = self._ai_player_controllers.get(game_id)
@@ -832,6 +868,7 @@ class MahjongGameService(GameService):
     def cleanup_game(self, game_id: str) -> None:
         """Remove all game state for a game that was abandoned or cleaned up externally."""
         self._games.pop(game_id, None)
+        self._snapshots.pop(game_id, None)
         self._ai_player_controllers.pop(game_id, None)
         self._furiten_tracker.cleanup_game(game_id)
         self._round_advance.cleanup_game(game_id)
@@ -1000,8 +1037,7 @@ class MahjongGameService(GameService):
     async def _start_next_round(self, game_id: str) -> list[ServiceEvent]:
         """Start the next round and return events."""
         frozen_game = self._games[game_id]
-        frozen_game = init_round(frozen_game)
-        self._games[game_id] = frozen_game
+        frozen_game = self._store_game_state(game_id, init_round(frozen_game))
 
         hands = {p.seat: list(p.tiles) for p in frozen_game.round_state.players}
         logger.debug("starting next round", hands=hands)
@@ -1016,7 +1052,7 @@ class MahjongGameService(GameService):
             frozen_game.round_state,
             frozen_game,
         )
-        self._games[game_id] = new_game_state
+        self._store_game_state(game_id, new_game_state)
         events.extend(convert_events(draw_events))
 
         dealer_seat = new_game_state.round_state.dealer_seat
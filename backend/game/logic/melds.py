@@ -16,7 +16,7 @@ from game.logic.round import (
     draw_from_dead_wall,
 )
 from game.logic.settings import NUM_PLAYERS
-from game.logic.state_utils import clear_all_players_ippatsu, update_player
+from game.logic.state_utils import clear_all_players_ippatsu, tile_count_updates, update_player
 from game.logic.tiles import DRAGONS_34, TILES_PER_SUIT, WINDS_34, is_honor, tile_to_34
 from game.logic.wall import increment_pending_dora, tiles_remaining
 from game.logic.win import get_waiting_tiles
@@ -103,14 +103,7 @@ def can_call_pon(player: MahjongPlayer, discarded_tile: int) -> bool:
     if player.is_riichi:
         return False
 
-    discarded_34 = discarded_tile // 4
-    count = 0
-    for t in player.tiles:
-        if t // 4 == discarded_34:
-            count += 1
-            if count >= TILES_FOR_PON:
-                return True
-    return False
+    return player.tiles_34[discarded_tile // 4] >= TILES_FOR_PON
 
 
 def can_call_chi(
@@ -144,22 +137,26 @@ def can_call_chi(
         return []
 
     tile_value = discarded_34 % TILES_PER_SUIT
-    hand_tiles_by_34 = _build_same_suit_tile_map(player.tiles, discarded_34)
+    pairs = _find_chi_combinations(discarded_34, tile_value, player.tiles_34)
+    if not pairs:
+        return []
 
-    return _find_chi_combinations(discarded_34, tile_value, hand_tiles_by_34)
+    # resolve each tile type to the first matching tile in hand
+    first_by_34 = _build_same_suit_tile_map(player.tiles, discarded_34)
+    return [(first_by_34[a], first_by_34[b]) for a, b in pairs]
 
 
-def _build_same_suit_tile_map(tiles: list[int] | tuple[int, ...], discarded_34: int) -> dict[int, list[int]]:
+def _build_same_suit_tile_map(tiles: list[int] | tuple[int, ...], discarded_34: int) -> dict[int, int]:
     """
-    Build a map of tiles in hand that are in the same suit as discarded tile.
+    Map each tile type in the discarded tile's suit to its first tile in hand.
     """
-    result: dict[int, list[int]] = {}
+    result: dict[int, int] = {}
     discarded_suit = discarded_34 // TILES_PER_SUIT
 
     for t in tiles:
         t34 = tile_to_34(t)
         if t34 // TILES_PER_SUIT == discarded_suit:
-            result.setdefault(t34, []).append(t)
+            result.setdefault(t34, t)
 
     return result
 
@@ -167,39 +164,39 @@ def _build_same_suit_tile_map(tiles: list[int] | tuple[int, ...], discarded_34:
 def _find_chi_combinations(
     discarded_34: int,
     tile_value: int,
-    hand_tiles: dict[int, list[int]],
+    tiles_34: tuple[int, ...],
 ) -> list[tuple[int, int]]:
     """
-    Find all valid chi combinations for a discarded tile.
+    Find the tile type pairs in hand that complete a chi with the discarded tile.
     """
     combinations: list[tuple[int, int]] = []
 
     # discarded tile is lowest in sequence (e.g., 1 in 123)
     if tile_value <= CHI_LOWEST_MAX_VALUE:
-        _add_combination_if_valid(combinations, hand_tiles, discarded_34 + 1, discarded_34 + 2)
+        _add_combination_if_valid(combinations, tiles_34, discarded_34 + 1, discarded_34 + 2)
 
     # discarded tile is middle in sequence (e.g., 2 in 123)
     if CHI_MIDDLE_MIN_VALUE <= tile_value <= CHI_MIDDLE_MAX_VALUE:
-        _add_combination_if_valid(combinations, hand_tiles, discarded_34 - 1, discarded_34 + 1)
+        _add_combination_if_valid(combinations, tiles_34, discarded_34 - 1, discarded_34 + 1)
 
     # discarded tile is highest in sequence (e.g., 3 in 123)
     if tile_value >= CHI_HIGHEST_MIN_VALUE:
-        _add_combination_if_valid(combinations, hand_tiles, discarded_34 - 2, discarded_34 - 1)
+        _add_combination_if_valid(combinations, tiles_34, discarded_34 - 2, discarded_34 - 1)
 
     return combinations
 
 
 def _add_combination_if_valid(
     combinations: list[tuple[int, int]],
-    hand_tiles: dict[int, list[int]],
+    tiles_34: tuple[int, ...],
     tile34_a: int,
     tile34_b: int,
 ) -> None:
     """
-    Add a chi combination if both required tiles exist in hand.
+    Add a chi combination if both required tile types exist in hand.
     """
-    if tile34_a in hand_tiles and tile34_b in hand_tiles:
-        combinations.append((hand_tiles[tile34_a][0], hand_tiles[tile34_b][0]))
+    if tiles_34[tile34_a] and tiles_34[tile34_b]:
+        combinations.append((tile34_a, tile34_b))
 
 
 def can_call_open_kan(
@@ -222,14 +219,7 @@ def can_call_open_kan(
 
     # Check matching tiles first — having 3 of a kind is rare, so this
     # short-circuits before the more expensive wall/kan-count checks.
-    discarded_34 = discarded_tile // 4
-    count = 0
-    for t in player.tiles:
-        if t // 4 == discarded_34:
-            count += 1
-            if count >= TILES_FOR_OPEN_KAN:
-                break
-    else:
+    if player.tiles_34[discarded_tile // 4] < TILES_FOR_OPEN_KAN:
         return False
 
     if tiles_remaining(round_state.wall) < settings.min_wall_for_kan:
@@ -247,13 +237,14 @@ def _kan_preserves_waits_for_riichi(player: MahjongPlayer, tile_34: int) -> bool
     2. The tile is not one of the waiting tiles
     """
     # reduce to 13 tiles by removing one copy of the kan tile
+    removed = next(t for t in player.tiles if tile_to_34(t) == tile_34)
     tiles_13 = list(player.tiles)
-    for i, t in enumerate(tiles_13):
-        if tile_to_34(t) == tile_34:
-            tiles_13.pop(i)
-            break
+    tiles_13.remove(removed)
 
-    tenpai_player = player.model_copy(update={"tiles": tuple(tiles_13)})
+    new_tiles = tuple(tiles_13)
+    tenpai_player = player.model_copy(
+        update={"tiles": new_tiles, **tile_count_updates(player, new_tiles, removed=(removed,))},
+    )
     original_waits = get_waiting_tiles(tenpai_player)
 
     if not original_waits:
@@ -279,6 +270,7 @@ def _kan_preserves_waits_for_riichi(player: MahjongPlayer, tile_34: int) -> bool
         update={
             "tiles": remaining_tiles,
             "melds": (*player.melds, kan_meld),
+            **tile_count_updates(player, remaining_tiles, removed=kan_tiles, declared=kan_tiles),
         },
     )
 
@@ -329,6 +321,10 @@ def get_possible_closed_kans(
     if tiles_remaining(round_state.wall) < settings.min_wall_for_kan:
         return []
 
+    # a closed kan needs all 4 copies in hand, which is rare
+    if TILES_FOR_CLOSED_KAN not in player.tiles_34:
+        return []
+
     tile_counts: dict[int, int] = {}
     for t in player.tiles:
         t34 = t // 4
@@ -372,7 +368,7 @@ def get_possible_added_kans(
     for meld in player.melds:
         if meld.type == FrozenMeld.PON:
             meld_tile_34 = meld.tiles[0] // 4
-            if any(t // 4 == meld_tile_34 for t in player.tiles):
+            if player.tiles_34[meld_tile_34]:
                 possible.append(meld_tile_34)
 
     if not possible:
@@ -553,10 +549,12 @@ def call_pon(
         kuikae_tiles = tuple(get_kuikae_tiles(MeldCallType.PON, tile_34))
 
     # update player state
+    new_tiles = tuple(new_hand)
     player_updates: dict[str, object] = {
-        "tiles": tuple(new_hand),
+        "tiles": new_tiles,
         "melds": new_melds,
         "kuikae_tiles": kuikae_tiles,
+        **tile_count_updates(caller, new_tiles, removed=tuple(removed_tiles), declared=meld_tiles),
     }
     if pao_seat is not None:
         player_updates["pao_seat"] = pao_seat
@@ -640,12 +638,14 @@ def call_chi(  # noqa: PLR0913
             kuikae = [called_34]
 
     # update player state
+    new_tiles = tuple(new_hand)
     new_state = update_player(
         round_state,
         caller_seat,
-        tiles=tuple(new_hand),
+        tiles=new_tiles,
         melds=new_melds,
         kuikae_tiles=tuple(kuikae),
+        **tile_count_updates(caller, new_tiles, removed=sequence_tiles, declared=meld_tiles),
     )
     new_state = _finalize_meld_state(new_state, caller_seat, mark_open=True)
     # Chi requires a subsequent discard without drawing; mark state for tsumogiri detection
@@ -704,9 +704,11 @@ def call_open_kan(
     pao_seat = _check_pao(caller, discarder_seat, tile_34, settings)
 
     # update player state
+    new_tiles = tuple(new_hand)
     player_updates: dict[str, object] = {
-        "tiles": tuple(new_hand),
+        "tiles": new_tiles,
         "melds": new_melds,
+        **tile_count_updates(caller, new_tiles, removed=tuple(removed_tiles), declared=meld_tiles),
     }
     if pao_seat is not None:
         player_updates["pao_seat"] = pao_seat
@@ -742,7 +744,7 @@ def validate_closed_kan(
 
     _validate_kan_preconditions(round_state, settings)
 
-    count = sum(1 for t in player.tiles if tile_to_34(t) == tile_34)
+    count = player.tiles_34[tile_34]
     if count < TILES_FOR_CLOSED_KAN:
         raise InvalidMeldError(
             f"closed kan requires {TILES_FOR_CLOSED_KAN} tiles of type {tile_34}, player {seat} has {count}",
@@ -793,11 +795,13 @@ def call_closed_kan(
     new_melds = (*player.melds, meld)
 
     # update player state
+    new_tiles = tuple(new_hand)
     new_state = update_player(
         round_state,
         seat,
-        tiles=tuple(new_hand),
+        tiles=new_tiles,
         melds=new_melds,
+        **tile_count_updates(player, new_tiles, removed=meld_tiles, declared=meld_tiles),
     )
     # closed kan does NOT make the hand open (mark_open=False)
     new_state = _finalize_meld_state(new_state, seat, mark_open=False)
@@ -914,11 +918,13 @@ def call_added_kan(
     new_melds[pon_index] = upgraded_meld
 
     # update player state
+    new_tiles = tuple(new_hand)
     new_state = update_player(
         round_state,
         seat,
-        tiles=tuple(new_hand),
+        tiles=new_tiles,
         melds=tuple(new_melds),
+        **tile_count_updates(player, new_tiles, removed=(tile_id,), declared=(tile_id,)),
     )
     # added kan keeps the hand open (already open from the pon), no need to re-mark
     new_state = _finalize_meld_state(new_state, seat, mark_open=False)
@@ -0,0 +1,342 @@
+"""
+Mutable __slots__ state for the mutable state engine.
+
+MutableWall, MutablePlayer, MutableRoundState and MutableGameState mirror the
+frozen Wall, MahjongPlayer, MahjongRoundState and MahjongGameState field for
+field as plain __slots__ classes: no validation, no frozen guard, and a
+model_copy(update=...) that copies a handful of slot references instead of
+going through Pydantic's copy machinery. Every function in game.logic reads
+attributes and calls model_copy, so it runs on them unchanged.
+
+model_copy still returns a new object rather than updating in place. Logic
+code builds scratch copies (e.g. the simulated hands in melds.py), the furiten
+tracker compares player identity, and a handler that raises halfway through
+must leave the stored state untouched; copy-on-write keeps all three exactly
+as they behave on the frozen models.
+
+MahjongGameService holds thawed state when StateEngine.MUTABLE is selected
+and freezes it back into the Pydantic models only at its boundaries.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Self
+
+from pydantic import BaseModel
+
+from game.logic.state import MahjongGameState, MahjongPlayer, MahjongRoundState, with_tile_counts
+from game.logic.wall import Wall
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from game.logic.enums import GamePhase, RoundPhase
+    from game.logic.meld_wrapper import FrozenMeld
+    from game.logic.settings import GameSettings
+    from game.logic.state import Discard, PendingCallPrompt
+
+
+class _MutableModel:
+    """Shared model_copy for the mutable mirrors; subclasses provide _clone."""
+
+    __slots__ = ()
+
+    def _clone(self) -> Self:
+        raise NotImplementedError  # pragma: no cover -- every mirror overrides _clone
+
+    def model_copy(self, *, update: Mapping[str, Any] | None = None) -> Self:
+        """Return a shallow copy with `update` applied, like BaseModel.model_copy."""
+        new = self._clone()
+        if update:
+            for name, value in update.items():
+                setattr(new, name, value)
+        return new
+
+
+class MutableWall(_MutableModel):
+    """Mutable mirror of Wall."""
+
+    __slots__ = (
+        "dead_wall_tiles",
+        "dice",
+        "dora_indicators",
+        "live_tiles",
+        "pending_dora_count",
+        "rinshan_draws_count",
+        "ura_dora_indicators",
+    )
+
+    live_tiles: tuple[int, ...]
+    dead_wall_tiles: tuple[int, ...]
+    dora_indicators: tuple[int, ...]
+    ura_dora_indicators: tuple[int, ...]
+    pending_dora_count: int
+    rinshan_draws_count: int
+    dice: tuple[int, int]
+
+    def _clone(self) -> Self:
+        new = object.__new__(type(self))
+        new.live_tiles = self.live_tiles
+        new.dead_wall_tiles = self.dead_wall_tiles
+        new.dora_indicators = self.dora_indicators
+        new.ura_dora_indicators = self.ura_dora_indicators
+        new.pending_dora_count = self.pending_dora_count
+        new.rinshan_draws_count = self.rinshan_draws_count
+        new.dice = self.dice
+        return new
+
+
+class MutablePlayer(_MutableModel):
+    """Mutable mirror of MahjongPlayer, including its tile count vectors."""
+
+    __slots__ = (
+        "discards",
+        "is_daburi",
+        "is_ippatsu",
+        "is_riichi",
+        "is_riichi_furiten",
+        "is_rinshan",
+        "is_temporary_furiten",
+        "kuikae_tiles",
+        "meld_tiles_34",
+        "melds",
+        "name",
+        "pao_seat",
+        "score",
+        "seat",
+        "tiles",
+        "tiles_34",
+    )
+
+    seat: int
+    name: str
+    tiles: tuple[int, ...]
+    discards: tuple[Discard, ...]
+    melds: tuple[FrozenMeld, ...]
+    is_riichi: bool
+    is_ippatsu: bool
+    is_daburi: bool
+    is_rinshan: bool
+    kuikae_tiles: tuple[int, ...]
+    pao_seat: int | None
+    is_temporary_furiten: bool
+    is_riichi_furiten: bool
+    score: int
+    tiles_34: tuple[int, ...]
+    meld_tiles_34: tuple[int, ...]
+
+    def _clone(self) -> Self:
+        new = object.__new__(type(self))
+        new.seat = self.seat
+        new.name = self.name
+        new.tiles = self.tiles
+        new.discards = self.discards
+        new.melds = self.melds
+        new.is_riichi = self.is_riichi
+        new.is_ippatsu = self.is_ippatsu
+        new.is_daburi = self.is_daburi
+        new.is_rinshan = self.is_rinshan
+        new.kuikae_tiles = self.kuikae_tiles
+        new.pao_seat = self.pao_seat
+        new.is_temporary_furiten = self.is_temporary_furiten
+        new.is_riichi_furiten = self.is_riichi_furiten
+        new.score = self.score
+        new.tiles_34 = self.tiles_34
+        new.meld_tiles_34 = self.meld_tiles_34
+        return new
+
+    def model_copy(self, *, update: Mapping[str, Any] | None = None) -> Self:
+        """Copy the player, recounting tile vectors when tiles or melds change without them."""
+        if update:
+            update = with_tile_counts(update, self.tiles, self.melds)
+        return super().model_copy(update=update)
+
+    def has_open_melds(self) -> bool:
+        """Check if player has any open melds (excluding closed kans)."""
+        return any(meld.opened for meld in self.melds)
+
+
+class MutableRoundState(_MutableModel):
+    """Mutable mirror of MahjongRoundState."""
+
+    __slots__ = (
+        "all_discards",
+        "current_player_seat",
+        "dealer_seat",
+        "is_after_meld_call",
+        "pending_call_prompt",
+        "phase",
+        "players",
+        "players_with_open_hands",
+        "round_wind",
+        "turn_count",
+        "wall",
+    )
+
+    wall: MutableWall
+    players: tuple[MutablePlayer, ...]
+    dealer_seat: int
+    current_player_seat: int
+    round_wind: int
+    turn_count: int
+    all_discards: tuple[int, ...]
+    players_with_open_hands: tuple[int, ...]
+    phase: RoundPhase
+    pending_call_prompt: PendingCallPrompt | None
+    is_after_meld_call: bool
+
+    def _clone(self) -> Self:
+        new = object.__new__(type(self))
+        new.wall = self.wall
+        new.players = self.players
+        new.dealer_seat = self.dealer_seat
+        new.current_player_seat = self.current_player_seat
+        new.round_wind = self.round_wind
+        new.turn_count = self.turn_count
+        new.all_discards = self.all_discards
+        new.players_with_open_hands = self.players_with_open_hands
+        new.phase = self.phase
+        new.pending_call_prompt = self.pending_call_prompt
+        new.is_after_meld_call = self.is_after_meld_call
+        return new
+
+
+class MutableGameState(_MutableModel):
+    """Mutable mirror of MahjongGameState."""
+
+    __slots__ = (
+        "dealer_dice",
+        "game_phase",
+        "honba_sticks",
+        "riichi_sticks",
+        "rng_version",
+        "round_number",
+        "round_state",
+        "seed",
+        "settings",
+        "starting_dealer_seat",
+        "unique_dealers",
+    )
+
+    round_state: MutableRoundState
+    round_number: int
+    unique_dealers: int
+    honba_sticks: int
+    riichi_sticks: int
+    game_phase: GamePhase
+    seed: str
+    rng_version: str
+    settings: GameSettings
+    dealer_dice: tuple[tuple[int, int], tuple[int, int]]
+    starting_dealer_seat: int
+
+    def _clone(self) -> Self:
+        new = object.__new__(type(self))
+        new.round_state = self.round_state
+        new.round_number = self.round_number
+        new.unique_dealers = self.unique_dealers
+        new.honba_sticks = self.honba_sticks
+        new.riichi_sticks = self.riichi_sticks
+        new.game_phase = self.game_phase
+        new.seed = self.seed
+        new.rng_version = self.rng_version
+        new.settings = self.settings
+        new.dealer_dice = self.dealer_dice
+        new.starting_dealer_seat = self.starting_dealer_seat
+        return new
+
+
+def _thaw_fields[T: _MutableModel](mutable_type: type[T], model: object) -> T:
+    """Build a mutable mirror holding the same field values as `model`."""
+    new = object.__new__(mutable_type)
+    for name in mutable_type.__slots__:
+        setattr(new, name, getattr(model, name))
+    return new
+
+
+def _freeze[M: BaseModel](model_type: type[M], mutable: _MutableModel, **nested: object) -> M:
+    """
+    Build a frozen model from a mirror's field values, overriding already-frozen nested values.
+
+    The values came from validated models and logic code, so this sets the
+    instance attributes directly instead of calling model_construct, which
+    is several times slower per object.
+    """
+    fields = {name: nested[name] if name in nested else getattr(mutable, name) for name in model_type.model_fields}
+    model = object.__new__(model_type)
+    object.__setattr__(model, "__dict__", fields)
+    object.__setattr__(model, "__pydantic_fields_set__", set(fields))
+    object.__setattr__(model, "__pydantic_extra__", None)
+    object.__setattr__(model, "__pydantic_private__", None)
+    return model
+
+
+def _thaw_round_state(round_state: MahjongRoundState | MutableRoundState) -> MutableRoundState:
+    """Convert round state into its mutable mirror, reusing parts that are already mutable."""
+    players = tuple(p if isinstance(p, MutablePlayer) else _thaw_fields(MutablePlayer, p) for p in round_state.players)
+    wall = (
+        round_state.wall if isinstance(round_state.wall, MutableWall) else _thaw_fields(MutableWall, round_state.wall)
+    )
+    if (
+        isinstance(round_state, MutableRoundState)
+        and wall is round_state.wall
+        and all(new is old for new, old in zip(players, round_state.players, strict=True))
+    ):
+        return round_state
+    return _thaw_fields(MutableRoundState, round_state).model_copy(update={"players": players, "wall": wall})
+
+
+def thaw_game_state(game_state: MahjongGameState | MutableGameState) -> MutableGameState:
+    """
+    Convert game state into its mutable mirror.
+
+    Accepts partially thawed state, e.g. a MutableGameState whose round_state
+    was just replaced by a frozen MahjongRoundState from init_round, and only
+    converts the frozen parts. Objects that are already mutable are reused,
+    never modified, so the result stays safe to hand back to logic code.
+    """
+    round_state = _thaw_round_state(game_state.round_state)
+    if isinstance(game_state, MutableGameState) and round_state is game_state.round_state:
+        return game_state
+    return _thaw_fields(MutableGameState, game_state).model_copy(update={"round_state": round_state})
+
+
+def _freeze_round_state(
+    round_state: MutableRoundState,
+    previous: tuple[MutableRoundState, MahjongRoundState] | None,
+) -> MahjongRoundState:
+    """Freeze round state, reusing the previous snapshot's wall and players where the mirrors are unchanged."""
+    if previous is None:
+        wall = _freeze(Wall, round_state.wall)
+        players = tuple(_freeze(MahjongPlayer, p) for p in round_state.players)
+    else:
+        old_round, old_frozen = previous
+        if old_round is round_state:
+            return old_frozen
+        wall = old_frozen.wall if old_round.wall is round_state.wall else _freeze(Wall, round_state.wall)
+        players = tuple(
+            frozen if p is old else _freeze(MahjongPlayer, p)
+            for p, old, frozen in zip(round_state.players, old_round.players, old_frozen.players, strict=True)
+        )
+    return _freeze(MahjongRoundState, round_state, wall=wall, players=players)
+
+
+def freeze_game_state(
+    game_state: MutableGameState,
+    previous: tuple[MutableGameState, MahjongGameState] | None = None,
+) -> MahjongGameState:
+    """
+    Convert mutable game state into frozen Pydantic models.
+
+    `previous` is an earlier (mirror, snapshot) pair of the same game. Mirrors
+    are only ever replaced through model_copy, never changed in place, so any
+    part that is still the same mirror object reuses its frozen counterpart
+    and a snapshot only pays for what changed since the last one.
+    """
+    if previous is None:
+        return _freeze(MahjongGameState, game_state, round_state=_freeze_round_state(game_state.round_state, None))
+    old_game, old_frozen = previous
+    if old_game is game_state:
+        return old_frozen
+    frozen_round = _freeze_round_state(game_state.round_state, (old_game.round_state, old_frozen.round_state))
+    return _freeze(MahjongGameState, game_state, round_state=frozen_round)
@@ -51,7 +51,7 @@ def can_declare_riichi(
         return False
 
     # must be in tempai
-    return is_tempai(player.tiles, player.melds)
+    return is_tempai(player.tiles, player.melds, player.tiles_34)
 
 
 def declare_riichi(
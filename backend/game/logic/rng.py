@@ -20,10 +20,14 @@ Statistically Good Algorithms for Random Number Generation."
 import hashlib
 import random
 import secrets
+from typing import TYPE_CHECKING
 
 from game.logic.settings import NUM_PLAYERS
 from game.logic.tiles import NUM_TILES
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 SEED_BYTES = 96  # 768 bits — exceeds 136!/(4!)^34 ≈ 2^616 unique game space (136! ≈ 2^772.5)
 RNG_VERSION = "pcg64dxsm-v1"  # Stored in game metadata for replay compatibility detection
 _DOMAIN_PREFIX = b"ronin-wall-v1:"  # Domain separator for hash-based derivation (versioned)
@@ -35,6 +39,7 @@ _PCG_MULTIPLIER = 0x2360ED051FC65DA44385DF649FCCF645
 _PCG_DXSM_MUL = 0xDA942042E4DD58B5  # DXSM output permutation multiplier
 _UINT128_MASK = (1 << 128) - 1
 _UINT64_MASK = (1 << 64) - 1
+_UINT64_RANGE = 1 << 64
 
 
 def validate_seed_hex(seed_hex: str) -> None:
@@ -61,7 +66,9 @@ class PCG64DXSM:
     Uses a 128-bit LCG state with the full 128-bit multiplier and the DXSM
     (double-xorshift-multiply) output permutation for high-quality 64-bit output.
 
-    Reference: NumPy's default PCG64DXSM bit generator uses the same constants.
+    The 128-bit LCG multiplier differs from NumPy's PCG64DXSM, which advances
+    its state with the 64-bit "cheap" multiplier (here used only in the DXSM
+    output step), so NumPy's bit generators cannot reproduce this stream.
     """
 
     def __init__(self, state: int, increment: int) -> None:
@@ -92,6 +99,28 @@ class PCG64DXSM:
 
         return hi
 
+    def next_uint64_batch(self, count: int) -> list[int]:
+        """
+        Generate the next `count` 64-bit outputs in one call.
+
+        Produces exactly the values of `count` next_uint64() calls, with the
+        state kept in locals for the whole loop instead of on the instance.
+        """
+        state = self._state
+        inc = self._inc
+        outputs = []
+        append = outputs.append
+        for _ in range(count):
+            hi = state >> 64
+            lo = (state & _UINT64_MASK) | 1
+            hi ^= hi >> 32
+            hi = (hi * _PCG_DXSM_MUL) & _UINT64_MASK
+            hi ^= hi >> 48
+            append((hi * lo) & _UINT64_MASK)
+            state = (state * _PCG_MULTIPLIER + inc) & _UINT128_MASK
+        self._state = state
+        return outputs
+
 
 def generate_seed() -> str:
     """Generate a cryptographic seed as a hex string (192 chars / 768 bits)."""
@@ -145,20 +174,38 @@ def _bounded_uint64(pcg: PCG64DXSM, bound: int) -> int:
             return r % bound
 
 
+def _uint64_stream(pcg: PCG64DXSM, prefetch: int) -> Iterator[int]:
+    """Yield PCG outputs in stream order: a batch of `prefetch` values, then one at a time."""
+    yield from pcg.next_uint64_batch(prefetch)
+    while True:
+        yield pcg.next_uint64()
+
+
 def _fisher_yates_shuffle(tiles: list[int], pcg: PCG64DXSM) -> list[int]:
     """
     Perform Fisher-Yates (Knuth) shuffle using PCG64DXSM random values.
 
     For i in 0..n-2: swap tiles[i] with tiles[i + bounded_uint64(n - i)]
 
-    Uses rejection sampling via _bounded_uint64 to produce a provably unbiased
+    Uses rejection sampling (as in _bounded_uint64) to produce a provably unbiased
     permutation. This follows the RNG research recommendation and industry best
     practice (Node.js crypto.randomInt and NumPy both use rejection sampling).
+
+    The n - 1 outputs are drawn as one batch. Every step consumes at least one
+    output, so the batch never runs ahead of the stream; a rejected value
+    simply moves on to the next output, exactly as _bounded_uint64 would, and
+    the generator is left where the per-draw shuffle would leave it.
     """
     n = len(tiles)
     result = list(tiles)
+    draws = _uint64_stream(pcg, n - 1)
     for i in range(n - 1):
-        j = i + _bounded_uint64(pcg, n - i)
+        bound = n - i
+        limit = _UINT64_RANGE - (_UINT64_RANGE % bound)
+        r = next(draws)
+        while r >= limit:
+            r = next(draws)
+        j = i + r % bound
         result[i], result[j] = result[j], result[i]
     return result
 
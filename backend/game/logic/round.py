@@ -5,7 +5,6 @@ Round initialization and management for Mahjong game.
 from __future__ import annotations
 
 import structlog
-from mahjong.agari import Agari
 from xiangting import PlayerCount, calculate_replacement_number
 
 from game.logic import wall as wall_ops
@@ -21,10 +20,12 @@ from game.logic.state import (
 )
 from game.logic.state_utils import (
     add_tile_to_player,
+    tile_count_updates,
     update_player,
 )
-from game.logic.tiles import NUM_TILE_TYPES, hand_to_34_array, is_terminal_or_honor, tile_to_34
+from game.logic.tiles import hand_to_34_array, is_terminal_or_honor, tile_to_34
 from game.logic.types import ExhaustiveDrawResult, NagashiManganResult, TenpaiHand
+from game.logic.waits import find_waiting_tiles
 from game.logic.win import MAX_TILE_COPIES
 
 logger = structlog.get_logger()
@@ -42,28 +43,6 @@ def check_exhaustive_draw(round_state: MahjongRoundState) -> bool:
     return wall_ops.is_wall_exhausted(round_state.wall)
 
 
-def _get_hand_waiting_tiles(tiles: list[int]) -> set[int]:
-    """
-    Find waiting tiles based on hand tiles only (ignoring melds for agari check).
-
-    Uses agari.is_agari without open_sets since the mahjong library's agari
-    checker expects meld tiles to be included in the tiles_34 array when
-    open_sets is provided. For tenpai/karaten checks, we only have hand tiles
-    (excluding melds), so passing None is correct.
-    """
-    tiles_34 = hand_to_34_array(tiles)
-    waiting = set()
-    for tile_34 in range(NUM_TILE_TYPES):
-        if tiles_34[tile_34] >= MAX_TILE_COPIES:
-            continue
-        tiles_34[tile_34] += 1
-        if Agari.is_agari(tiles_34, None):
-            waiting.add(tile_34)
-        tiles_34[tile_34] -= 1
-
-    return waiting
-
-
 def draw_tile(
     round_state: MahjongRoundState,
 ) -> tuple[MahjongRoundState, int | None]:
@@ -122,9 +101,11 @@ def discard_tile(
     # clears per-turn flags).
     tiles = list(player.tiles)
     tiles.remove(tile_id)
+    new_tiles = tuple(tiles)
     new_player = player.model_copy(
         update={
-            "tiles": tuple(tiles),
+            "tiles": new_tiles,
+            **tile_count_updates(player, new_tiles, removed=(tile_id,)),
             "discards": (*player.discards, discard),
             "is_ippatsu": False,
             "is_temporary_furiten": False,
@@ -202,6 +183,7 @@ def draw_from_dead_wall(
 def is_tempai(
     tiles: tuple[int, ...] | list[int],
     melds: tuple | list,
+    tiles_34: tuple[int, ...] | list[int] | None = None,
 ) -> bool:
     """
     Check if the given tiles are in tenpai (one tile away from winning).
@@ -214,65 +196,61 @@ def is_tempai(
     Args:
         tiles: The player's hand tiles (13 or 14 tiles).
         melds: The player's melds (for karaten check).
+        tiles_34: Tile counts of `tiles` when already known (e.g. the
+            player's maintained tiles_34); computed from `tiles` otherwise.
 
     Returns:
         True if the hand is in tenpai, False otherwise.
 
     """
-    tiles_list = list(tiles)
+    counts = list(tiles_34) if tiles_34 is not None else hand_to_34_array(tiles)
 
-    if len(tiles_list) == HAND_SIZE_AFTER_DRAW:
-        # Compute the 34-array once, then modify in-place for each discard check.
+    if len(tiles) == HAND_SIZE_AFTER_DRAW:
+        # Modify the 34-array in-place for each discard check.
         # Deduplicate by tile type: discarding two tiles of the same type yields
         # the same 34-array, so only one shanten check is needed per type.
         #
         # Call calculate_replacement_number directly instead of calculate_shanten
         # to skip the per-call sum(tiles_34) guard. After removing one tile from
         # a 14-tile hand the count is always 13 (3*4+1), so the guard always passes.
-        tiles_34 = hand_to_34_array(tiles_list)
-        checked: set[int] = set()
         four = PlayerCount.FOUR
-        for i in range(len(tiles_list)):
-            t34 = tiles_list[i] // 4
-            if t34 in checked:
+        for t34, count in enumerate(counts):
+            if not count:
                 continue
-            checked.add(t34)
-            tiles_34[t34] -= 1
-            is_tenpai = calculate_replacement_number(tiles_34, four) == 1
-            tiles_34[t34] += 1
+            counts[t34] -= 1
+            is_tenpai = calculate_replacement_number(counts, four) == 1 and not _is_pure_karaten(counts, melds)
+            counts[t34] += 1
             if is_tenpai:
-                remaining = tiles_list[:i] + tiles_list[i + 1 :]
-                if not _is_pure_karaten(remaining, melds):
-                    return True
+                return True
         return False
 
     # Unlike the 14-tile loop above, tile count here can be invalid for
     # calculate_replacement_number: empty hands (0 tiles) or 3n+0 counts
     # like 15 tiles. calculate_shanten guards against these with sum().
-    tiles_34 = hand_to_34_array(tiles_list)
-    if calculate_shanten(tiles_34) != 0:
+    if calculate_shanten(counts) != 0:
         return False
 
-    return not _is_pure_karaten(tiles_list, melds)
+    return not _is_pure_karaten(counts, melds)
 
 
 def _is_pure_karaten(
-    tiles: list[int],
+    tiles_34: list[int],
     melds: tuple | list,
 ) -> bool:
     """
     Check if all winning tiles are entirely in the player's own hand + melds.
 
-    Uses local tile and meld lists rather than player object.
+    Uses local tile counts and meld lists rather than player object.
     Pure karaten means the player holds all 4 copies of every tile they are
     waiting on. This is not considered valid tenpai.
     """
-    waiting = _get_hand_waiting_tiles(tiles)
+    # wait detection only sees the hand tiles (melds excluded from the agari check)
+    waiting = find_waiting_tiles(tiles_34)
     if not waiting:
         return True  # no waiting tiles at all  # pragma: no cover
 
     # count tiles in player's hand + melds
-    tile_counts = hand_to_34_array(tiles)
+    tile_counts = list(tiles_34)
     for meld in melds:
         for t in meld.tiles:
             tile_counts[tile_to_34(t)] += 1
@@ -307,7 +285,7 @@ def process_exhaustive_draw(
     tenpai_hands = []
 
     for player in round_state.players:
-        if is_tempai(player.tiles, player.melds):
+        if is_tempai(player.tiles, player.melds, player.tiles_34):
             tempai_seats.append(player.seat)
             tenpai_hands.append(
                 TenpaiHand(
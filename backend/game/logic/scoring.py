@@ -10,11 +10,10 @@ from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 import structlog
-from mahjong.hand_calculating.hand import HandCalculator
 from mahjong.hand_calculating.hand_config import HandConfig
 
+from game.logic.hand_value import hand_value_cache
 from game.logic.meld_compact import frozen_meld_to_compact
-from game.logic.meld_wrapper import frozen_melds_to_melds
 from game.logic.settings import NUM_PLAYERS, GameSettings, RenhouValue, build_optional_rules
 from game.logic.state import seat_to_wind
 from game.logic.state_utils import update_player
@@ -155,11 +154,10 @@ def _evaluate_hand(
     dora_indicators = _collect_dora_indicators(ctx.round_state, ctx.settings)
     ura_dora_indicators = collect_ura_dora_indicators(ctx.player, ctx.round_state, ctx.settings)
 
-    melds = frozen_melds_to_melds(ctx.player.melds)
-    result = HandCalculator.estimate_hand_value(
+    result = hand_value_cache.estimate_hand_value(
         tiles=tiles,
         win_tile=win_tile,
-        melds=melds,
+        melds=ctx.player.melds,
         dora_indicators=dora_indicators,
         config=config,
         ura_dora_indicators=ura_dora_indicators,
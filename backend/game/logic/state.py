@@ -6,16 +6,21 @@ Uses frozen Pydantic models for immutable state management.
 
 from __future__ import annotations
 
-from pydantic import BaseModel, ConfigDict, Field
+from typing import TYPE_CHECKING, Any, Self, cast
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from game.logic.enums import CallType, GameAction, GamePhase, RoundPhase, WindName
 from game.logic.meld_wrapper import FrozenMeld
 from game.logic.rng import RNG_VERSION
 from game.logic.settings import NUM_PLAYERS, GameSettings
-from game.logic.tiles import WINDS_34
+from game.logic.tiles import NUM_TILE_TYPES, WINDS_34, hand_to_34_array
 from game.logic.types import GameView, MeldCaller, PlayerView
 from game.logic.wall import Wall
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
 _WIND_NAMES = (WindName.EAST, WindName.SOUTH, WindName.WEST, WindName.NORTH)
 
 
@@ -57,11 +62,48 @@ class PendingCallPrompt(BaseModel):
     responses: tuple[CallResponse, ...] = ()
 
 
+def count_player_tiles_34(
+    tiles: tuple[int, ...],
+    melds: Iterable[FrozenMeld],
+) -> dict[str, tuple[int, ...]]:
+    """
+    Count a player's closed hand and meld tiles by tile type.
+
+    Returns the tiles_34 and meld_tiles_34 fields of MahjongPlayer. Meld tiles
+    that also appear in the closed hand are counted only in tiles_34.
+    """
+    meld_tiles_34 = [0] * NUM_TILE_TYPES
+    hand_ids = set(tiles)
+    for meld in melds:
+        for t in meld.tiles:
+            if t not in hand_ids:
+                meld_tiles_34[t // 4] += 1
+    return {"tiles_34": tuple(hand_to_34_array(tiles)), "meld_tiles_34": tuple(meld_tiles_34)}
+
+
+def with_tile_counts(
+    update: Mapping[str, Any],
+    tiles: tuple[int, ...],
+    melds: tuple[FrozenMeld, ...],
+) -> Mapping[str, Any]:
+    """Add recounted tile vectors to a player update that changes tiles or melds without them."""
+    if "tiles_34" not in update and ("tiles" in update or "melds" in update):
+        counts = count_player_tiles_34(tuple(update.get("tiles", tiles)), update.get("melds", melds))
+        return {**update, **counts}
+    return update
+
+
 class MahjongPlayer(BaseModel):
     """
     Immutable player state.
 
     Uses FrozenMeld wrapper for true immutability of meld data.
+
+    tiles_34 and meld_tiles_34 are per-type counts of the closed hand and of
+    meld tiles held outside it, kept in step with tiles and melds so win and
+    call checks read them instead of rebuilding 34-arrays. Hot paths pass
+    incremental counts (see state_utils.tile_count_updates); any other
+    construction or model_copy that changes tiles or melds recounts them.
     """
 
     model_config = ConfigDict(frozen=True)
@@ -80,6 +122,22 @@ class MahjongPlayer(BaseModel):
     is_temporary_furiten: bool = False
     is_riichi_furiten: bool = False
     score: int
+    tiles_34: tuple[int, ...] = Field(default=(), exclude=True, repr=False)
+    meld_tiles_34: tuple[int, ...] = Field(default=(), exclude=True, repr=False)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _fill_tile_counts(cls, data: object) -> object:
+        if isinstance(data, dict) and "tiles_34" not in data:
+            fields = cast("dict[str, Any]", data)
+            return {**fields, **count_player_tiles_34(tuple(fields.get("tiles", ())), fields.get("melds", ()))}
+        return data
+
+    def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> Self:
+        """Copy the player, recounting tile vectors when tiles or melds change without them."""
+        if update:
+            update = with_tile_counts(update, self.tiles, self.melds)
+        return super().model_copy(update=update, deep=deep)
 
     def has_open_melds(self) -> bool:
         """Check if player has any open melds (excluding closed kans)."""
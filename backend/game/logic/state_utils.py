@@ -66,7 +66,63 @@ def add_tile_to_player(
     """
     player = round_state.players[seat]
     new_tiles = (*player.tiles, tile_id)
-    return update_player(round_state, seat, tiles=new_tiles)
+    return update_player(
+        round_state,
+        seat,
+        tiles=new_tiles,
+        **tile_count_updates(player, new_tiles, added=(tile_id,)),
+    )
+
+
+def tile_count_updates(
+    player: MahjongPlayer,
+    new_tiles: tuple[int, ...],
+    *,
+    added: tuple[int, ...] = (),
+    removed: tuple[int, ...] = (),
+    declared: tuple[int, ...] = (),
+) -> dict[str, object]:
+    """
+    Return incrementally updated tile count fields for a hand change.
+
+    Adjusts the player's tiles_34 and meld_tiles_34 for tiles added to and
+    removed from the closed hand, and for tiles newly declared in melds,
+    without recounting the whole hand.
+
+    Args:
+        player: Player before the change
+        new_tiles: Closed hand after the change
+        added: Tile IDs added to the closed hand
+        removed: Tile IDs removed from the closed hand
+        declared: Tile IDs newly added to the player's melds
+
+    Returns:
+        Player field updates for tiles_34 and meld_tiles_34
+
+    """
+    tiles_34 = list(player.tiles_34)
+    for t in added:
+        tiles_34[t // 4] += 1
+    for t in removed:
+        tiles_34[t // 4] -= 1
+
+    meld_tiles_34 = player.meld_tiles_34
+    if declared or (player.melds and (added or removed)):
+        meld_34 = list(meld_tiles_34)
+        meld_ids = {t for meld in player.melds for t in meld.tiles}
+        # meld_tiles_34 counts meld tiles held outside the closed hand
+        for t in added:
+            if t in meld_ids:
+                meld_34[t // 4] -= 1
+        for t in removed:
+            if t in meld_ids:
+                meld_34[t // 4] += 1
+        for t in declared:
+            if t not in new_tiles:
+                meld_34[t // 4] += 1
+        meld_tiles_34 = tuple(meld_34)
+
+    return {"tiles_34": tuple(tiles_34), "meld_tiles_34": meld_tiles_34}
 
 
 def advance_turn(
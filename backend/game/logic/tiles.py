@@ -2,6 +2,10 @@
 Tile representation utilities for Mahjong game.
 """
 
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
 
 # tile ranges in 136-format (4 copies of each tile)
 # man (characters): 0-35 (1m-9m, 4 copies each)
@@ -77,7 +81,7 @@ def sort_tiles(tiles: list[int]) -> list[int]:
     return sorted(tiles)
 
 
-def hand_to_34_array(tiles: list[int] | tuple[int, ...]) -> list[int]:
+def hand_to_34_array(tiles: Sequence[int]) -> list[int]:
     """
     Convert a list of 136-format tile IDs to a 34-array (tile counts).
 
@@ -309,7 +309,9 @@ def _validate_riichi_discard(
         simulated.append(t)
     if not removed:
         raise InvalidRiichiError(f"tile {tile_id} not in hand")
-    if not is_tempai(tuple(simulated), player.melds):
+    simulated_34 = list(player.tiles_34)
+    simulated_34[tile_id // 4] -= 1
+    if not is_tempai(simulated, player.melds, simulated_34):
         raise InvalidRiichiError(f"hand is not tenpai after discarding tile {tile_id}")
 
 
@@ -0,0 +1,185 @@
+"""
+Precomputed wait tables for tenpai detection.
+
+A concealed hand is split into its three numbered suits and seven honor types.
+Every suit shape that decomposes into melds (optionally plus one pair) is
+enumerated once at import into lookup sets keyed by packed per-suit count
+vectors, so the complete wait set of a 13-tile hand (or 13-3n tiles after
+calls) is resolved with a few set lookups on the one group that can still
+take the winning tile, instead of one Agari.is_agari call per tile type.
+
+Results match the Agari scan exactly: a tile type is a wait if the hand holds
+fewer than 4 copies of it and adding one copy produces a regular hand
+(4 melds + pair), chiitoitsu, or kokushi musou.
+"""
+
+from mahjong.agari import Agari
+
+from game.logic.tiles import HONOR_34_START, NUM_TILE_TYPES, TILES_PER_SUIT
+
+# a packed suit key stores one tile count per byte, lowest tile first
+_COUNT_BITS = 8
+_MAX_COPIES = 4
+# adding this to a key sets a field's high bit exactly when that count exceeds 4
+_FIELD_OVERFLOW = sum((0x80 - _MAX_COPIES - 1) << (_COUNT_BITS * i) for i in range(TILES_PER_SUIT))
+_FIELD_HIGH_BITS = sum(0x80 << (_COUNT_BITS * i) for i in range(TILES_PER_SUIT))
+# a concealed hand holds at most 4 melds besides its pair
+_MAX_SUIT_MELDS = 4
+# largest hand the tables cover: a closed 13-tile hand waiting on its 14th tile
+_TENPAI_HAND_SIZE = 13
+
+_SUIT_STARTS = (0, TILES_PER_SUIT, 2 * TILES_PER_SUIT)
+_HONOR_TYPES = range(HONOR_34_START, NUM_TILE_TYPES)
+
+_PAIR_COUNT = 2
+_TRIPLET_COUNT = 3
+
+_KOKUSHI_TYPES = (0, 8, 9, 17, 18, 26, *_HONOR_TYPES)
+_CHIITOITSU_PAIRS = 7
+
+
+def _unit(index: int, count: int = 1) -> int:
+    """Return the packed suit key holding `count` copies of tile `index`."""
+    return count << (_COUNT_BITS * index)
+
+
+def _is_valid_shape(key: int) -> bool:
+    """Check that no tile in a packed suit key exceeds 4 copies."""
+    return not ((key + _FIELD_OVERFLOW) & _FIELD_HIGH_BITS)
+
+
+def _build_suit_shapes() -> tuple[frozenset[int], frozenset[int]]:
+    """
+    Enumerate every complete suit shape of up to 4 melds.
+
+    Returns (meld_shapes, pair_shapes): packed suit keys that decompose into
+    melds only, and into melds plus exactly one pair.
+    """
+    melds = [_unit(i, _TRIPLET_COUNT) for i in range(TILES_PER_SUIT)]
+    melds += [_unit(i) + _unit(i + 1) + _unit(i + 2) for i in range(TILES_PER_SUIT - 2)]
+
+    meld_shapes = {0}
+    frontier = {0}
+    for _ in range(_MAX_SUIT_MELDS):
+        frontier = {key + meld for key in frontier for meld in melds if _is_valid_shape(key + meld)}
+        meld_shapes |= frontier
+
+    pairs = [_unit(i, _PAIR_COUNT) for i in range(TILES_PER_SUIT)]
+    pair_shapes = {key + pair for key in meld_shapes for pair in pairs if _is_valid_shape(key + pair)}
+    return frozenset(meld_shapes), frozenset(pair_shapes)
+
+
+_MELD_SHAPES, _PAIR_SHAPES = _build_suit_shapes()
+_SUIT_UNITS = tuple(_unit(i) for i in range(TILES_PER_SUIT))
+
+
+def _suit_key(tiles_34: list[int], start: int) -> int:
+    """Pack the nine tile counts of the suit starting at `start` into a single int."""
+    return int.from_bytes(bytes(tiles_34[start : start + TILES_PER_SUIT]), "little")
+
+
+def _suit_waits(start: int, key: int, other_pairs: int) -> list[int]:
+    """Return the tiles completing one suit, given how many pairs the other groups hold."""
+    if other_pairs == 0:
+        shapes = _PAIR_SHAPES
+    elif other_pairs == 1:
+        shapes = _MELD_SHAPES
+    else:
+        return []
+    return [start + i for i, unit in enumerate(_SUIT_UNITS) if key + unit in shapes]
+
+
+def _regular_waits(tiles_34: list[int]) -> set[int]:
+    """
+    Find waits completing a regular hand (melds + one pair).
+
+    Each suit and honor type is classified as complete (melds only), complete
+    with a pair, or incomplete. The winning tile must land in the single
+    incomplete group, or in any group when all are complete; the group it
+    lands in must end up holding the pair exactly when no other group does.
+    """
+    suits = [(start, _suit_key(tiles_34, start)) for start in _SUIT_STARTS]
+    # honor types that are not already a finished triplet (or absent)
+    honors = [tile_34 for tile_34 in _HONOR_TYPES if tiles_34[tile_34] not in {0, _TRIPLET_COUNT}]
+    pairs = sum(key in _PAIR_SHAPES for _, key in suits)
+    pairs += sum(tiles_34[tile_34] == _PAIR_COUNT for tile_34 in honors)
+
+    broken_suits = [(start, key) for start, key in suits if key not in _PAIR_SHAPES and key not in _MELD_SHAPES]
+    broken_honors = [tile_34 for tile_34 in honors if tiles_34[tile_34] != _PAIR_COUNT]
+    if len(broken_suits) + len(broken_honors) > 1:
+        return set()
+    if broken_suits or broken_honors:
+        suits, honors = broken_suits, broken_honors
+
+    waiting: set[int] = set()
+    for start, key in suits:
+        waiting.update(_suit_waits(start, key, pairs - (key in _PAIR_SHAPES)))
+    for tile_34 in honors:
+        count = tiles_34[tile_34]
+        other_pairs = pairs - (count == _PAIR_COUNT)
+        # a single becomes the pair, a pair becomes a triplet
+        if (count == 1 and other_pairs == 0) or (count == _PAIR_COUNT and other_pairs == 1):
+            waiting.add(tile_34)
+    return waiting
+
+
+def _chiitoitsu_wait(tiles_34: list[int]) -> int | None:
+    """Return the single tile type completing seven distinct pairs, if any."""
+    # 6 pairs + 1 single already account for all 13 tiles
+    if tiles_34.count(_PAIR_COUNT) == _CHIITOITSU_PAIRS - 1 and tiles_34.count(1) == 1:
+        return tiles_34.index(1)
+    return None
+
+
+def _kokushi_waits(tiles_34: list[int]) -> tuple[int, ...]:
+    """Return the tile types completing kokushi musou (thirteen orphans)."""
+    if any(any(tiles_34[start + 1 : start + TILES_PER_SUIT - 1]) for start in _SUIT_STARTS):
+        return ()
+    missing: list[int] = []
+    has_pair = False
+    for tile_34 in _KOKUSHI_TYPES:
+        count = tiles_34[tile_34]
+        if count == 0:
+            missing.append(tile_34)
+        elif count == _PAIR_COUNT and not has_pair:
+            has_pair = True
+        elif count != 1:
+            return ()
+    # with 13 tiles, a pair leaves exactly one orphan missing, no pair leaves none
+    return tuple(missing) or _KOKUSHI_TYPES
+
+
+def _scan_waits(tiles_34: list[int]) -> set[int]:
+    """Find waits by checking every tile type with Agari.is_agari."""
+    waiting = set()
+    for tile_34 in range(NUM_TILE_TYPES):
+        if tiles_34[tile_34] >= _MAX_COPIES:
+            continue
+        tiles_34[tile_34] += 1
+        if Agari.is_agari(tiles_34, None):
+            waiting.add(tile_34)
+        tiles_34[tile_34] -= 1
+    return waiting
+
+
+def find_waiting_tiles(tiles_34: list[int]) -> set[int]:
+    """
+    Find all tile types that complete a concealed hand.
+
+    `tiles_34` holds only the concealed tiles (declared melds excluded).
+    Returns tile_34 values (0-33) of which the hand holds fewer than 4 copies
+    and that turn the hand into a winning shape. Hands of 3n+1 tiles (at most
+    13) are resolved from the precomputed tables; any other size (e.g. a
+    14-tile hand mid-turn) falls back to the direct Agari scan.
+    """
+    total = sum(tiles_34)
+    if total % 3 != 1 or total > _TENPAI_HAND_SIZE:
+        return _scan_waits(list(tiles_34))
+
+    waiting = _regular_waits(tiles_34)
+    if total == _TENPAI_HAND_SIZE:
+        chiitoitsu = _chiitoitsu_wait(tiles_34)
+        if chiitoitsu is not None:
+            waiting.add(chiitoitsu)
+        waiting.update(_kokushi_waits(tiles_34))
+    return waiting
@@ -10,20 +10,21 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from mahjong.agari import Agari
-from mahjong.hand_calculating.hand import HandCalculator
 from mahjong.hand_calculating.hand_config import HandConfig
 
-from game.logic.meld_wrapper import FrozenMeld, frozen_melds_to_melds
+from game.logic.hand_value import hand_value_cache
 from game.logic.settings import NUM_PLAYERS, GameSettings, RenhouValue, build_optional_rules
 from game.logic.shanten import calculate_shanten
 from game.logic.state import seat_to_wind
 from game.logic.state_utils import update_player
-from game.logic.tiles import NUM_TILE_TYPES, WINDS_34, hand_to_34_array, tile_to_34
+from game.logic.tiles import NUM_TILE_TYPES, WINDS_34, tile_to_34
+from game.logic.waits import find_waiting_tiles
 from game.logic.wall import is_wall_exhausted
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+    from game.logic.meld_wrapper import FrozenMeld
     from game.logic.state import (
         MahjongPlayer,
         MahjongRoundState,
@@ -77,18 +78,8 @@ def check_tsumo(player: MahjongPlayer) -> bool:
     Uses the mahjong library's Agari class to determine if the hand
     can form 4 melds + 1 pair (or special hands like kokushi/chiitoitsu).
     """
-    # Build tiles_34 directly from closed hand + meld tiles, avoiding
-    # intermediate list creation and redundant hand_to_34_array validation.
-    tiles_34 = [0] * NUM_TILE_TYPES
-    for t in player.tiles:
-        tiles_34[t // 4] += 1
-    if player.melds:
-        hand_ids = set(player.tiles)
-        for meld in player.melds:
-            for t in meld.tiles:
-                if t not in hand_ids:
-                    tiles_34[t // 4] += 1
-
+    # closed hand + meld tiles held outside it, read from the maintained counts
+    tiles_34 = [h + m for h, m in zip(player.tiles_34, player.meld_tiles_34, strict=True)]
     open_sets_34 = _melds_to_34_sets(player.melds)
 
     return Agari.is_agari(tiles_34, open_sets_34)
@@ -122,46 +113,36 @@ def get_waiting_tiles(player: MahjongPlayer) -> set[int]:
     """
     Find all tiles that would complete the player's hand.
 
-    Uses shanten calculator to identify which tiles would bring shanten to -1 (agari).
+    The shanten check rejects non-tenpai hands cheaply; tenpai hands then get
+    their full wait set from the precomputed wait tables in a single call.
     Returns a set of tile_34 values (0-33) that complete the hand.
     """
     # shanten operates on closed hand tiles only.
     # Tile count can be invalid for calculate_replacement_number: empty hands
     # (0 tiles from chankan checks) or 3n+0 counts like 12 tiles (after melds).
     # calculate_shanten guards against these with sum().
-    closed_tiles_34 = hand_to_34_array(player.tiles)
-    current_shanten = calculate_shanten(closed_tiles_34)
-
-    if current_shanten != 0:
+    closed_tiles_34 = list(player.tiles_34)
+    if calculate_shanten(closed_tiles_34) != 0:
         return set()
 
-    # Build full tiles_34 (closed + melds) by adding meld tile counts to
-    # the existing closed_tiles_34, avoiding a second hand_to_34_array call.
-    tiles_34 = list(closed_tiles_34)
-    hand_ids = set(player.tiles)
-    for meld in player.melds:
-        for t in meld.tiles:
-            if t not in hand_ids:
-                tiles_34[t // 4] += 1
-
-    # compute open sets once — the result is the same for every tile check
-    open_sets = _melds_to_34_sets(player.melds)
-
-    waiting = set()
-
-    # check each of the 34 tile types
-    for tile_34 in range(NUM_TILE_TYPES):
-        # skip if already 4 of this tile (can't draw a 5th)
-        if tiles_34[tile_34] >= MAX_TILE_COPIES:
-            continue
-
-        # add tile and check if hand becomes agari
-        tiles_34[tile_34] += 1
-        if Agari.is_agari(tiles_34, open_sets):
-            waiting.add(tile_34)
-        tiles_34[tile_34] -= 1
+    if not player.melds:
+        return find_waiting_tiles(closed_tiles_34)
+
+    # The agari check sees the closed hand minus declared meld tiles, while
+    # the copy limit counts the closed hand plus meld tiles held outside it.
+    held_34 = [h + m for h, m in zip(closed_tiles_34, player.meld_tiles_34, strict=True)]
+    if sum(player.meld_tiles_34) == sum(len(meld.tiles) for meld in player.melds):
+        concealed_34 = closed_tiles_34
+    else:
+        # some meld tiles are also listed in the closed hand
+        concealed_34 = list(closed_tiles_34)
+        hand_ids = set(player.tiles)
+        for meld in player.melds:
+            for t in meld.tiles:
+                if t in hand_ids:
+                    concealed_34[t // 4] -= 1
 
-    return waiting
+    return {tile_34 for tile_34 in find_waiting_tiles(concealed_34) if held_34[tile_34] < MAX_TILE_COPIES}
 
 
 def is_furiten(player: MahjongPlayer) -> bool:
@@ -207,7 +188,7 @@ def _has_yaku_for_open_hand(
     """
     Check if an open hand has at least one yaku.
 
-    Uses HandCalculator to verify the hand has valid yaku.
+    Uses the cached HandCalculator to verify the hand has valid yaku.
     """
     # the win tile is the last tile added to hand (the drawn tile)
     if not player.tiles:
@@ -228,10 +209,10 @@ def _has_yaku_for_open_hand(
         options=build_optional_rules(settings),
     )
 
-    result = HandCalculator.estimate_hand_value(
+    result = hand_value_cache.estimate_hand_value(
         tiles=all_player_tiles(player),
         win_tile=win_tile,
-        melds=frozen_melds_to_melds(player.melds),
+        melds=player.melds,
         dora_indicators=round_state.wall.dora_indicators,
         config=config,
     )
@@ -409,7 +390,7 @@ def is_kokushi_tenpai(player: MahjongPlayer) -> bool:
     if player.melds:
         return False
 
-    tiles_34 = hand_to_34_array(player.tiles)
+    tiles_34 = player.tiles_34
     total = sum(tiles_34)
     if total != KOKUSHI_HAND_SIZE:
         return False
@@ -435,24 +416,17 @@ def is_kokushi_chankan_possible(
     return _find_chankan_seats(round_state, caller_seat, kan_tile, extra_filter=is_kokushi_tenpai)
 
 
-def check_tsumo_with_tiles(player: MahjongPlayer, tiles: list[int]) -> bool:
+def check_tsumo_with_tile(player: MahjongPlayer, tile_id: int) -> bool:
     """
-    Check if the given tiles form a winning hand (agari).
+    Check if the player's hand plus one extra tile is a winning hand (agari).
 
-    Uses a local tile list instead of mutating player.tiles.
-    Used for ron/tsumo checks.
+    Reads the maintained tile counts instead of copying player.tiles.
+    Used for ron checks on a discarded tile.
     """
-    # Build tiles_34 directly from tiles (closed hand + win tile) + meld tiles,
-    # avoiding intermediate list creation and redundant hand_to_34_array validation.
-    tiles_34 = [0] * NUM_TILE_TYPES
-    for t in tiles:
-        tiles_34[t // 4] += 1
-    if player.melds:
-        hand_ids = set(tiles)
-        for meld in player.melds:
-            for t in meld.tiles:
-                if t not in hand_ids:
-                    tiles_34[t // 4] += 1
+    tiles_34 = [h + m for h, m in zip(player.tiles_34, player.meld_tiles_34, strict=True)]
+    # a tile already counted as a meld tile is not double-counted
+    if not any(tile_id in meld.tiles for meld in player.melds):
+        tiles_34[tile_id // 4] += 1
 
     open_sets_34 = _melds_to_34_sets(player.melds)
     return Agari.is_agari(tiles_34, open_sets_34)
@@ -472,12 +446,8 @@ def can_call_ron(
     - Player must not be in furiten
     - For open hands, must have at least one yaku
     """
-    # create local tile list with the discarded tile
-    tiles_with_win = [*list(player.tiles), discarded_tile]
-
-    # check if hand wins with local tiles
-    is_winning = check_tsumo_with_tiles(player, tiles_with_win)
-    if not is_winning:
+    # check if hand wins with the discarded tile
+    if not check_tsumo_with_tile(player, discarded_tile):
         return False
 
     # check riichi furiten (permanent for the hand)
@@ -502,7 +472,7 @@ def can_call_ron(
         player,
         round_state,
         discarded_tile,
-        tiles_with_win,
+        [*player.tiles, discarded_tile],
         settings,
     )
 
@@ -531,10 +501,10 @@ def _has_yaku_for_ron_with_tiles(
         options=build_optional_rules(settings),
     )
 
-    result = HandCalculator.estimate_hand_value(
+    result = hand_value_cache.estimate_hand_value(
         tiles=all_tiles_from_hand_and_melds(tiles, player.melds),
         win_tile=win_tile,
-        melds=frozen_melds_to_melds(player.melds),
+        melds=player.melds,
         dora_indicators=round_state.wall.dora_indicators,
         config=config,
     )
@@ -31,6 +31,37 @@ def encode(data: dict[str, Any]) -> bytes:
     return msgpack.packb(_stringify_keys(data))
 
 
+def encode_string_keyed(data: dict[str, Any]) -> bytes:
+    """
+    Encode a dict whose keys are already strings at every depth.
+
+    Skips the _stringify_keys copy; callers must guarantee there are no integer keys
+    (e.g. payloads from Pydantic's JSON-mode dump).
+    """
+    return msgpack.packb(data)
+
+
+# MessagePack array headers: fixarray holds up to 15 items, array16 up to 65535.
+_FIXARRAY_MAX = 0x0F
+_ARRAY16_MAX = 0xFFFF
+
+
+def encode_array_frame(parts: list[bytes]) -> bytes:
+    """
+    Join already-encoded MessagePack values into one MessagePack array.
+
+    The result decodes to the list of the original values; nothing is re-encoded.
+    """
+    count = len(parts)
+    if count <= _FIXARRAY_MAX:
+        header = bytes((0x90 | count,))
+    elif count <= _ARRAY16_MAX:
+        header = b"\xdc" + count.to_bytes(2, "big")
+    else:
+        header = b"\xdd" + count.to_bytes(4, "big")
+    return header + b"".join(parts)
+
+
 class DecodeError(Exception):
     """Error raised when MessagePack decoding fails."""
 
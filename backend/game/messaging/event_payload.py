@@ -7,12 +7,21 @@ serialization logic is defined once.
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Literal
 
 from game.logic.enums import RoundResultType, WireCallType
-from game.logic.events import DiscardEvent, DrawEvent, EventType, MeldEvent, RoundEndEvent, ServiceEvent
+from game.logic.events import (
+    CallPromptEvent,
+    DiscardEvent,
+    DrawEvent,
+    EventType,
+    MeldEvent,
+    RoundEndEvent,
+    ServiceEvent,
+)
 from game.logic.meld_compact import meld_event_to_compact
 from game.messaging.compact import encode_discard, encode_draw
+from game.messaging.encoder import encode_string_keyed
 from game.wire.enums import WireEventType, WireRoundResultType
 from shared.lib.melds import EVENT_TYPE_MELD
 
@@ -29,7 +38,7 @@ if set(EVENT_TYPE_INT.keys()) != set(EventType):
     )
 
 
-def service_event_payload(event: ServiceEvent) -> dict[str, Any]:
+def service_event_payload(event: ServiceEvent, *, mode: Literal["python", "json"] = "python") -> dict[str, Any]:
     """Return the wire-format dict for a ServiceEvent payload.
 
     Shape: {"t": <int>, **data_fields} with internal-only fields
@@ -39,6 +48,10 @@ def service_event_payload(event: ServiceEvent) -> dict[str, Any]:
     DrawEvent/DiscardEvent use packed integer encoding in "d" field.
     All other events use Pydantic serialization aliases via by_alias=True,
     with None fields excluded via exclude_none=True.
+
+    mode is passed to Pydantic's model_dump. "json" makes pydantic-core emit
+    string keys for integer-keyed maps (score maps), so the result can be
+    packed without a key walk.
     """
     if isinstance(event.data, MeldEvent):
         return {"t": WireEventType.MELD, "m": meld_event_to_compact(event.data)}
@@ -47,7 +60,9 @@ def service_event_payload(event: ServiceEvent) -> dict[str, Any]:
         d = encode_draw(event.data.seat, event.data.tile_id)
         payload: dict[str, Any] = {"t": EVENT_TYPE_INT[EventType.DRAW], "d": d}
         if event.data.available_actions:
-            payload["aa"] = [aa.model_dump(by_alias=True, exclude_none=True) for aa in event.data.available_actions]
+            payload["aa"] = [
+                aa.model_dump(mode=mode, by_alias=True, exclude_none=True) for aa in event.data.available_actions
+            ]
         return payload
 
     if isinstance(event.data, DiscardEvent):
@@ -64,6 +79,7 @@ def service_event_payload(event: ServiceEvent) -> dict[str, Any]:
     payload = {
         "t": EVENT_TYPE_INT[event.event],
         **event.data.model_dump(
+            mode=mode,
             exclude={"type", "target"},
             by_alias=True,
             exclude_none=True,
@@ -74,6 +90,19 @@ def service_event_payload(event: ServiceEvent) -> dict[str, Any]:
     return payload
 
 
+def encode_service_event(event: ServiceEvent) -> bytes:
+    """Encode a ServiceEvent straight to MessagePack wire bytes.
+
+    Same wire shape as encode(service_event_payload(event)), with call
+    prompts shaped for their recipient, but dumped in JSON mode and packed
+    directly instead of being copied again by encoder._stringify_keys.
+    """
+    payload = service_event_payload(event, mode="json")
+    if isinstance(event.data, CallPromptEvent):
+        payload = shape_call_prompt_payload(payload)
+    return encode_string_keyed(payload)
+
+
 _ROUND_RESULT_TYPE_TO_WIRE: dict[str, int] = {
     rt.value: WireRoundResultType[rt.name] for rt in RoundResultType if rt.name in WireRoundResultType.__members__
 }
@@ -113,6 +113,7 @@ class MessageRouter:
             connection=connection,
             game_id=connection.game_id,
             session_token=message.game_ticket,
+            batch_events=message.batch_events,
         )
 
     async def _handle_reconnect(
@@ -128,6 +129,7 @@ class MessageRouter:
             connection=connection,
             game_id=connection.game_id,
             session_token=message.game_ticket,
+            batch_events=message.batch_events,
         )
 
     async def _handle_game_action(
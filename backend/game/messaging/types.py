@@ -116,11 +116,15 @@ class PingMessage(BaseModel):
 class ReconnectMessage(BaseModel):
     t: Literal[WireClientMessageType.RECONNECT] = WireClientMessageType.RECONNECT
     game_ticket: str = Field(min_length=1, max_length=2000)
+    # Opt in to batched event frames (one MessagePack array per action)
+    batch_events: bool = False
 
 
 class JoinGameMessage(BaseModel):
     t: Literal[WireClientMessageType.JOIN_GAME] = WireClientMessageType.JOIN_GAME
     game_ticket: str = Field(min_length=1, max_length=2000)
+    # Opt in to batched event frames (one MessagePack array per action)
+    batch_events: bool = False
 
 
 ClientMessage = (
@@ -7,6 +7,7 @@ Game logic modules never import from replay.
 
 from game.replay.loader import (
     ReplayLoadError,
+    load_replay_from_bytes,
     load_replay_from_file,
     load_replay_from_string,
 )
@@ -41,6 +42,7 @@ __all__ = [
     "ReplayStep",
     "ReplayStepLimitError",
     "ReplayTrace",
+    "load_replay_from_bytes",
     "load_replay_from_file",
     "load_replay_from_string",
     "run_replay",
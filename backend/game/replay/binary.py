@@ -0,0 +1,124 @@
+"""
+Binary replay format: msgpack records with packed draw/discard/meld ints.
+
+A binary replay is the header (magic bytes plus a format version byte)
+followed by a stream of msgpack values, one per NDJSON line of the text
+format:
+
+- draw, discard and meld events ({"t": 1, "d": n}, {"t": 2, "d": n},
+  {"t": 0, "m": n}) become a single non-negative int, (n << 2) | kind
+- the version tag and every other event are stored as the event map itself
+
+Draws and discards are most of a replay and already carry packed ints from
+game.messaging.compact (melds carry IMME ints), so each such record shrinks
+from a JSON object to a 1-3 byte msgpack int. Decoding returns the same dicts
+json.loads gives for the NDJSON lines, so both formats feed the same loader.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, cast
+
+import msgpack
+
+from game.logic.events import EventType
+from game.messaging.event_payload import EVENT_TYPE_INT
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+BINARY_REPLAY_MAGIC = b"RRPB"
+BINARY_REPLAY_FORMAT = 1
+
+_HEADER = BINARY_REPLAY_MAGIC + bytes((BINARY_REPLAY_FORMAT,))
+
+_KIND_BITS = 2
+_KIND_MASK = (1 << _KIND_BITS) - 1
+
+# kind -> (event type int, payload key) for records packed into a single int.
+_PACKED_KINDS = (
+    (EVENT_TYPE_INT[EventType.DRAW], "d"),
+    (EVENT_TYPE_INT[EventType.DISCARD], "d"),
+    (EVENT_TYPE_INT[EventType.MELD], "m"),
+)
+_KIND_BY_TYPE = {event_type: (kind, key) for kind, (event_type, key) in enumerate(_PACKED_KINDS)}
+
+# Number of keys in a packable event: "t" plus its packed value.
+_PACKED_EVENT_LEN = 2
+
+
+def is_binary_replay(data: bytes) -> bool:
+    """Check whether data starts with the binary replay magic bytes."""
+    return data.startswith(BINARY_REPLAY_MAGIC)
+
+
+def _pack_record(event: dict[str, Any]) -> int | dict[str, Any]:
+    packed = _KIND_BY_TYPE.get(event.get("t"))
+    if packed is None or len(event) != _PACKED_EVENT_LEN:
+        return event
+    kind, key = packed
+    value = event.get(key)
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        return event
+    return (value << _KIND_BITS) | kind
+
+
+def encode_replay_events(events: Iterable[dict[str, Any]]) -> bytes:
+    """Encode replay lines (version tag first, then events) as a binary replay."""
+    return _HEADER + encode_replay_records(events)
+
+
+def encode_replay_records(events: Iterable[dict[str, Any]]) -> bytes:
+    """Encode replay lines as records without the header, to append to an encoded replay."""
+    packer = msgpack.Packer()
+    return b"".join([packer.pack(_pack_record(event)) for event in events])
+
+
+def encode_replay(content: str) -> bytes:
+    """Convert NDJSON replay text, as written by ReplayCollector, to the binary format.
+
+    Raise ValueError if a line is not valid JSON.
+    """
+    return encode_replay_events(json.loads(line) for line in content.splitlines() if line.strip())
+
+
+def _unpack_record(record: object) -> dict[str, Any]:
+    if isinstance(record, dict):
+        return cast("dict[str, Any]", record)
+    if isinstance(record, int) and not isinstance(record, bool) and record >= 0:
+        kind = record & _KIND_MASK
+        if kind < len(_PACKED_KINDS):
+            event_type, key = _PACKED_KINDS[kind]
+            return {"t": event_type, key: record >> _KIND_BITS}
+    raise ValueError(f"invalid binary replay record: {record!r}")
+
+
+def decode_replay(data: bytes, *, max_records: int | None = None) -> list[dict[str, Any]]:
+    """Decode a binary replay into its lines as dicts (version tag first).
+
+    Raise ValueError if the header is missing or unsupported, a record is
+    malformed or truncated, or there are more than max_records records.
+    """
+    if not is_binary_replay(data):
+        raise ValueError("not a binary replay")
+    if len(data) <= len(BINARY_REPLAY_MAGIC) or data[len(BINARY_REPLAY_MAGIC)] != BINARY_REPLAY_FORMAT:
+        raise ValueError("unsupported binary replay format version")
+
+    body = memoryview(data)[len(_HEADER) :]
+    unpacker = msgpack.Unpacker(raw=False, max_buffer_size=max(len(body), 1))
+    unpacker.feed(body)
+    records: list[dict[str, Any]] = []
+    # tell() also counts a trailing partial record, so track where the last whole one ended.
+    end = 0
+    try:
+        for record in unpacker:
+            if max_records is not None and len(records) >= max_records:
+                raise ValueError(f"binary replay exceeds {max_records} records")
+            records.append(_unpack_record(record))
+            end = unpacker.tell()
+    except (msgpack.UnpackException, TypeError) as exc:
+        raise ValueError(f"malformed binary replay: {exc}") from exc
+    if end != len(body):
+        raise ValueError("truncated binary replay")
+    return records
@@ -1,8 +1,9 @@
 """Replay loader: parse ReplayCollector event-log format into ReplayInput.
 
 The ReplayCollector writes gameplay events as newline-delimited JSON objects.
-This module reads that format, extracts player actions from the event
-stream, and constructs a validated ReplayInput for the replay runner.
+This module reads that format (and the equivalent binary record format from
+game.replay.binary), extracts player actions from the event stream, and
+constructs a validated ReplayInput for the replay runner.
 
 Event types that represent player actions are mapped via an explicit allowlist.
 Unknown event types raise ReplayLoadError to surface new action-producing
@@ -15,7 +16,7 @@ import gzip
 import json
 import zlib
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from game.logic.enums import GameAction
 from game.logic.events import EventType
@@ -23,9 +24,14 @@ from game.logic.rng import RNG_VERSION, create_seat_rng, validate_seed_hex
 from game.logic.settings import NUM_PLAYERS
 from game.messaging.compact import decode_discard
 from game.messaging.event_payload import EVENT_TYPE_INT
+from game.replay.binary import decode_replay, is_binary_replay
 from game.replay.models import REPLAY_VERSION, ReplayInput, ReplayInputEvent
 from game.wire.enums import WireRoundResultType
 from shared.lib.melds import MeldData, decode_meld_compact
+from shared.replay_packs import read_packed_replay
+
+if TYPE_CHECKING:
+    from shared.replay_packs import PackedReplay
 
 # Minimum number of events: version tag + game_started.
 _MIN_EVENT_COUNT = 2
@@ -106,6 +112,26 @@ def load_replay_from_string(content: str) -> ReplayInput:
     except json.JSONDecodeError as exc:
         raise ReplayLoadError(f"Malformed JSON: {exc}") from exc
 
+    return _load_events(events)
+
+
+def load_replay_from_bytes(data: bytes) -> ReplayInput:
+    """Parse an uncompressed replay in either format: binary records or NDJSON text."""
+    if is_binary_replay(data):
+        try:
+            events = decode_replay(data, max_records=_MAX_REPLAY_EVENTS)
+        except ValueError as exc:
+            raise ReplayLoadError(f"Malformed binary replay: {exc}") from exc
+        return _load_events(events)
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise ReplayLoadError(f"Replay is neither binary nor UTF-8 text: {exc}") from exc
+    return load_replay_from_string(content)
+
+
+def _load_events(events: list[dict[str, Any]]) -> ReplayInput:
+    """Validate decoded replay lines (version tag first) and extract player actions."""
     if len(events) > _MAX_REPLAY_EVENTS:
         raise ReplayLoadError(f"Replay exceeds maximum event count ({_MAX_REPLAY_EVENTS})")
 
@@ -132,21 +158,46 @@ def load_replay_from_string(content: str) -> ReplayInput:
     )
 
 
-def load_replay_from_file(path: str | Path) -> ReplayInput:
-    """Load a replay from a file path.
+def _read_replay_bytes(path: Path) -> bytes:
+    """Read a replay file, gunzipping it if the name ends in .gz."""
+    try:
+        data = path.read_bytes()
+        return gzip.decompress(data) if path.name.endswith(".gz") else data
+    except (OSError, EOFError, zlib.error) as exc:
+        raise ReplayLoadError(f"Cannot read replay file {path}: {exc}") from exc
+
 
-    Supports both plain text and gzip-compressed (.gz) replay files.
+def read_replay_file(path: str | Path) -> str:
+    """Read a replay file's event-log text.
+
+    Supports plain text and gzip-compressed (.gz) replay files. Binary
+    replays are converted to the equivalent NDJSON text.
     """
     path = Path(path)
+    return _decode_replay_text(_read_replay_bytes(path), f"replay file {path}")
+
+
+def read_packed_replay_file(packed: PackedReplay) -> str:
+    """Read a packed replay's event-log text (see shared.replay_packs)."""
     try:
-        if path.name.endswith(".gz"):
-            with gzip.open(path, "rt", encoding="utf-8") as f:
-                content = f.read()
-        else:
-            content = path.read_text(encoding="utf-8")
-    except (OSError, EOFError, zlib.error) as exc:
-        raise ReplayLoadError(f"Cannot read replay file {path}: {exc}") from exc
-    return load_replay_from_string(content)
+        data = gzip.decompress(read_packed_replay(packed))
+    except (OSError, EOFError, ValueError, zlib.error) as exc:
+        raise ReplayLoadError(f"Cannot read packed replay {packed.location}: {exc}") from exc
+    return _decode_replay_text(data, f"packed replay {packed.location}")
+
+
+def _decode_replay_text(data: bytes, source: str) -> str:
+    try:
+        if is_binary_replay(data):
+            return "\n".join(json.dumps(event) for event in decode_replay(data, max_records=_MAX_REPLAY_EVENTS))
+        return data.decode("utf-8")
+    except ValueError as exc:
+        raise ReplayLoadError(f"Cannot read {source}: {exc}") from exc
+
+
+def load_replay_from_file(path: str | Path) -> ReplayInput:
+    """Load a replay from a file path (NDJSON or binary, plain or gzip-compressed)."""
+    return load_replay_from_bytes(_read_replay_bytes(Path(path)))
 
 
 def _extract_seat_to_name(players: list[dict[str, Any]]) -> dict[int, str]:
@@ -0,0 +1,314 @@
+"""
+Bulk replay verification: re-simulate stored replays and diff their event streams.
+
+Each replay is loaded into a ReplayInput, run through MahjongGameService
+with run_replay(), and the trace's events are recorded again through
+ReplayCollector, the same code that wrote the stored file. The re-recorded
+event log must match the stored one event for event (compared as parsed
+JSON, so formatting differences do not count). The one normalization is the
+"ai" flag in game_started: replays seat every player by name, so AI seats
+come back as human seats.
+
+Replays are verified in a ProcessPoolExecutor. The JSON report lists
+divergences (first differing event), failures (replays that could not be
+loaded or raised during simulation), overall throughput, and games/sec and
+steps/sec per worker process. The exit status is 1 when any replay diverged
+or failed, so the command can gate engine changes.
+
+Directories are searched for replay files and for the replays indexed by
+their cold-storage packs (shared.replay_packs); packed replays are reported
+as ``{pack}#{game_id}``. A replay that is both loose and packed is verified
+once, from the loose file.
+
+Usage:
+    make verify-replays
+    PYTHONPATH=backend uv run python -m game.replay.verify backend/data/replays --workers 8
+    PYTHONPATH=backend uv run python -m game.replay.verify path/to/replay.txt.gz --engine mutable --output report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from game.logic.enums import StateEngine
+from game.logic.events import EventType
+from game.logic.mahjong_service import MahjongGameService
+from game.messaging.event_payload import EVENT_TYPE_INT
+from game.replay.loader import load_replay_from_string, read_packed_replay_file, read_replay_file
+from game.replay.runner import ReplayOptions, run_replay_async
+from game.session.replay_collector import ReplayCollector
+from shared.logging import setup_logging
+from shared.replay_packs import PackedReplay, list_packed_replays
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from game.replay.models import ReplayTrace
+
+REPLAYS_DIR = Path("backend/data/replays")
+
+_REPLAY_PATTERNS = ("*.txt.gz", "*.txt")
+
+_GAME_STARTED = EVENT_TYPE_INT[EventType.GAME_STARTED]
+
+# A replay file or an entry in a cold-storage pack.
+type ReplaySource = Path | PackedReplay
+
+
+@dataclass(frozen=True, slots=True)
+class Divergence:
+    """First event where the re-simulated stream differs from the stored one.
+
+    expected or actual is None when one stream ends before the other.
+    """
+
+    index: int
+    expected: dict[str, Any] | None
+    actual: dict[str, Any] | None
+
+
+@dataclass(frozen=True, slots=True)
+class ReplayVerification:
+    """Outcome of verifying one replay."""
+
+    path: str
+    worker: int
+    elapsed: float
+    steps: int = 0
+    events: int = 0
+    divergence: Divergence | None = None
+    error: str | None = None
+
+    @property
+    def passed(self) -> bool:
+        return self.divergence is None and self.error is None
+
+
+@dataclass(slots=True)
+class WorkerStats:
+    """Verification work done by one worker process."""
+
+    worker: int
+    games: int = 0
+    steps: int = 0
+    busy_seconds: float = 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.busy_seconds if self.busy_seconds else 0.0
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.steps / self.busy_seconds if self.busy_seconds else 0.0
+
+
+@dataclass(slots=True)
+class VerificationReport:
+    """Summary of a verify_replays() run."""
+
+    engine: StateEngine
+    elapsed: float
+    results: list[ReplayVerification] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return all(result.passed for result in self.results)
+
+    def workers(self) -> list[WorkerStats]:
+        by_worker: dict[int, WorkerStats] = {}
+        for result in self.results:
+            stats = by_worker.setdefault(result.worker, WorkerStats(worker=result.worker))
+            stats.games += 1
+            stats.steps += result.steps
+            stats.busy_seconds += result.elapsed
+        return sorted(by_worker.values(), key=lambda stats: stats.worker)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the machine-readable report."""
+        steps = sum(result.steps for result in self.results)
+        return {
+            "engine": self.engine.value,
+            "replays": len(self.results),
+            "passed": sum(1 for result in self.results if result.passed),
+            "diverged": sum(1 for result in self.results if result.divergence is not None),
+            "failed": sum(1 for result in self.results if result.error is not None),
+            "elapsed_seconds": round(self.elapsed, 3),
+            "games_per_second": round(len(self.results) / self.elapsed, 2) if self.elapsed else 0.0,
+            "steps_per_second": round(steps / self.elapsed, 1) if self.elapsed else 0.0,
+            "workers": [
+                {
+                    "pid": stats.worker,
+                    "games": stats.games,
+                    "steps": stats.steps,
+                    "busy_seconds": round(stats.busy_seconds, 3),
+                    "games_per_second": round(stats.games_per_second, 2),
+                    "steps_per_second": round(stats.steps_per_second, 1),
+                }
+                for stats in self.workers()
+            ],
+            "divergences": [
+                {"path": result.path, **asdict(result.divergence)}
+                for result in self.results
+                if result.divergence is not None
+            ],
+            "failures": [{"path": result.path, "error": result.error} for result in self.results if result.error],
+        }
+
+
+class _CapturedReplay:
+    """ReplayStorage that keeps the saved replay text in memory."""
+
+    def __init__(self) -> None:
+        self.content = ""
+
+    def save_replay(self, game_id: str, content: str) -> None:  # noqa: ARG002
+        self.content = content
+
+
+def find_replay_files(paths: Iterable[Path]) -> list[ReplaySource]:
+    """Expand files, flat replay directories, and shard trees into replays.
+
+    Replay files come first, sorted by path, then the packed replays that are
+    not also loose, sorted by game ID.
+    """
+    found: set[Path] = set()
+    packed: dict[str, PackedReplay] = {}
+    for path in paths:
+        if path.is_dir():
+            for pattern in _REPLAY_PATTERNS:
+                found.update(p for p in path.rglob(pattern) if p.is_file())
+            packed.update((entry.game_id, entry) for entry in list_packed_replays(path))
+        else:
+            found.add(path)
+    loose_ids = {_game_id(path) for path in found}
+    return [*sorted(found), *(entry for game_id, entry in sorted(packed.items()) if game_id not in loose_ids)]
+
+
+def _game_id(source: ReplaySource) -> str:
+    return source.game_id if isinstance(source, PackedReplay) else source.name.split(".", 1)[0]
+
+
+def _parse_events(content: str) -> list[dict[str, Any]]:
+    events = [json.loads(line) for line in content.splitlines() if line.strip()]
+    for event in events:
+        if event.get("t") == _GAME_STARTED:
+            for player in event.get("p", ()):
+                player.pop("ai", None)
+    return events
+
+
+def _first_divergence(expected: list[dict[str, Any]], actual: list[dict[str, Any]]) -> Divergence | None:
+    for index, (stored, simulated) in enumerate(zip(expected, actual, strict=False)):
+        if stored != simulated:
+            return Divergence(index=index, expected=stored, actual=simulated)
+    if len(expected) != len(actual):
+        index = min(len(expected), len(actual))
+        return Divergence(
+            index=index,
+            expected=expected[index] if index < len(expected) else None,
+            actual=actual[index] if index < len(actual) else None,
+        )
+    return None
+
+
+async def _rerecord(trace: ReplayTrace, game_id: str) -> str:
+    """Record the trace's events through ReplayCollector, as a live game would."""
+    captured = _CapturedReplay()
+    collector = ReplayCollector(captured)
+    collector.start_game(game_id, trace.seed, trace.rng_version)
+    collector.collect_events(game_id, list(trace.startup_events))
+    for step in trace.steps:
+        collector.collect_events(game_id, list(step.emitted_events))
+    await collector.save_and_cleanup(game_id)
+    return captured.content
+
+
+async def verify_replay_async(source: ReplaySource, engine: StateEngine = StateEngine.FROZEN) -> ReplayVerification:
+    """Re-simulate one replay and compare its event stream with the stored one."""
+    start = time.perf_counter()
+    path = source.location if isinstance(source, PackedReplay) else str(source)
+    try:
+        content = read_packed_replay_file(source) if isinstance(source, PackedReplay) else read_replay_file(source)
+        expected = _parse_events(content)
+        game_started = next((event for event in expected if event.get("t") == _GAME_STARTED), {})
+        game_id = game_started.get("gid") or _game_id(source)
+        trace = await run_replay_async(
+            load_replay_from_string(content),
+            ReplayOptions(game_id=game_id),
+            service_factory=lambda: MahjongGameService(auto_cleanup=False, engine=engine),
+        )
+        actual = _parse_events(await _rerecord(trace, game_id))
+    except Exception as exc:  # noqa: BLE001 -- any crash is a verification failure to report
+        return ReplayVerification(
+            path=path,
+            worker=os.getpid(),
+            elapsed=time.perf_counter() - start,
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    return ReplayVerification(
+        path=path,
+        worker=os.getpid(),
+        elapsed=time.perf_counter() - start,
+        steps=len(trace.steps),
+        events=len(expected),
+        divergence=_first_divergence(expected, actual),
+    )
+
+
+def verify_replay_file(source: ReplaySource, engine: StateEngine = StateEngine.FROZEN) -> ReplayVerification:
+    """Sync wrapper around verify_replay_async(), used as the process-pool entry point."""
+    return asyncio.run(verify_replay_async(source, engine))
+
+
+def _init_worker() -> None:
+    # Engine debug/info logs would drown the report; workers only log errors.
+    setup_logging(level=logging.ERROR)
+
+
+def verify_replays(
+    sources: list[ReplaySource],
+    *,
+    workers: int | None = None,
+    engine: StateEngine = StateEngine.FROZEN,
+) -> VerificationReport:
+    """Verify replays in a process pool (default: one worker per CPU)."""
+    start = time.perf_counter()
+    results: list[ReplayVerification] = []
+    if sources:
+        max_workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+            results = list(pool.map(functools.partial(verify_replay_file, engine=engine), sources))
+    return VerificationReport(engine=engine, elapsed=time.perf_counter() - start, results=results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-simulate replays and report event-stream divergences")
+    parser.add_argument("paths", nargs="*", type=Path, default=[REPLAYS_DIR], help="Replay files or directories")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--engine", type=StateEngine, choices=list(StateEngine), default=StateEngine.FROZEN)
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    setup_logging(level=logging.ERROR)
+    report = verify_replays(find_replay_files(args.paths), workers=args.workers, engine=args.engine)
+    text = json.dumps(report.to_dict(), indent=2) + "\n"
+    if args.output is None:
+        sys.stdout.write(text)
+    else:
+        args.output.write_text(text)
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,16 +9,18 @@ from starlette.requests import ClientDisconnect
 from starlette.responses import JSONResponse
 from starlette.routing import Route, WebSocketRoute
 
+from game.logic.hand_value import hand_value_cache
 from game.logic.mahjong_service import MahjongGameService
 from game.messaging.router import MessageRouter
 from game.server.settings import GameServerSettings
 from game.server.types import CreateGameRequest
 from game.server.websocket import websocket_endpoint
+from game.session.broadcast import broadcast_stats
 from game.session.manager import SessionManager
 from game.session.replay_collector import ReplayCollector
 from shared.auth.game_ticket import verify_game_ticket
 from shared.build_info import APP_VERSION, GIT_COMMIT
-from shared.db import Database, SqliteGameRepository
+from shared.db import Database, GroupCommitGameRepository
 from shared.logging import setup_logging
 from shared.storage import LocalReplayStorage
 
@@ -38,6 +40,7 @@ async def health(_request: Request) -> JSONResponse:
 async def status(request: Request) -> JSONResponse:
     session_manager: SessionManager = request.app.state.session_manager
     settings: GameServerSettings = request.app.state.settings
+    game_repository: GroupCommitGameRepository | None = request.app.state.game_repository
     return JSONResponse(
         {
             "status": "ok",
@@ -47,6 +50,9 @@ async def status(request: Request) -> JSONResponse:
             "active_games": session_manager.started_game_count,
             "capacity_used": session_manager.game_count,
             "max_capacity": settings.max_capacity,
+            "hand_value_cache": hand_value_cache.stats(),
+            "broadcast": broadcast_stats.stats(),
+            "record_backlog": game_repository.pending if game_repository is not None else 0,
         },
     )
 
@@ -134,19 +140,29 @@ def create_app(
         settings = GameServerSettings()  # ty: ignore[missing-argument]
 
     if game_service is None:  # pragma: no cover
-        game_service = MahjongGameService()
+        game_service = MahjongGameService(engine=settings.state_engine)
 
     # When the app creates its own SessionManager, it owns the DB lifecycle.
     owned_db: Database | None = None
+    owned_repository: GroupCommitGameRepository | None = None
 
     if session_manager is None:
         db = Database(settings.database_path)
         db.connect()
         owned_db = db
-        game_repository = SqliteGameRepository(db)
+        game_repository = GroupCommitGameRepository(
+            db,
+            flush_interval=settings.record_flush_ms / 1000,
+            max_batch=settings.record_flush_batch,
+        )
+        owned_repository = game_repository
 
         storage = LocalReplayStorage(settings.replay_dir)
-        replay_collector = ReplayCollector(storage)
+        replay_collector = ReplayCollector(
+            storage,
+            streaming=settings.replay_streaming,
+            binary=settings.replay_binary,
+        )
         session_manager = SessionManager(
             game_service,
             replay_collector=replay_collector,
@@ -157,7 +173,12 @@ def create_app(
         message_router = MessageRouter(session_manager, game_ticket_secret=settings.game_ticket_secret)
 
     async def ws_endpoint(websocket: WebSocket) -> None:
-        await websocket_endpoint(websocket, message_router)
+        await websocket_endpoint(
+            websocket,
+            message_router,
+            send_queue_size=settings.send_queue_size,
+            send_queue_overflow=settings.send_queue_overflow,
+        )
 
     routes = [
         Route("/health", health, methods=["GET"]),
@@ -169,6 +190,8 @@ def create_app(
     async def on_shutdown() -> None:
         session_manager.cancel_all_pending_timeouts()
         session_manager.cancel_all_auth_timeouts()
+        if owned_repository is not None:
+            await owned_repository.close()
         if owned_db is not None:
             owned_db.close()
 
@@ -181,6 +204,7 @@ def create_app(
     )
     app.state.settings = settings
     app.state.session_manager = session_manager
+    app.state.game_repository = owned_repository
 
     logger.info("game server ready")
     return app
@@ -0,0 +1,124 @@
+"""Bounded per-connection outbound queue drained by a dedicated writer task."""
+
+import asyncio
+import contextlib
+from enum import StrEnum
+
+import structlog
+
+from game.messaging.protocol import ConnectionProtocol
+
+logger = structlog.get_logger()
+
+# Close code sent to a client whose outbound queue overflowed under the DISCONNECT policy.
+SEND_QUEUE_OVERFLOW_CLOSE_CODE = 4005
+
+# How long stop() waits for the writer to flush before cancelling it.
+_WRITER_STOP_TIMEOUT = 5.0
+
+
+class SendQueueOverflow(StrEnum):
+    """What send_bytes does when a connection's outbound queue is full."""
+
+    DISCONNECT = "disconnect"  # drop the frame and close the slow connection
+    BLOCK = "block"  # wait for the writer to free a slot
+
+
+class QueuedConnection(ConnectionProtocol):
+    """Wrap a connection so sends enqueue frames instead of awaiting the socket.
+
+    send_bytes() returns as soon as the frame is queued; a writer task owned by
+    this wrapper delivers frames to the inner connection in order. Broadcasts
+    made under the per-game lock therefore no longer wait on client latency,
+    and one slow client cannot stall the rest of the table.
+
+    close() is queued behind pending frames so final events (e.g. game end)
+    are flushed before the socket closes. Once closed, or once the writer sees
+    the socket fail, further sends raise ConnectionError.
+    """
+
+    def __init__(
+        self,
+        inner: ConnectionProtocol,
+        *,
+        max_size: int,
+        overflow: SendQueueOverflow = SendQueueOverflow.DISCONNECT,
+    ) -> None:
+        self._inner = inner
+        self._max_size = max_size
+        self._overflow = overflow
+        # Unbounded so the close marker always fits; max_size is enforced in send_bytes.
+        self._queue: asyncio.Queue[bytes | tuple[int, str]] = asyncio.Queue()
+        self._space = asyncio.Event()
+        self._closed = False
+        self._writer = asyncio.create_task(self._drain())
+
+    @property
+    def connection_id(self) -> str:
+        return self._inner.connection_id
+
+    @property
+    def game_id(self) -> str:
+        return self._inner.game_id
+
+    @property
+    def pending(self) -> int:
+        """Number of frames queued but not yet handed to the socket."""
+        return self._queue.qsize()
+
+    async def send_bytes(self, data: bytes) -> None:
+        while not self._closed and self._queue.qsize() >= self._max_size:
+            if self._overflow == SendQueueOverflow.DISCONNECT:
+                logger.warning(
+                    "send queue overflow, disconnecting",
+                    connection_id=self.connection_id,
+                    max_size=self._max_size,
+                )
+                # The client is too far behind to catch up: drop its backlog so
+                # the close is not stuck behind frames it cannot drain.
+                while not self._queue.empty():
+                    self._queue.get_nowait()
+                await self.close(code=SEND_QUEUE_OVERFLOW_CLOSE_CODE, reason="send_queue_overflow")
+                break
+            self._space.clear()
+            await self._space.wait()
+        if self._closed:
+            raise ConnectionError("Connection is closed")
+        self._queue.put_nowait(data)
+
+    async def receive_bytes(self) -> bytes:
+        return await self._inner.receive_bytes()
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        """Close the inner connection after the frames already queued are sent."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put_nowait((code, reason))
+        self._space.set()
+
+    async def stop(self) -> None:
+        """Close (if not already) and wait for the writer to finish, bounded by a timeout."""
+        await self.close()
+        try:
+            await asyncio.wait_for(self._writer, timeout=_WRITER_STOP_TIMEOUT)
+        except TimeoutError:
+            logger.warning("send queue writer did not drain in time", connection_id=self.connection_id)
+
+    async def _drain(self) -> None:
+        while True:
+            item = await self._queue.get()
+            self._space.set()
+            if isinstance(item, tuple):
+                code, reason = item
+                with contextlib.suppress(RuntimeError, OSError):
+                    await self._inner.close(code=code, reason=reason)
+                return
+            try:
+                await self._inner.send_bytes(item)
+            except RuntimeError, OSError:
+                # Socket is gone: refuse further sends and let the receive loop
+                # run the normal disconnect path. Queued frames are undeliverable.
+                self._closed = True
+                self._space.set()
+                return
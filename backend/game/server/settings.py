@@ -5,6 +5,8 @@ from typing import TYPE_CHECKING
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 
+from game.logic.enums import StateEngine
+from game.server.send_queue import SendQueueOverflow
 from shared.validators import StringListEnvSettingsSource, parse_string_list
 
 if TYPE_CHECKING:
@@ -18,6 +20,22 @@ class GameServerSettings(BaseSettings):
     log_dir: str = ""
     cors_origins: list[str] = ["http://localhost:8712"]
     replay_dir: str = Field(default="backend/data/replays", min_length=1)
+    # Compress replay lines into the replay file at each round end instead of
+    # holding the whole game in memory until it ends (see ReplayCollector).
+    replay_streaming: bool = False
+    # Also write each replay in the binary record format (game.replay.binary)
+    # as {game_id}.bin.gz next to the NDJSON replay.
+    replay_binary: bool = False
+    # "mutable" keeps in-progress game state in __slots__ mirrors (see game.logic.mutable_state)
+    state_engine: StateEngine = StateEngine.FROZEN
+    # Per-connection outbound queue (see game.server.send_queue): frames buffered
+    # per client, and whether a full queue disconnects the client or blocks the sender.
+    send_queue_size: int = Field(default=256, ge=1)
+    send_queue_overflow: SendQueueOverflow = SendQueueOverflow.DISCONNECT
+    # Game start/finish records are group-committed every record_flush_ms
+    # milliseconds, or sooner once record_flush_batch records are queued.
+    record_flush_ms: int = Field(default=50, ge=1)
+    record_flush_batch: int = Field(default=64, ge=1)
 
     # SQLite database file path shared with the lobby service.
     database_path: str = Field(
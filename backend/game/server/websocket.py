@@ -10,6 +10,7 @@ from game.messaging.encoder import DecodeError, decode
 from game.messaging.protocol import ConnectionProtocol
 from game.messaging.types import ErrorMessage, SessionErrorCode
 from game.server.rate_limit import TokenBucket
+from game.server.send_queue import QueuedConnection, SendQueueOverflow
 
 logger = structlog.get_logger()
 
@@ -60,7 +61,13 @@ class WebSocketConnection(ConnectionProtocol):
             await self._websocket.close(code=code, reason=reason)
 
 
-async def websocket_endpoint(websocket: WebSocket, router: MessageRouter) -> None:
+async def websocket_endpoint(
+    websocket: WebSocket,
+    router: MessageRouter,
+    *,
+    send_queue_size: int = 256,
+    send_queue_overflow: SendQueueOverflow = SendQueueOverflow.DISCONNECT,
+) -> None:
     game_id = websocket.path_params["game_id"]
     if not _GAME_ID_PATTERN.match(game_id) or len(game_id) > _MAX_GAME_ID_LENGTH:
         await websocket.close(code=4000, reason="invalid_game_id")
@@ -68,7 +75,11 @@ async def websocket_endpoint(websocket: WebSocket, router: MessageRouter) -> Non
 
     await websocket.accept()
 
-    connection = WebSocketConnection(websocket, game_id=game_id)
+    connection = QueuedConnection(
+        WebSocketConnection(websocket, game_id=game_id),
+        max_size=send_queue_size,
+        overflow=send_queue_overflow,
+    )
     logger.info("websocket connected", connection_id=connection.connection_id)
     await router.handle_connect(connection)
 
@@ -112,4 +123,5 @@ async def websocket_endpoint(websocket: WebSocket, router: MessageRouter) -> Non
     finally:
         logger.info("websocket disconnected", connection_id=connection.connection_id)
         await router.handle_disconnect(connection)
+        await connection.stop()
         structlog.contextvars.clear_contextvars()
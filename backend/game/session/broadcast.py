@@ -1,7 +1,50 @@
 """Shared broadcast utility for sending messages to player groups."""
 
 import contextlib
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from game.messaging.encoder import encode, encode_array_frame
+from game.messaging.event_payload import encode_service_event
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from game.logic.events import ServiceEvent
+    from game.session.models import Player
+
+
+class BroadcastStats:
+    """Counts message encodes against the per-connection sends they were shared by."""
+
+    def __init__(self) -> None:
+        self.encodes = 0
+        self.sends = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"encodes": self.encodes, "sends": self.sends}
+
+
+broadcast_stats = BroadcastStats()
+
+
+def encode_counted(message: dict[str, Any]) -> bytes:
+    """Encode a message once, counting it in broadcast_stats."""
+    broadcast_stats.encodes += 1
+    return encode(message)
+
+
+def encode_event_counted(event: ServiceEvent) -> bytes:
+    """Encode a ServiceEvent once via the direct wire encoder, counting it in broadcast_stats."""
+    broadcast_stats.encodes += 1
+    return encode_service_event(event)
+
+
+async def send_encoded(players: Iterable[Player], data: bytes) -> None:
+    """Hand the same pre-encoded bytes to every player, skipping dead connections."""
+    for player in players:
+        with contextlib.suppress(RuntimeError, OSError):
+            await player.connection.send_bytes(data)
+            broadcast_stats.sends += 1
 
 
 async def broadcast_to_players(
@@ -11,10 +54,39 @@ async def broadcast_to_players(
 ) -> None:
     """Broadcast a message to all players, skipping one if excluded.
 
+    The message is encoded once and the same bytes are handed to every
+    recipient, so the encode cost no longer grows with the number of seats.
+
     Snapshot the dict values via list() to avoid RuntimeError if a
-    concurrent leave mutates the dict while we yield on send_message.
+    concurrent leave mutates the dict while we yield on send_bytes.
     """
-    for player in list(players.values()):
-        if player.connection_id != exclude_connection_id:
-            with contextlib.suppress(RuntimeError, OSError):
-                await player.connection.send_message(message)
+    recipients = [p for p in list(players.values()) if p.connection_id != exclude_connection_id]
+    if not recipients:
+        return
+    await send_encoded(recipients, encode_counted(message))
+
+
+class EventBatches:
+    """Collect pre-encoded events per batching player and send each player one array frame.
+
+    Players that negotiated batch_events receive every event from one service
+    result as a single MessagePack array instead of one frame per event. The
+    array is assembled from the already-encoded events, so batching adds no
+    re-encoding.
+    """
+
+    def __init__(self) -> None:
+        self._batches: dict[str, tuple[Player, list[bytes]]] = {}
+
+    def add(self, player: Player, data: bytes) -> None:
+        entry = self._batches.get(player.connection_id)
+        if entry is None:
+            self._batches[player.connection_id] = (player, [data])
+        else:
+            entry[1].append(data)
+
+    async def flush(self) -> None:
+        """Send one array frame per player and clear the batches."""
+        batches, self._batches = self._batches, {}
+        for player, parts in batches.values():
+            await send_encoded([player], encode_array_frame(parts))
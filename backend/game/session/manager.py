@@ -8,7 +8,6 @@ import structlog
 
 from game.logic.enums import GameAction, MeldViewType, RoundPhase, TimeoutType
 from game.logic.events import (
-    BroadcastTarget,
     CallPromptEvent,
     DrawEvent,
     ErrorEvent,
@@ -21,7 +20,7 @@ from game.logic.events import (
 )
 from game.logic.exceptions import InvalidGameActionError
 from game.logic.timer import TimerConfig
-from game.messaging.event_payload import service_event_payload, shape_call_prompt_payload
+from game.messaging.event_payload import encode_service_event
 from game.messaging.types import (
     ErrorMessage,
     GameLeftMessage,
@@ -32,7 +31,7 @@ from game.messaging.types import (
     SessionErrorCode,
     SessionMessageType,
 )
-from game.session.broadcast import broadcast_to_players
+from game.session.broadcast import EventBatches, broadcast_to_players, encode_event_counted, send_encoded
 from game.session.heartbeat import HeartbeatMonitor
 from game.session.models import Game, Player, SessionData
 from game.session.session_store import SessionStore
@@ -85,6 +84,8 @@ class SessionManager:
         self._pending_games: dict[str, PendingGameInfo] = {}  # game_id -> PendingGameInfo
         self._heartbeat = HeartbeatMonitor()
         self._auth_timeouts: dict[str, asyncio.Task[None]] = {}  # connection_id -> timeout task
+        # game_id -> standings recorded at game start, reused to enrich the finish record
+        self._start_standings: dict[str, list[PlayedGameStanding]] = {}
 
     def _get_game_lock(self, game_id: str) -> asyncio.Lock | None:
         """Get the per-game lock, or None if the game has no lock (not yet started or already cleaned up)."""
@@ -151,6 +152,7 @@ class SessionManager:
             )
             for p in game_state.round_state.players
         ]
+        self._start_standings[game.game_id] = standings
 
         played_game = PlayedGame(
             game_id=game.game_id,
@@ -175,26 +177,21 @@ class SessionManager:
 
         standings = None
         num_rounds_played = None
+        # Names and user_ids come from the standings kept at game start; game state is
+        # unavailable here (auto_cleanup runs before events are returned) and reading
+        # the stored record back would cost a round-trip per finished game.
+        start_standings = self._start_standings.pop(game_id, [])
 
         if game_ended_event is not None:
             num_rounds_played = game_ended_event.num_rounds if game_ended_event.num_rounds > 0 else None
-            try:
-                # Read existing game record to preserve user_ids and names from game start
-                # (game state is unavailable here -- auto_cleanup runs before events are returned)
-                existing = await self._game_repository.get_game(game_id)
-                uid_by_seat = {s.seat: s.user_id for s in existing.standings} if existing else {}
-                names_by_seat = {s.seat: s.name for s in existing.standings} if existing else {}
-            except Exception:
-                logger.exception("failed to read existing game for standings enrichment", game_id=game_id)
-                uid_by_seat = {}
-                names_by_seat = {}
+            start_by_seat = {s.seat: s for s in start_standings}
             # Preserve the game logic's placement order (handles tiebreaking by seat
             # proximity to dealer) -- do NOT re-sort by final_score.
             standings = [
                 PlayedGameStanding(
-                    name=names_by_seat.get(s.seat, ""),
+                    name=start.name if (start := start_by_seat.get(s.seat)) else "",
                     seat=s.seat,
-                    user_id=uid_by_seat.get(s.seat, ""),
+                    user_id=start.user_id if start else "",
                     score=s.score,
                     final_score=s.final_score,
                 )
@@ -345,6 +342,7 @@ class SessionManager:
                 pending.timeout_task.cancel()
             if game.started and not game.ended:
                 await self._record_game_finish(game_id, "abandoned")
+            self._start_standings.pop(game_id, None)
             self._session_store.cleanup_game(game_id)
             self._timer_manager.cleanup_game(game_id)
             self._game_locks.pop(game_id, None)
@@ -570,6 +568,8 @@ class SessionManager:
         connection: ConnectionProtocol,
         game_id: str,
         session_token: str,
+        *,
+        batch_events: bool = False,
     ) -> None:
         """Handle a player reconnecting to an active game."""
         result = await self._validate_reconnect(connection, game_id, session_token)
@@ -629,6 +629,7 @@ class SessionManager:
                     seat,
                     saved_bank_seconds,
                 )
+                player.batch_events = batch_events
 
                 # Mark session as reconnected and clear bank state.
                 # If the send below fails, the disconnect handler
@@ -800,7 +801,7 @@ class SessionManager:
     ) -> None:
         """Send draw event for a reconnected player when it is currently their turn.
 
-        Uses direct connection.send_message() instead of _broadcast_events() to avoid
+        Uses direct connection.send_bytes() instead of _broadcast_events() to avoid
         recording duplicate events in the replay collector.
         """
         game_state = self._game_service.get_game_state(game_id)
@@ -818,9 +819,8 @@ class SessionManager:
         if round_state.current_player_seat == seat:
             events = self._game_service.build_draw_event_for_seat(game_id, seat)
             for event in events:
-                message = service_event_payload(event)
                 with contextlib.suppress(RuntimeError, OSError, ConnectionError):
-                    await player.connection.send_message(message)
+                    await player.connection.send_bytes(encode_service_event(event))
             self._timer_manager.start_turn_timer(game_id, seat)
 
     # --- Pending game management (direct game creation from lobby) ---
@@ -866,6 +866,8 @@ class SessionManager:
         connection: ConnectionProtocol,
         game_id: str,
         session_token: str,
+        *,
+        batch_events: bool = False,
     ) -> None:
         """Handle a player connecting to a pending game via JOIN_GAME."""
         # Check for already-started game before looking at pending state
@@ -896,7 +898,12 @@ class SessionManager:
                 if error is not None:
                     await self._send_error(connection, *error)
                     return
-                stale_conn = await self._register_pending_player(connection, game_id, session_token)
+                stale_conn = await self._register_pending_player(
+                    connection,
+                    game_id,
+                    session_token,
+                    batch_events=batch_events,
+                )
         finally:
             # Close evicted stale socket outside the lock to avoid deadlock
             # (close triggers disconnect handler which calls leave_game).
@@ -934,6 +941,8 @@ class SessionManager:
         connection: ConnectionProtocol,
         game_id: str,
         session_token: str,
+        *,
+        batch_events: bool = False,
     ) -> ConnectionProtocol | None:
         """Register a validated player into a pending game. Caller must hold the pending lock.
 
@@ -975,6 +984,7 @@ class SessionManager:
             session_token=session_token,
             user_id=session.user_id,
             game_id=game_id,
+            batch_events=batch_events,
         )
         self._players[connection.connection_id] = player
         game.players[connection.connection_id] = player
@@ -1220,24 +1230,36 @@ class SessionManager:
         game: Game,
         events: list[ServiceEvent],
     ) -> None:
-        """Broadcast events with target-based filtering using typed targets."""
+        """Broadcast events with target-based filtering using typed targets.
+
+        Each event is encoded once. Legacy players get one frame per event;
+        players that negotiated batch_events get all of their events from this
+        call in a single array frame, sent after the per-event frames.
+        """
         if self._replay_collector:
             self._replay_collector.collect_events(game.game_id, events)
 
         seat_to_player = {p.seat: p for p in game.players.values() if p.seat is not None}
+        batches = EventBatches()
 
         for event in events:
-            message = service_event_payload(event)
-            if isinstance(event.data, CallPromptEvent):
-                message = shape_call_prompt_payload(message)
-
-            if isinstance(event.target, BroadcastTarget):
-                await self._broadcast_to_game(game, message)
-            elif isinstance(event.target, SeatTarget):
+            if isinstance(event.target, SeatTarget):
                 player = seat_to_player.get(event.target.seat)
-                if player:
-                    with contextlib.suppress(RuntimeError, OSError):
-                        await player.connection.send_message(message)
+                recipients = [player] if player else []
+            else:
+                recipients = list(game.players.values())
+            # AI seats have no connection, so their events are not encoded.
+            if not recipients:
+                continue
+
+            data = encode_event_counted(event)
+
+            await send_encoded((p for p in recipients if not p.batch_events), data)
+            for p in recipients:
+                if p.batch_events:
+                    batches.add(p, data)
+
+        await batches.flush()
 
     async def _broadcast_to_game(
         self,
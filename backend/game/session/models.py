@@ -47,6 +47,7 @@ class Player:
     user_id: str = ""  # from verified game ticket
     game_id: str | None = None
     seat: int | None = None
+    batch_events: bool = False  # negotiated on JOIN_GAME/RECONNECT: one array frame per action
 
     @property
     def connection_id(self) -> str:
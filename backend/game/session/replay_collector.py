@@ -7,6 +7,24 @@ end, etc.). Seat-targeted DrawEvent carries concealed draw data
 (available_actions stripped). Per-seat RoundStartedEvent views are merged into
 a single record with all players' tiles for full game reconstruction. Internal
 prompt and error event types are excluded.
+
+In streaming mode the collected lines are gzip-compressed into a temp file
+in the replay's shard directory each time a round or the game ends, so
+per-game memory stays bounded by one round. The temp file is opened, and each
+round compressed and written, in a worker thread, one write at a time per
+game, and the file is renamed into place at game end.
+
+Storages that support streams also get a segment index: the header (version
+tag and game_started) and each round are closed as separate segments,
+each round's segment tagged with a summary (wind, dealer, honba, starting scores,
+result, score changes) so a single round can be served without inflating
+the whole replay. Buffered games are written through a stream at save time
+for the same reason; plain ReplayStorage backends just get save_replay().
+
+In binary mode a copy of each replay in the binary record format
+(game.replay.binary) is also written through the BinaryReplayStorage once
+the NDJSON replay is saved. Records are encoded each time lines are flushed
+to the stream, so streaming games only keep the compact binary records.
 """
 
 from __future__ import annotations
@@ -23,16 +41,20 @@ from game.logic.events import (
     DrawEvent,
     ErrorEvent,
     FuritenEvent,
+    GameEndedEvent,
     GameStartedEvent,
+    RoundEndEvent,
     RoundStartedEvent,
     SeatTarget,
 )
 from game.messaging.event_payload import service_event_payload
+from game.replay.binary import encode_replay, encode_replay_records
 from game.replay.models import REPLAY_VERSION
+from shared.storage import BinaryReplayStorage, StreamingReplayStorage
 
 if TYPE_CHECKING:
     from game.logic.events import ServiceEvent
-    from shared.storage import ReplayStorage
+    from shared.storage import ReplayStorage, ReplayStream
 
 logger = structlog.get_logger()
 
@@ -45,6 +67,9 @@ _SEAT_TARGET_INCLUDED = (DrawEvent,)
 # These are internal prompts or error signals, not gameplay state transitions.
 _EXCLUDED_EVENT_TYPES = (CallPromptEvent, ErrorEvent, FuritenEvent)
 
+# In streaming mode, pending lines are flushed to the replay stream after these events.
+_STREAM_FLUSH_EVENT_TYPES = (RoundEndEvent, GameEndedEvent)
+
 
 class ReplayCollector:
     """Collects and persists gameplay events per game for post-game replay.
@@ -61,19 +86,70 @@ class ReplayCollector:
     2. collect_events(game_id, events) - accumulate qualifying events
     3. save_and_cleanup(game_id) - persist to storage and discard buffer
     4. cleanup_game(game_id) - discard buffer without persisting (abandoned game)
+
+    Segment boundaries are tracked as (buffer position, metadata) pairs next
+    to the buffer and replayed into ReplayStream.end_segment() on write.
+
+    With streaming=True (requires a StreamingReplayStorage), start_game opens a
+    replay stream in a background task and, once it is open, the buffer only
+    holds lines since the last round end. Flushed lines are written by a task
+    chained after the game's previous write; save_and_cleanup awaits it before
+    committing. If the stream cannot be opened, that game falls back to the
+    whole-game buffer and save_replay().
+
+    With binary=True (requires a BinaryReplayStorage), each saved replay is
+    also written in the binary format with save_binary_replay().
     """
 
-    def __init__(self, storage: ReplayStorage) -> None:
+    def __init__(self, storage: ReplayStorage, *, streaming: bool = False, binary: bool = False) -> None:
+        if streaming and not isinstance(storage, StreamingReplayStorage):
+            raise TypeError(f"{type(storage).__name__} does not support streaming replays")
+        if binary and not isinstance(storage, BinaryReplayStorage):
+            raise TypeError(f"{type(storage).__name__} does not support binary replays")
         self._storage = storage
+        self._stream_storage = storage if streaming and isinstance(storage, StreamingReplayStorage) else None
+        self._binary_storage = storage if binary and isinstance(storage, BinaryReplayStorage) else None
+        # Binary records of the lines already flushed to a game's stream.
+        self._binary_records: dict[str, list[bytes]] = {}
         self._buffers: dict[str, list[str]] = {}
+        self._segment_ends: dict[str, list[tuple[int, dict[str, Any]]]] = {}
+        self._round_starts: dict[str, dict[str, Any]] = {}
+        self._streams: dict[str, ReplayStream] = {}
+        # Stream opens in progress per streamed game; its lines stay buffered until the stream is open.
+        self._stream_opens: dict[str, asyncio.Task[None]] = {}
+        # Latest background write per streamed game; each awaits the one before it.
+        self._stream_writes: dict[str, asyncio.Task[bool]] = {}
         self._seeds: dict[str, str] = {}
         self._rng_versions: dict[str, str] = {}
 
     def start_game(self, game_id: str, seed: str, rng_version: str) -> None:
-        """Begin collecting events for a game."""
-        self._buffers[game_id] = []
+        """Begin collecting events for a game.
+
+        In streaming mode this must run on the event loop; the stream is opened in the background.
+        """
+        buffer: list[str] = []
+        self._buffers[game_id] = buffer
+        self._segment_ends[game_id] = []
         self._seeds[game_id] = seed
         self._rng_versions[game_id] = rng_version
+        if self._binary_storage is not None:
+            self._binary_records[game_id] = []
+        if self._stream_storage is not None:
+            opening = self._open_stream(self._stream_storage, game_id, buffer)
+            self._stream_opens[game_id] = asyncio.create_task(opening)
+
+    async def _open_stream(self, storage: StreamingReplayStorage, game_id: str, buffer: list[str]) -> None:
+        """Open the game's replay stream in a worker thread and start streaming into it."""
+        try:
+            stream = await asyncio.to_thread(_open_tagged_stream, storage, game_id)
+        except (OSError, ValueError):  # fmt: skip
+            logger.exception("failed to open replay stream, buffering whole game", game_id=game_id)
+            return
+        if self._buffers.get(game_id) is not buffer:
+            # The game was abandoned while its stream was opening.
+            stream.abort()
+            return
+        self._streams[game_id] = stream
 
     def collect_events(self, game_id: str, events: list[ServiceEvent]) -> None:
         """Append qualifying events to the game buffer.
@@ -96,7 +172,7 @@ class ReplayCollector:
 
             # Flush pending round_started events before other event types
             if pending_round_started:
-                buffer.append(self._merge_round_started_payloads(pending_round_started))
+                self._start_round(game_id, buffer, pending_round_started)
                 pending_round_started = []
 
             if not self._should_include(event):
@@ -107,10 +183,73 @@ class ReplayCollector:
                 payload.pop("aa", None)
             self._inject_seed_if_game_started(game_id, event, payload)
             buffer.append(json.dumps(payload, default=str))
+            self._mark_segment_end(game_id, event, payload, len(buffer))
 
         # Flush any remaining round_started events at end of batch
         if pending_round_started:
-            buffer.append(self._merge_round_started_payloads(pending_round_started))
+            self._start_round(game_id, buffer, pending_round_started)
+
+        if game_id in self._streams and any(isinstance(e.data, _STREAM_FLUSH_EVENT_TYPES) for e in events):
+            self._flush_to_stream(game_id)
+
+    def _mark_segment_end(self, game_id: str, event: ServiceEvent, payload: dict[str, Any], position: int) -> None:
+        """Close the header segment after game_started and a round segment after round_end."""
+        if isinstance(event.data, GameStartedEvent):
+            self._segment_ends[game_id].append((position, {"kind": "header"}))
+        elif isinstance(event.data, RoundEndEvent):
+            summary = _round_summary(self._round_starts.pop(game_id, {}), payload)
+            self._segment_ends[game_id].append((position, summary))
+
+    def _start_round(self, game_id: str, buffer: list[str], events: list[ServiceEvent]) -> None:
+        merged = self._merge_round_started_payloads(events)
+        buffer.append(json.dumps(merged, default=str))
+        self._round_starts[game_id] = merged
+
+    def _flush_to_stream(self, game_id: str) -> None:
+        """Hand the game's pending lines to a background write into its replay stream and clear them."""
+        buffer = self._buffers[game_id]
+        if not buffer:
+            return
+        segment_ends = self._segment_ends[game_id]
+        write = self._write_to_stream(
+            game_id,
+            self._streams[game_id],
+            self._stream_writes.get(game_id),
+            buffer.copy(),
+            segment_ends.copy(),
+            self._binary_records.get(game_id),
+        )
+        self._stream_writes[game_id] = asyncio.create_task(write)
+        buffer.clear()
+        segment_ends.clear()
+
+    async def _write_to_stream(  # noqa: PLR0913
+        self,
+        game_id: str,
+        stream: ReplayStream,
+        previous: asyncio.Task[bool] | None,
+        lines: list[str],
+        segment_ends: list[tuple[int, dict[str, Any]]],
+        records: list[bytes] | None,
+    ) -> bool:
+        """Compress lines into the stream in a worker thread once the previous write is done.
+
+        On a write error the stream is aborted and the game stops being
+        collected. Returns True on success.
+        """
+        if previous is not None and not await previous:
+            return False
+        try:
+            await asyncio.to_thread(_write_segments, stream, lines, segment_ends)
+            if records is not None:
+                records.append(await asyncio.to_thread(_encode_binary_records, lines))
+        except (OSError, ValueError):  # fmt: skip
+            logger.exception("failed to write replay stream, dropping replay", game_id=game_id)
+            stream.abort()
+            if self._streams.get(game_id) is stream:
+                self._discard(game_id)
+            return False
+        return True
 
     @staticmethod
     def _should_include(event: ServiceEvent) -> bool:
@@ -137,8 +276,8 @@ class ReplayCollector:
                 payload["rv"] = rng_version
 
     @staticmethod
-    def _merge_round_started_payloads(events: list[ServiceEvent]) -> str:
-        """Merge per-seat RoundStartedEvent payloads into a single JSON record.
+    def _merge_round_started_payloads(events: list[ServiceEvent]) -> dict[str, Any]:
+        """Merge per-seat RoundStartedEvent payloads into a single record.
 
         Take the first seat's payload as the base. Extract my_tiles from each seat's
         event and store per-player tiles in the merged record for full game reconstruction.
@@ -151,7 +290,7 @@ class ReplayCollector:
         contiguous block within a single collect_events() call.
         """
         if not events:
-            return "{}"
+            return {}
         tiles_by_seat: dict[int, list[int]] = {}
         base_payload = service_event_payload(events[0])
 
@@ -167,7 +306,7 @@ class ReplayCollector:
         base_payload.pop("mt", None)
         base_payload.pop("s", None)
 
-        return json.dumps(base_payload, default=str)
+        return base_payload
 
     async def save_and_cleanup(self, game_id: str) -> None:
         """Persist collected events to storage and discard the buffer.
@@ -176,21 +315,157 @@ class ReplayCollector:
         async event loop. Errors during storage are logged but never raised,
         to avoid blocking the game-end cleanup flow.
         """
-        buffer = self._buffers.pop(game_id, None)
-        self._seeds.pop(game_id, None)
-        self._rng_versions.pop(game_id, None)
+        opening = self._stream_opens.get(game_id)
+        if opening is not None:
+            await opening
+        stream = self._streams.get(game_id)
+        if stream is not None:
+            self._flush_to_stream(game_id)
+            write = self._stream_writes.get(game_id)
+            records = self._binary_records.get(game_id)
+            self._discard(game_id)
+            if write is not None and not await write:
+                return
+            try:
+                await asyncio.to_thread(stream.commit)
+            except (OSError, ValueError):  # fmt: skip
+                logger.exception("failed to save replay")
+                return
+            await self._save_binary(game_id, records, [])
+            return
+
+        buffer = self._buffers.get(game_id)
+        segment_ends = self._segment_ends.get(game_id, [])
+        records = self._binary_records.get(game_id)
+        self._discard(game_id)
         if buffer is None:
             return
 
         try:
-            version_tag = json.dumps({"version": REPLAY_VERSION})
-            content = "\n".join([version_tag, *buffer])
-            await asyncio.to_thread(self._storage.save_replay, game_id, content)
+            if isinstance(self._storage, StreamingReplayStorage):
+                await asyncio.to_thread(self._save_indexed, self._storage, game_id, buffer, segment_ends)
+            else:
+                content = "\n".join([_version_tag(), *buffer])
+                await asyncio.to_thread(self._storage.save_replay, game_id, content)
         except (OSError, ValueError):  # fmt: skip
             logger.exception("failed to save replay")
+            return
+        await self._save_binary(game_id, records, buffer)
+
+    async def _save_binary(self, game_id: str, records: list[bytes] | None, lines: list[str]) -> None:
+        """Write the binary copy of a saved replay from its encoded records and unflushed lines.
+
+        Errors are logged; the NDJSON replay is already saved.
+        """
+        if self._binary_storage is None or records is None:
+            return
+
+        def encode_and_save(storage: BinaryReplayStorage) -> None:
+            head = encode_replay(_version_tag())
+            storage.save_binary_replay(game_id, b"".join([head, *records, _encode_binary_records(lines)]))
+
+        try:
+            await asyncio.to_thread(encode_and_save, self._binary_storage)
+        except (OSError, ValueError):  # fmt: skip
+            logger.exception("failed to save binary replay", game_id=game_id)
+
+    @staticmethod
+    def _save_indexed(
+        storage: StreamingReplayStorage,
+        game_id: str,
+        buffer: list[str],
+        segment_ends: list[tuple[int, dict[str, Any]]],
+    ) -> None:
+        """Write a buffered game through a replay stream so it gets a segment index.
+
+        Fall back to save_replay() if the stream cannot be opened.
+        """
+        try:
+            stream = storage.open_stream(game_id)
+        except (OSError, ValueError):  # fmt: skip
+            storage.save_replay(game_id, "\n".join([_version_tag(), *buffer]))
+            return
+        try:
+            stream.write(_version_tag())
+            _write_segments(stream, buffer, segment_ends)
+        except BaseException:
+            stream.abort()
+            raise
+        stream.commit()
 
     def cleanup_game(self, game_id: str) -> None:
         """Discard the event buffer without persisting (abandoned game)."""
+        stream = self._streams.get(game_id)
+        if stream is not None:
+            write = self._stream_writes.get(game_id)
+            if write is None or write.done():
+                stream.abort()
+            else:
+                # Abort only once the worker thread has stopped writing to the stream.
+                write.add_done_callback(lambda _write: stream.abort())
+        self._discard(game_id)
+
+    def _discard(self, game_id: str) -> None:
         self._buffers.pop(game_id, None)
+        self._segment_ends.pop(game_id, None)
+        self._round_starts.pop(game_id, None)
+        self._streams.pop(game_id, None)
+        self._stream_opens.pop(game_id, None)
+        self._stream_writes.pop(game_id, None)
+        self._binary_records.pop(game_id, None)
         self._seeds.pop(game_id, None)
         self._rng_versions.pop(game_id, None)
+
+
+def _version_tag() -> str:
+    return json.dumps({"version": REPLAY_VERSION})
+
+
+def _open_tagged_stream(storage: StreamingReplayStorage, game_id: str) -> ReplayStream:
+    """Open a game's replay stream and write the version tag."""
+    stream = storage.open_stream(game_id)
+    try:
+        stream.write(_version_tag())
+    except BaseException:
+        stream.abort()
+        raise
+    return stream
+
+
+def _encode_binary_records(lines: list[str]) -> bytes:
+    """Encode NDJSON lines as binary replay records."""
+    return encode_replay_records(json.loads(line) for line in lines)
+
+
+def _write_segments(stream: ReplayStream, lines: list[str], segment_ends: list[tuple[int, dict[str, Any]]]) -> None:
+    """Write newline-prefixed lines, closing a segment at each recorded boundary."""
+    start = 0
+    for end, meta in segment_ends:
+        stream.write("".join(f"\n{line}" for line in lines[start:end]))
+        stream.end_segment(meta)
+        start = end
+    if start < len(lines):
+        stream.write("".join(f"\n{line}" for line in lines[start:]))
+
+
+def _round_summary(started: dict[str, Any], ended: dict[str, Any]) -> dict[str, Any]:
+    """Summarize a round from its merged round_started and round_end payloads."""
+    if "wn" in ended:
+        winners = [winner["ws"] for winner in ended["wn"]]
+    elif "ws" in ended:
+        winners = [ended["ws"]]
+    else:
+        winners = ended.get("qs", [])
+    return {
+        "kind": "round",
+        "wind": started.get("w"),
+        "round_number": started.get("n"),
+        "dealer": started.get("dl"),
+        "honba": started.get("h"),
+        "riichi_sticks": started.get("r"),
+        "scores": {str(player["s"]): player["sc"] for player in started.get("p", [])},
+        "result": ended.get("rt"),
+        "winners": winners,
+        "loser": ended.get("ls"),
+        "score_changes": {str(seat): change for seat, change in ended.get("sch", {}).items()},
+    }
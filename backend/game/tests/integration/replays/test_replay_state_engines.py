@@ -0,0 +1,35 @@
+"""Integration test: every replay fixture produces identical traces on both state engines."""
+
+from pathlib import Path
+
+import pytest
+
+from game.logic.enums import StateEngine
+from game.logic.mahjong_service import MahjongGameService
+from game.replay import run_replay_async
+from game.replay.loader import load_replay_from_file
+from game.replay.runner import ReplayOptions
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+FIXTURES = sorted(FIXTURES_DIR.rglob("*.txt"))
+
+
+async def _run(fixture: Path, engine: StateEngine):
+    replay = load_replay_from_file(fixture)
+    return await run_replay_async(
+        replay,
+        ReplayOptions(game_id="engine-diff"),
+        service_factory=lambda: MahjongGameService(auto_cleanup=False, engine=engine),
+    )
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=lambda p: f"{p.parent.name}/{p.stem}")
+async def test_mutable_engine_matches_frozen_engine(fixture):
+    frozen = await _run(fixture, StateEngine.FROZEN)
+    mutable = await _run(fixture, StateEngine.MUTABLE)
+
+    assert len(mutable.steps) == len(frozen.steps)
+    for index, (expected, actual) in enumerate(zip(frozen.steps, mutable.steps, strict=True)):
+        assert actual.model_dump() == expected.model_dump(), f"step {index} diverged"
+    # model_dump drops the excluded tile count vectors; equality covers them too
+    assert mutable == frozen
@@ -0,0 +1,191 @@
+"""Integration test: bulk replay verification re-simulates replays and diffs event streams."""
+
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from game.logic.enums import StateEngine
+from game.replay import load_replay_from_file, run_replay_async, verify
+from game.replay.runner import ReplayOptions
+from game.replay.verify import (
+    _init_worker,
+    _rerecord,
+    find_replay_files,
+    main,
+    verify_replay_async,
+    verify_replay_file,
+    verify_replays,
+)
+from shared.replay_packs import compact_replays, find_packed_replay
+from shared.storage import LocalReplayStorage, replay_file_path
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+GAME_ID = "abcd0000000000000000000000000001"
+
+
+@pytest.fixture
+async def recorded_lines() -> list[str]:
+    """A full game recorded by the current engine and ReplayCollector."""
+    trace = await run_replay_async(
+        load_replay_from_file(FIXTURES_DIR / "full_round" / "full_game.txt"),
+        ReplayOptions(game_id=GAME_ID),
+    )
+    return (await _rerecord(trace, GAME_ID)).splitlines()
+
+
+def _store(replay_dir: Path, game_id: str, lines: list[str]) -> Path:
+    LocalReplayStorage(str(replay_dir)).save_replay(game_id, "\n".join(lines))
+    return replay_file_path(replay_dir, game_id)
+
+
+async def test_recorded_replay_verifies(tmp_path: Path, recorded_lines: list[str]) -> None:
+    path = _store(tmp_path, GAME_ID, recorded_lines)
+
+    result = await verify_replay_async(path)
+
+    assert result.passed
+    assert result.events == len(recorded_lines)
+    assert result.steps > 0
+
+
+async def test_packed_replay_verifies(tmp_path: Path, recorded_lines: list[str]) -> None:
+    _store(tmp_path, GAME_ID, recorded_lines)
+    compact_replays(tmp_path, older_than_days=0, now=time.time() + 60)
+    packed = find_packed_replay(tmp_path, GAME_ID)
+    assert packed is not None
+
+    result = await verify_replay_async(packed)
+
+    assert result.passed
+    assert result.path == packed.location
+    assert result.events == len(recorded_lines)
+
+
+async def test_mutable_engine_verifies(tmp_path: Path, recorded_lines: list[str]) -> None:
+    path = _store(tmp_path, GAME_ID, recorded_lines)
+
+    result = await verify_replay_async(path, StateEngine.MUTABLE)
+
+    assert result.passed
+
+
+async def test_changed_event_is_reported(tmp_path: Path, recorded_lines: list[str]) -> None:
+    game_end = json.loads(recorded_lines[-1])
+    game_end["st"][0]["fs"] += 1
+    path = _store(tmp_path, GAME_ID, [*recorded_lines[:-1], json.dumps(game_end)])
+
+    result = await verify_replay_async(path)
+
+    assert result.divergence is not None
+    assert result.divergence.index == len(recorded_lines) - 1
+    assert result.divergence.expected == game_end
+    assert result.divergence.actual is not None
+    assert result.divergence.actual["st"][0]["fs"] == game_end["st"][0]["fs"] - 1
+
+
+async def test_truncated_replay_is_reported(tmp_path: Path, recorded_lines: list[str]) -> None:
+    path = _store(tmp_path, GAME_ID, recorded_lines[:-1])
+
+    result = await verify_replay_async(path)
+
+    assert result.divergence is not None
+    assert result.divergence.index == len(recorded_lines) - 1
+    assert result.divergence.expected is None
+    assert result.divergence.actual == json.loads(recorded_lines[-1])
+
+
+async def test_unloadable_replay_is_a_failure(tmp_path: Path) -> None:
+    path = _store(tmp_path, GAME_ID, ['{"version": "0.0"}'])
+
+    result = await verify_replay_async(path)
+
+    assert not result.passed
+    assert result.error is not None
+    assert result.error.startswith("ReplayLoadError")
+
+
+def test_find_replay_files_expands_directories_and_shard_trees(tmp_path: Path) -> None:
+    sharded = _store(tmp_path / "replays", GAME_ID, ["{}"])
+    flat = tmp_path / "flat" / "game.txt"
+    flat.parent.mkdir()
+    flat.write_text("{}")
+    single = tmp_path / "single.txt.gz"
+
+    found = find_replay_files([tmp_path / "replays", tmp_path / "flat", single])
+
+    assert found == sorted([sharded, flat, single])
+
+
+def test_find_replay_files_lists_packed_replays_once(tmp_path: Path) -> None:
+    packed_id = "abcd0000000000000000000000000002"
+    _store(tmp_path, packed_id, ["{}"])
+    _store(tmp_path, GAME_ID, ["{}"])
+    compact_replays(tmp_path, older_than_days=0, now=time.time() + 60)
+    # As if packing crashed after indexing GAME_ID but before deleting it.
+    loose = _store(tmp_path, GAME_ID, ["{}"])
+
+    found = find_replay_files([tmp_path])
+
+    assert found == [loose, find_packed_replay(tmp_path, packed_id)]
+
+
+def test_verify_replay_file_runs_the_async_check(tmp_path: Path) -> None:
+    path = _store(tmp_path, GAME_ID, ["not json"])
+
+    result = verify_replay_file(path)
+
+    assert result.error is not None
+    assert result.path == str(path)
+
+
+def test_worker_logs_errors_only(monkeypatch: pytest.MonkeyPatch) -> None:
+    levels: list[int | None] = []
+    monkeypatch.setattr(verify, "setup_logging", lambda level=None: levels.append(level))
+
+    _init_worker()
+
+    assert levels == [logging.ERROR]
+
+
+async def test_verify_replays_report(tmp_path: Path, recorded_lines: list[str]) -> None:
+    good = _store(tmp_path, GAME_ID, recorded_lines)
+    bad = _store(tmp_path, "abcd0000000000000000000000000002", ["not json"])
+
+    report = verify_replays([good, bad], workers=2)
+    summary = report.to_dict()
+
+    assert not report.passed
+    assert (summary["replays"], summary["passed"], summary["diverged"], summary["failed"]) == (2, 1, 0, 1)
+    assert summary["failures"][0]["path"] == str(bad)
+    assert summary["steps_per_second"] > 0
+    assert sum(worker["games"] for worker in summary["workers"]) == 2
+    json.dumps(summary)
+
+
+def test_main_writes_report_and_exit_status(
+    tmp_path: Path,
+    recorded_lines: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.setattr(verify, "setup_logging", lambda level=None: None)
+    good = _store(tmp_path / "good", GAME_ID, recorded_lines)
+    bad = _store(tmp_path / "bad", GAME_ID, ["not json"])
+    output = tmp_path / "report.json"
+
+    monkeypatch.setattr(sys, "argv", ["verify", str(good), "--workers", "1", "--output", str(output)])
+    with pytest.raises(SystemExit) as passed:
+        main()
+    monkeypatch.setattr(sys, "argv", ["verify", str(bad), "--workers", "1"])
+    with pytest.raises(SystemExit) as failed:
+        main()
+
+    assert passed.value.code == 0
+    assert json.loads(output.read_text())["passed"] == 1
+    assert failed.value.code == 1
+    assert json.loads(capsys.readouterr().out)["failures"][0]["path"] == str(bad)
@@ -0,0 +1,32 @@
+"""Integration test: the direct event encoder emits the same bytes as the dict + key-walk path."""
+
+from pathlib import Path
+
+import pytest
+
+from game.logic.events import CallPromptEvent
+from game.logic.mahjong_service import MahjongGameService
+from game.messaging.encoder import encode
+from game.messaging.event_payload import encode_service_event, service_event_payload, shape_call_prompt_payload
+from game.replay import run_replay_async
+from game.replay.loader import load_replay_from_file
+from game.replay.runner import ReplayOptions
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+FIXTURES = sorted(FIXTURES_DIR.rglob("*.txt"))
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=lambda p: f"{p.parent.name}/{p.stem}")
+async def test_direct_encoding_matches_stringified_payload(fixture):
+    trace = await run_replay_async(
+        load_replay_from_file(fixture),
+        ReplayOptions(game_id="wire-encoding"),
+        service_factory=lambda: MahjongGameService(auto_cleanup=False),
+    )
+    events = [*trace.startup_events, *(e for step in trace.steps for e in step.emitted_events)]
+
+    for index, event in enumerate(events):
+        payload = service_event_payload(event)
+        if isinstance(event.data, CallPromptEvent):
+            payload = shape_call_prompt_payload(payload)
+        assert encode_service_event(event) == encode(payload), f"event {index} ({event.event}) diverged"
@@ -5,6 +5,7 @@ MessagePack encoding) using the test client. They complement the game logic
 Replay tests by ensuring the service layer works correctly.
 """
 
+from datetime import UTC, datetime
 from unittest.mock import patch
 
 import pytest
@@ -20,6 +21,7 @@ from game.messaging.types import SessionErrorCode, SessionMessageType
 from game.messaging.wire_enums import WireClientMessageType, WireGameAction
 from game.server import websocket as ws_module
 from game.server.app import _read_request_body, create_app
+from game.server.settings import GameServerSettings
 from game.session.manager import SessionManager
 from game.tests.helpers.auth import make_test_game_ticket
 from game.tests.helpers.websocket import (
@@ -29,6 +31,7 @@ from game.tests.helpers.websocket import (
     send_ws,
 )
 from game.tests.mocks import MockGameService
+from shared.dal.models import PlayedGame
 
 
 class TestWebSocketIntegration:
@@ -219,6 +222,9 @@ class TestStatusEndpoint:
         assert data["active_games"] == 0
         assert data["capacity_used"] == 0
         assert data["max_capacity"] == 100
+        assert set(data["hand_value_cache"]) == {"hits", "misses", "size", "maxsize"}
+        assert set(data["broadcast"]) == {"encodes", "sends"}
+        assert data["record_backlog"] == 0
         assert "version" in data
         assert "commit" in data
 
@@ -230,6 +236,16 @@ class TestStatusEndpoint:
         assert data["active_games"] == 0
         assert data["capacity_used"] == 1
 
+    def test_status_reports_queued_game_records(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("AUTH_DATABASE_PATH", str(tmp_path / "game.db"))
+        settings = GameServerSettings(replay_dir=str(tmp_path / "replays"), record_flush_ms=60_000)
+        app = create_app(settings=settings, game_service=MockGameService())
+        with TestClient(app) as client:
+            game = PlayedGame(game_id="g1", started_at=datetime(2025, 1, 15, 12, 0, 0, tzinfo=UTC))
+            client.portal.call(app.state.game_repository.create_game, game)
+
+            assert client.get("/status").json()["record_backlog"] == 1
+
 
 class TestCreateGameEndpoint:
     @pytest.fixture
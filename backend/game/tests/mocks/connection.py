@@ -2,6 +2,8 @@ import asyncio
 from typing import Any
 from uuid import uuid4
 
+import msgpack
+
 from game.messaging.encoder import decode, encode
 from game.messaging.protocol import ConnectionProtocol
 
@@ -11,7 +13,7 @@ class MockConnection(ConnectionProtocol):
         self._connection_id = connection_id or str(uuid4())
         self._game_id = game_id
         self._inbox: asyncio.Queue[bytes] = asyncio.Queue()
-        self._outbox: list[dict[str, Any]] = []
+        self._outbox: list[Any] = []
         self._closed = False
         self._close_code: int | None = None
         self._close_reason: str | None = None
@@ -25,7 +27,7 @@ class MockConnection(ConnectionProtocol):
         return self._game_id
 
     @property
-    def sent_messages(self) -> list[dict[str, Any]]:
+    def sent_messages(self) -> list[Any]:
         return self._outbox.copy()
 
     @property
@@ -35,8 +37,11 @@ class MockConnection(ConnectionProtocol):
     async def send_bytes(self, data: bytes) -> None:
         if self._closed:
             raise RuntimeError("Connection is closed")
-        # decode and store for test inspection
-        self._outbox.append(decode(data))
+        # decode and store for test inspection; batched event frames are stored as one list
+        if data[:1] and (data[0] & 0xF0 == 0x90 or data[0] in (0xDC, 0xDD)):
+            self._outbox.append(msgpack.unpackb(data, raw=False))
+        else:
+            self._outbox.append(decode(data))
 
     async def receive_bytes(self) -> bytes:
         if self._closed:
@@ -0,0 +1,116 @@
+"""
+Tests for encode-once broadcasting.
+"""
+
+from game.logic.events import BroadcastTarget, DrawEvent, EventType, SeatTarget, ServiceEvent
+from game.session.broadcast import broadcast_stats, broadcast_to_players, send_encoded
+from game.session.models import Player
+from game.tests.mocks import MockConnection
+
+from .helpers import create_started_game
+
+
+def _record_bytes(conn: MockConnection) -> list[bytes]:
+    """Capture the raw bytes handed to a connection while keeping its decoded outbox."""
+    received: list[bytes] = []
+    send_bytes = conn.send_bytes
+
+    async def recording_send_bytes(data: bytes) -> None:
+        received.append(data)
+        await send_bytes(data)
+
+    conn.send_bytes = recording_send_bytes  # type: ignore[method-assign]
+    return received
+
+
+def _draw_event() -> ServiceEvent:
+    return ServiceEvent(
+        event=EventType.DRAW,
+        data=DrawEvent(seat=0, tile_id=42, available_actions=[], target="all"),
+        target=BroadcastTarget(),
+    )
+
+
+class TestBroadcastEncoding:
+    async def test_event_encoded_once_for_all_recipients(self, manager):
+        conns = await create_started_game(manager, "game1", num_ai_players=0)
+        received = [_record_bytes(conn) for conn in conns]
+        encodes, sends = broadcast_stats.encodes, broadcast_stats.sends
+
+        await manager._broadcast_events(manager.get_game("game1"), [_draw_event(), _draw_event()])
+
+        assert broadcast_stats.encodes - encodes == 2
+        assert broadcast_stats.sends - sends == 8
+        for index in range(2):
+            first = received[0][index]
+            assert all(r[index] is first for r in received)
+        assert all(conn.sent_messages == conns[0].sent_messages for conn in conns)
+
+    async def test_excluded_only_recipient_skips_encoding(self):
+        conn = MockConnection()
+        players = {conn.connection_id: Player(connection=conn, name="Alice", session_token="tok")}
+        encodes = broadcast_stats.encodes
+
+        await broadcast_to_players(players, {"type": "x"}, exclude_connection_id=conn.connection_id)
+
+        assert broadcast_stats.encodes == encodes
+        assert conn.sent_messages == []
+
+    async def test_send_to_closed_connection_is_not_counted(self):
+        conn = MockConnection()
+        await conn.close()
+        sends = broadcast_stats.sends
+
+        await send_encoded([Player(connection=conn, name="Alice", session_token="tok")], b"x")
+
+        assert broadcast_stats.sends == sends
+
+    async def test_event_for_seat_without_player_is_not_encoded(self, manager):
+        conns = await create_started_game(manager, "game1", num_ai_players=2)
+        game = manager.get_game("game1")
+        human_seats = {p.seat for p in game.players.values()}
+        ai_seat = next(seat for seat in range(4) if seat not in human_seats)
+        event = ServiceEvent(
+            event=EventType.DRAW,
+            data=DrawEvent(seat=ai_seat, tile_id=42, available_actions=[], target=f"seat_{ai_seat}"),
+            target=SeatTarget(seat=ai_seat),
+        )
+        encodes = broadcast_stats.encodes
+        sent = [len(conn.sent_messages) for conn in conns]
+
+        await manager._broadcast_events(game, [event])
+
+        assert broadcast_stats.encodes == encodes
+        assert [len(conn.sent_messages) for conn in conns] == sent
+
+
+class TestBatchedEventFrames:
+    async def test_batching_player_gets_one_array_frame(self, manager):
+        conns = await create_started_game(manager, "game1", num_ai_players=2)
+        game = manager.get_game("game1")
+        game.players[conns[0].connection_id].batch_events = True
+        encodes = broadcast_stats.encodes
+
+        await manager._broadcast_events(game, [_draw_event(), _draw_event()])
+
+        assert broadcast_stats.encodes - encodes == 2
+        assert len(conns[0].sent_messages) == 1
+        assert conns[0].sent_messages[0] == conns[1].sent_messages
+        assert len(conns[1].sent_messages) == 2
+
+    async def test_batching_player_without_events_gets_no_frame(self, manager):
+        conns = await create_started_game(manager, "game1", num_ai_players=2)
+        game = manager.get_game("game1")
+        batching = game.players[conns[0].connection_id]
+        batching.batch_events = True
+        other_seat = game.players[conns[1].connection_id].seat
+        event = ServiceEvent(
+            event=EventType.DRAW,
+            data=DrawEvent(seat=other_seat, tile_id=42, available_actions=[], target=f"seat_{other_seat}"),
+            target=SeatTarget(seat=other_seat),
+        )
+
+        await manager._broadcast_events(game, [event])
+
+        assert conns[0].sent_messages == []
+        assert len(conns[1].sent_messages) == 1
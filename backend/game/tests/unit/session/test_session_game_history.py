@@ -260,8 +260,8 @@ class TestGameCompletionRecording:
         assert conns[0].is_closed
         assert conns[1].is_closed
 
-    async def test_get_game_failure_does_not_block_socket_close(self, manager_with_repo, game_repo):
-        """If get_game raises inside _record_game_finish, sockets still close."""
+    async def test_finish_does_not_read_back_game_record(self, manager_with_repo, game_repo):
+        """Names and user_ids come from the start standings kept in memory, not a get_game round-trip."""
         conns = await create_started_game(
             manager_with_repo,
             "game1",
@@ -269,13 +269,14 @@ class TestGameCompletionRecording:
             player_names=["Alice", "Bob"],
         )
 
-        game_repo.get_game = AsyncMock(side_effect=RuntimeError("DB read failed"))
         manager_with_repo._game_service.handle_action = AsyncMock(return_value=_make_game_end_events())
-
         await manager_with_repo.handle_game_action(conns[0], GameAction.DISCARD, {})
 
-        assert conns[0].is_closed
-        assert conns[1].is_closed
+        game_repo.get_game.assert_not_called()
+        standings = game_repo.finish_game.call_args.kwargs["standings"]
+        assert standings[0].name == "Alice"
+        assert standings[0].user_id == "user-0"
+        assert manager_with_repo._start_standings == {}
 
 
 class TestGameAbandonmentRecording:
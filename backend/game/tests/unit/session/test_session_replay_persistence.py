@@ -69,10 +69,10 @@ async def _create_started_game_with_collector(
 class TestReplayCollectorMerge:
     """Tests for ReplayCollector static helper."""
 
-    def test_empty_list_returns_empty_json(self):
-        """_merge_round_started_payloads returns '{}' for empty list."""
+    def test_empty_list_returns_empty_record(self):
+        """_merge_round_started_payloads returns {} for empty list."""
         result = ReplayCollector._merge_round_started_payloads([])
-        assert result == "{}"
+        assert result == {}
 
 
 class TestSessionReplayStart:
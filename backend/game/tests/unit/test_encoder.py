@@ -7,7 +7,7 @@ import pytest
 
 from game.logic.enums import CallType, MeldCallType, MeldViewType
 from game.logic.events import EventType
-from game.messaging.encoder import MAX_BUFFER_LEN, DecodeError, decode, encode
+from game.messaging.encoder import MAX_BUFFER_LEN, DecodeError, decode, encode, encode_array_frame
 
 
 class TestRoundTrip:
@@ -82,6 +82,17 @@ class TestIntegerKeyConversion:
         }
 
 
+class TestArrayFrame:
+    @pytest.mark.parametrize("count", [0, 1, 15, 16, 65535, 65536])
+    def test_array_frame_decodes_to_original_messages(self, count: int) -> None:
+        """encode_array_frame() output matches msgpack's own array encoding across header sizes."""
+        messages = [{"t": i % 7} for i in range(count)]
+
+        frame = encode_array_frame([encode(m) for m in messages])
+
+        assert frame == msgpack.packb(messages)
+
+
 class TestDecodeErrors:
     def test_invalid_msgpack_data_raises_decode_error(self) -> None:
         """Decoding invalid bytes raises DecodeError."""
@@ -17,6 +17,7 @@ from game.logic.state import (
     MahjongPlayer,
     MahjongRoundState,
     PendingCallPrompt,
+    count_player_tiles_34,
     get_player_view,
     wind_name,
 )
@@ -26,6 +27,7 @@ from game.logic.state_utils import (
     advance_turn,
     clear_all_players_ippatsu,
     clear_pending_prompt,
+    tile_count_updates,
     update_player,
 )
 from game.logic.wall import Wall
@@ -94,6 +96,57 @@ class TestStateUtilsTileOperations:
         assert new_state.players[0].tiles[-1] == new_tile
 
 
+class TestPlayerTileCounts:
+    def _assert_counts_match(self, player: MahjongPlayer) -> None:
+        expected = count_player_tiles_34(player.tiles, player.melds)
+        assert player.tiles_34 == expected["tiles_34"]
+        assert player.meld_tiles_34 == expected["meld_tiles_34"]
+
+    def test_counts_filled_on_construction(self):
+        tiles = tuple(TilesConverter.string_to_136_array(man="1123", honors="77"))
+        pon = FrozenMeld(meld_type=FrozenMeld.PON, tiles=(36, 37, 38), opened=True)
+        player = MahjongPlayer(seat=0, name="P0", tiles=tiles, melds=(pon,), score=25000)
+
+        assert player.tiles_34[0] == 2
+        assert player.tiles_34[33] == 2
+        assert player.meld_tiles_34[9] == 3
+        assert sum(player.tiles_34) == len(tiles)
+
+    def test_counts_excluded_from_dump(self):
+        player = MahjongPlayer(seat=0, name="P0", tiles=(0, 1), score=25000)
+        dumped = player.model_dump()
+        assert "tiles_34" not in dumped
+        assert "meld_tiles_34" not in dumped
+
+    def test_model_copy_recounts_changed_tiles_and_melds(self):
+        player = MahjongPlayer(seat=0, name="P0", tiles=(0, 1, 2, 4), score=25000)
+        kan = FrozenMeld(meld_type=FrozenMeld.KAN, tiles=(8, 9, 10, 11), opened=False)
+
+        self._assert_counts_match(player.model_copy(update={"tiles": (4, 5)}))
+        self._assert_counts_match(player.model_copy(update={"melds": (kan,)}))
+        self._assert_counts_match(update_player(MahjongRoundState(players=(player,)), 0, tiles=(12,)).players[0])
+
+    def test_add_tile_updates_counts_incrementally(self):
+        state = MahjongRoundState(players=(MahjongPlayer(seat=0, name="P0", tiles=(0, 4), score=25000),))
+        new_state = add_tile_to_player(state, 0, 5)
+
+        assert new_state.players[0].tiles_34[1] == 2
+        self._assert_counts_match(new_state.players[0])
+
+    def test_meld_tile_listed_in_hand_moves_between_vectors(self):
+        pon = FrozenMeld(meld_type=FrozenMeld.PON, tiles=(36, 37, 38), opened=True)
+        player = MahjongPlayer(seat=0, name="P0", tiles=(0, 36), melds=(pon,), score=25000)
+        assert player.meld_tiles_34[9] == 2
+
+        removed = player.model_copy(update={"tiles": (0,), **tile_count_updates(player, (0,), removed=(36,))})
+        assert removed.meld_tiles_34[9] == 3
+        self._assert_counts_match(removed)
+
+        added = removed.model_copy(update={"tiles": (0, 37), **tile_count_updates(removed, (0, 37), added=(37,))})
+        assert added.meld_tiles_34[9] == 2
+        self._assert_counts_match(added)
+
+
 class TestStateUtilsTurnAdvance:
     def _players(self) -> tuple[MahjongPlayer, ...]:
         return tuple(MahjongPlayer(seat=i, name=f"P{i}", score=25000) for i in range(4))
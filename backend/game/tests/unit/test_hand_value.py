@@ -0,0 +1,114 @@
+"""
+Tests for the memoized hand value cache.
+"""
+
+from mahjong.constants import FIVE_RED_MAN
+from mahjong.hand_calculating.hand import HandCalculator
+from mahjong.hand_calculating.hand_config import HandConfig, OptionalRules
+from mahjong.tile import TilesConverter
+
+from game.logic.hand_value import HandValueCache, hand_signature
+from game.logic.meld_wrapper import FrozenMeld, frozen_melds_to_melds
+
+# 123m 456m 789m 234p + 99s pair, winning on 9s; second copies, so no red fives
+_HAND = [t + 1 for t in TilesConverter.string_to_136_array(man="123456789", pin="234", sou="9")] + [106]
+_WIN_TILE = _HAND[-1]
+
+
+def _config(**flags) -> HandConfig:
+    return HandConfig(options=OptionalRules(has_aka_dora=True, has_open_tanyao=True), **flags)
+
+
+def _shift_copies(tiles: list[int]) -> list[int]:
+    """Swap every tile for the next copy of the same type (never a red five)."""
+    return [t + 1 for t in tiles]
+
+
+class TestHandSignature:
+    def test_same_types_different_copies_share_signature(self):
+        shifted = _shift_copies(_HAND)
+        assert hand_signature(_HAND, _WIN_TILE, (), [0], _config()) == hand_signature(
+            shifted,
+            shifted[-1],
+            (),
+            [3],
+            _config(),
+        )
+
+    def test_red_five_changes_signature_only_with_aka_dora(self):
+        with_red = [FIVE_RED_MAN if t == FIVE_RED_MAN + 1 else t for t in _HAND]
+        assert hand_signature(with_red, _WIN_TILE, (), None, _config()) != hand_signature(
+            _HAND,
+            _WIN_TILE,
+            (),
+            None,
+            _config(),
+        )
+        plain = HandConfig()
+        assert hand_signature(with_red, _WIN_TILE, (), None, plain) == hand_signature(
+            _HAND,
+            _WIN_TILE,
+            (),
+            None,
+            plain,
+        )
+
+    def test_config_flags_and_dora_change_signature(self):
+        base = hand_signature(_HAND, _WIN_TILE, (), [0], _config(is_tsumo=True))
+        assert base != hand_signature(_HAND, _WIN_TILE, (), [0], _config(is_tsumo=False))
+        assert base != hand_signature(_HAND, _WIN_TILE, (), [4], _config(is_tsumo=True))
+        assert base != hand_signature(_HAND, _WIN_TILE, (), [0], _config(is_tsumo=True, player_wind=28))
+
+
+class TestHandValueCache:
+    def test_repeated_hand_hits_cache(self):
+        cache = HandValueCache()
+        first = cache.estimate_hand_value(_HAND, _WIN_TILE, (), [0], _config(is_tsumo=True))
+        shifted = _shift_copies(_HAND)
+        second = cache.estimate_hand_value(shifted, shifted[-1], (), [1], _config(is_tsumo=True))
+
+        assert second is first
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "maxsize": cache.maxsize}
+
+    def test_result_matches_hand_calculator(self):
+        pon_tiles = tuple(TilesConverter.string_to_136_array(honors="555"))
+        pon = FrozenMeld(meld_type=FrozenMeld.PON, tiles=pon_tiles, opened=True, called_tile=pon_tiles[0], who=0)
+        closed = TilesConverter.string_to_136_array(man="234567", sou="23455")
+        tiles = [*closed, *pon_tiles]
+        config = _config(is_tsumo=False, player_wind=28, round_wind=27)
+
+        cached = HandValueCache().estimate_hand_value(tiles, closed[-3], (pon,), [closed[0]], config)
+        direct = HandCalculator.estimate_hand_value(
+            tiles=tiles,
+            win_tile=closed[-3],
+            melds=frozen_melds_to_melds((pon,)),
+            dora_indicators=[closed[0]],
+            config=_config(is_tsumo=False, player_wind=28, round_wind=27),
+        )
+
+        assert (cached.han, cached.fu, cached.cost, cached.error) == (direct.han, direct.fu, direct.cost, direct.error)
+        assert cached.yaku is not None
+        assert direct.yaku is not None
+        assert [y.yaku_id for y in cached.yaku] == [y.yaku_id for y in direct.yaku]
+
+    def test_evicts_least_recently_used(self):
+        cache = HandValueCache(maxsize=2)
+        tsumo = _config(is_tsumo=True)
+        cache.estimate_hand_value(_HAND, _WIN_TILE, (), None, tsumo)
+        cache.estimate_hand_value(_HAND, _WIN_TILE, (), None, _config())
+        # touch the tsumo entry so the ron entry becomes the oldest
+        cache.estimate_hand_value(_HAND, _WIN_TILE, (), None, tsumo)
+        cache.estimate_hand_value(_HAND, _WIN_TILE, (), [0], tsumo)
+
+        assert len(cache) == 2
+        cache.estimate_hand_value(_HAND, _WIN_TILE, (), None, tsumo)
+        assert cache.hits == 2
+        cache.estimate_hand_value(_HAND, _WIN_TILE, (), None, _config())
+        assert cache.misses == 4
+
+    def test_clear_resets_entries_and_counters(self):
+        cache = HandValueCache()
+        cache.estimate_hand_value(_HAND, _WIN_TILE, (), None, _config())
+        cache.clear()
+
+        assert cache.stats() == {"hits": 0, "misses": 0, "size": 0, "maxsize": cache.maxsize}
@@ -17,6 +17,7 @@ from game.logic.melds import (
     resolve_added_kan_tile,
 )
 from game.logic.settings import GameSettings
+from game.logic.state import count_player_tiles_34
 from game.logic.tiles import tile_to_34
 from game.tests.conftest import create_player, create_round_state
 
@@ -46,6 +47,14 @@ def _round_state(player0_tiles, *, player0_melds=(), current_player_seat=0, dead
     )
 
 
+def _assert_tile_counts_match(player):
+    """Incrementally maintained tile counts equal a full recount."""
+    assert {"tiles_34": player.tiles_34, "meld_tiles_34": player.meld_tiles_34} == count_player_tiles_34(
+        player.tiles,
+        player.melds,
+    )
+
+
 class TestCallPonImmutable:
     def test_call_pon_state_changes(self):
         """Pon creates correct meld, opens hand, and sets kuikae restriction."""
@@ -69,6 +78,7 @@ class TestCallPonImmutable:
         assert meld.called_tile == man_1m[2]
         assert 0 in new_state.players_with_open_hands
         assert tile_to_34(man_1m[0]) in new_state.players[0].kuikae_tiles
+        _assert_tile_counts_match(new_state.players[0])
 
     def test_call_pon_clears_ippatsu_for_all_players(self):
         """Pon by any player clears ippatsu for all riichi players."""
@@ -144,6 +154,7 @@ class TestCallChiImmutable:
         for p in new_state.players:
             assert p.is_ippatsu is False
         assert tile_to_34(man_tiles[0]) in new_state.players[1].kuikae_tiles
+        _assert_tile_counts_match(new_state.players[1])
 
 
 class TestCallOpenKanImmutable:
@@ -173,6 +184,7 @@ class TestCallOpenKanImmutable:
         assert len(new_state.wall.dead_wall_tiles) == original_dead_wall_len
         assert new_state.players[0].is_rinshan is True
         assert new_state.wall.pending_dora_count == 1
+        _assert_tile_counts_match(new_state.players[0])
 
     def test_call_open_kan_raises_on_insufficient_tiles(self):
         man_1m = TilesConverter.string_to_136_array(man="1111")
@@ -204,6 +216,7 @@ class TestCallClosedKanImmutable:
         assert new_state.wall.pending_dora_count == 0
         assert len(new_state.wall.dora_indicators) == original_dora_count + 1
         assert new_state.players[0].is_rinshan is True
+        _assert_tile_counts_match(new_state.players[0])
 
     def test_call_closed_kan_clears_ippatsu_for_all_players(self):
         """Closed kan (ankan) keeps hand closed but still clears ippatsu for all riichi players."""
@@ -262,6 +275,7 @@ class TestCallAddedKanImmutable:
         assert new_state.players[0].melds[0].type == Meld.SHOUMINKAN
         assert new_state.wall.pending_dora_count == 1
         assert new_state.players[0].is_rinshan is True
+        _assert_tile_counts_match(new_state.players[0])
 
     def test_call_added_kan_raises_on_no_pon(self):
         man_1m = TilesConverter.string_to_136_array(man="1111")
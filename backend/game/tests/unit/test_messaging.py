@@ -98,6 +98,27 @@ class TestMessageRouterBranches:
         assert response["code"] == SessionErrorCode.INVALID_TICKET
         assert "mismatch" in response["message"]
 
+    async def test_join_game_negotiates_batch_events(self, setup):
+        """JOIN_GAME with batch_events=True marks the player for batched event frames."""
+        router, connection, session_manager = setup
+        ticket = make_test_game_ticket("Alice", "test-game")
+        specs = [PlayerSpec(name="Alice", user_id="user-0", game_ticket=ticket)]
+        session_manager.create_pending_game("test-game", specs, num_ai_players=3)
+
+        await router.handle_message(
+            connection,
+            {
+                "t": WireClientMessageType.JOIN_GAME,
+                "game_ticket": ticket,
+                "batch_events": True,
+            },
+        )
+
+        player = session_manager.get_game("test-game").players[connection.connection_id]
+        assert player.batch_events is True
+        assert connection.sent_messages
+        assert all(isinstance(frame, list) for frame in connection.sent_messages)
+
     async def test_disconnect_without_joining_game(self, setup):
         """Disconnecting a registered connection that never joined a game returns cleanly."""
         router, connection, _ = setup
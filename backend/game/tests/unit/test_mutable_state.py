@@ -0,0 +1,193 @@
+"""
+Tests for the __slots__ mirrors used by the mutable state engine.
+"""
+
+import pytest
+
+from game.logic.enums import StateEngine
+from game.logic.mahjong_service import MahjongGameService
+from game.logic.mutable_state import (
+    MutableGameState,
+    MutablePlayer,
+    MutableRoundState,
+    MutableWall,
+    freeze_game_state,
+    thaw_game_state,
+)
+from game.logic.state import MahjongGameState, MahjongPlayer, MahjongRoundState
+from game.logic.state_utils import add_tile_to_player
+from game.logic.wall import Wall
+from game.tests.conftest import create_game_state, create_player, create_round_state
+
+
+def _game_state() -> MahjongGameState:
+    players = [create_player(seat=i, tiles=[i * 4, i * 4 + 1]) for i in range(4)]
+    return create_game_state(create_round_state(players=players), honba_sticks=2)
+
+
+class TestMirrorFields:
+    @pytest.mark.parametrize(
+        ("mutable_type", "frozen_type"),
+        [
+            (MutableWall, Wall),
+            (MutablePlayer, MahjongPlayer),
+            (MutableRoundState, MahjongRoundState),
+            (MutableGameState, MahjongGameState),
+        ],
+    )
+    def test_slots_match_model_fields(self, mutable_type, frozen_type):
+        assert set(mutable_type.__slots__) == set(frozen_type.model_fields)
+
+
+class TestThawAndFreeze:
+    def test_round_trip_preserves_state(self):
+        frozen = _game_state()
+        thawed = thaw_game_state(frozen)
+
+        assert isinstance(thawed.round_state.wall, MutableWall)
+        assert all(isinstance(p, MutablePlayer) for p in thawed.round_state.players)
+        assert freeze_game_state(thawed) == frozen
+
+    def test_thaw_reuses_fully_mutable_state(self):
+        thawed = thaw_game_state(_game_state())
+        assert thaw_game_state(thawed) is thawed
+
+    def test_thaw_converts_only_frozen_parts(self):
+        thawed = thaw_game_state(_game_state())
+        frozen_player = create_player(seat=1, tiles=[99])
+        players = (thawed.round_state.players[0], frozen_player, *thawed.round_state.players[2:])
+        mixed = thawed.model_copy(update={"round_state": thawed.round_state.model_copy(update={"players": players})})
+
+        result = thaw_game_state(mixed)
+
+        assert result.round_state.players[0] is thawed.round_state.players[0]
+        assert isinstance(result.round_state.players[1], MutablePlayer)
+        assert result.round_state.players[1].tiles == (99,)
+        assert result.round_state.wall is thawed.round_state.wall
+        # the partially thawed input is left untouched
+        assert mixed.round_state.players[1] is frozen_player
+
+    def test_thaw_replaces_frozen_wall(self):
+        thawed = thaw_game_state(_game_state())
+        mixed = thawed.model_copy(update={"round_state": thawed.round_state.model_copy(update={"wall": Wall()})})
+
+        result = thaw_game_state(mixed)
+
+        assert isinstance(result.round_state.wall, MutableWall)
+        assert result.round_state.players == thawed.round_state.players
+
+    def test_freeze_reuses_unchanged_parts_of_previous_snapshot(self):
+        thawed = thaw_game_state(_game_state())
+        snapshot = freeze_game_state(thawed)
+        assert freeze_game_state(thawed, (thawed, snapshot)) is snapshot
+
+        updated = thawed.model_copy(update={"round_state": add_tile_to_player(thawed.round_state, 2, 50)})
+        new_snapshot = freeze_game_state(updated, (thawed, snapshot))
+
+        assert new_snapshot.round_state.players[2].tiles == (8, 9, 50)
+        assert new_snapshot.round_state.players[0] is snapshot.round_state.players[0]
+        assert new_snapshot.round_state.wall is snapshot.round_state.wall
+
+    def test_freeze_reuses_unchanged_round_state(self):
+        thawed = thaw_game_state(_game_state())
+        snapshot = freeze_game_state(thawed)
+        updated = thawed.model_copy(update={"honba_sticks": 3})
+
+        new_snapshot = freeze_game_state(updated, (thawed, snapshot))
+
+        assert new_snapshot.honba_sticks == 3
+        assert new_snapshot.round_state is snapshot.round_state
+
+    def test_freeze_refreezes_replaced_wall(self):
+        thawed = thaw_game_state(_game_state())
+        snapshot = freeze_game_state(thawed)
+        wall = thawed.round_state.wall.model_copy(update={"pending_dora_count": 1})
+        updated = thawed.model_copy(update={"round_state": thawed.round_state.model_copy(update={"wall": wall})})
+
+        new_snapshot = freeze_game_state(updated, (thawed, snapshot))
+
+        assert new_snapshot.round_state.wall.pending_dora_count == 1
+        assert new_snapshot.round_state.players == snapshot.round_state.players
+
+
+class TestFreezeMatchesValidation:
+    """_freeze sets instance attributes directly; the result must equal what model_validate builds."""
+
+    @staticmethod
+    async def _started_game_snapshot() -> MahjongGameState:
+        service = MahjongGameService(engine=StateEngine.MUTABLE)
+        await service.start_game("game1", ["Player"], seed="a" * 192)
+        snapshot = service.get_game_state("game1")
+        assert snapshot is not None
+        return snapshot
+
+    @pytest.mark.parametrize("source", ["fixture", "started_game"])
+    async def test_frozen_models_match_model_validate(self, source):
+        if source == "fixture":
+            frozen = freeze_game_state(thaw_game_state(_game_state()))
+        else:
+            frozen = await self._started_game_snapshot()
+        round_state = frozen.round_state
+
+        for model in (frozen, round_state, round_state.wall, *round_state.players):
+            fields = {name: getattr(model, name) for name in type(model).model_fields}
+            validated = type(model).model_validate(fields)
+            for name in type(model).model_fields:
+                frozen_value, validated_value = getattr(model, name), getattr(validated, name)
+                assert type(frozen_value) is type(validated_value), (type(model).__name__, name)
+                assert frozen_value == validated_value, (type(model).__name__, name)
+            assert model.model_fields_set == validated.model_fields_set
+            assert model.__pydantic_extra__ == validated.__pydantic_extra__
+            assert model.__pydantic_private__ == validated.__pydantic_private__
+            assert model == validated
+
+
+class TestMutableCopies:
+    def test_model_copy_leaves_original_untouched(self):
+        round_state = thaw_game_state(_game_state()).round_state
+        updated = round_state.model_copy(update={"turn_count": 5})
+
+        assert updated is not round_state
+        assert (round_state.turn_count, updated.turn_count) == (0, 5)
+        assert updated.players is round_state.players
+
+    def test_player_copy_recounts_tile_vectors(self):
+        player = thaw_game_state(_game_state()).round_state.players[0]
+        updated = player.model_copy(update={"tiles": (8, 9, 10)})
+
+        assert updated.tiles_34 == create_player(tiles=[8, 9, 10]).tiles_34
+        assert player.tiles_34 == create_player(tiles=[0, 1]).tiles_34
+
+    def test_logic_helpers_accept_mirrors(self):
+        frozen_round = _game_state().round_state
+        thawed_round = thaw_game_state(_game_state()).round_state
+
+        expected = add_tile_to_player(frozen_round, 2, 50)
+        actual = add_tile_to_player(thawed_round, 2, 50)
+
+        assert isinstance(actual, MutableRoundState)
+        assert actual.players[2].tiles == expected.players[2].tiles
+        assert actual.players[2].tiles_34 == expected.players[2].tiles_34
+        assert not actual.players[2].has_open_melds()
+
+
+class TestServiceEngine:
+    async def test_mutable_engine_stores_mirrors_and_returns_snapshots(self):
+        service = MahjongGameService(engine=StateEngine.MUTABLE)
+        await service.start_game("game1", ["Player"], seed="a" * 192)
+
+        assert isinstance(service._games["game1"], MutableGameState)
+        snapshot = service.get_game_state("game1")
+        assert isinstance(snapshot, MahjongGameState)
+        assert all(isinstance(p, MahjongPlayer) for p in snapshot.round_state.players)
+        assert service.get_game_state("game1") is snapshot
+
+        service.cleanup_game("game1")
+        assert service.get_game_state("game1") is None
+        assert service._snapshots == {}
+
+    async def test_frozen_engine_stores_frozen_state(self):
+        service = MahjongGameService()
+        await service.start_game("game1", ["Player"], seed="a" * 192)
+
+        assert service.get_game_state("game1") is service._games["game1"]
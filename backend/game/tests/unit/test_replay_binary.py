@@ -0,0 +1,116 @@
+"""Tests for the binary replay format and loading it alongside NDJSON."""
+
+import gzip
+import json
+from pathlib import Path
+
+import msgpack
+import pytest
+
+from game.replay import loader
+from game.replay.binary import (
+    BINARY_REPLAY_MAGIC,
+    decode_replay,
+    encode_replay,
+    encode_replay_events,
+    encode_replay_records,
+)
+from game.replay.loader import ReplayLoadError, load_replay_from_bytes, load_replay_from_file, read_replay_file
+
+FIXTURES_DIR = Path(__file__).parent.parent / "integration" / "replays" / "fixtures"
+FULL_GAME = FIXTURES_DIR / "full_round" / "full_game.txt"
+
+
+def _lines(content: str) -> list[dict]:
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+class TestBinaryFormat:
+    @pytest.mark.parametrize("fixture", sorted(FIXTURES_DIR.rglob("*.txt")), ids=lambda p: p.name)
+    def test_round_trips_fixture_lines(self, fixture: Path) -> None:
+        content = fixture.read_text()
+
+        assert decode_replay(encode_replay(content)) == _lines(content)
+
+    def test_draw_discard_and_meld_are_single_ints(self) -> None:
+        events = [{"t": 1, "d": 300}, {"t": 2, "d": 5000}, {"t": 0, "m": 123456}]
+
+        data = encode_replay_events(events)
+        unpacker = msgpack.Unpacker()
+        unpacker.feed(data[len(BINARY_REPLAY_MAGIC) + 1 :])
+
+        assert list(unpacker) == [300 << 2, (5000 << 2) | 1, (123456 << 2) | 2]
+        assert decode_replay(data) == events
+
+    def test_events_with_extra_keys_stay_maps(self) -> None:
+        events = [{"version": "0.3-dev"}, {"t": 1, "d": 3, "aa": []}, {"t": 2, "d": -1}]
+
+        assert decode_replay(encode_replay_events(events)) == events
+
+    def test_is_smaller_than_ndjson(self) -> None:
+        content = FULL_GAME.read_text()
+
+        assert len(encode_replay(content)) < len(content.encode("utf-8")) / 3
+
+    @pytest.mark.parametrize(
+        ("data", "match"),
+        [
+            (b'{"version": "0.3-dev"}', "not a binary replay"),
+            (BINARY_REPLAY_MAGIC + b"\x09", "unsupported"),
+            (encode_replay_events([{"t": 8, "p": [1, 2]}])[:-1], "truncated"),
+            (encode_replay_events([]) + msgpack.packb(3), "invalid binary replay record"),
+            (encode_replay_events([]) + msgpack.packb("text"), "invalid binary replay record"),
+        ],
+    )
+    def test_rejects_malformed_data(self, data: bytes, match: str) -> None:
+        with pytest.raises(ValueError, match=match):
+            decode_replay(data)
+
+    def test_max_records(self) -> None:
+        data = encode_replay_events([{"t": 1, "d": 1}] * 3)
+
+        assert len(decode_replay(data, max_records=3)) == 3
+        with pytest.raises(ValueError, match="exceeds 2 records"):
+            decode_replay(data, max_records=2)
+
+    def test_appended_records_decode_as_one_replay(self) -> None:
+        events = _lines(FULL_GAME.read_text())
+
+        data = encode_replay_events(events[:5]) + encode_replay_records(events[5:])
+
+        assert decode_replay(data) == events
+
+
+class TestLoadingBothFormats:
+    def test_binary_and_text_load_the_same_replay(self) -> None:
+        content = FULL_GAME.read_text()
+
+        assert load_replay_from_bytes(encode_replay(content)) == load_replay_from_bytes(content.encode("utf-8"))
+
+    def test_load_gzip_binary_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "game.rpb.gz"
+        path.write_bytes(gzip.compress(encode_replay(FULL_GAME.read_text())))
+
+        assert load_replay_from_file(path) == load_replay_from_file(FULL_GAME)
+
+    def test_read_replay_file_converts_binary_to_ndjson(self, tmp_path: Path) -> None:
+        path = tmp_path / "game.rpb"
+        path.write_bytes(encode_replay(FULL_GAME.read_text()))
+
+        assert _lines(read_replay_file(path)) == _lines(FULL_GAME.read_text())
+
+    def test_read_replay_file_limits_binary_records(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        path = tmp_path / "game.rpb"
+        path.write_bytes(encode_replay(FULL_GAME.read_text()))
+        monkeypatch.setattr(loader, "_MAX_REPLAY_EVENTS", 10)
+
+        with pytest.raises(ReplayLoadError, match="exceeds 10 records"):
+            read_replay_file(path)
+
+    def test_malformed_binary_raises_load_error(self) -> None:
+        with pytest.raises(ReplayLoadError, match="Malformed binary replay"):
+            load_replay_from_bytes(BINARY_REPLAY_MAGIC + b"\x01\xc1")
+
+    def test_non_utf8_text_raises_load_error(self) -> None:
+        with pytest.raises(ReplayLoadError, match="neither binary nor UTF-8"):
+            load_replay_from_bytes(b"\xff\xfe")
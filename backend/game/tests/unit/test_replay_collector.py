@@ -1,4 +1,8 @@
+import gzip
 import json
+import threading
+
+import pytest
 
 from game.logic.enums import CallType, GameErrorCode, MeldViewType, WindName
 from game.logic.events import (
@@ -22,16 +26,29 @@ from game.logic.events import (
 from game.logic.rng import RNG_VERSION
 from game.logic.types import (
     AvailableActionItem,
+    DoubleRonResult,
+    DoubleRonWinner,
     ExhaustiveDrawResult,
     GamePlayerInfo,
+    HandResultInfo,
     PlayerStanding,
     PlayerView,
     TenpaiHand,
+    TsumoResult,
+    YakuInfo,
 )
 from game.messaging.compact import encode_discard, encode_draw
 from game.messaging.event_payload import EVENT_TYPE_INT, service_event_payload
+from game.replay.binary import decode_replay
 from game.replay.models import REPLAY_VERSION
 from game.session.replay_collector import ReplayCollector
+from shared.storage import (
+    LocalReplayStorage,
+    binary_replay_path,
+    read_replay_segment,
+    replay_file_path,
+    replay_index_path,
+)
 
 
 class FakeStorage:
@@ -51,6 +68,79 @@ class FailingStorage:
         raise OSError("disk full")
 
 
+class FakeStream:
+    """In-memory replay stream recording chunks and how it was finished."""
+
+    def __init__(
+        self,
+        *,
+        write_error: Exception | None = None,
+        tag_error: Exception | None = None,
+        commit_error: Exception | None = None,
+    ) -> None:
+        self.chunks: list[str] = []
+        self.segments: list[dict] = []
+        self.committed = False
+        self.aborted = False
+        self.writer_threads: set[int] = set()
+        # Cleared by tests to hold writes after the version tag until set again.
+        self.writable = threading.Event()
+        self.writable.set()
+        self._write_error = write_error
+        self._tag_error = tag_error
+        self._commit_error = commit_error
+
+    def write(self, text: str) -> None:
+        error = self._write_error if self.chunks else self._tag_error
+        if error is not None:
+            raise error
+        if self.chunks:
+            self.writable.wait()
+            self.writer_threads.add(threading.get_ident())
+        self.chunks.append(text)
+
+    def end_segment(self, meta: dict) -> None:
+        self.segments.append(meta)
+
+    def commit(self) -> None:
+        if self._commit_error is not None:
+            raise self._commit_error
+        self.committed = True
+
+    def abort(self) -> None:
+        self.aborted = True
+
+
+class FakeStreamingStorage(FakeStorage):
+    """FakeStorage that also hands out in-memory replay streams."""
+
+    def __init__(self, **stream_errors: Exception) -> None:
+        super().__init__()
+        self.streams: dict[str, FakeStream] = {}
+        self.open_threads: set[int] = set()
+        self._stream_errors = stream_errors
+
+    def open_stream(self, game_id: str) -> FakeStream:
+        self.open_threads.add(threading.get_ident())
+        stream = FakeStream(**self._stream_errors)
+        self.streams[game_id] = stream
+        return stream
+
+
+class UnopenableStreamingStorage(FakeStorage):
+    """Streaming storage whose streams cannot be opened."""
+
+    def open_stream(self, game_id: str) -> FakeStream:
+        raise OSError("no space")
+
+
+class FailingBinaryStorage(LocalReplayStorage):
+    """Local storage that cannot write binary replay copies."""
+
+    def save_binary_replay(self, game_id: str, data: bytes) -> None:
+        raise OSError("disk full")
+
+
 def _parse_saved_replay(content: str) -> list[dict]:
     """Parse saved replay content, validate version tag, return event dicts."""
     events = [json.loads(line) for line in content.strip().split("\n") if line]
@@ -148,6 +238,56 @@ def _make_round_end_event() -> ServiceEvent:
     )
 
 
+def _hand_result() -> HandResultInfo:
+    return HandResultInfo(han=1, fu=30, yaku=[YakuInfo(yaku_id=0, han=1)])
+
+
+def _make_tsumo_round_end_event(winner: int = 2) -> ServiceEvent:
+    return ServiceEvent(
+        event=EventType.ROUND_END,
+        data=RoundEndEvent(
+            target="all",
+            result=TsumoResult(
+                winner_seat=winner,
+                hand_result=_hand_result(),
+                scores={0: 24000, 1: 24000, 2: 28000, 3: 24000},
+                score_changes={0: -1000, 1: -1000, 2: 3000, 3: -1000},
+                riichi_sticks_collected=0,
+                closed_tiles=[],
+                melds=[],
+                win_tile=5,
+            ),
+        ),
+        target=BroadcastTarget(),
+    )
+
+
+def _make_double_ron_round_end_event() -> ServiceEvent:
+    return ServiceEvent(
+        event=EventType.ROUND_END,
+        data=RoundEndEvent(
+            target="all",
+            result=DoubleRonResult(
+                loser_seat=3,
+                winning_tile=5,
+                winners=[
+                    DoubleRonWinner(
+                        winner_seat=seat,
+                        hand_result=_hand_result(),
+                        riichi_sticks_collected=0,
+                        closed_tiles=[],
+                        melds=[],
+                    )
+                    for seat in (0, 1)
+                ],
+                scores={0: 26000, 1: 26000, 2: 25000, 3: 23000},
+                score_changes={0: 1000, 1: 1000, 2: 0, 3: -2000},
+            ),
+        ),
+        target=BroadcastTarget(),
+    )
+
+
 def _make_draw_event(seat: int = 0, tile_id: int = 1) -> ServiceEvent:
     """Seat-target draw event (included for replay reconstruction)."""
     return ServiceEvent(
@@ -214,6 +354,23 @@ def _make_all_round_started_events() -> list[ServiceEvent]:
     return [_make_round_started_event(seat) for seat in range(4)]
 
 
+async def _start_game(collector: ReplayCollector, game_id: str = "game1") -> None:
+    """Start collecting a game and wait until its replay stream (if any) is open."""
+    collector.start_game(game_id, seed="b" * 192, rng_version=RNG_VERSION)
+    opening = collector._stream_opens.get(game_id)
+    if opening is not None:
+        await opening
+
+
+async def _play_two_rounds(collector: ReplayCollector) -> None:
+    await _start_game(collector)
+    collector.collect_events("game1", [_make_game_started_event(), *_make_all_round_started_events()])
+    collector.collect_events("game1", [_make_draw_event(), _make_discard_event()])
+    collector.collect_events("game1", [_make_round_end_event()])
+    collector.collect_events("game1", [*_make_all_round_started_events(), _make_meld_event()])
+    collector.collect_events("game1", [_make_round_end_event(), _make_game_ended_event()])
+
+
 class TestReplayCollectorLifecycle:
     """Tests for the start -> collect -> save -> cleanup lifecycle."""
 
@@ -647,3 +804,292 @@ class TestReplayCollectorSensitiveDataGuard:
         await collector.save_and_cleanup("game1")
 
         assert "game1" not in storage.saved
+
+
+class TestReplayCollectorStreaming:
+    """Tests for streaming mode, which flushes lines to the replay stream at round boundaries."""
+
+    def test_rejects_storage_without_streams(self):
+        with pytest.raises(TypeError, match="does not support streaming"):
+            ReplayCollector(FakeStorage(), streaming=True)
+
+    async def test_streamed_file_matches_buffered_content(self, tmp_path):
+        buffered = FakeStorage()
+        buffered_collector = ReplayCollector(buffered)
+        await _play_two_rounds(buffered_collector)
+        await buffered_collector.save_and_cleanup("game1")
+
+        streaming = ReplayCollector(LocalReplayStorage(str(tmp_path)), streaming=True)
+        await _play_two_rounds(streaming)
+        await streaming.save_and_cleanup("game1")
+
+        file_path = replay_file_path(tmp_path, "game1")
+        assert gzip.decompress(file_path.read_bytes()).decode("utf-8") == buffered.saved["game1"]
+
+    async def test_lines_flushed_at_round_end(self):
+        storage = FakeStreamingStorage()
+        collector = ReplayCollector(storage, streaming=True)
+
+        await _start_game(collector)
+        collector.collect_events("game1", [_make_discard_event(), _make_meld_event()])
+        stream = storage.streams["game1"]
+        assert len(stream.chunks) == 1  # only the version tag so far
+
+        collector.collect_events("game1", [_make_round_end_event()])
+        assert await collector._stream_writes["game1"]
+        assert len(stream.chunks) == 2
+        assert stream.chunks[1].count("\n") == 3
+        assert threading.get_ident() not in stream.writer_threads
+
+        await collector.save_and_cleanup("game1")
+        assert stream.committed
+        assert "game1" not in storage.saved
+
+    async def test_cleanup_aborts_stream(self):
+        storage = FakeStreamingStorage()
+        collector = ReplayCollector(storage, streaming=True)
+
+        await _start_game(collector)
+        collector.collect_events("game1", [_make_discard_event()])
+        collector.cleanup_game("game1")
+
+        assert storage.streams["game1"].aborted
+        assert not storage.streams["game1"].committed
+
+    async def test_cleanup_waits_for_pending_write_before_aborting(self):
+        storage = FakeStreamingStorage()
+        collector = ReplayCollector(storage, streaming=True)
+        await _start_game(collector)
+        stream = storage.streams["game1"]
+        stream.writable.clear()
+        collector.collect_events("game1", [_make_discard_event(), _make_round_end_event()])
+        write = collector._stream_writes["game1"]
+
+        collector.cleanup_game("game1")
+        assert not stream.aborted
+
+        stream.writable.set()
+        await write
+        assert stream.aborted
+        assert not stream.committed
+
+    @pytest.mark.parametrize("error", [OSError("disk full"), ValueError("write to closed file")])
+    async def test_write_failure_aborts_and_drops_game(self, error):
+        storage = FakeStreamingStorage(write_error=error)
+        collector = ReplayCollector(storage, streaming=True)
+
+        await _start_game(collector)
+        collector.collect_events("game1", [_make_discard_event(), _make_round_end_event()])
+        collector.collect_events("game1", [_make_discard_event()])
+        await collector.save_and_cleanup("game1")
+
+        stream = storage.streams["game1"]
+        assert stream.aborted
+        assert not stream.committed
+        assert "game1" not in storage.saved
+
+    async def test_write_failure_stops_collecting_the_game(self):
+        storage = FakeStreamingStorage(write_error=OSError("disk full"))
+        collector = ReplayCollector(storage, streaming=True)
+        await _start_game(collector)
+        collector.collect_events("game1", [_make_discard_event(), _make_round_end_event()])
+
+        assert not await collector._stream_writes["game1"]
+        collector.collect_events("game1", [_make_discard_event()])
+        await collector.save_and_cleanup("game1")
+
+        assert storage.streams["game1"].aborted
+        assert "game1" not in storage.saved
+
+    async def test_stream_is_opened_off_the_event_loop(self):
+        storage = FakeStreamingStorage()
+        collector = ReplayCollector(storage, streaming=True)
+
+        collector.start_game("game1", seed="b" * 192, rng_version=RNG_VERSION)
+        assert "game1" not in storage.streams
+        await collector._stream_opens["game1"]
+
+        assert storage.streams["game1"].chunks == [json.dumps({"version": REPLAY_VERSION})]
+        assert threading.get_ident() not in storage.open_threads
+
+    async def test_lines_stay_buffered_until_the_stream_is_open(self):
+        storage = FakeStreamingStorage()
+        collector = ReplayCollector(storage, streaming=True)
+
+        collector.start_game("game1", seed="b" * 192, rng_version=RNG_VERSION)
+        collector.collect_events("game1", [_make_discard_event(), _make_round_end_event()])
+        assert "game1" not in collector._stream_writes
+        await collector.save_and_cleanup("game1")
+
+        stream = storage.streams["game1"]
+        assert stream.committed
+        assert "".join(stream.chunks).count("\n") == 2
+
+    async def test_stream_opened_after_cleanup_is_aborted(self):
+        storage = FakeStreamingStorage()
+        collector = ReplayCollector(storage, streaming=True)
+        collector.start_game("game1", seed="b" * 192, rng_version=RNG_VERSION)
+        opening = collector._stream_opens["game1"]
+
+        collector.cleanup_game("game1")
+        await opening
+
+        assert storage.streams["game1"].aborted
+        assert "game1" not in collector._streams
+
+    async def test_version_tag_failure_aborts_stream_and_buffers(self):
+        storage = FakeStreamingStorage(tag_error=OSError("disk full"))
+        collector = ReplayCollector(storage, streaming=True)
+
+        await _start_game(collector)
+        collector.collect_events("game1", [_make_discard_event(), _make_round_end_event()])
+
+        assert storage.streams["game1"].aborted
+        assert "game1" not in collector._streams
+        assert "game1" not in collector._stream_writes
+        assert collector._buffers["game1"]
+        collector.cleanup_game("game1")
+
+    async def test_commit_failure_is_logged_not_raised(self):
+        storage = FakeStreamingStorage(commit_error=OSError("disk full"))
+        collector = ReplayCollector(storage, streaming=True)
+
+        await _play_two_rounds(collector)
+        await collector.save_and_cleanup("game1")
+
+        assert not storage.streams["game1"].committed
+        assert "game1" not in storage.saved
+
+    async def test_falls_back_to_buffer_when_stream_cannot_open(self):
+        storage = UnopenableStreamingStorage()
+        collector = ReplayCollector(storage, streaming=True)
+
+        await _start_game(collector)
+        collector.collect_events("game1", [_make_discard_event(), _make_round_end_event()])
+        await collector.save_and_cleanup("game1")
+
+        lines = _parse_saved_replay(storage.saved["game1"])
+        assert len(lines) == 2
+
+
+class TestReplayCollectorBinary:
+    """Tests for binary mode, which also writes each replay in the binary record format."""
+
+    def test_rejects_storage_without_binary_replays(self):
+        with pytest.raises(TypeError, match="does not support binary"):
+            ReplayCollector(FakeStorage(), binary=True)
+
+    @pytest.mark.parametrize("streaming", [False, True], ids=["buffered", "streaming"])
+    async def test_binary_copy_decodes_to_ndjson_lines(self, tmp_path, streaming):
+        collector = ReplayCollector(LocalReplayStorage(str(tmp_path)), streaming=streaming, binary=True)
+        await _play_two_rounds(collector)
+        await collector.save_and_cleanup("game1")
+
+        text = gzip.decompress(replay_file_path(tmp_path, "game1").read_bytes()).decode("utf-8")
+        binary = gzip.decompress(binary_replay_path(tmp_path, "game1").read_bytes())
+        assert decode_replay(binary) == [json.loads(line) for line in text.split("\n")]
+
+    async def test_no_binary_copy_without_binary_mode(self, tmp_path):
+        collector = ReplayCollector(LocalReplayStorage(str(tmp_path)), streaming=True)
+        await _play_two_rounds(collector)
+        await collector.save_and_cleanup("game1")
+
+        assert replay_file_path(tmp_path, "game1").exists()
+        assert not binary_replay_path(tmp_path, "game1").exists()
+
+    async def test_binary_save_failure_keeps_ndjson_replay(self, tmp_path):
+        collector = ReplayCollector(FailingBinaryStorage(str(tmp_path)), streaming=True, binary=True)
+
+        await _play_two_rounds(collector)
+        await collector.save_and_cleanup("game1")
+
+        assert replay_file_path(tmp_path, "game1").exists()
+        assert not binary_replay_path(tmp_path, "game1").exists()
+
+    async def test_abandoned_game_writes_no_binary_copy(self, tmp_path):
+        collector = ReplayCollector(LocalReplayStorage(str(tmp_path)), streaming=True, binary=True)
+        await _start_game(collector)
+        collector.collect_events("game1", [_make_discard_event(), _make_round_end_event()])
+        collector.cleanup_game("game1")
+        await collector.save_and_cleanup("game1")
+
+        assert not binary_replay_path(tmp_path, "game1").exists()
+
+
+class TestReplayCollectorSegments:
+    """Tests for the per-round segment index written through replay streams."""
+
+    async def test_streamed_segments_close_header_and_rounds(self):
+        storage = FakeStreamingStorage()
+        collector = ReplayCollector(storage, streaming=True)
+
+        await _play_two_rounds(collector)
+        await collector.save_and_cleanup("game1")
+
+        segments = storage.streams["game1"].segments
+        assert [meta["kind"] for meta in segments] == ["header", "round", "round"]
+        assert segments[1] == {
+            "kind": "round",
+            "wind": 0,
+            "round_number": 1,
+            "dealer": 0,
+            "honba": 0,
+            "riichi_sticks": 0,
+            "scores": dict.fromkeys(("0", "1", "2", "3"), 250),
+            "result": 3,
+            "winners": [],
+            "loser": None,
+            "score_changes": {"0": 30, "1": -10, "2": -10, "3": -10},
+        }
+
+    async def test_round_summaries_list_tsumo_and_double_ron_winners(self):
+        storage = FakeStreamingStorage()
+        collector = ReplayCollector(storage, streaming=True)
+
+        await _start_game(collector)
+        collector.collect_events("game1", [_make_game_started_event(), *_make_all_round_started_events()])
+        collector.collect_events("game1", [_make_draw_event(), _make_tsumo_round_end_event(winner=2)])
+        collector.collect_events("game1", [*_make_all_round_started_events(), _make_double_ron_round_end_event()])
+        await collector.save_and_cleanup("game1")
+
+        _header, tsumo, double_ron = storage.streams["game1"].segments
+        assert (tsumo["winners"], tsumo["loser"]) == ([2], None)
+        assert tsumo["score_changes"] == {"0": -10, "1": -10, "2": 30, "3": -10}
+        assert (double_ron["winners"], double_ron["loser"]) == ([0, 1], 3)
+
+    async def test_buffered_game_is_saved_with_index(self, tmp_path):
+        collector = ReplayCollector(LocalReplayStorage(str(tmp_path)))
+
+        await _play_two_rounds(collector)
+        await collector.save_and_cleanup("game1")
+
+        lines = gzip.decompress(replay_file_path(tmp_path, "game1").read_bytes()).decode("utf-8").split("\n")
+        index = json.loads(replay_index_path(tmp_path, "game1").read_text())
+        header, first_round, second_round = index["segments"]
+        with replay_file_path(tmp_path, "game1").open("rb") as replay:
+            assert read_replay_segment(replay, header) == "\n".join(lines[:2])
+            assert read_replay_segment(replay, first_round) == "\n" + "\n".join(lines[2:6])
+            assert read_replay_segment(replay, second_round) == "\n" + "\n".join(lines[6:9])
+        assert json.loads(lines[-1])["t"] == EVENT_TYPE_INT[EventType.GAME_END]
+
+    async def test_buffered_save_aborts_stream_on_write_failure(self):
+        storage = FakeStreamingStorage(write_error=OSError("disk full"))
+        collector = ReplayCollector(storage)
+
+        collector.start_game("game1", seed="b" * 192, rng_version=RNG_VERSION)
+        collector.collect_events("game1", [_make_discard_event(), _make_round_end_event()])
+        await collector.save_and_cleanup("game1")
+
+        assert storage.streams["game1"].aborted
+        assert not storage.streams["game1"].committed
+        assert "game1" not in storage.saved
+
+    async def test_buffered_save_falls_back_when_stream_cannot_open(self):
+        storage = UnopenableStreamingStorage()
+        collector = ReplayCollector(storage)
+
+        collector.start_game("game1", seed="b" * 192, rng_version=RNG_VERSION)
+        collector.collect_events("game1", [_make_discard_event(), _make_round_end_event()])
+        await collector.save_and_cleanup("game1")
+
+        assert len(_parse_saved_replay(storage.saved["game1"])) == 2
@@ -20,10 +20,12 @@ from game.replay.loader import (
     ReplayLoadError,
     load_replay_from_file,
     load_replay_from_string,
+    read_packed_replay_file,
 )
 from game.replay.models import REPLAY_VERSION
 from game.wire.enums import WireRoundResultType
 from shared.lib.melds import MeldData, encode_meld_compact
+from shared.replay_packs import PackedReplay
 
 # Hex seed that produces identity seat assignment: Alice->0, Bob->1, Charlie->2, Diana->3
 _TEST_SEED = "0" * 191 + "6"
@@ -460,6 +462,26 @@ def test_load_replay_from_corrupted_gzip_file(tmp_path: Path):
         load_replay_from_file(file_path)
 
 
+def test_read_packed_replay_file(tmp_path: Path):
+    """Packed replays are read through their pack index entry."""
+    pack = tmp_path / "pack-2026-01.pack"
+    data = gzip.compress(b'{"version":"0.3-dev"}\n')
+    pack.write_bytes(b"earlier replay" + data)
+    packed = PackedReplay(game_id="g1", pack=pack, offset=14, length=len(data), mtime_ns=0)
+
+    assert read_packed_replay_file(packed) == '{"version":"0.3-dev"}\n'
+
+
+def test_read_packed_replay_file_corrupted(tmp_path: Path):
+    """ReplayLoadError when the packed bytes are not gzip data."""
+    pack = tmp_path / "pack-2026-01.pack"
+    pack.write_bytes(b"not valid gzip data at all")
+    packed = PackedReplay(game_id="g1", pack=pack, offset=0, length=10, mtime_ns=0)
+
+    with pytest.raises(ReplayLoadError, match="Cannot read packed replay"):
+        read_packed_replay_file(packed)
+
+
 def test_error_missing_players():
     """ReplayLoadError when game_started missing p."""
     no_players = json.dumps(
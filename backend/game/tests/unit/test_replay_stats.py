@@ -0,0 +1,359 @@
+"""Tests for replay statistics aggregation: per-replay summaries and incremental folding."""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from game.logic.events import EventType
+from game.messaging.compact import encode_discard
+from game.messaging.event_payload import EVENT_TYPE_INT
+from game.replay.loader import ReplayLoadError
+from game.replay.models import REPLAY_VERSION
+from game.replay.stats import (
+    AggregationReport,
+    _summarize_in_worker,
+    aggregate_replays,
+    load_player_stats,
+    main,
+    summarize_replay,
+    summarize_replay_file,
+)
+from game.wire.enums import WireRoundResultType
+from shared.db import Database
+from shared.replay_packs import compact_replays, find_packed_replay
+from shared.storage import LocalReplayStorage, replay_file_path
+
+FIXTURE = Path(__file__).parent.parent / "integration" / "replays" / "fixtures" / "full_round" / "full_game.txt"
+
+NAMES = ("Alice", "Bob", "Charlie", "Diana")
+
+
+def _game_started(names: tuple[str, ...] = NAMES) -> dict:
+    return {
+        "t": EVENT_TYPE_INT[EventType.GAME_STARTED],
+        "gid": "g",
+        "p": [{"s": seat, "nm": name, "ai": 0} for seat, name in enumerate(names)],
+    }
+
+
+def _round_started() -> dict:
+    return {"t": EVENT_TYPE_INT[EventType.ROUND_STARTED]}
+
+
+def _discard(seat: int, tile_id: int, *, is_riichi: bool = False) -> dict:
+    return {
+        "t": EVENT_TYPE_INT[EventType.DISCARD],
+        "d": encode_discard(seat, tile_id, is_tsumogiri=False, is_riichi=is_riichi),
+    }
+
+
+def _hand(*yaku_ids: int) -> dict:
+    return {"han": len(yaku_ids), "fu": 30, "yk": [{"yi": yaku_id, "han": 1} for yaku_id in yaku_ids]}
+
+
+def _tsumo(winner: int, *yaku_ids: int) -> dict:
+    return {
+        "t": EVENT_TYPE_INT[EventType.ROUND_END],
+        "rt": WireRoundResultType.TSUMO,
+        "ws": winner,
+        "hr": _hand(*yaku_ids),
+    }
+
+
+def _ron(winner: int, loser: int, *yaku_ids: int) -> dict:
+    return {
+        "t": EVENT_TYPE_INT[EventType.ROUND_END],
+        "rt": WireRoundResultType.RON,
+        "ws": winner,
+        "ls": loser,
+        "hr": _hand(*yaku_ids),
+    }
+
+
+def _double_ron(winners: dict[int, tuple[int, ...]], loser: int) -> dict:
+    return {
+        "t": EVENT_TYPE_INT[EventType.ROUND_END],
+        "rt": WireRoundResultType.DOUBLE_RON,
+        "ls": loser,
+        "wn": [{"ws": seat, "hr": _hand(*yaku_ids)} for seat, yaku_ids in winners.items()],
+    }
+
+
+def _exhaustive_draw() -> dict:
+    return {"t": EVENT_TYPE_INT[EventType.ROUND_END], "rt": WireRoundResultType.EXHAUSTIVE_DRAW}
+
+
+def _game_end(*placement_seats: int) -> dict:
+    return {
+        "t": EVENT_TYPE_INT[EventType.GAME_END],
+        "ws": placement_seats[0],
+        "st": [{"s": seat, "sc": 250, "fs": 0} for seat in placement_seats],
+    }
+
+
+def _replay(*events: dict) -> str:
+    return "\n".join(json.dumps(line) for line in ({"version": REPLAY_VERSION}, *events)) + "\n"
+
+
+SAMPLE = _replay(
+    _game_started(),
+    _round_started(),
+    _discard(1, 10, is_riichi=True),
+    _ron(0, 1, 1, 7),
+    _round_started(),
+    _discard(2, 20, is_riichi=True),
+    _discard(3, 30),
+    _tsumo(2, 1, 2),
+    _round_started(),
+    _double_ron({0: (7,), 3: (12,)}, loser=2),
+    _round_started(),
+    _exhaustive_draw(),
+    _game_end(0, 2, 3, 1),
+)
+
+
+class TestSummarizeReplay:
+    def test_counts_rounds_wins_deal_ins_riichi_and_yaku(self) -> None:
+        summary = summarize_replay("game-1", SAMPLE)
+
+        alice, bob, charlie, diana = summary.seats
+        assert [seat.name for seat in summary.seats] == list(NAMES)
+        assert all(seat.rounds == 4 for seat in summary.seats)
+        assert (alice.wins, bob.wins, charlie.wins, diana.wins) == (2, 0, 1, 1)
+        assert (alice.deal_ins, bob.deal_ins, charlie.deal_ins, diana.deal_ins) == (0, 1, 1, 0)
+        assert (alice.riichis, bob.riichis, charlie.riichis, diana.riichis) == (0, 1, 1, 0)
+        assert (alice.placement, bob.placement, charlie.placement, diana.placement) == (1, 4, 2, 3)
+        assert alice.yaku == {1: 1, 7: 2}
+        assert charlie.yaku == {1: 1, 2: 1}
+
+    def test_unfinished_game_has_no_placements(self) -> None:
+        summary = summarize_replay("game-1", _replay(_game_started(), _round_started()))
+
+        assert all(seat.placement is None for seat in summary.seats)
+        assert all(seat.rounds == 1 for seat in summary.seats)
+
+    def test_game_started_without_every_seat_raises(self) -> None:
+        with pytest.raises(ReplayLoadError, match="must list seats"):
+            summarize_replay("game-1", _replay(_game_started(NAMES[:3])))
+
+    def test_missing_game_started_raises(self) -> None:
+        with pytest.raises(ReplayLoadError, match="no game_started"):
+            summarize_replay("game-1", _replay(_round_started()))
+
+    def test_malformed_line_raises(self) -> None:
+        with pytest.raises(ReplayLoadError, match="Malformed replay game-1"):
+            summarize_replay("game-1", "\n".join([*SAMPLE.splitlines()[:3], "{not json"]))
+
+    def test_fixture_replay(self) -> None:
+        content = FIXTURE.read_text()
+        round_count = sum(
+            1 for line in content.splitlines() if json.loads(line).get("t") == EVENT_TYPE_INT[EventType.ROUND_STARTED]
+        )
+
+        summary = summarize_replay("fixture-fg", content)
+
+        assert all(seat.rounds == round_count for seat in summary.seats)
+        assert sorted(seat.placement for seat in summary.seats) == [1, 2, 3, 4]
+
+    def test_unreadable_file_raises(self, tmp_path: Path) -> None:
+        path = tmp_path / "game-1.txt.gz"
+        path.write_bytes(b"not gzip")
+
+        with pytest.raises(ReplayLoadError, match="Cannot read replay file"):
+            summarize_replay_file(path)
+
+    def test_worker_returns_summary_or_error_message(self, tmp_path: Path) -> None:
+        storage = LocalReplayStorage(str(tmp_path))
+        storage.save_replay("aaaa0001", SAMPLE)
+        storage.save_replay("aaaa0002", "not a replay")
+
+        summary = _summarize_in_worker(replay_file_path(tmp_path, "aaaa0001"))
+        error = _summarize_in_worker(replay_file_path(tmp_path, "aaaa0002"))
+
+        assert not isinstance(summary, str)
+        assert summary.game_id == "aaaa0001"
+        assert isinstance(error, str)
+        assert "aaaa0002" in error
+
+    def test_worker_reads_packed_replay(self, tmp_path: Path) -> None:
+        LocalReplayStorage(str(tmp_path)).save_replay("aaaa0001", SAMPLE)
+        compact_replays(tmp_path, older_than_days=0, now=time.time() + 60)
+        packed = find_packed_replay(tmp_path, "aaaa0001")
+        assert packed is not None
+
+        summary = _summarize_in_worker(packed)
+
+        assert not isinstance(summary, str)
+        assert [seat.name for seat in summary.seats] == list(NAMES)
+
+
+def test_report_throughput() -> None:
+    assert AggregationReport(scanned=4, processed=4, skipped=0, failed=0, elapsed=2.0).throughput == 2.0
+    assert AggregationReport(scanned=0, processed=0, skipped=0, failed=0, elapsed=0.0).throughput == 0.0
+
+
+class TestAggregateReplays:
+    @pytest.fixture
+    def db(self, tmp_path: Path):
+        database = Database(tmp_path / "stats.db")
+        database.connect()
+        yield database
+        database.close()
+
+    @pytest.fixture
+    def storage(self, tmp_path: Path) -> LocalReplayStorage:
+        return LocalReplayStorage(str(tmp_path / "replays"))
+
+    def test_folds_replays_into_player_stats(self, db: Database, storage: LocalReplayStorage, tmp_path: Path) -> None:
+        storage.save_replay("aaaa0001", SAMPLE)
+        storage.save_replay("bbbb0002", SAMPLE)
+
+        report = aggregate_replays(tmp_path / "replays", db.connection, workers=2)
+
+        assert (report.scanned, report.processed, report.skipped, report.failed) == (2, 2, 0, 0)
+        stats = {s.player_name: s for s in load_player_stats(db.connection)}
+        alice = stats["Alice"]
+        assert (alice.games, alice.completed_games, alice.rounds, alice.wins) == (2, 2, 8, 4)
+        assert alice.win_rate == pytest.approx(0.5)
+        assert alice.average_placement == pytest.approx(1.0)
+        assert alice.yaku == {7: 4, 1: 2}
+        assert stats["Bob"].deal_in_rate == pytest.approx(0.25)
+        assert stats["Bob"].riichi_rate == pytest.approx(0.25)
+        assert stats["Bob"].average_placement == pytest.approx(4.0)
+
+    def test_rerun_only_processes_new_replays(self, db: Database, storage: LocalReplayStorage, tmp_path: Path) -> None:
+        storage.save_replay("aaaa0001", SAMPLE)
+        aggregate_replays(tmp_path / "replays", db.connection, workers=1)
+
+        again = aggregate_replays(tmp_path / "replays", db.connection, workers=1)
+        storage.save_replay("aaaa0003", SAMPLE)
+        storage.save_replay("cccc0004", SAMPLE)
+        after_new = aggregate_replays(tmp_path / "replays", db.connection, workers=1)
+
+        assert again.processed == 0
+        assert after_new.processed == 2
+        assert {s.player_name: s.games for s in load_player_stats(db.connection)} == dict.fromkeys(NAMES, 3)
+
+    def test_unchanged_shard_directories_are_not_listed(
+        self,
+        db: Database,
+        storage: LocalReplayStorage,
+        tmp_path: Path,
+    ) -> None:
+        storage.save_replay("aaaa0001", SAMPLE)
+        aggregate_replays(tmp_path / "replays", db.connection, workers=1)
+        old_dir = tmp_path / "replays" / "aa" / "aa"
+        old_dir_mtime = old_dir.stat().st_mtime_ns - 60 * 10**9
+        os.utime(old_dir, ns=(old_dir_mtime, old_dir_mtime))
+        storage.save_replay("cccc0004", SAMPLE)
+
+        report = aggregate_replays(tmp_path / "replays", db.connection, workers=1)
+
+        assert (report.scanned, report.processed) == (1, 1)
+
+    def test_replay_added_to_a_listed_directory_is_picked_up_next_run(
+        self,
+        db: Database,
+        storage: LocalReplayStorage,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        storage.save_replay("aaaa0001", SAMPLE)
+        storage.save_replay("bbbb0001", SAMPLE)
+        listed_dir = tmp_path / "replays" / "aa" / "aa"
+        later_dir = tmp_path / "replays" / "bb" / "bb"
+        real_scandir = os.scandir
+        raced = []
+
+        def scandir(path: str | Path) -> list[os.DirEntry[str]]:
+            entries = list(real_scandir(path))
+            if Path(path) == listed_dir and not raced:
+                # A replay lands in the directory just listed, then a later
+                # directory is touched before the scan reaches it.
+                raced.append(path)
+                storage.save_replay("aaaa0002", SAMPLE)
+                future = time.time_ns() + 60 * 10**9
+                os.utime(later_dir, ns=(future, future))
+            return entries
+
+        monkeypatch.setattr(os, "scandir", scandir)
+        first = aggregate_replays(tmp_path / "replays", db.connection, workers=1)
+        monkeypatch.undo()
+        second = aggregate_replays(tmp_path / "replays", db.connection, workers=1)
+
+        assert first.processed == 2
+        assert second.processed == 1
+        assert {s.player_name: s.games for s in load_player_stats(db.connection)} == dict.fromkeys(NAMES, 3)
+
+    def test_unreadable_replay_is_counted_once(
+        self,
+        db: Database,
+        storage: LocalReplayStorage,
+        tmp_path: Path,
+    ) -> None:
+        storage.save_replay("aaaa0001", SAMPLE)
+        storage.save_replay("aaaa0002", "not a replay")
+
+        first = aggregate_replays(tmp_path / "replays", db.connection, workers=1)
+        second = aggregate_replays(tmp_path / "replays", db.connection, workers=1)
+
+        assert (first.processed, first.failed) == (1, 1)
+        assert (second.processed, second.failed, second.skipped) == (0, 0, 2)
+
+    def test_packed_replays_are_folded(self, db: Database, storage: LocalReplayStorage, tmp_path: Path) -> None:
+        replay_dir = tmp_path / "replays"
+        storage.save_replay("aaaa0001", SAMPLE)
+        storage.save_replay("aaaa0002", SAMPLE)
+        aggregate_replays(replay_dir, db.connection, workers=1)
+        storage.save_replay("aaaa0003", SAMPLE)
+        compact_replays(replay_dir, older_than_days=0, now=time.time() + 60)
+        storage.save_replay("aaaa0004", SAMPLE)
+
+        report = aggregate_replays(replay_dir, db.connection, workers=1)
+
+        assert not replay_file_path(replay_dir, "aaaa0003").exists()
+        assert (report.scanned, report.processed, report.skipped) == (4, 2, 2)
+        assert {s.player_name: s.games for s in load_player_stats(db.connection)} == dict.fromkeys(NAMES, 4)
+
+    def test_replay_both_loose_and_packed_is_folded_once(
+        self,
+        db: Database,
+        storage: LocalReplayStorage,
+        tmp_path: Path,
+    ) -> None:
+        replay_dir = tmp_path / "replays"
+        storage.save_replay("aaaa0001", SAMPLE)
+        compact_replays(replay_dir, older_than_days=0, now=time.time() + 60)
+        # As if packing crashed after indexing the replay but before deleting it.
+        storage.save_replay("aaaa0001", SAMPLE)
+
+        report = aggregate_replays(replay_dir, db.connection, workers=1)
+
+        assert (report.scanned, report.processed) == (1, 1)
+        assert {s.player_name: s.games for s in load_player_stats(db.connection)} == dict.fromkeys(NAMES, 1)
+
+    def test_missing_replay_dir_is_empty(self, db: Database, tmp_path: Path) -> None:
+        report = aggregate_replays(tmp_path / "missing", db.connection)
+
+        assert (report.scanned, report.processed) == (0, 0)
+        assert load_player_stats(db.connection) == []
+
+
+def test_main_aggregates_and_logs_top_players(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    LocalReplayStorage(str(tmp_path / "replays")).save_replay("aaaa0001", SAMPLE)
+    db_path = tmp_path / "stats.db"
+    argv = ["stats", "--replay-dir", str(tmp_path / "replays"), "--db", str(db_path), "--workers", "1", "--top", "2"]
+    monkeypatch.setattr(sys, "argv", argv)
+
+    main()
+
+    database = Database(db_path)
+    database.connect()
+    try:
+        assert {s.player_name: s.games for s in load_player_stats(database.connection)} == dict.fromkeys(NAMES, 1)
+    finally:
+        database.close()
@@ -5,6 +5,8 @@ Covers PCG64DXSM determinism, Fisher-Yates correctness, seed generation,
 validation, bounded sampling, and reference vector regression tests.
 """
 
+import hashlib
+
 import pytest
 
 from game.logic.rng import (
@@ -64,6 +66,13 @@ class TestPCG64DXSM:
         for _ in range(100):
             assert pcg1.next_uint64() == pcg2.next_uint64()
 
+    def test_batch_matches_single_draws(self):
+        """next_uint64_batch yields the same stream and leaves the same state as single draws."""
+        batched = PCG64DXSM(state=42, increment=17)
+        single = PCG64DXSM(state=42, increment=17)
+        assert batched.next_uint64_batch(200) == [single.next_uint64() for _ in range(200)]
+        assert batched.next_uint64() == single.next_uint64()
+
     def test_reference_vector(self):
         """Fixed state+increment yields exact expected outputs (regression guard).
 
@@ -152,6 +161,24 @@ class TestBoundedUint64:
         assert 0 <= result < (1 << 64)
 
 
+class _ScriptedPCG(PCG64DXSM):
+    """PCG whose stream inserts a rejected (out of range) value before the given shuffle steps."""
+
+    def __init__(self, rejected_steps: tuple[int, ...], n: int) -> None:
+        super().__init__(state=1, increment=2)
+        self._values = []
+        for step in range(n - 1):
+            if step in rejected_steps:
+                self._values.append((1 << 64) - 1)
+            self._values.append(step * 7919)
+
+    def next_uint64(self) -> int:
+        return self._values.pop(0) if self._values else super().next_uint64()
+
+    def next_uint64_batch(self, count: int) -> list[int]:
+        return [self.next_uint64() for _ in range(count)]
+
+
 class TestFisherYatesShuffle:
     def test_permutation_invariants(self):
         """Every shuffle is a valid permutation (no duplicates, no missing tiles)."""
@@ -167,6 +194,22 @@ class TestFisherYatesShuffle:
         pcg2 = PCG64DXSM(state=555, increment=777)
         assert _fisher_yates_shuffle(tiles, pcg1) == _fisher_yates_shuffle(tiles, pcg2)
 
+    @pytest.mark.parametrize("rejected_steps", [(), (0,), (3, 4), (7,)])
+    def test_matches_per_draw_shuffle_with_rejections(self, rejected_steps):
+        """Batched draws consume the stream exactly like per-draw rejection sampling."""
+        tiles = list(range(10))
+        scripted = _ScriptedPCG(rejected_steps, len(tiles))
+        reference = _ScriptedPCG(rejected_steps, len(tiles))
+
+        expected = list(tiles)
+        for i in range(len(tiles) - 1):
+            j = i + _bounded_uint64(reference, len(tiles) - i)
+            expected[i], expected[j] = expected[j], expected[i]
+
+        assert _fisher_yates_shuffle(tiles, scripted) == expected
+        # both leave the generator at the same stream position
+        assert scripted.next_uint64() == reference.next_uint64()
+
 
 class TestCreateSeatRng:
     def test_deterministic(self):
@@ -257,3 +300,63 @@ class TestDetermineFirstDealer:
         temp_dealer = (sum(first_dice) - 1) % 4
         expected_dealer = (temp_dealer + sum(second_dice) - 1) % 4
         assert dealer == expected_dealer
+
+
+class TestGoldenWalls:
+    """
+    Golden walls recorded under RNG_VERSION "pcg64dxsm-v1".
+
+    Replays store only the seed, so any change to the derivation, generator
+    or shuffle that alters these values breaks reproduction of old games.
+    """
+
+    @pytest.mark.parametrize(
+        ("seed", "round_number", "wall_digest", "dice"),
+        [
+            (FIXED_SEED, 0, "64fb9f496690162f954421872963096a", (1, 3)),
+            (FIXED_SEED, 1, "7b311478793163518d31b7f324f1baaf", (1, 6)),
+            (FIXED_SEED, 7, "d65baa1e3ebc3ad5c86154d5ada177fa", (1, 2)),
+            (FIXED_SEED, 2**32 - 1, "4b52cc1637f672e20e04e37bed3bd6f0", (3, 1)),
+            ("00" * SEED_BYTES, 0, "e138290c41c13afee16323bcf8590a14", (1, 1)),
+            ("00" * SEED_BYTES, 1, "1643e8acd3a8fca9dee650f017af488e", (4, 3)),
+            ("00" * SEED_BYTES, 7, "80b2d45ddc5c28ee1316c1bc336d8220", (2, 5)),
+            ("00" * SEED_BYTES, 2**32 - 1, "0cb4ed00392184aa20cb86b5776685c5", (2, 1)),
+            ("ff" * SEED_BYTES, 0, "89ce3be78b48462fa9738a152fdca690", (1, 3)),
+            ("ff" * SEED_BYTES, 1, "3504901da286dae4ee14c1395e1bf3b0", (1, 3)),
+            ("ff" * SEED_BYTES, 7, "5ec615885ec9055c324b959283501cca", (5, 6)),
+            ("ff" * SEED_BYTES, 2**32 - 1, "e3082a8e0e0a21c3523680b75f074a75", (6, 4)),
+            (bytes(range(SEED_BYTES)).hex(), 0, "c8a52b720289f69365b4f4b05535fa93", (6, 4)),
+            (bytes(range(SEED_BYTES)).hex(), 1, "04126a512400b61f8879016ef62c07b3", (5, 4)),
+            (bytes(range(SEED_BYTES)).hex(), 7, "1b16dff38506aa599a8a8034733997c0", (6, 5)),
+            (bytes(range(SEED_BYTES)).hex(), 2**32 - 1, "542a74bf3723e601ba3573f18a4343d1", (3, 5)),
+        ],
+    )
+    def test_wall_and_dice_match_golden(self, seed, round_number, wall_digest, dice):
+        wall, rolled = generate_shuffled_wall_and_dice(seed, round_number)
+        assert hashlib.sha256(bytes(wall)).hexdigest()[:32] == wall_digest
+        assert rolled == dice
+
+    def test_full_wall_matches_golden(self):
+        wall, dice = generate_shuffled_wall_and_dice(FIXED_SEED, 0)
+        assert wall == [
+            67, 33, 110, 28, 68, 36, 129, 13, 29, 87, 48, 71, 10, 125, 23, 93, 26, 7, 130, 17,
+            56, 35, 50, 54, 109, 70, 55, 89, 45, 134, 119, 69, 120, 3, 127, 111, 101, 44, 42, 126,
+            65, 94, 104, 1, 97, 73, 115, 76, 112, 32, 100, 46, 96, 38, 99, 75, 43, 106, 60, 21,
+            81, 135, 19, 2, 20, 116, 95, 64, 102, 16, 103, 63, 22, 122, 61, 83, 0, 62, 85, 78,
+            9, 41, 91, 59, 113, 117, 114, 14, 37, 30, 84, 8, 51, 128, 80, 92, 53, 74, 88, 72,
+            6, 11, 123, 132, 131, 58, 82, 40, 18, 15, 107, 124, 86, 121, 39, 98, 25, 34, 5, 57,
+            105, 49, 31, 24, 108, 27, 4, 133, 12, 47, 77, 52, 90, 66, 79, 118,
+        ]  # fmt: skip
+        assert dice == (1, 3)
+
+    @pytest.mark.parametrize(
+        ("seed", "expected"),
+        [
+            (FIXED_SEED, (1, (2, 1), (3, 1))),
+            ("00" * SEED_BYTES, (3, (2, 3), (4, 4))),
+            ("ff" * SEED_BYTES, (0, (5, 4), (3, 2))),
+            (bytes(range(SEED_BYTES)).hex(), (2, (4, 2), (5, 5))),
+        ],
+    )
+    def test_first_dealer_matches_golden(self, seed, expected):
+        assert determine_first_dealer(seed) == expected
@@ -1,6 +1,8 @@
 import pytest
 from pydantic import ValidationError
 
+from game.logic.enums import StateEngine
+from game.server.send_queue import SendQueueOverflow
 from game.server.settings import GameServerSettings
 
 
@@ -38,3 +40,36 @@ class TestGameServerSettings:
         monkeypatch.setenv("AUTH_DATABASE_PATH", "custom/auth.db")
         settings = GameServerSettings()
         assert settings.database_path == "custom/auth.db"
+
+    def test_state_engine_defaults_to_frozen(self):
+        assert GameServerSettings().state_engine == StateEngine.FROZEN
+
+    def test_state_engine_from_env(self, monkeypatch):
+        monkeypatch.setenv("GAME_STATE_ENGINE", "mutable")
+        assert GameServerSettings().state_engine == StateEngine.MUTABLE
+
+    def test_send_queue_from_env(self, monkeypatch):
+        monkeypatch.setenv("GAME_SEND_QUEUE_SIZE", "8")
+        monkeypatch.setenv("GAME_SEND_QUEUE_OVERFLOW", "block")
+        settings = GameServerSettings()
+        assert settings.send_queue_size == 8
+        assert settings.send_queue_overflow == SendQueueOverflow.BLOCK
+
+    def test_replay_streaming_from_env(self, monkeypatch):
+        monkeypatch.setenv("GAME_REPLAY_STREAMING", "true")
+        assert GameServerSettings().replay_streaming is True
+
+    def test_replay_binary_from_env(self, monkeypatch):
+        monkeypatch.setenv("GAME_REPLAY_BINARY", "true")
+        assert GameServerSettings().replay_binary is True
+
+    def test_record_flush_from_env(self, monkeypatch):
+        monkeypatch.setenv("GAME_RECORD_FLUSH_MS", "200")
+        monkeypatch.setenv("GAME_RECORD_FLUSH_BATCH", "10")
+        settings = GameServerSettings()
+        assert settings.record_flush_ms == 200
+        assert settings.record_flush_batch == 10
+
+    def test_send_queue_size_zero_rejected(self):
+        with pytest.raises(ValidationError, match="send_queue_size"):
+            GameServerSettings(send_queue_size=0)
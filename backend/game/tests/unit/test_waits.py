@@ -0,0 +1,246 @@
+"""
+Equivalence tests for the precomputed wait tables.
+
+The reference implementations below are the Agari-loop versions that
+get_waiting_tiles and the karaten wait check used before the table engine.
+Randomized hands (tenpai shapes, near-tenpai noise, chiitoitsu, kokushi,
+open and closed kans) are checked against them with fixed seeds.
+"""
+
+import random
+
+import pytest
+from mahjong.agari import Agari
+from mahjong.tile import TilesConverter
+
+from game.logic.meld_wrapper import FrozenMeld
+from game.logic.round import is_tempai
+from game.logic.shanten import calculate_shanten
+from game.logic.tiles import NUM_TILE_TYPES, hand_to_34_array, tile_to_34
+from game.logic.waits import find_waiting_tiles
+from game.logic.win import get_waiting_tiles
+from game.tests.conftest import create_player
+
+_KOKUSHI_TYPES = (0, 8, 9, 17, 18, 26, 27, 28, 29, 30, 31, 32, 33)
+
+
+def _reference_scan(tiles_34):
+    waiting = set()
+    tiles_34 = list(tiles_34)
+    for tile_34 in range(NUM_TILE_TYPES):
+        if tiles_34[tile_34] >= 4:
+            continue
+        tiles_34[tile_34] += 1
+        if Agari.is_agari(tiles_34, None):
+            waiting.add(tile_34)
+        tiles_34[tile_34] -= 1
+    return waiting
+
+
+def _reference_waiting_tiles(player):
+    closed_tiles_34 = hand_to_34_array(player.tiles)
+    if calculate_shanten(closed_tiles_34) != 0:
+        return set()
+
+    tiles_34 = list(closed_tiles_34)
+    hand_ids = set(player.tiles)
+    for meld in player.melds:
+        for t in meld.tiles:
+            if t not in hand_ids:
+                tiles_34[t // 4] += 1
+    open_sets = [[tile_to_34(t) for t in meld.tiles] for meld in player.melds] or None
+
+    waiting = set()
+    for tile_34 in range(NUM_TILE_TYPES):
+        if tiles_34[tile_34] >= 4:
+            continue
+        tiles_34[tile_34] += 1
+        if Agari.is_agari(tiles_34, open_sets):
+            waiting.add(tile_34)
+        tiles_34[tile_34] -= 1
+    return waiting
+
+
+def _hand(man="", pin="", sou="", honors=""):
+    return TilesConverter.string_to_136_array(man=man, pin=pin, sou=sou, honors=honors)
+
+
+def _hand_34(man="", pin="", sou="", honors=""):
+    return hand_to_34_array(_hand(man=man, pin=pin, sou=sou, honors=honors))
+
+
+class _HandFactory:
+    """Build random hands as 136-format tiles, keeping copies unique across hand and melds."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)  # noqa: S311
+
+    def _take(self, counts, tile_34):
+        if counts[tile_34] >= 4:
+            return None
+        counts[tile_34] += 1
+        return tile_34 * 4 + counts[tile_34] - 1
+
+    def _group(self):
+        if self.rng.random() < 0.5:
+            suit = self.rng.randrange(3)
+            first = suit * 9 + self.rng.randrange(7)
+            return [first, first + 1, first + 2]
+        tile_34 = self.rng.randrange(NUM_TILE_TYPES)
+        return [tile_34] * 3
+
+    def complete_counts(self, groups):
+        while True:
+            counts = [0] * NUM_TILE_TYPES
+            for _ in range(groups):
+                for tile_34 in self._group():
+                    counts[tile_34] += 1
+            counts[self.rng.randrange(NUM_TILE_TYPES)] += 2
+            if max(counts) <= 4:
+                return counts
+
+    def concealed_counts(self, groups):
+        """Return a 3n+1 count vector that is usually tenpai, sometimes broken."""
+        shape = self.rng.random()
+        if shape < 0.1 and groups == 4:
+            counts = [0] * NUM_TILE_TYPES
+            for tile_34 in self.rng.sample(range(NUM_TILE_TYPES), 7):
+                counts[tile_34] = 2
+        elif shape < 0.2 and groups == 4:
+            counts = [0] * NUM_TILE_TYPES
+            for tile_34 in _KOKUSHI_TYPES:
+                counts[tile_34] = 1
+            counts[self.rng.choice(_KOKUSHI_TYPES)] += 1
+        else:
+            counts = self.complete_counts(groups)
+        counts[self.rng.choice([i for i, c in enumerate(counts) if c])] -= 1
+        if self.rng.random() < 0.3:
+            counts[self.rng.choice([i for i, c in enumerate(counts) if c])] -= 1
+            target = self.rng.randrange(NUM_TILE_TYPES)
+            counts[target] += 1
+            if counts[target] > 4:
+                counts[target] -= 1
+                counts[0 if target else 1] += 1
+        return counts
+
+    def player(self):
+        num_melds = self.rng.choice([0, 0, 0, 1, 2, 3, 4])
+        counts = [0] * NUM_TILE_TYPES
+        melds = []
+        for _ in range(num_melds):
+            group = self._group()
+            is_kan = group[0] == group[1] and self.rng.random() < 0.4
+            if is_kan:
+                group = [group[0]] * 4
+            tiles = [self._take(counts, tile_34) for tile_34 in group]
+            if None in tiles:
+                continue
+            meld_type = FrozenMeld.KAN if is_kan else (FrozenMeld.PON if group[0] == group[1] else FrozenMeld.CHI)
+            melds.append(FrozenMeld(meld_type=meld_type, tiles=tuple(tiles), opened=True, who=0, from_who=1))
+
+        hand = []
+        concealed = self.concealed_counts(4 - len(melds))
+        if self.rng.random() < 0.2:
+            # mid-turn hand holding a drawn 14th tile
+            concealed[self.rng.randrange(NUM_TILE_TYPES)] += 1
+        for tile_34, count in enumerate(concealed):
+            for _ in range(count):
+                tile = self._take(counts, tile_34)
+                if tile is not None:
+                    hand.append(tile)
+        return create_player(tiles=hand, melds=melds)
+
+
+class TestFindWaitingTilesEquivalence:
+    """Randomized comparison of the table engine against the Agari scan."""
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_matches_agari_scan(self, seed):
+        factory = _HandFactory(seed)
+        for _ in range(1500):
+            groups = factory.rng.choice([4, 4, 3, 2, 1, 0])
+            counts = factory.concealed_counts(groups)
+            if max(counts) > 4:
+                continue
+            assert find_waiting_tiles(counts) == _reference_scan(counts), counts
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_get_waiting_tiles_matches_reference(self, seed):
+        factory = _HandFactory(100 + seed)
+        for _ in range(1500):
+            player = factory.player()
+            assert get_waiting_tiles(player) == _reference_waiting_tiles(player), (player.tiles, player.melds)
+
+    def test_is_tempai_matches_reference(self):
+        factory = _HandFactory(200)
+        for _ in range(1500):
+            counts = factory.concealed_counts(4)
+            tiles = [tile_34 * 4 + copy for tile_34, count in enumerate(counts) for copy in range(min(count, 4))]
+            tiles_34 = hand_to_34_array(tiles)
+            expected = calculate_shanten(tiles_34) == 0 and bool(_reference_scan(tiles_34))
+            assert is_tempai(tiles, ()) == expected, tiles
+
+
+class TestFindWaitingTiles:
+    """Known wait shapes resolved from the tables."""
+
+    def test_nine_sided_wait(self):
+        assert find_waiting_tiles(_hand_34(man="1112345678999")) == set(range(9))
+
+    def test_kokushi_thirteen_sided_wait(self):
+        assert find_waiting_tiles(_hand_34(man="19", pin="19", sou="19", honors="1234567")) == set(_KOKUSHI_TYPES)
+
+    def test_kokushi_single_wait(self):
+        assert find_waiting_tiles(_hand_34(man="19", pin="19", sou="19", honors="1123456")) == {33}
+
+    def test_chiitoitsu_wait(self):
+        assert find_waiting_tiles(_hand_34(man="1133", pin="55", sou="7799", honors="112")) == {28}
+
+    def test_chiitoitsu_wait_with_sequence_reading(self):
+        # 112233m also reads as two 123m sequences, but the lone 4455p and
+        # the single honor leave seven pairs as the only winning shape
+        waits = find_waiting_tiles(_hand_34(man="112233", pin="4455", sou="66", honors="1"))
+        assert waits == {27}
+
+    def test_honor_shanpon_wait(self):
+        assert find_waiting_tiles(_hand_34(man="123456789", pin="11", honors="11")) == {9, 27}
+
+    def test_tanki_after_four_melds(self):
+        assert find_waiting_tiles(_hand_34(honors="7")) == {33}
+
+    def test_four_copies_held_are_not_waits(self):
+        # 1111m + 234p567p789s waits only on a fifth 1m
+        assert find_waiting_tiles(_hand_34(man="1111", pin="234567", sou="789")) == set()
+
+    def test_four_honor_copies_never_win(self):
+        assert find_waiting_tiles(_hand_34(man="123456", pin="11", honors="1111")) == set()
+
+    def test_two_broken_groups_have_no_waits(self):
+        assert find_waiting_tiles(_hand_34(man="1245", pin="123456", sou="11", honors="1")) == set()
+
+    def test_fourteen_tiles_fall_back_to_scan(self):
+        # 6 pairs + 2 singles: the Agari check accepts 7 pairs plus a stray tile
+        tiles_34 = _hand_34(man="113355", pin="2244", sou="66", honors="12")
+        assert find_waiting_tiles(tiles_34) == _reference_scan(tiles_34)
+
+    def test_does_not_mutate_input(self):
+        tiles_34 = _hand_34(man="1112345678999", pin="1")
+        snapshot = list(tiles_34)
+        find_waiting_tiles(tiles_34)
+        assert tiles_34 == snapshot
+
+
+class TestGetWaitingTilesWithMelds:
+    """Meld handling around the table lookup."""
+
+    def test_wait_exhausted_by_own_kan_is_dropped(self):
+        kan_tiles = _hand(man="5555")
+        kan = FrozenMeld(meld_type=FrozenMeld.KAN, tiles=tuple(kan_tiles), opened=False, who=0)
+        player = create_player(tiles=_hand(man="46", pin="123456", sou="11"), melds=[kan])
+        assert get_waiting_tiles(player) == set()
+
+    def test_meld_tiles_listed_in_hand(self):
+        pon_tiles = _hand(pin="888")
+        pon = FrozenMeld(meld_type=FrozenMeld.PON, tiles=tuple(pon_tiles), opened=True, who=0, from_who=1)
+        player = create_player(tiles=_hand(man="234567", sou="2345") + pon_tiles, melds=[pon])
+        assert get_waiting_tiles(player) == _reference_waiting_tiles(player) == {19, 22}
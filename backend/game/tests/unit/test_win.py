@@ -23,7 +23,7 @@ from game.logic.win import (
     can_call_ron,
     can_declare_tsumo,
     check_tsumo,
-    check_tsumo_with_tiles,
+    check_tsumo_with_tile,
     get_waiting_tiles,
     is_chiihou,
     is_effective_furiten,
@@ -73,8 +73,8 @@ class TestCheckTsumoMeldDedup:
         assert check_tsumo(player) is True
 
 
-class TestCheckTsumoWithTiles:
-    """Test check_tsumo_with_tiles uses all_tiles_from_hand_and_melds for consistent tile assembly."""
+class TestCheckTsumoWithTile:
+    """Test check_tsumo_with_tile combines the hand, meld tiles and the extra tile."""
 
     def test_winning_hand_with_ron_tile_and_meld(self):
         """Winning hand with ron tile added and meld tiles separate from closed hand."""
@@ -92,9 +92,8 @@ class TestCheckTsumoWithTiles:
 
         player = MahjongPlayer(seat=0, name="Player1", tiles=tuple(closed_tiles), melds=(pon,), score=25000)
         ron_tile = TilesConverter.string_to_136_array(sou="4")[0]
-        tiles_with_ron = [*closed_tiles, ron_tile]
 
-        assert check_tsumo_with_tiles(player, tiles_with_ron) is True
+        assert check_tsumo_with_tile(player, ron_tile) is True
 
 
 class TestCanDeclareTsumo:
@@ -0,0 +1,101 @@
+"""Unit tests for the per-connection outbound send queue."""
+
+import asyncio
+
+import pytest
+
+from game.server.send_queue import SEND_QUEUE_OVERFLOW_CLOSE_CODE, QueuedConnection, SendQueueOverflow
+from game.tests.mocks import MockConnection
+
+
+class _SlowConnection(MockConnection):
+    """Mock connection whose sends block until released."""
+
+    def __init__(self) -> None:
+        super().__init__(connection_id="slow")
+        self.release = asyncio.Event()
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self.release.wait()
+        await super().send_bytes(data)
+
+
+class TestQueuedConnection:
+    async def test_frames_delivered_in_order_before_close(self):
+        inner = MockConnection()
+        conn = QueuedConnection(inner, max_size=8)
+
+        await conn.send_message({"n": 1})
+        await conn.send_message({"n": 2})
+        await conn.close(code=1000, reason="game_ended")
+        await conn.stop()
+
+        assert inner.sent_messages == [{"n": 1}, {"n": 2}]
+        assert inner.is_closed
+        assert inner._close_reason == "game_ended"
+
+    async def test_send_does_not_wait_for_slow_socket(self):
+        inner = _SlowConnection()
+        conn = QueuedConnection(inner, max_size=8)
+
+        await asyncio.wait_for(conn.send_message({"n": 1}), timeout=0.1)
+        assert inner.sent_messages == []
+
+        inner.release.set()
+        await conn.stop()
+        assert inner.sent_messages == [{"n": 1}]
+
+    async def test_overflow_disconnect_drops_backlog_and_closes(self):
+        inner = _SlowConnection()
+        conn = QueuedConnection(inner, max_size=2, overflow=SendQueueOverflow.DISCONNECT)
+        await conn.send_message({"n": 1})
+        await asyncio.sleep(0)  # writer takes the first frame and blocks on the socket
+        await conn.send_message({"n": 2})
+        await conn.send_message({"n": 3})
+
+        with pytest.raises(ConnectionError):
+            await conn.send_message({"n": 4})
+        assert conn.pending == 1  # only the close marker remains
+
+        inner.release.set()
+        await conn.stop()
+        assert inner.is_closed
+        assert inner._close_code == SEND_QUEUE_OVERFLOW_CLOSE_CODE
+
+    async def test_overflow_block_waits_for_space(self):
+        inner = _SlowConnection()
+        conn = QueuedConnection(inner, max_size=1, overflow=SendQueueOverflow.BLOCK)
+        await conn.send_message({"n": 1})
+        await asyncio.sleep(0)
+        await conn.send_message({"n": 2})
+
+        blocked = asyncio.create_task(conn.send_message({"n": 3}))
+        await asyncio.sleep(0)
+        assert not blocked.done()
+
+        inner.release.set()
+        await asyncio.wait_for(blocked, timeout=1)
+        await conn.stop()
+        assert inner.sent_messages == [{"n": 1}, {"n": 2}, {"n": 3}]
+
+    async def test_send_after_socket_failure_raises(self):
+        inner = MockConnection()
+        await inner.close()
+        conn = QueuedConnection(inner, max_size=8)
+
+        await conn.send_message({"n": 1})
+        await conn.stop()
+
+        with pytest.raises(ConnectionError):
+            await conn.send_message({"n": 2})
+
+    async def test_stop_gives_up_on_writer_stuck_on_socket(self, monkeypatch):
+        monkeypatch.setattr("game.server.send_queue._WRITER_STOP_TIMEOUT", 0.01)
+        inner = _SlowConnection()
+        conn = QueuedConnection(inner, max_size=8)
+        await conn.send_message({"n": 1})
+
+        await asyncio.wait_for(conn.stop(), timeout=1)
+
+        assert inner.sent_messages == []
+        assert not inner.is_closed
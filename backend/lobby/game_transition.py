@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
+import time
 from http import HTTPStatus
 from typing import TYPE_CHECKING
 
 import httpx
+import structlog
 
+from lobby.metrics import game_creation_stats
 from shared.auth.game_ticket import create_signed_ticket
 
 if TYPE_CHECKING:
     from lobby.registry.manager import RegistryManager
+    from lobby.registry.types import GameServer
+
+logger = structlog.get_logger()
 
 
 class GameTransitionError(Exception):
@@ -18,6 +24,7 @@ class GameTransitionError(Exception):
 
 
 _HTTP_CREATED = HTTPStatus.CREATED
+_HTTP_SERVICE_UNAVAILABLE = HTTPStatus.SERVICE_UNAVAILABLE
 
 
 async def create_game_on_server(
@@ -26,32 +33,61 @@ async def create_game_on_server(
     num_ai_players: int,
     registry: RegistryManager,
 ) -> str:
-    """Call POST /games on a game server. Return the game server WebSocket URL."""
-    await registry.check_health()
-    healthy_servers = registry.get_healthy_servers()
-    if not healthy_servers:
+    """Call POST /games on a game server. Return the game server WebSocket URL.
+
+    Servers are tried in the registry's placement order (least loaded first),
+    each through its pooled keep-alive client. A server that answers 503 (at
+    capacity) or cannot be connected to is skipped for the next one; any
+    other failure is raised. Latency, retries and failures are recorded in
+    game_creation_stats.
+    """
+    start = time.perf_counter()
+    payload = {"game_id": game_id, "players": players, "num_ai_players": num_ai_players}
+    try:
+        server = await _place_game(registry, payload)
+    except GameTransitionError:
+        game_creation_stats.failures += 1
+        raise
+    game_creation_stats.latency.observe(time.perf_counter() - start)
+
+    ws_url = server.client_url.replace("http://", "ws://").replace("https://", "wss://")
+    return f"{ws_url}/ws/{game_id}"
+
+
+async def _place_game(registry: RegistryManager, payload: dict) -> GameServer:
+    """POST the game to each server in placement order until one creates it; return that server."""
+    await registry.refresh_if_stale()
+    servers = registry.placement_order()
+    if not servers:
         raise GameTransitionError("No healthy game servers available")
 
-    server = healthy_servers[0]
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    error = ""
+    for server in servers:
+        post_start = time.perf_counter()
         try:
-            response = await client.post(
-                f"{server.url}/games",
-                json={
-                    "game_id": game_id,
-                    "players": players,
-                    "num_ai_players": num_ai_players,
-                },
-            )
-            if response.status_code != _HTTP_CREATED:
-                raise GameTransitionError(
-                    f"Game server returned {response.status_code}: {response.text}",
-                )
+            async with registry.client(server) as client:
+                response = await client.post(f"{server.url}/games", json=payload)
+        except httpx.ConnectError as e:
+            # The request never reached the server, so the game can go elsewhere.
+            registry.record_server_down(server)
+            game_creation_stats.retries += 1
+            error = f"Failed to connect to game server: {e}"
+            logger.warning("game server unreachable, trying next", server_name=server.name, error=str(e))
+            continue
         except httpx.RequestError as e:
             raise GameTransitionError(f"Failed to connect to game server: {e}") from e
-
-    ws_url = server.client_url.replace("http://", "ws://").replace("https://", "wss://")
-    return f"{ws_url}/ws/{game_id}"
+        if response.status_code == _HTTP_SERVICE_UNAVAILABLE:
+            registry.record_server_full(server)
+            game_creation_stats.retries += 1
+            error = f"Game server returned {response.status_code}: {response.text}"
+            logger.warning("game server at capacity, trying next", server_name=server.name)
+            continue
+        if response.status_code != _HTTP_CREATED:
+            raise GameTransitionError(f"Game server returned {response.status_code}: {response.text}")
+        game_creation_stats.observe_post(server.name, time.perf_counter() - post_start)
+        registry.record_game_placed(server)
+        return server
+    raise GameTransitionError(f"No game server could take the game: {error}")
 
 
 def sign_player_tickets(
@@ -0,0 +1,144 @@
+"""Coalesced queue_update broadcasts to players waiting in matchmaking."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import math
+import time
+from typing import TYPE_CHECKING
+
+import structlog
+from starlette.websockets import WebSocketDisconnect, WebSocketState
+
+from lobby.metrics import queue_broadcast_stats
+
+if TYPE_CHECKING:
+    from starlette.websockets import WebSocket
+
+    from lobby.matchmaking.manager import MatchmakingManager
+    from lobby.matchmaking.models import QueueEntry
+
+logger = structlog.get_logger()
+
+# Close code for a player whose queue_update send timed out (same as the game server's slow-consumer close).
+SEND_TIMEOUT_CLOSE_CODE = 4005
+
+
+class QueueUpdateBroadcaster:
+    """Tell queued players the queue size, at most once per interval.
+
+    Handlers call notify() whenever the queue changes. The first change after
+    a quiet interval is broadcast right away; changes during the interval are
+    folded into one broadcast at its end. Each broadcast serializes the
+    message once and sends it to all queued players concurrently, each send
+    bounded by send_timeout, and skips players who already know the current
+    size (including a joining player's own queue_joined).
+
+    A send that times out is cancelled partway, which can leave a partial
+    frame on the socket, so that player is closed with
+    SEND_TIMEOUT_CLOSE_CODE and never sent to again; their handler then
+    removes them from the queue.
+    """
+
+    def __init__(self, manager: MatchmakingManager, *, interval: float, send_timeout: float) -> None:
+        self._manager = manager
+        self._interval = interval
+        self._send_timeout = send_timeout
+        # connection_id -> queue size last sent to that player
+        self._sent_sizes: dict[str, int] = {}
+        # Players closed after a send timeout.
+        self._dropped: set[str] = set()
+        self._pending = False
+        self._last_broadcast = -math.inf
+        self._task: asyncio.Task[None] | None = None
+
+    def mark_sent(self, connection_id: str, queue_size: int) -> None:
+        """Record a queue size the player was told outside of a broadcast."""
+        self._sent_sizes[connection_id] = queue_size
+
+    def notify(self) -> None:
+        """Schedule a queue_update broadcast for a change to the queue."""
+        queue_broadcast_stats.notifications += 1
+        self._pending = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel a pending broadcast."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def broadcast(self) -> None:
+        """Send the current queue size to every queued player who has not seen it."""
+        start = time.perf_counter()
+        async with self._manager.lock:
+            queue_size = self._manager.queue_size
+            entries = self._manager.get_queue_entries()
+
+        # Rebuilt from the queue each time, so players who left are forgotten.
+        sent_sizes = {
+            entry.connection_id: self._sent_sizes[entry.connection_id]
+            for entry in entries
+            if entry.connection_id in self._sent_sizes
+        }
+        self._dropped &= {entry.connection_id for entry in entries}
+        recipients = [
+            entry
+            for entry in entries
+            if sent_sizes.get(entry.connection_id) != queue_size
+            and entry.connection_id not in self._dropped
+            and entry.websocket.client_state == WebSocketState.CONNECTED
+        ]
+        for entry in recipients:
+            sent_sizes[entry.connection_id] = queue_size
+        self._sent_sizes = sent_sizes
+        if not recipients:
+            return
+
+        payload = json.dumps({"type": "queue_update", "queue_size": queue_size})
+        delivered = await asyncio.gather(*(self._send(entry, payload) for entry in recipients))
+        for entry, ok in zip(recipients, delivered, strict=True):
+            if not ok and entry.connection_id not in self._dropped:
+                # Retry on the next broadcast.
+                self._sent_sizes.pop(entry.connection_id, None)
+        queue_broadcast_stats.broadcasts += 1
+        queue_broadcast_stats.messages += sum(delivered)
+        queue_broadcast_stats.duration.observe(time.perf_counter() - start)
+
+    async def _run(self) -> None:
+        while self._pending:
+            delay = self._last_broadcast + self._interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._pending = False
+            self._last_broadcast = time.monotonic()
+            try:
+                await self.broadcast()
+            except Exception:  # pragma: no cover -- defensive, keeps later broadcasts running
+                logger.exception("queue_update broadcast failed")
+
+    async def _send(self, entry: QueueEntry, payload: str) -> bool:
+        try:
+            await asyncio.wait_for(entry.websocket.send_text(payload), self._send_timeout)
+        except TimeoutError:
+            queue_broadcast_stats.timeouts += 1
+            self._dropped.add(entry.connection_id)
+            logger.warning("closing slow matchmaking connection", connection_id=entry.connection_id)
+            await self._close(entry.websocket)
+            return False
+        except (WebSocketDisconnect, ConnectionError, RuntimeError):  # fmt: skip
+            queue_broadcast_stats.failures += 1
+            return False
+        return True
+
+    async def _close(self, websocket: WebSocket) -> None:
+        with contextlib.suppress(TimeoutError, WebSocketDisconnect, ConnectionError, RuntimeError):
+            await asyncio.wait_for(
+                websocket.close(code=SEND_TIMEOUT_CLOSE_CODE, reason="send_timeout"),
+                self._send_timeout,
+            )
@@ -3,10 +3,26 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+import contextlib
+import itertools
+import math
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
 
 import structlog
 
-from lobby.matchmaking.models import MATCHMAKING_SEATS, QueueEntry
+from lobby.matchmaking.models import (
+    INITIAL_RATING_WINDOW,
+    MATCHMAKING_SEATS,
+    RATING_BUCKET_WIDTH,
+    RATING_WINDOW_GROWTH,
+    QueueEntry,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
 
 logger = structlog.get_logger()
 
@@ -16,13 +32,36 @@ class MatchmakingManager:
 
     Pure state management -- no WebSocket I/O. The WebSocket handler
     calls manager methods and handles responses.
+
+    The queue is an OrderedDict keyed by connection ID in waiting order,
+    indexed by rating buckets (a dict of buckets plus their sorted keys), so
+    adding and removing a player costs O(log b) for b non-empty buckets. A
+    table is formed around an anchor player from the nearest-rated players
+    within the anchor's window, which widens the longer the anchor waits.
     """
 
-    def __init__(self) -> None:
-        self._queue: list[QueueEntry] = []
+    def __init__(
+        self,
+        *,
+        initial_window: float = INITIAL_RATING_WINDOW,
+        window_growth: float = RATING_WINDOW_GROWTH,
+        bucket_width: float = RATING_BUCKET_WIDTH,
+    ) -> None:
+        self._queue: OrderedDict[str, QueueEntry] = OrderedDict()
+        # Each bucket is in waiting order, like _queue.
+        self._buckets: dict[int, OrderedDict[str, QueueEntry]] = {}
+        self._bucket_keys: list[int] = []
+        # Waiting order of queued connections; requeued players get lower numbers.
+        self._order: dict[str, int] = {}
+        self._next_order = itertools.count()
+        self._next_front_order = itertools.count(-1, -1)
         self._user_ids: set[str] = set()
         self._in_flight: set[str] = set()
         self._lock = asyncio.Lock()
+        self._initial_window = initial_window
+        self._window_growth = window_growth
+        self._bucket_width = bucket_width
+        self._matcher_task: asyncio.Task[None] | None = None
 
     def add_player(self, entry: QueueEntry) -> None:
         """Add a player to the matchmaking queue.
@@ -31,45 +70,70 @@ class MatchmakingManager:
         """
         if entry.user_id in self._user_ids or entry.user_id in self._in_flight:
             raise ValueError("already_in_queue")
-        self._queue.append(entry)
-        self._user_ids.add(entry.user_id)
+        self._insert(entry, next(self._next_order))
 
     def remove_player(self, connection_id: str) -> None:
         """Remove a player from the queue by connection_id.
 
         Caller must hold self._lock.
         """
-        for i, entry in enumerate(self._queue):
-            if entry.connection_id == connection_id:
-                self._user_ids.discard(entry.user_id)
-                self._queue.pop(i)
-                return
+        entry = self._queue.get(connection_id)
+        if entry is not None:
+            self._discard(entry)
 
-    def try_match(self) -> list[QueueEntry] | None:
-        """Pop MATCHMAKING_SEATS players if enough in queue, else None.
+    def try_match(self, connection_id: str | None = None, *, now: float | None = None) -> list[QueueEntry] | None:
+        """Pop one table of MATCHMAKING_SEATS players, else None.
 
+        The table is formed around the player with connection_id (a player who
+        just joined), or else around the longest-waiting player that has
+        enough players within their rating window.
         Caller must hold self._lock.
         """
-        if len(self._queue) >= MATCHMAKING_SEATS:
-            matched = self._queue[:MATCHMAKING_SEATS]
-            self._queue = self._queue[MATCHMAKING_SEATS:]
-            for entry in matched:
-                self._user_ids.discard(entry.user_id)
-                self._in_flight.add(entry.user_id)
-            return matched
+        now = time.monotonic() if now is None else now
+        if connection_id is not None:
+            anchors = [self._queue[connection_id]] if connection_id in self._queue else []
+        else:
+            anchors = list(self._queue.values())
+        for anchor in anchors:
+            matched = self._match_around(anchor, now)
+            if matched is not None:
+                return matched
         return None
 
+    def match_round(self, *, now: float | None = None) -> list[list[QueueEntry]]:
+        """Pop every table that can be formed, anchoring on players in waiting order.
+
+        Caller must hold self._lock.
+        """
+        now = time.monotonic() if now is None else now
+        tables: list[list[QueueEntry]] = []
+        for anchor in list(self._queue.values()):
+            if len(self._queue) < MATCHMAKING_SEATS:
+                break
+            if anchor.connection_id not in self._queue:
+                continue
+            matched = self._match_around(anchor, now)
+            if matched is not None:
+                tables.append(matched)
+        return tables
+
     def requeue_at_front(self, entries: list[QueueEntry]) -> None:
         """Re-insert entries at the front of the queue.
 
-        Used when game creation fails after popping a match.
+        Used when game creation fails after popping a match. Entries keep
+        their queued_at, so their rating window stays as wide as before.
         Caller must hold self._lock.
         """
         for entry in reversed(entries):
             self._in_flight.discard(entry.user_id)
             if entry.user_id not in self._user_ids:
-                self._queue.insert(0, entry)
-                self._user_ids.add(entry.user_id)
+                self._insert(entry, next(self._next_front_order))
+                self._queue.move_to_end(entry.connection_id, last=False)
+                self._buckets[self._bucket_key(entry.rating)].move_to_end(entry.connection_id, last=False)
+
+    def rating_window(self, entry: QueueEntry, now: float) -> float:
+        """Max rating difference the player accepts after waiting until now."""
+        return self._initial_window + self._window_growth * max(0.0, now - entry.queued_at)
 
     @property
     def lock(self) -> asyncio.Lock:
@@ -80,11 +144,11 @@ class MatchmakingManager:
         return len(self._queue)
 
     def get_queue_entries(self) -> list[QueueEntry]:
-        """Return a snapshot of current queue entries.
+        """Return a snapshot of current queue entries in waiting order.
 
         Caller must hold self._lock.
         """
-        return list(self._queue)
+        return list(self._queue.values())
 
     def clear_in_flight(self, user_ids: set[str]) -> None:
         """Remove user IDs from the in-flight set.
@@ -96,3 +160,100 @@ class MatchmakingManager:
 
     def has_user(self, user_id: str) -> bool:
         return user_id in self._user_ids or user_id in self._in_flight
+
+    def start_matcher(
+        self,
+        on_match: Callable[[list[QueueEntry]], Awaitable[None]],
+        interval: float,
+    ) -> None:
+        """Start the periodic task that runs match_round() and hands each table to on_match."""
+        if self._matcher_task is not None:
+            return
+        self._matcher_task = asyncio.create_task(self._matcher_loop(on_match, interval))
+
+    async def stop_matcher(self) -> None:
+        """Cancel the matcher task."""
+        if self._matcher_task is not None:
+            self._matcher_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._matcher_task
+            self._matcher_task = None
+
+    async def _matcher_loop(
+        self,
+        on_match: Callable[[list[QueueEntry]], Awaitable[None]],
+        interval: float,
+    ) -> None:
+        """Periodically match players whose widened windows now overlap."""
+        while True:
+            await asyncio.sleep(interval)
+            # A failed round must not end matching for everyone still queued.
+            try:
+                async with self._lock:
+                    tables = self.match_round()
+                if tables:
+                    logger.info("matchmaking round", tables=len(tables), queue_size=self.queue_size)
+                    await asyncio.gather(*(on_match(table) for table in tables))
+            except Exception:
+                logger.exception("matchmaking round failed")
+
+    def _bucket_key(self, rating: float) -> int:
+        return math.floor(rating / self._bucket_width)
+
+    def _insert(self, entry: QueueEntry, order: int) -> None:
+        key = self._bucket_key(entry.rating)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = OrderedDict()
+            bisect.insort(self._bucket_keys, key)
+        bucket[entry.connection_id] = entry
+        self._queue[entry.connection_id] = entry
+        self._order[entry.connection_id] = order
+        self._user_ids.add(entry.user_id)
+
+    def _discard(self, entry: QueueEntry) -> None:
+        key = self._bucket_key(entry.rating)
+        bucket = self._buckets[key]
+        del bucket[entry.connection_id]
+        if not bucket:
+            del self._buckets[key]
+            del self._bucket_keys[bisect.bisect_left(self._bucket_keys, key)]
+        del self._queue[entry.connection_id]
+        del self._order[entry.connection_id]
+        self._user_ids.discard(entry.user_id)
+
+    def _match_around(self, anchor: QueueEntry, now: float) -> list[QueueEntry] | None:
+        """Pop anchor and enough players within its rating window, if there are any.
+
+        Buckets are visited outward from the anchor's rating, nearest first,
+        and players are taken in waiting order within a bucket, so a dense
+        rating range costs a few bucket lookups rather than a scan of it.
+        """
+        window = self.rating_window(anchor, now)
+        keys = self._bucket_keys
+        width = self._bucket_width
+        above = bisect.bisect_left(keys, self._bucket_key(anchor.rating))
+        below = above - 1
+        tablemates: list[QueueEntry] = []
+        while len(tablemates) < MATCHMAKING_SEATS - 1:
+            below_distance = anchor.rating - (keys[below] + 1) * width if below >= 0 else math.inf
+            above_distance = max(0.0, keys[above] * width - anchor.rating) if above < len(keys) else math.inf
+            if min(below_distance, above_distance) > window:
+                return None
+            if below_distance < above_distance:
+                key = keys[below]
+                below -= 1
+            else:
+                key = keys[above]
+                above += 1
+            for entry in self._buckets[key].values():
+                if entry is not anchor and abs(entry.rating - anchor.rating) <= window:
+                    tablemates.append(entry)
+                    if len(tablemates) == MATCHMAKING_SEATS - 1:
+                        break
+
+        matched = sorted([anchor, *tablemates], key=lambda entry: self._order[entry.connection_id])
+        for entry in matched:
+            self._discard(entry)
+            self._in_flight.add(entry.user_id)
+        return matched
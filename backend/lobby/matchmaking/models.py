@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -8,6 +9,17 @@ if TYPE_CHECKING:
 
 MATCHMAKING_SEATS = 4
 
+# Rating given to players until the lobby has a rating source.
+DEFAULT_RATING = 1500.0
+
+# A player accepts tablemates within INITIAL_RATING_WINDOW of their rating,
+# widened by RATING_WINDOW_GROWTH per second waited, so nobody waits forever.
+INITIAL_RATING_WINDOW = 100.0
+RATING_WINDOW_GROWTH = 25.0
+
+# Width of the rating buckets that index the queue.
+RATING_BUCKET_WIDTH = 50.0
+
 
 @dataclass
 class QueueEntry:
@@ -17,3 +29,6 @@ class QueueEntry:
     user_id: str
     username: str
     websocket: WebSocket
+    rating: float = DEFAULT_RATING
+    # time.monotonic() when the player joined; kept across requeues.
+    queued_at: float = field(default_factory=time.monotonic)
@@ -17,6 +17,7 @@ from lobby.matchmaking.models import QueueEntry
 from lobby.websocket_utils import check_origin
 
 if TYPE_CHECKING:
+    from lobby.matchmaking.broadcast import QueueUpdateBroadcaster
     from lobby.matchmaking.manager import MatchmakingManager
     from lobby.registry.manager import RegistryManager
     from lobby.rooms.manager import LobbyRoomManager
@@ -31,6 +32,7 @@ class _MatchmakingContext:
 
     __slots__ = (
         "auth_settings",
+        "broadcaster",
         "connection_id",
         "matchmaking_manager",
         "registry",
@@ -44,6 +46,7 @@ class _MatchmakingContext:
         self.settings: LobbyServerSettings = websocket.app.state.settings
         self.auth_settings: AuthSettings = websocket.app.state.auth_settings
         self.matchmaking_manager: MatchmakingManager = websocket.app.state.matchmaking_manager
+        self.broadcaster: QueueUpdateBroadcaster = websocket.app.state.matchmaking_broadcaster
         self.room_manager: LobbyRoomManager = websocket.app.state.room_manager
         self.registry: RegistryManager = websocket.app.state.registry
         self.connection_id: str = str(uuid.uuid4())
@@ -110,7 +113,9 @@ async def _try_join_queue(websocket: WebSocket, ctx: _MatchmakingContext) -> boo
             duplicate = True
         else:
             position = ctx.matchmaking_manager.queue_size
-            matched = ctx.matchmaking_manager.try_match()
+            # The queue_joined below tells this player the size.
+            ctx.broadcaster.mark_sent(ctx.connection_id, position)
+            matched = ctx.matchmaking_manager.try_match(ctx.connection_id)
 
     # Lock released -- handle duplicate rejection outside lock
     if duplicate:
@@ -127,11 +132,21 @@ async def _try_join_queue(websocket: WebSocket, ctx: _MatchmakingContext) -> boo
 
     await websocket.send_json({"type": "queue_joined", "position": position, "queue_size": position})
     log.info("player queued", queue_size=position)
-    # Broadcast queue update to other waiting players (exclude self, already got queue_joined)
-    await _broadcast_queue_update(ctx, exclude=ctx.connection_id)
+    ctx.broadcaster.notify()
     return True
 
 
+async def handle_round_match(matched: list[QueueEntry]) -> None:
+    """Start a game for a table formed by the periodic matchmaking round.
+
+    Passed to MatchmakingManager.start_matcher(). The table has no joining
+    connection of its own, so the match is handled in the context of its
+    longest-waiting player's connection (only app state is used).
+    """
+    logger.info("match found", players=[e.username for e in matched])
+    await _handle_match(matched, _MatchmakingContext(matched[0].websocket))
+
+
 async def _message_loop(websocket: WebSocket) -> None:
     while True:
         raw = await websocket.receive_text()
@@ -170,7 +185,7 @@ async def _handle_match(matched: list[QueueEntry], ctx: _MatchmakingContext) ->
             disconnected=[e.username for e in disconnected],
         )
         if remaining:
-            await _broadcast_queue_update(ctx)
+            ctx.broadcaster.notify()
         return
 
     # Sign tickets and create game -- catch any exception to avoid leaking _in_flight
@@ -201,7 +216,7 @@ async def _handle_match(matched: list[QueueEntry], ctx: _MatchmakingContext) ->
                 await entry.websocket.send_json(
                     {"type": "error", "message": "Failed to start game, please try again"},
                 )
-        await _broadcast_queue_update(ctx)
+        ctx.broadcaster.notify()
         return
 
     game_client_url = ctx.settings.game_client_url
@@ -228,24 +243,10 @@ async def _handle_match(matched: list[QueueEntry], ctx: _MatchmakingContext) ->
             log.warning("failed to send game_starting", connection_id=entry.connection_id)
 
 
-async def _broadcast_queue_update(ctx: _MatchmakingContext, *, exclude: str | None = None) -> None:
-    """Send queue_update to all players currently in the queue."""
-    async with ctx.matchmaking_manager.lock:
-        queue_size = ctx.matchmaking_manager.queue_size
-        entries = ctx.matchmaking_manager.get_queue_entries()
-
-    for entry in entries:
-        if entry.connection_id == exclude:
-            continue
-        if entry.websocket.client_state == WebSocketState.CONNECTED:
-            with contextlib.suppress(WebSocketDisconnect, ConnectionError, RuntimeError):
-                await entry.websocket.send_json({"type": "queue_update", "queue_size": queue_size})
-
-
 async def _cleanup_connection(ctx: _MatchmakingContext) -> None:
     """Remove player from queue on disconnect."""
     async with ctx.matchmaking_manager.lock:
         ctx.matchmaking_manager.remove_player(ctx.connection_id)
 
     logger.info("player left matchmaking queue", username=ctx.username)
-    await _broadcast_queue_update(ctx)
+    ctx.broadcaster.notify()
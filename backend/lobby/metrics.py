@@ -0,0 +1,122 @@
+"""In-process latency and fan-out metrics reported by the lobby's /status endpoint."""
+
+import bisect
+from typing import TypedDict
+
+# Upper bounds (milliseconds) of the histogram buckets; the last bucket is unbounded.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyStats(TypedDict):
+    """JSON summary of a LatencyHistogram; "+inf" stands for a quantile past the last bound."""
+
+    count: int
+    mean_ms: float | None
+    p50_ms: float | str | None
+    p95_ms: float | str | None
+    p99_ms: float | str | None
+    buckets: dict[str, int]
+
+
+class LatencyHistogram:
+    """Counts of observed latencies in fixed millisecond buckets.
+
+    Quantiles are estimated as the upper bound of the bucket they fall in,
+    so they are accurate to a bucket and cost no per-sample memory.
+    """
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound (ms) of the bucket holding quantile q, inf past the last bound, None if empty."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip((*LATENCY_BUCKETS_MS, float("inf")), self.counts, strict=True):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")  # pragma: no cover — unreachable, the last bucket always reaches count
+
+    def stats(self) -> LatencyStats:
+        def bound(q: float) -> float | str | None:
+            value = self.quantile(q)
+            return "+inf" if value == float("inf") else value
+
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "p50_ms": bound(0.5),
+            "p95_ms": bound(0.95),
+            "p99_ms": bound(0.99),
+            "buckets": {
+                **{f"le_{le}": count for le, count in zip(LATENCY_BUCKETS_MS, self.counts, strict=False)},
+                "inf": self.counts[-1],
+            },
+        }
+
+
+class GameCreationStats:
+    """Latency of creating games on game servers (POST /games).
+
+    latency covers a whole successful create_game_on_server() call,
+    including retries on other servers; post_latency is the round trip of
+    each successful POST /games per game server.
+    """
+
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        self.post_latency: dict[str, LatencyHistogram] = {}
+        self.retries = 0
+        self.failures = 0
+
+    def observe_post(self, server_name: str, seconds: float) -> None:
+        self.post_latency.setdefault(server_name, LatencyHistogram()).observe(seconds)
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "latency": self.latency.stats(),
+            "post_latency": {name: histogram.stats() for name, histogram in self.post_latency.items()},
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+class QueueBroadcastStats:
+    """Matchmaking queue_update fan-out.
+
+    notifications counts queue changes; broadcasts counts the coalesced
+    fan-outs they caused, and messages the sockets each fan-out reached.
+    """
+
+    def __init__(self) -> None:
+        self.duration = LatencyHistogram()
+        self.notifications = 0
+        self.broadcasts = 0
+        self.messages = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "duration": self.duration.stats(),
+            "notifications": self.notifications,
+            "broadcasts": self.broadcasts,
+            "messages": self.messages,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+        }
+
+
+game_creation_stats = GameCreationStats()
+queue_broadcast_stats = QueueBroadcastStats()
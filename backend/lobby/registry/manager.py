@@ -1,3 +1,8 @@
+import asyncio
+import contextlib
+import importlib.util
+import random
+import time
 from http import HTTPStatus
 from pathlib import Path
 
@@ -5,7 +10,7 @@ import httpx
 import structlog
 import yaml
 
-from lobby.registry.types import GameServer
+from lobby.registry.types import ClientOptions, GameServer
 
 logger = structlog.get_logger()
 
@@ -17,8 +22,34 @@ def _get_default_config_path() -> Path:  # pragma: no cover — production defau
 
 
 class RegistryManager:
-    def __init__(self, config_path: Path | None = None) -> None:
+    """Configured game servers with their cached health and load.
+
+    start() opens one pooled keep-alive client per server (shared by the
+    /status probes and POST /games) and runs a background task that probes
+    every server concurrently every poll_interval seconds. Callers read the
+    cached state; refresh_if_stale() probes inline only when a server has
+    not been checked within stale_after seconds (before the first poll, or
+    when the registry is not started). Until start(), client() hands out
+    one-off clients.
+    """
+
+    def __init__(
+        self,
+        config_path: Path | None = None,
+        *,
+        poll_interval: float = 5.0,
+        stale_after: float = 15.0,
+        probe_timeout: float = 2.0,
+        client_options: ClientOptions | None = None,
+    ) -> None:
         self._servers: list[GameServer] = []
+        self._rng = random.Random()  # noqa: S311 -- load balancing, not security
+        self._poll_interval = poll_interval
+        self._stale_after = stale_after
+        self._probe_timeout = probe_timeout
+        self._client_options = client_options or ClientOptions()
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._poll_task: asyncio.Task[None] | None = None
         self._config_path = config_path or _get_default_config_path()
         self._load_config()
 
@@ -41,18 +72,131 @@ class RegistryManager:
     def get_servers(self) -> list[GameServer]:
         return self._servers.copy()
 
-    def get_healthy_servers(self) -> list[GameServer]:
-        return [s for s in self._servers if s.healthy]
+    def placement_order(self) -> list[GameServer]:
+        """Order the healthy servers to try when placing a new game.
+
+        The first server is picked by weighted power-of-two-choices: of two
+        random servers with free capacity, the one using the smaller fraction
+        of its max_capacity. The other servers with free capacity follow from
+        least to most loaded, then servers last reported full, as fallbacks
+        for a 503.
+        """
+        healthy = [s for s in self._servers if s.healthy]
+        available = sorted((s for s in healthy if not s.is_full), key=lambda s: s.load)
+        full = [s for s in healthy if s.is_full]
+        if len(available) > 1:
+            first, second = self._rng.sample(available, 2)
+            choice = second if second.load < first.load else first
+            available.remove(choice)
+            available.insert(0, choice)
+        return available + full
+
+    def record_game_placed(self, server: GameServer) -> None:
+        """Count a game created on server until its next /status poll reports it."""
+        server.pending_games += 1
+        server.capacity_used += 1
+
+    def record_server_down(self, server: GameServer) -> None:
+        """Treat server as unhealthy after a connection to it failed."""
+        server.healthy = False
+
+    def record_server_full(self, server: GameServer) -> None:
+        """Treat server as full after it rejected a game with 503.
+
+        A server not polled yet has no known capacity, so what it has in use
+        (at least one game) is taken as its capacity until the next poll.
+        """
+        if not server.max_capacity:
+            server.max_capacity = max(server.capacity_used, 1)
+        server.capacity_used = max(server.capacity_used, server.max_capacity)
+
+    def is_stale(self) -> bool:
+        """Whether any server's cached state is missing or older than stale_after."""
+        deadline = time.monotonic() - self._stale_after
+        return any(s.checked_at is None or s.checked_at < deadline for s in self._servers)
+
+    async def refresh_if_stale(self) -> None:
+        """Probe the servers inline only if the cached state is stale."""
+        if self.is_stale():
+            await self.check_health()
+
+    def client(self, server: GameServer) -> contextlib.AbstractAsyncContextManager[httpx.AsyncClient]:
+        """Return the server's pooled client to use in ``async with``, or a one-off client before start()."""
+        client = self._clients.get(server.name)
+        if client is not None:
+            return contextlib.nullcontext(client)
+        return httpx.AsyncClient(timeout=self._client_options.timeout)
 
     async def check_health(self) -> None:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            for server in self._servers:
-                try:
-                    response = await client.get(f"{server.url}/health")
-                    if response.status_code == HTTPStatus.OK:
-                        server.healthy = True
-                    else:
-                        server.healthy = False
-                except httpx.RequestError as e:
-                    logger.warning("health check failed", server_name=server.name, error=str(e))
-                    server.healthy = False
+        """Probe every server's /status concurrently: healthy on 200, with its load recorded."""
+        await asyncio.gather(*(self._probe(server) for server in self._servers))
+
+    async def _probe(self, server: GameServer) -> None:
+        try:
+            async with self.client(server) as client:
+                response = await client.get(f"{server.url}/status", timeout=self._probe_timeout)
+            if response.status_code == HTTPStatus.OK:
+                server.healthy = True
+                _update_load(server, response)
+            else:
+                server.healthy = False
+        except httpx.RequestError as e:
+            logger.warning("health check failed", server_name=server.name, error=str(e))
+            server.healthy = False
+        except Exception:
+            # e.g. httpx.InvalidURL from a bad config entry; must not end the poll loop.
+            logger.exception("health check failed", server_name=server.name)
+            server.healthy = False
+        server.checked_at = time.monotonic()
+
+    def start(self) -> None:
+        """Open the pooled per-server clients and start the background poll task."""
+        if self._poll_task is not None:
+            return
+        options = self._client_options
+        http2 = options.http2 and importlib.util.find_spec("h2") is not None
+        if options.http2 and not http2:
+            logger.warning("HTTP/2 to game servers needs the h2 package (httpx[http2]), using HTTP/1.1")
+        limits = httpx.Limits(
+            max_connections=options.max_connections,
+            max_keepalive_connections=options.max_keepalive_connections,
+            keepalive_expiry=options.keepalive_expiry,
+        )
+        for server in self._servers:
+            self._clients[server.name] = httpx.AsyncClient(timeout=options.timeout, limits=limits, http2=http2)
+        self._poll_task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self) -> None:
+        """Cancel the poll task and close the pooled clients."""
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._poll_task
+            self._poll_task = None
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    async def _poll_loop(self) -> None:
+        """Probe all servers every poll_interval seconds."""
+        while True:
+            try:
+                await self.check_health()
+            except Exception:  # pragma: no cover -- defensive, _probe handles its own errors
+                logger.exception("registry poll failed")
+            await asyncio.sleep(self._poll_interval)
+
+
+def _update_load(server: GameServer, response: httpx.Response) -> None:
+    """Copy the load counters from a /status response; keep the previous ones if it is malformed."""
+    try:
+        status = response.json()
+        load = {key: int(status[key]) for key in ("active_games", "pending_games", "capacity_used", "max_capacity")}
+    except (ValueError, TypeError, KeyError):  # fmt: skip
+        logger.warning("malformed status response", server_name=server.name)
+        return
+    server.active_games = load["active_games"]
+    server.pending_games = load["pending_games"]
+    server.capacity_used = load["capacity_used"]
+    server.max_capacity = load["max_capacity"]
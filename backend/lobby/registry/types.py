@@ -1,13 +1,42 @@
+from dataclasses import dataclass
+
 from pydantic import BaseModel
 
 
+@dataclass(frozen=True, slots=True)
+class ClientOptions:
+    """Connection pool settings of the per-server HTTP clients (timeouts in seconds)."""
+
+    timeout: float = 10.0
+    max_connections: int = 10
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+
 class GameServer(BaseModel):
     name: str
     url: str
     public_url: str | None = None
     healthy: bool = False
+    # Load last reported by the server's /status endpoint (0 until first polled).
+    active_games: int = 0
+    pending_games: int = 0
+    capacity_used: int = 0
+    max_capacity: int = 0
+    # time.monotonic() of the last /status probe, or None if never probed.
+    checked_at: float | None = None
 
     @property
     def client_url(self) -> str:
         """URL exposed to browser clients (for WebSocket connections)."""
         return self.public_url or self.url
+
+    @property
+    def load(self) -> float:
+        """Fraction of the server's game capacity in use (0.0 while unknown)."""
+        return self.capacity_used / self.max_capacity if self.max_capacity else 0.0
+
+    @property
+    def is_full(self) -> bool:
+        return self.max_capacity > 0 and self.capacity_used >= self.max_capacity
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import contextlib
+import time
 from datetime import UTC, datetime
 from http import HTTPStatus
 from pathlib import Path
@@ -25,17 +26,23 @@ from lobby.auth.policy import (
     public_route,
     validate_route_auth_policy,
 )
+from lobby.matchmaking.broadcast import QueueUpdateBroadcaster
 from lobby.matchmaking.manager import MatchmakingManager
-from lobby.matchmaking.websocket import matchmaking_websocket
+from lobby.matchmaking.websocket import handle_round_match, matchmaking_websocket
+from lobby.metrics import game_creation_stats, queue_broadcast_stats
 from lobby.registry.manager import RegistryManager
+from lobby.registry.types import ClientOptions
 from lobby.rooms.connections import RoomConnectionManager
 from lobby.rooms.manager import LobbyRoomManager
 from lobby.rooms.websocket import room_websocket
 from lobby.server.middleware import SecurityHeadersMiddleware, SlashNormalizationMiddleware
 from lobby.server.settings import LobbyServerSettings
 from lobby.views import (
+    HistoryPageCache,
+    ReplayCache,
     create_room_and_redirect,
     create_templates,
+    history_api,
     history_page,
     join_room_and_redirect,
     load_vite_manifest,
@@ -43,6 +50,8 @@ from lobby.views import (
     matchmaking_page,
     play_page,
     replay_content,
+    replay_round,
+    replay_rounds,
     resolve_vite_asset_urls,
     room_page,
     storybook_page,
@@ -97,10 +106,25 @@ async def health(_request: Request) -> JSONResponse:
     return JSONResponse({"status": "ok", "version": APP_VERSION, "commit": GIT_COMMIT})
 
 
+async def status(request: Request) -> JSONResponse:
+    replay_cache: ReplayCache = request.app.state.replay_cache
+    return JSONResponse(
+        {
+            "status": "ok",
+            "version": APP_VERSION,
+            "commit": GIT_COMMIT,
+            "game_creation": game_creation_stats.stats(),
+            "matchmaking_broadcast": queue_broadcast_stats.stats(),
+            "replay_cache": replay_cache.stats(),
+        },
+    )
+
+
 async def list_servers(request: Request) -> JSONResponse:
     registry: RegistryManager = request.app.state.registry
-    await registry.check_health()
+    await registry.refresh_if_stale()
 
+    now = time.monotonic()
     servers = registry.get_servers()
     return JSONResponse(
         {
@@ -109,6 +133,10 @@ async def list_servers(request: Request) -> JSONResponse:
                     "name": s.name,
                     "url": s.url,
                     "healthy": s.healthy,
+                    "active_games": s.active_games,
+                    "capacity_used": s.capacity_used,
+                    "max_capacity": s.max_capacity,
+                    "checked_seconds_ago": None if s.checked_at is None else round(now - s.checked_at, 1),
                 }
                 for s in servers
             ],
@@ -129,6 +157,11 @@ def create_app(
     game_assets_dir = Path(settings.game_assets_dir).resolve()
 
     matchmaking_manager = MatchmakingManager()
+    matchmaking_broadcaster = QueueUpdateBroadcaster(
+        matchmaking_manager,
+        interval=settings.matchmaking_update_seconds,
+        send_timeout=settings.matchmaking_send_timeout,
+    )
     room_connections = RoomConnectionManager()
     room_manager = LobbyRoomManager(
         room_ttl_seconds=300,
@@ -171,11 +204,13 @@ def create_app(
         Route("/matchmaking", protected_html(matchmaking_page), methods=["GET"], name="matchmaking_page"),
         # Protected JSON routes (return 401 JSON when unauthenticated)
         Route("/servers", protected_api(list_servers), methods=["GET"], name="list_servers"),
+        Route("/api/history", protected_api(history_api), methods=["GET"], name="history_api"),
         # WebSocket routes (auth handled inside the handlers)
         WebSocketRoute("/ws/rooms/{room_id}", room_websocket, name="room_websocket"),
         WebSocketRoute("/ws/matchmaking", matchmaking_websocket, name="matchmaking_websocket"),
         # Public routes
         Route("/health", public_route(health), methods=["GET"], name="health"),
+        Route("/status", public_route(status), methods=["GET"], name="status"),
         Route("/login", public_route(login_page), methods=["GET"], name="login_page"),
         Route("/login", public_route(login), methods=["POST"], name="login"),
         Route("/register", public_route(register_page), methods=["GET"], name="register_page"),
@@ -190,6 +225,18 @@ def create_app(
             name="bot_matchmaking_auth",
         ),
         Route("/api/replays/{game_id}", public_route(replay_content), methods=["GET"], name="replay_content"),
+        Route(
+            "/api/replays/{game_id}/rounds",
+            public_route(replay_rounds),
+            methods=["GET"],
+            name="replay_rounds",
+        ),
+        Route(
+            "/api/replays/{game_id}/rounds/{n:int}",
+            public_route(replay_round),
+            methods=["GET"],
+            name="replay_round",
+        ),
     ]
 
     if APP_VERSION == "dev":
@@ -218,12 +265,30 @@ def create_app(
     session_store = AuthSessionStore()
     hasher = get_hasher(auth_settings.password_hasher)
     auth_service = AuthService(player_repo, session_store, password_hasher=hasher)
+    registry = RegistryManager(
+        settings.config_path,
+        poll_interval=settings.registry_poll_seconds,
+        stale_after=settings.registry_stale_seconds,
+        probe_timeout=settings.registry_probe_timeout,
+        client_options=ClientOptions(
+            timeout=settings.game_server_timeout,
+            max_connections=settings.game_server_max_connections,
+            max_keepalive_connections=settings.game_server_max_keepalive,
+            keepalive_expiry=settings.game_server_keepalive_seconds,
+            http2=settings.game_server_http2,
+        ),
+    )
 
     @contextlib.asynccontextmanager
     async def lifespan(_app: Starlette) -> AsyncGenerator[None]:  # pragma: no cover
         session_store.start_cleanup()
         room_manager.start_reaper()
+        matchmaking_manager.start_matcher(handle_round_match, settings.matchmaking_round_seconds)
+        registry.start()
         yield
+        await registry.stop()
+        await matchmaking_manager.stop_matcher()
+        await matchmaking_broadcaster.stop()
         await room_manager.stop_reaper()
         await session_store.stop_cleanup()
         db.close()
@@ -244,7 +309,6 @@ def create_app(
     app.add_middleware(SecurityHeadersMiddleware, vite_dev_url=settings.vite_dev_url)  # type: ignore[arg-type]
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.allowed_hosts)  # type: ignore[arg-type]
 
-    registry = RegistryManager(settings.config_path)
     _attach_state(
         app,
         settings=settings,
@@ -256,6 +320,7 @@ def create_app(
         room_manager=room_manager,
         room_connections=room_connections,
         matchmaking_manager=matchmaking_manager,
+        matchmaking_broadcaster=matchmaking_broadcaster,
     )
 
     logger.info("lobby server ready")
@@ -274,9 +339,12 @@ def _attach_state(  # noqa: PLR0913
     room_manager: LobbyRoomManager,
     room_connections: RoomConnectionManager,
     matchmaking_manager: MatchmakingManager,
+    matchmaking_broadcaster: QueueUpdateBroadcaster,
 ) -> None:
     app.state.db = db
     app.state.game_repo = game_repo
+    app.state.history_cache = HistoryPageCache(ttl=settings.history_cache_seconds)
+    app.state.replay_cache = ReplayCache(settings.replay_cache_bytes)
     app.state.settings = settings
     app.state.auth_settings = auth_settings
     app.state.registry = registry
@@ -318,6 +386,7 @@ def _attach_state(  # noqa: PLR0913
     app.state.room_manager = room_manager
     app.state.room_connections = room_connections
     app.state.matchmaking_manager = matchmaking_manager
+    app.state.matchmaking_broadcaster = matchmaking_broadcaster
 
 
 def get_app() -> Starlette:  # pragma: no cover  # deadcode: ignore
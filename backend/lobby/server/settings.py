@@ -24,6 +24,27 @@ class LobbyServerSettings(BaseSettings):
     game_assets_dir: str = "frontend/dist"
     vite_dev_url: str = ""  # Set to "http://localhost:5173" via LOBBY_VITE_DEV_URL when running Vite dev server
     replay_dir: str = Field(default="backend/data/replays", min_length=1)
+    # Max age of the cached first /history page; 0 disables the cache.
+    history_cache_seconds: float = Field(default=5.0, ge=0)
+    # Memory budget for recently served replay files; 0 disables the cache.
+    replay_cache_bytes: int = Field(default=64 * 1024 * 1024, ge=0)
+    # Game server /status polling: interval, age after which the cached state is
+    # re-probed inline, and per-probe timeout (seconds).
+    registry_poll_seconds: float = Field(default=5.0, gt=0)
+    registry_stale_seconds: float = Field(default=15.0, gt=0)
+    registry_probe_timeout: float = Field(default=2.0, gt=0)
+    # Pooled keep-alive client per game server, shared by /status probes and POST /games.
+    # HTTP/2 needs the h2 package (httpx[http2]); without it the lobby uses HTTP/1.1.
+    game_server_timeout: float = Field(default=10.0, gt=0)
+    game_server_max_connections: int = Field(default=10, ge=1)
+    game_server_max_keepalive: int = Field(default=10, ge=0)
+    game_server_keepalive_seconds: float = Field(default=30.0, ge=0)
+    game_server_http2: bool = False
+    # Interval of the matchmaking round that matches players whose rating windows have widened.
+    matchmaking_round_seconds: float = Field(default=1.0, gt=0)
+    # queue_update broadcasts: at most one per interval, each send bounded by the timeout (seconds).
+    matchmaking_update_seconds: float = Field(default=0.5, gt=0)
+    matchmaking_send_timeout: float = Field(default=2.0, gt=0)
     ws_allowed_origin: str | None = "http://localhost:8710"
 
     @field_validator("cors_origins", mode="before")
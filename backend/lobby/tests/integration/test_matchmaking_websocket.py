@@ -1,6 +1,7 @@
 """Integration tests for matchmaking WebSocket handler."""
 
 import json
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -46,6 +47,7 @@ def _make_mock_entry(user_id: str, username: str, connection_id: str) -> QueueEn
     ws = MagicMock()
     ws.client_state = WebSocketState.CONNECTED
     ws.send_json = AsyncMock()
+    ws.send_text = AsyncMock()
     ws.close = AsyncMock()
     return QueueEntry(
         connection_id=connection_id,
@@ -256,6 +258,47 @@ class TestMatchmakingGameTransition:
         # Queue should be empty
         assert app.state.matchmaking_manager.queue_size == 0
 
+    def test_matchmaking_round_starts_game_for_queued_table(self, tmp_path):
+        """A table formed by the periodic round gets game_starting without a new connection."""
+        app = _make_app(tmp_path, matchmaking_round_seconds=0.01)
+        self._set_servers_healthy(app)
+        entries = self._prefill_queue(app, 4)
+        for entry in entries:
+            # handle_round_match reads app state through the first player's connection.
+            entry.websocket.app = app
+            entry.websocket.user.user_id = entry.user_id
+            entry.websocket.user.username = entry.username
+
+        mock_response = AsyncMock(spec=httpx.Response)
+        mock_response.status_code = 201
+        mock_response.text = ""
+
+        with (
+            patch.object(app.state.registry, "start"),
+            patch.object(app.state.registry, "check_health", new_callable=AsyncMock),
+            patch("lobby.game_transition.httpx.AsyncClient") as mock_client_cls,
+        ):
+            mock_client = AsyncMock()
+            mock_client.post = AsyncMock(return_value=mock_response)
+            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+            mock_client.__aexit__ = AsyncMock(return_value=False)
+            mock_client_cls.return_value = mock_client
+
+            with TestClient(app):
+                deadline = time.monotonic() + 5
+                while not entries[-1].websocket.send_json.called and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+        game_ids = set()
+        for entry in entries:
+            entry.websocket.send_json.assert_called_once()
+            message = entry.websocket.send_json.call_args[0][0]
+            assert message["type"] == "game_starting"
+            game_ids.add(message["game_id"])
+        assert len(game_ids) == 1
+        assert app.state.matchmaking_manager.queue_size == 0
+        assert not app.state.matchmaking_manager.has_user(entries[0].user_id)
+
     def test_game_server_failure_requeues_players(self, app, client):
         """When game server fails, matched players are re-queued."""
         self._set_servers_healthy(app)
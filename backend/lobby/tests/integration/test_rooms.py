@@ -46,6 +46,16 @@ servers:
         assert "version" in data
         assert "commit" in data
 
+    def test_status_reports_game_creation_metrics(self, client):
+        response = client.get("/status")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ok"
+        assert set(data["game_creation"]) == {"latency", "post_latency", "retries", "failures"}
+        assert "p99_ms" in data["game_creation"]["latency"]
+        assert {"broadcasts", "messages", "timeouts"} <= set(data["matchmaking_broadcast"])
+        assert data["replay_cache"]["entries"] == 0
+
     def test_list_servers(self, client):
         response = client.get("/servers")
         assert response.status_code == 200
@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import re
 from datetime import UTC, datetime, timedelta
 
 import pytest
@@ -472,6 +473,84 @@ class TestHistoryPage:
         assert "active-game" not in response.text
         assert "abandoned-game" not in response.text
 
+    def _create_completed_games(self, client, count: int) -> None:
+        now = datetime.now(UTC)
+        for i in range(count):
+            started_at = now - timedelta(hours=count - i)
+            game = PlayedGame(
+                game_id=f"game-{i:04d}",
+                started_at=started_at,
+                ended_at=started_at + timedelta(minutes=30),
+                end_reason="completed",
+                standings=[PlayedGameStanding(name="Alice", seat=0, score=40000, final_score=50)],
+            )
+            asyncio.run(client.app.state.game_repo.create_game(game))
+
+    def test_history_page_links_to_older_games(self, client):
+        """More completed games than one page: the page links to the next page by cursor."""
+        self._create_completed_games(client, 25)
+
+        first = client.get("/history")
+        assert "game-0024" in first.text
+        assert "game-0004" not in first.text
+        match = re.search(r'href="/history\?cursor=([^"]+)"', first.text)
+        assert match is not None
+
+        second = client.get(f"/history?cursor={match.group(1)}")
+        assert second.status_code == 200
+        assert "game-0004" in second.text
+        assert "game-0005" not in second.text
+        assert "/history?cursor=" not in second.text
+
+    def test_history_page_invalid_cursor(self, client):
+        response = client.get("/history?cursor=bogus")
+        assert response.status_code == 400
+
+    def test_history_page_unchanged_data_is_served_from_cache(self, client, monkeypatch):
+        """A repeat first-page request with an unchanged data_version does not query the repository."""
+        self._create_completed_games(client, 1)
+        game_repo = client.app.state.game_repo
+        calls = []
+        get_completed_games = game_repo.get_completed_games
+
+        async def counting_get_completed_games(**kwargs):
+            calls.append(kwargs)
+            return await get_completed_games(**kwargs)
+
+        monkeypatch.setattr(game_repo, "get_completed_games", counting_get_completed_games)
+
+        first = client.get("/history")
+        second = client.get("/history")
+
+        assert len(calls) == 1
+        assert "game-0000" in first.text
+        assert "game-0000" in second.text
+
+    def test_history_page_shows_game_finished_after_cached_render(self, client):
+        """The cached first page is dropped once a new commit lands."""
+        assert "No games played yet" in client.get("/history").text
+
+        self._create_completed_games(client, 1)
+
+        assert "game-0000" in client.get("/history").text
+
+    def test_history_api_pages_completed_games(self, client):
+        self._create_completed_games(client, 3)
+
+        first = client.get("/api/history?limit=2").json()
+        assert [g["game_id"] for g in first["games"]] == ["game-0002", "game-0001"]
+        assert first["games"][0]["standings"][0]["final_score"] == 50
+
+        second = client.get(f"/api/history?limit=2&cursor={first['next_cursor']}").json()
+        assert [g["game_id"] for g in second["games"]] == ["game-0000"]
+        assert second["next_cursor"] is None
+
+    @pytest.mark.parametrize("query", ["cursor=bogus", "limit=0", "limit=101", "limit=abc"])
+    def test_history_api_rejects_bad_params(self, client, query):
+        response = client.get(f"/api/history?{query}")
+        assert response.status_code == 400
+        assert "error" in response.json()
+
     def test_history_page_unauthenticated_redirects(self, tmp_path, monkeypatch):
         """Unauthenticated access to /history redirects to login."""
         monkeypatch.setattr("lobby.server.app.APP_VERSION", "dev")
@@ -2,7 +2,15 @@
 
 from __future__ import annotations
 
-from lobby.game_transition import sign_player_tickets
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from lobby.game_transition import GameTransitionError, create_game_on_server, sign_player_tickets
+from lobby.metrics import GameCreationStats
+from lobby.registry.manager import RegistryManager
 
 
 class TestSignPlayerTickets:
@@ -43,3 +51,169 @@ class TestSignPlayerTickets:
         ]
         _specs, ticket_map = sign_player_tickets(players, "game-123", "secret")
         assert ticket_map["conn1"] != ticket_map["conn2"]
+
+
+def _registry(tmp_path, loads):
+    """A registry of healthy servers s0, s1, ... with the given (capacity_used, max_capacity)."""
+    config = tmp_path / "servers.yaml"
+    entries = "".join(f'  - name: "s{i}"\n    url: "http://s{i}:8001"\n' for i in range(len(loads)))
+    config.write_text("servers:\n" + entries)
+    registry = RegistryManager(config_path=config)
+    for server, (capacity_used, max_capacity) in zip(registry.get_servers(), loads, strict=True):
+        server.healthy = True
+        server.capacity_used = capacity_used
+        server.max_capacity = max_capacity
+    return registry
+
+
+def _serve(handler):
+    """Patch httpx.AsyncClient so POST /games requests go to handler instead of the network."""
+    real_client = httpx.AsyncClient
+
+    def factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    return patch("lobby.game_transition.httpx.AsyncClient", side_effect=factory)
+
+
+class TestCreateGameOnServer:
+    @pytest.fixture(autouse=True)
+    def _no_health_check(self):
+        with patch.object(RegistryManager, "check_health", new_callable=AsyncMock):
+            yield
+
+    @pytest.fixture(autouse=True)
+    def stats(self, monkeypatch):
+        stats = GameCreationStats()
+        monkeypatch.setattr("lobby.game_transition.game_creation_stats", stats)
+        return stats
+
+    async def test_places_game_on_least_loaded_server(self, tmp_path):
+        registry = _registry(tmp_path, [(90, 100), (10, 100)])
+        hosts = []
+
+        def handler(request):
+            hosts.append(request.url.host)
+            return httpx.Response(201, json={"status": "pending"})
+
+        with _serve(handler):
+            ws_url = await create_game_on_server("game-1", [], 3, registry)
+
+        assert hosts == ["s1"]
+        assert ws_url == "ws://s1:8001/ws/game-1"
+        assert registry.get_servers()[1].capacity_used == 11
+
+    async def test_retries_on_another_server_after_503(self, tmp_path):
+        registry = _registry(tmp_path, [(10, 100), (50, 100)])
+        hosts = []
+
+        def handler(request):
+            hosts.append(request.url.host)
+            if request.url.host == "s0":
+                return httpx.Response(503, json={"error": "Server at capacity"})
+            return httpx.Response(201)
+
+        with _serve(handler):
+            ws_url = await create_game_on_server("game-1", [], 3, registry)
+
+        assert hosts == ["s0", "s1"]
+        assert ws_url == "ws://s1:8001/ws/game-1"
+        assert registry.get_servers()[0].is_full
+
+    async def test_retries_on_another_server_after_connect_error(self, tmp_path):
+        registry = _registry(tmp_path, [(10, 100), (50, 100)])
+
+        def handler(request):
+            if request.url.host == "s0":
+                raise httpx.ConnectError("Connection refused", request=request)
+            return httpx.Response(201)
+
+        with _serve(handler):
+            ws_url = await create_game_on_server("game-1", [], 3, registry)
+
+        assert ws_url == "ws://s1:8001/ws/game-1"
+        assert registry.get_servers()[0].healthy is False
+
+    async def test_all_servers_full_raises(self, tmp_path):
+        registry = _registry(tmp_path, [(10, 100), (50, 100)])
+
+        with _serve(lambda request: httpx.Response(503)), pytest.raises(GameTransitionError, match="503"):
+            await create_game_on_server("game-1", [], 3, registry)
+
+    async def test_other_errors_are_not_retried(self, tmp_path):
+        registry = _registry(tmp_path, [(10, 100), (50, 100)])
+        hosts = []
+
+        def handler(request):
+            hosts.append(request.url.host)
+            return httpx.Response(400, text="bad request")
+
+        with _serve(handler), pytest.raises(GameTransitionError, match="400"):
+            await create_game_on_server("game-1", [], 3, registry)
+
+        assert hosts == ["s0"]
+
+    async def test_request_errors_after_connecting_are_not_retried(self, tmp_path):
+        registry = _registry(tmp_path, [(10, 100), (50, 100)])
+        hosts = []
+
+        def handler(request):
+            hosts.append(request.url.host)
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        with _serve(handler), pytest.raises(GameTransitionError, match="timed out"):
+            await create_game_on_server("game-1", [], 3, registry)
+
+        # The game may have been created, so it is not placed on another server.
+        assert hosts == ["s0"]
+        assert registry.get_servers()[0].healthy is True
+
+    async def test_fresh_registry_state_is_not_probed_again(self, tmp_path):
+        registry = _registry(tmp_path, [(10, 100)])
+        for server in registry.get_servers():
+            server.checked_at = time.monotonic()
+
+        with _serve(lambda request: httpx.Response(201)):
+            await create_game_on_server("game-1", [], 3, registry)
+
+        registry.check_health.assert_not_awaited()
+
+    async def test_no_healthy_servers_raises(self, tmp_path):
+        registry = _registry(tmp_path, [(10, 100)])
+        registry.get_servers()[0].healthy = False
+
+        with pytest.raises(GameTransitionError, match="No healthy game servers"):
+            await create_game_on_server("game-1", [], 3, registry)
+
+    async def test_records_latency_retries_and_failures(self, tmp_path, stats):
+        registry = _registry(tmp_path, [(10, 100), (50, 100)])
+
+        def handler(request):
+            return httpx.Response(503 if request.url.host == "s0" else 201)
+
+        with _serve(handler):
+            await create_game_on_server("game-1", [], 3, registry)
+        with _serve(lambda request: httpx.Response(400)), pytest.raises(GameTransitionError):
+            await create_game_on_server("game-2", [], 3, registry)
+
+        assert (stats.latency.count, stats.retries, stats.failures) == (1, 1, 1)
+        assert list(stats.post_latency) == ["s1"]
+
+    async def test_reuses_pooled_client_across_games(self, tmp_path):
+        registry = _registry(tmp_path, [(10, 100)])
+        connections = []
+
+        def handler(request):
+            return httpx.Response(201)
+
+        with _serve(handler) as client_cls:
+            registry.start()
+            try:
+                for n in range(3):
+                    await create_game_on_server(f"game-{n}", [], 3, registry)
+                connections.append(client_cls.call_count)
+            finally:
+                await registry.stop()
+
+        # One pooled client for the one server, none created per game.
+        assert connections == [1]
@@ -1,12 +1,19 @@
 """Tests for lobby handler utility functions."""
 
 import json
+import time
 from datetime import UTC, datetime, timedelta
 
 import pytest
 
 from lobby.views.assets import load_vite_manifest, resolve_vite_asset_urls
-from lobby.views.history_handlers import _format_duration, _prepare_history_for_display
+from lobby.views.history_handlers import (
+    HistoryPageCache,
+    _format_duration,
+    _prepare_history_for_display,
+    decode_cursor,
+    encode_cursor,
+)
 from shared.dal.models import PlayedGame, PlayedGameStanding
 
 
@@ -219,3 +226,44 @@ class TestPrepareGamesForDisplay:
         game = PlayedGame(game_id="g", started_at=now, standings=[])
         result = _prepare_history_for_display([game])
         assert result[0]["players"] == []
+
+
+class TestHistoryCursor:
+    def test_round_trips_started_at_and_game_id(self):
+        started_at = datetime(2025, 1, 15, 12, 0, 0, tzinfo=UTC)
+        game = PlayedGame(game_id="g-1", started_at=started_at)
+
+        assert decode_cursor(encode_cursor(game)) == (started_at, "g-1")
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", "bm90IGpzb24", "WzEsMiwzXQ", "WyJub3QgYSBkYXRlIiwgImciXQ"])
+    def test_rejects_malformed_cursor(self, cursor):
+        with pytest.raises(ValueError, match="invalid history cursor"):
+            decode_cursor(cursor)
+
+
+class TestHistoryPageCache:
+    def test_hit_while_fresh_and_version_unchanged(self):
+        cache = HistoryPageCache(ttl=60)
+        cache.put(1, [{"game": "g"}], "next")
+
+        assert cache.get(1) == ([{"game": "g"}], "next")
+
+    def test_miss_after_a_commit(self):
+        cache = HistoryPageCache(ttl=60)
+        cache.put(1, [], None)
+
+        assert cache.get(2) is None
+
+    def test_miss_after_ttl(self, monkeypatch):
+        cache = HistoryPageCache(ttl=5)
+        cache.put(1, [], None)
+        later = time.monotonic() + 5
+        monkeypatch.setattr("lobby.views.history_handlers.time.monotonic", lambda: later)
+
+        assert cache.get(1) is None
+
+    def test_zero_ttl_disables_cache(self):
+        cache = HistoryPageCache(ttl=0)
+        cache.put(1, [], None)
+
+        assert cache.get(1) is None
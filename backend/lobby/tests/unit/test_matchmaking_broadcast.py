@@ -0,0 +1,166 @@
+"""Unit tests for coalesced matchmaking queue_update broadcasts."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from starlette.websockets import WebSocketState
+
+from lobby.matchmaking.broadcast import SEND_TIMEOUT_CLOSE_CODE, QueueUpdateBroadcaster
+from lobby.matchmaking.manager import MatchmakingManager
+from lobby.matchmaking.models import QueueEntry
+from lobby.metrics import QueueBroadcastStats
+
+
+@pytest.fixture(autouse=True)
+def stats(monkeypatch):
+    stats = QueueBroadcastStats()
+    monkeypatch.setattr("lobby.matchmaking.broadcast.queue_broadcast_stats", stats)
+    return stats
+
+
+def _mock_ws(send_side_effect: object = None) -> MagicMock:
+    ws = MagicMock()
+    ws.client_state = WebSocketState.CONNECTED
+    ws.send_text = AsyncMock(side_effect=send_side_effect)
+    ws.close = AsyncMock()
+    return ws
+
+
+def _queue(mgr: MatchmakingManager, name: str, ws: MagicMock) -> QueueEntry:
+    entry = QueueEntry(connection_id=name, user_id=name, username=name, websocket=ws)
+    mgr.add_player(entry)
+    return entry
+
+
+def _add(mgr: MatchmakingManager, *names: str) -> list[QueueEntry]:
+    return [_queue(mgr, name, _mock_ws()) for name in names]
+
+
+async def _hang(_payload: str) -> None:
+    await asyncio.Event().wait()
+
+
+def _sizes(entry: QueueEntry) -> list[int]:
+    return [json.loads(call.args[0])["queue_size"] for call in entry.websocket.send_text.call_args_list]
+
+
+class TestBroadcast:
+    async def test_sends_the_same_payload_to_every_player(self, stats):
+        mgr = MatchmakingManager()
+        entries = _add(mgr, "a", "b", "c")
+
+        await QueueUpdateBroadcaster(mgr, interval=1, send_timeout=1).broadcast()
+
+        payloads = {entry.websocket.send_text.call_args.args[0] for entry in entries}
+        assert len(payloads) == 1
+        assert json.loads(payloads.pop()) == {"type": "queue_update", "queue_size": 3}
+        assert (stats.broadcasts, stats.messages, stats.duration.count) == (1, 3, 1)
+
+    async def test_skips_players_who_know_the_size(self):
+        mgr = MatchmakingManager()
+        a, b = _add(mgr, "a", "b")
+        broadcaster = QueueUpdateBroadcaster(mgr, interval=1, send_timeout=1)
+        broadcaster.mark_sent("b", 2)
+
+        await broadcaster.broadcast()
+        await broadcaster.broadcast()
+
+        assert _sizes(a) == [2]
+        assert _sizes(b) == []
+
+    async def test_skips_disconnected_players(self):
+        mgr = MatchmakingManager()
+        a, b = _add(mgr, "a", "b")
+        b.websocket.client_state = WebSocketState.DISCONNECTED
+
+        await QueueUpdateBroadcaster(mgr, interval=1, send_timeout=1).broadcast()
+
+        assert _sizes(a) == [2]
+        assert _sizes(b) == []
+
+    async def test_slow_socket_times_out_without_holding_up_others(self, stats):
+        mgr = MatchmakingManager()
+        slow_ws = _mock_ws(_hang)
+        _queue(mgr, "slow", slow_ws)
+        (fast,) = _add(mgr, "fast")
+        broadcaster = QueueUpdateBroadcaster(mgr, interval=1, send_timeout=0.01)
+
+        await broadcaster.broadcast()
+
+        assert _sizes(fast) == [2]
+        assert (stats.messages, stats.timeouts) == (1, 1)
+        slow_ws.close.assert_awaited_once_with(code=SEND_TIMEOUT_CLOSE_CODE, reason="send_timeout")
+
+    async def test_timed_out_socket_is_not_sent_to_again(self):
+        mgr = MatchmakingManager()
+        slow_ws = _mock_ws(_hang)
+        _queue(mgr, "slow", slow_ws)
+        broadcaster = QueueUpdateBroadcaster(mgr, interval=1, send_timeout=0.01)
+        await broadcaster.broadcast()
+        _add(mgr, "other")
+
+        await broadcaster.broadcast()
+
+        assert slow_ws.send_text.await_count == 1
+
+    async def test_failed_send_is_retried(self):
+        mgr = MatchmakingManager()
+        ws = _mock_ws([RuntimeError("closed"), None])
+        _queue(mgr, "a", ws)
+        broadcaster = QueueUpdateBroadcaster(mgr, interval=1, send_timeout=1)
+
+        await broadcaster.broadcast()
+        await broadcaster.broadcast()
+
+        assert ws.send_text.await_count == 2
+
+    async def test_failed_send_is_counted(self, stats):
+        mgr = MatchmakingManager()
+        _queue(mgr, "a", _mock_ws(RuntimeError("closed")))
+
+        await QueueUpdateBroadcaster(mgr, interval=1, send_timeout=1).broadcast()
+
+        assert (stats.messages, stats.failures) == (0, 1)
+
+
+class TestNotify:
+    async def test_burst_of_changes_is_coalesced(self, stats):
+        mgr = MatchmakingManager()
+        broadcaster = QueueUpdateBroadcaster(mgr, interval=0.05, send_timeout=1)
+        (first,) = _add(mgr, "first")
+        sent = asyncio.Event()
+        first.websocket.send_text.side_effect = lambda _payload: sent.set()
+        broadcaster.notify()
+        await sent.wait()
+        for n in range(10):
+            async with mgr.lock:
+                _add(mgr, f"p{n}")
+            broadcaster.notify()
+            await asyncio.sleep(0)
+
+        assert broadcaster._task is not None
+        await broadcaster._task
+
+        # One broadcast on the leading edge, one for everything after it.
+        assert _sizes(first) == [1, 11]
+        assert stats.notifications == 11
+        assert stats.broadcasts == 2
+
+    async def test_stop_cancels_pending_broadcast(self):
+        mgr = MatchmakingManager()
+        (a,) = _add(mgr, "a")
+        broadcaster = QueueUpdateBroadcaster(mgr, interval=10, send_timeout=1)
+        sent = asyncio.Event()
+        a.websocket.send_text.side_effect = lambda _payload: sent.set()
+        broadcaster.notify()
+        await sent.wait()
+        _add(mgr, "b")
+        broadcaster.notify()
+
+        await broadcaster.stop()
+
+        assert _sizes(a) == [1]
@@ -2,23 +2,39 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import MagicMock
 
 import pytest
 
 from lobby.matchmaking.manager import MatchmakingManager
-from lobby.matchmaking.models import MATCHMAKING_SEATS, QueueEntry
+from lobby.matchmaking.models import DEFAULT_RATING, MATCHMAKING_SEATS, QueueEntry
 
 
-def _make_entry(user_id: str = "u1", username: str = "alice", connection_id: str = "c1") -> QueueEntry:
+def _make_entry(
+    user_id: str = "u1",
+    username: str = "alice",
+    connection_id: str = "c1",
+    *,
+    rating: float = DEFAULT_RATING,
+    queued_at: float = 0.0,
+) -> QueueEntry:
     return QueueEntry(
         connection_id=connection_id,
         user_id=user_id,
         username=username,
         websocket=MagicMock(),
+        rating=rating,
+        queued_at=queued_at,
     )
 
 
+def _add_rated(mgr: MatchmakingManager, *ratings: float, queued_at: float = 0.0) -> None:
+    for rating in ratings:
+        name = f"r{int(rating)}"
+        mgr.add_player(_make_entry(user_id=name, username=name, connection_id=name, rating=rating, queued_at=queued_at))
+
+
 class TestAddPlayer:
     def test_add_increments_queue_size(self):
         mgr = MatchmakingManager()
@@ -157,3 +173,150 @@ class TestHasUser:
     def test_returns_false_for_absent_user(self):
         mgr = MatchmakingManager()
         assert mgr.has_user("u1") is False
+
+
+class TestRatingWindows:
+    def test_matches_closest_ratings_within_window(self):
+        mgr = MatchmakingManager(initial_window=100, window_growth=0)
+        _add_rated(mgr, 1000, 1040, 1060, 1090, 1400, 2000)
+
+        matched = mgr.try_match("r1000", now=0)
+
+        assert matched is not None
+        assert [e.rating for e in matched] == [1000, 1040, 1060, 1090]
+        assert [e.rating for e in mgr.get_queue_entries()] == [1400, 2000]
+
+    def test_no_match_when_too_few_players_in_window(self):
+        mgr = MatchmakingManager(initial_window=100, window_growth=0)
+        _add_rated(mgr, 1000, 1050, 1200, 1300)
+
+        assert mgr.try_match(now=0) is None
+        assert mgr.queue_size == 4
+
+    def test_window_widens_with_waiting_time(self):
+        mgr = MatchmakingManager(initial_window=100, window_growth=10)
+        _add_rated(mgr, 1000, 1050, 1200, 1300)
+
+        assert mgr.try_match("r1000", now=10) is None
+        matched = mgr.try_match("r1000", now=20)
+
+        assert matched is not None
+        assert mgr.rating_window(matched[0], now=20) == 300
+
+    def test_prefers_closest_rating_over_waiting_time(self):
+        mgr = MatchmakingManager(initial_window=500, window_growth=0)
+        _add_rated(mgr, 1400)
+        _add_rated(mgr, 1000, 1010, 1020, 1030, queued_at=5)
+
+        matched = mgr.try_match("r1000", now=5)
+
+        assert matched is not None
+        assert [e.rating for e in matched] == [1000, 1010, 1020, 1030]
+
+    def test_remove_drops_player_from_rating_index(self):
+        mgr = MatchmakingManager(initial_window=100, window_growth=0)
+        _add_rated(mgr, 1000, 1010, 1020, 1030)
+        mgr.remove_player("r1010")
+        _add_rated(mgr, 2000)
+
+        assert mgr.try_match(now=0) is None
+        assert mgr._bucket_keys == [20, 40]
+
+
+class TestMatchRound:
+    def test_forms_every_table_it_can(self):
+        mgr = MatchmakingManager(initial_window=100, window_growth=0)
+        _add_rated(mgr, 1000, 2000, 1010, 2010, 1020, 2020, 1030, 2030, 3000)
+
+        tables = mgr.match_round(now=0)
+
+        assert sorted([e.rating for e in table] for table in tables) == [
+            [1000, 1010, 1020, 1030],
+            [2000, 2010, 2020, 2030],
+        ]
+        assert [e.rating for e in mgr.get_queue_entries()] == [3000]
+
+    def test_skips_anchors_already_seated(self):
+        mgr = MatchmakingManager(initial_window=100, window_growth=0)
+        _add_rated(mgr, 1000, 2000, 2010, 2020, 2030, 2040, 2050, 2060)
+
+        (table,) = mgr.match_round(now=0)
+
+        assert [e.rating for e in table] == [2000, 2010, 2020, 2030]
+        assert [e.rating for e in mgr.get_queue_entries()] == [1000, 2040, 2050, 2060]
+
+    def test_longest_waiting_player_anchors_first(self):
+        mgr = MatchmakingManager(initial_window=100, window_growth=10)
+        _add_rated(mgr, 1000, queued_at=0)
+        _add_rated(mgr, 1150, 1160, 1170, 1180, queued_at=9)
+
+        (table,) = mgr.match_round(now=10)
+
+        # r1000 has waited 10s (window 200), so it takes the three closest.
+        assert [e.rating for e in table] == [1000, 1150, 1160, 1170]
+        assert [e.rating for e in mgr.get_queue_entries()] == [1180]
+
+    def test_requeued_players_keep_their_wait(self):
+        mgr = MatchmakingManager(initial_window=100, window_growth=10)
+        _add_rated(mgr, 1000, 1010, 1020, 1030, queued_at=0)
+        matched = mgr.match_round(now=0)[0]
+        mgr.requeue_at_front(matched[:1])
+        _add_rated(mgr, 1250, 1260, 1270, queued_at=30)
+
+        (table,) = mgr.match_round(now=30)
+
+        assert [e.rating for e in table] == [1000, 1250, 1260, 1270]
+
+    def test_requeued_players_are_seated_before_newer_joins(self):
+        mgr = MatchmakingManager()
+        for name in ("p1", "p2", "p3", "p4"):
+            mgr.add_player(_make_entry(user_id=name, username=name, connection_id=name))
+        matched = mgr.try_match(now=0)
+        assert matched is not None
+        for name in ("x", "y"):
+            mgr.add_player(_make_entry(user_id=name, username=name, connection_id=name))
+        mgr.requeue_at_front(matched[:3])
+
+        (table,) = mgr.match_round(now=0)
+
+        assert [e.username for e in table] == ["p1", "p2", "p3", "x"]
+        assert [e.username for e in mgr.get_queue_entries()] == ["y"]
+
+
+class TestMatcher:
+    async def test_hands_each_round_table_to_on_match(self):
+        mgr = MatchmakingManager()
+        _add_rated(mgr, 1500, 1510, 1520, 1530)
+        tables: asyncio.Queue[list[QueueEntry]] = asyncio.Queue()
+
+        async def on_match(table: list[QueueEntry]) -> None:
+            await tables.put(table)
+
+        mgr.start_matcher(on_match, interval=0.001)
+        mgr.start_matcher(on_match, interval=0.001)
+        table = await asyncio.wait_for(tables.get(), timeout=1)
+        await mgr.stop_matcher()
+        await mgr.stop_matcher()
+
+        assert [entry.user_id for entry in table] == ["r1500", "r1510", "r1520", "r1530"]
+        assert mgr.queue_size == 0
+
+    async def test_failed_round_does_not_stop_the_matcher(self):
+        mgr = MatchmakingManager()
+        _add_rated(mgr, 1500, 1510, 1520, 1530)
+        tables: asyncio.Queue[list[QueueEntry]] = asyncio.Queue()
+        failed = False
+
+        async def on_match(table: list[QueueEntry]) -> None:
+            nonlocal failed
+            if not failed:
+                failed = True
+                _add_rated(mgr, 1600, 1610, 1620, 1630)
+                raise RuntimeError("game server exploded")
+            await tables.put(table)
+
+        mgr.start_matcher(on_match, interval=0.001)
+        table = await asyncio.wait_for(tables.get(), timeout=1)
+        await mgr.stop_matcher()
+
+        assert [entry.user_id for entry in table] == ["r1600", "r1610", "r1620", "r1630"]
@@ -0,0 +1,61 @@
+"""Tests for the lobby's in-process latency metrics."""
+
+import json
+
+from lobby.metrics import LATENCY_BUCKETS_MS, GameCreationStats, LatencyHistogram
+
+
+class TestLatencyHistogram:
+    def test_empty_histogram_has_no_quantiles(self):
+        stats = LatencyHistogram().stats()
+
+        assert stats["count"] == 0
+        assert stats["mean_ms"] is None
+        assert stats["p50_ms"] is None
+
+    def test_observations_land_in_their_buckets(self):
+        histogram = LatencyHistogram()
+        for seconds in (0.001, 0.005, 0.007, 0.2, 30.0):
+            histogram.observe(seconds)
+
+        buckets = histogram.stats()["buckets"]
+
+        assert buckets["le_5"] == 2
+        assert buckets["le_10"] == 1
+        assert buckets["le_250"] == 1
+        assert buckets["inf"] == 1
+        assert sum(buckets.values()) == 5
+        assert len(buckets) == len(LATENCY_BUCKETS_MS) + 1
+
+    def test_quantiles_are_bucket_upper_bounds(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.observe(0.003)
+        for _ in range(10):
+            histogram.observe(0.4)
+
+        assert histogram.quantile(0.5) == 5
+        assert histogram.quantile(0.9) == 5
+        assert histogram.quantile(0.95) == 500
+        assert histogram.stats()["mean_ms"] == 42.7
+
+    def test_stats_are_json_serializable_with_unbounded_quantiles(self):
+        histogram = LatencyHistogram()
+        histogram.observe(60.0)
+
+        stats = histogram.stats()
+
+        assert stats["p99_ms"] == "+inf"
+        json.dumps(stats, allow_nan=False)
+
+
+class TestGameCreationStats:
+    def test_post_latency_is_kept_per_server(self):
+        stats = GameCreationStats()
+        stats.observe_post("a", 0.01)
+        stats.observe_post("a", 0.02)
+        stats.observe_post("b", 0.03)
+
+        summary = stats.stats()
+
+        assert {name: h["count"] for name, h in summary["post_latency"].items()} == {"a": 2, "b": 1}
@@ -1,9 +1,12 @@
-from unittest.mock import AsyncMock, patch
+import asyncio
+import time
+from unittest.mock import patch
 
 import httpx
 import pytest
 
 from lobby.registry.manager import RegistryManager
+from lobby.registry.types import ClientOptions
 
 
 class TestRegistryManagerLoadConfig:
@@ -60,72 +63,299 @@ class TestRegistryManagerGetServers:
         assert len(manager.get_servers()) == 1
 
 
-class TestRegistryManagerGetHealthyServers:
-    def test_filters_unhealthy_servers(self, tmp_path):
-        config = tmp_path / "servers.yaml"
-        config.write_text(
-            'servers:\n  - name: "up"\n    url: "http://up:8001"\n  - name: "down"\n    url: "http://down:8002"\n',
-        )
-        manager = RegistryManager(config_path=config)
-        manager.get_servers()  # all unhealthy by default
-        assert manager.get_healthy_servers() == []
+def _mock_client(handler):
+    """Patch httpx.AsyncClient so requests go to handler instead of the network."""
+    real_client = httpx.AsyncClient
+
+    def factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    return patch("lobby.registry.manager.httpx.AsyncClient", side_effect=factory)
 
-        # Mark one as healthy
-        manager._servers[0].healthy = True
-        healthy = manager.get_healthy_servers()
-        assert len(healthy) == 1
-        assert healthy[0].name == "up"
+
+def _status(capacity_used=0, max_capacity=100, **extra):
+    return {
+        "status": "ok",
+        "active_games": capacity_used,
+        "pending_games": 0,
+        "capacity_used": capacity_used,
+        "max_capacity": max_capacity,
+        **extra,
+    }
+
+
+def _manager(tmp_path, *names, **kwargs):
+    config = tmp_path / "servers.yaml"
+    config.write_text("servers:\n" + "".join(f'  - name: "{n}"\n    url: "http://{n}:8001"\n' for n in names))
+    return RegistryManager(config_path=config, **kwargs)
 
 
 class TestRegistryManagerCheckHealth:
     @pytest.mark.asyncio
     async def test_marks_server_healthy_on_200(self, tmp_path):
-        config = tmp_path / "servers.yaml"
-        config.write_text('servers:\n  - name: "s1"\n    url: "http://s1:8001"\n')
-        manager = RegistryManager(config_path=config)
+        manager = _manager(tmp_path, "s1")
+
+        with _mock_client(lambda request: httpx.Response(200, json=_status())):
+            await manager.check_health()
 
-        mock_response = AsyncMock()
-        mock_response.status_code = 200
+        assert manager._servers[0].healthy is True
+
+    @pytest.mark.asyncio
+    async def test_polls_status_and_records_load(self, tmp_path):
+        manager = _manager(tmp_path, "s1")
+        paths = []
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_instance
-            mock_instance.get.return_value = mock_response
+        def handler(request):
+            paths.append(request.url.path)
+            return httpx.Response(200, json=_status(capacity_used=30, max_capacity=120, pending_games=2))
+
+        with _mock_client(handler):
+            await manager.check_health()
+
+        server = manager._servers[0]
+        assert paths == ["/status"]
+        assert (server.capacity_used, server.max_capacity, server.load) == (30, 120, 0.25)
+
+    @pytest.mark.asyncio
+    async def test_malformed_status_keeps_previous_load(self, tmp_path):
+        manager = _manager(tmp_path, "s1")
+        manager._servers[0].max_capacity = 100
 
+        with _mock_client(lambda request: httpx.Response(200, text="not json")):
             await manager.check_health()
 
         assert manager._servers[0].healthy is True
+        assert manager._servers[0].max_capacity == 100
 
     @pytest.mark.asyncio
     async def test_marks_server_unhealthy_on_non_200(self, tmp_path):
-        config = tmp_path / "servers.yaml"
-        config.write_text('servers:\n  - name: "s1"\n    url: "http://s1:8001"\n')
-        manager = RegistryManager(config_path=config)
+        manager = _manager(tmp_path, "s1")
         manager._servers[0].healthy = True  # pre-set to healthy
 
-        mock_response = AsyncMock()
-        mock_response.status_code = 500
-
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_instance
-            mock_instance.get.return_value = mock_response
-
+        with _mock_client(lambda request: httpx.Response(500)):
             await manager.check_health()
 
         assert manager._servers[0].healthy is False
 
     @pytest.mark.asyncio
     async def test_marks_server_unhealthy_on_connection_error(self, tmp_path):
-        config = tmp_path / "servers.yaml"
-        config.write_text('servers:\n  - name: "s1"\n    url: "http://s1:8001"\n')
-        manager = RegistryManager(config_path=config)
+        manager = _manager(tmp_path, "s1")
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_instance
-            mock_instance.get.side_effect = httpx.RequestError("Connection refused")
+        def handler(request):
+            raise httpx.ConnectError("Connection refused", request=request)
 
+        with _mock_client(handler):
             await manager.check_health()
 
         assert manager._servers[0].healthy is False
+
+
+def _set_load(manager, loads):
+    for server, (capacity_used, max_capacity) in zip(manager._servers, loads, strict=True):
+        server.healthy = True
+        server.capacity_used = capacity_used
+        server.max_capacity = max_capacity
+
+
+class TestRegistryManagerPlacementOrder:
+    def test_two_servers_prefer_the_less_loaded(self, tmp_path):
+        manager = _manager(tmp_path, "busy", "idle")
+        _set_load(manager, [(80, 100), (10, 100)])
+
+        for _ in range(20):
+            assert [s.name for s in manager.placement_order()] == ["idle", "busy"]
+
+    def test_load_is_weighted_by_capacity(self, tmp_path):
+        manager = _manager(tmp_path, "small", "big")
+        # 40 games on a 400-game box is a lighter load than 20 on a 50-game box.
+        _set_load(manager, [(20, 50), (40, 400)])
+
+        assert manager.placement_order()[0].name == "big"
+
+    def test_full_and_unhealthy_servers(self, tmp_path):
+        manager = _manager(tmp_path, "full", "ok", "down")
+        _set_load(manager, [(100, 100), (50, 100), (0, 100)])
+        manager._servers[2].healthy = False
+
+        assert [s.name for s in manager.placement_order()] == ["ok", "full"]
+
+    def test_power_of_two_choices_never_picks_the_most_loaded_first(self, tmp_path):
+        manager = _manager(tmp_path, "a", "b", "c", "d")
+        _set_load(manager, [(10, 100), (20, 100), (30, 100), (90, 100)])
+
+        firsts = {manager.placement_order()[0].name for _ in range(200)}
+
+        assert "d" not in firsts
+        assert firsts == {"a", "b", "c"}
+
+    def test_fallbacks_are_ordered_by_load(self, tmp_path):
+        manager = _manager(tmp_path, "a", "b", "c", "d")
+        _set_load(manager, [(40, 100), (30, 100), (20, 100), (10, 100)])
+
+        for _ in range(20):
+            first, *rest = manager.placement_order()
+            assert [s.load for s in rest] == sorted(s.load for s in rest)
+            assert first not in rest
+
+    def test_recorded_placements_shift_the_next_choice(self, tmp_path):
+        manager = _manager(tmp_path, "a", "b")
+        _set_load(manager, [(10, 100), (11, 100)])
+
+        for _ in range(3):
+            manager.record_game_placed(manager.placement_order()[0])
+
+        assert [s.capacity_used for s in manager._servers] == [12, 12]
+
+    def test_record_server_full_moves_it_last(self, tmp_path):
+        manager = _manager(tmp_path, "a", "b")
+        _set_load(manager, [(10, 100), (50, 100)])
+
+        manager.record_server_full(manager._servers[0])
+
+        assert [s.name for s in manager.placement_order()] == ["b", "a"]
+
+    def test_record_server_full_without_known_capacity(self, tmp_path):
+        manager = _manager(tmp_path, "a", "b")
+        _set_load(manager, [(0, 0), (0, 0)])
+
+        manager.record_server_full(manager._servers[0])
+
+        assert manager._servers[0].is_full
+        assert [s.name for s in manager.placement_order()] == ["b", "a"]
+
+
+class TestRegistryManagerPolling:
+    async def test_probes_servers_concurrently(self, tmp_path):
+        manager = _manager(tmp_path, "a", "b", "c")
+        arrived = 0
+        all_arrived = asyncio.Event()
+
+        async def handler(request):
+            nonlocal arrived
+            arrived += 1
+            if arrived == 3:
+                all_arrived.set()
+            # Serial probes would never get past the first server.
+            await asyncio.wait_for(all_arrived.wait(), timeout=1)
+            return httpx.Response(200, json=_status())
+
+        with _mock_client(handler):
+            await manager.check_health()
+
+        assert [s.healthy for s in manager.get_servers()] == [True, True, True]
+
+    async def test_records_check_time(self, tmp_path):
+        manager = _manager(tmp_path, "s1")
+        assert manager.is_stale()
+
+        with _mock_client(lambda request: httpx.Response(500)):
+            await manager.check_health()
+
+        assert manager._servers[0].checked_at is not None
+        assert not manager.is_stale()
+
+    async def test_refresh_if_stale_uses_cached_state_when_fresh(self, tmp_path):
+        manager = _manager(tmp_path, "s1")
+        probes = []
+
+        def handler(request):
+            probes.append(request.url.path)
+            return httpx.Response(200, json=_status())
+
+        with _mock_client(handler):
+            await manager.refresh_if_stale()
+            await manager.refresh_if_stale()
+            manager._servers[0].checked_at = time.monotonic() - 60
+            await manager.refresh_if_stale()
+
+        assert len(probes) == 2
+
+    async def test_background_poller_uses_pooled_clients(self, tmp_path):
+        manager = _manager(tmp_path, "a", "b", poll_interval=0.01)
+        probes = []
+
+        def handler(request):
+            probes.append(request.url.host)
+            return httpx.Response(200, json=_status())
+
+        with _mock_client(handler) as client_cls:
+            manager.start()
+            for _ in range(100):
+                if len(probes) >= 6:
+                    break
+                await asyncio.sleep(0.01)
+            clients = list(manager._clients.values())
+            await manager.stop()
+
+        assert len(probes) >= 6
+        # One client per server for the registry's lifetime, closed on stop().
+        assert client_cls.call_count == 2
+        assert all(client.is_closed for client in clients)
+        assert all(server.healthy for server in manager.get_servers())
+
+    async def test_unexpected_probe_error_marks_server_down_and_polling_continues(self, tmp_path):
+        manager = _manager(tmp_path, "a", "b", poll_interval=0.01)
+        probes = []
+
+        def handler(request):
+            probes.append(request.url.host)
+            if request.url.host == "a":
+                raise httpx.InvalidURL("bad host")
+            return httpx.Response(200, json=_status())
+
+        with _mock_client(handler):
+            manager.start()
+            for _ in range(100):
+                if probes.count("a") >= 3:
+                    break
+                await asyncio.sleep(0.01)
+            await manager.stop()
+
+        assert probes.count("a") >= 3
+        assert [s.healthy for s in manager.get_servers()] == [False, True]
+
+    async def test_start_is_idempotent(self, tmp_path):
+        manager = _manager(tmp_path, "a", poll_interval=60)
+
+        with _mock_client(lambda request: httpx.Response(200, json=_status())) as client_cls:
+            manager.start()
+            task = manager._poll_task
+            manager.start()
+            await manager.stop()
+
+        assert client_cls.call_count == 1
+        assert task is not None
+        assert task.cancelled()
+
+
+class TestRegistryManagerClients:
+    async def test_client_is_the_servers_pooled_client_after_start(self, tmp_path):
+        manager = _manager(tmp_path, "a", "b", client_options=ClientOptions(timeout=3.0, max_connections=4))
+        a, b = manager.get_servers()
+        manager.start()
+        try:
+            async with manager.client(a) as first, manager.client(a) as second, manager.client(b) as other:
+                assert first is second
+                assert first is not other
+                assert first.timeout.read == 3.0
+                assert not first.is_closed
+        finally:
+            await manager.stop()
+
+        assert first.is_closed
+
+    async def test_client_is_one_off_before_start(self, tmp_path):
+        manager = _manager(tmp_path, "a")
+        (server,) = manager.get_servers()
+
+        async with manager.client(server) as client:
+            pass
+
+        assert client.is_closed
+
+    async def test_http2_without_h2_falls_back_to_http1(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("lobby.registry.manager.importlib.util.find_spec", lambda name: None)
+        manager = _manager(tmp_path, "a", client_options=ClientOptions(http2=True))
+
+        manager.start()
+        await manager.stop()
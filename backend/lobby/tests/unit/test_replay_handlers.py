@@ -1,18 +1,21 @@
-"""Tests for the replay API handler."""
+"""Tests for the replay API handlers."""
 
 import gzip
+import os
 
 import pytest
 from starlette.testclient import TestClient
 
 from lobby.server.app import create_app
 from lobby.server.settings import LobbyServerSettings
-from lobby.views.replay_handlers import _load_replay
+from lobby.views import replay_handlers
+from lobby.views.replay_handlers import CachedReplay, ReplayCache, _stat_replay
 from shared.auth.settings import AuthSettings
-from shared.storage import replay_file_path
+from shared.replay_packs import compact_replays, find_packed_replay
+from shared.storage import LocalReplayStorage, replay_file_path, replay_index_path
 
 
-def _make_client(tmp_path):
+def _make_client(tmp_path, **settings):
     """Create a lobby TestClient with a temporary replay directory."""
     replay_dir = tmp_path / "replays"
     replay_dir.mkdir()
@@ -27,6 +30,7 @@ def _make_client(tmp_path):
             replay_dir=str(replay_dir),
             static_dir=str(static_dir),
             game_assets_dir=str(game_assets_dir),
+            **settings,
         ),
         auth_settings=AuthSettings(
             game_ticket_secret="test-secret",
@@ -167,7 +171,7 @@ class TestReplayContent:
         target.symlink_to(outside)
 
         # Call the sync helper directly — the symlink resolves outside replay_dir
-        result = _load_replay(str(replay_dir), game_id)
+        result = _stat_replay(str(replay_dir), game_id)
         assert result is None
 
     def test_replay_page_route_serves_play_page(self, setup):
@@ -183,3 +187,328 @@ class TestReplayContent:
         # No login — should still get 503 (not 303 redirect to login)
         response = client.get("/play/history/game-123", follow_redirects=False)
         assert response.status_code == 503
+
+
+class TestReplayContentValidators:
+    """Conditional GET, Range requests and the in-memory replay cache."""
+
+    @pytest.fixture(params=[64 * 1024, 0], ids=["cached", "uncached"])
+    def setup(self, tmp_path, request):
+        client, replay_dir = _make_client(tmp_path, replay_cache_bytes=request.param)
+        _write_gzip_replay(replay_dir, "game-123", '{"version":"0.3-dev"}\n{"t":1,"sd":"abc"}')
+        yield client, replay_dir
+        client.app.state.db.close()
+
+    def _etag(self, replay_dir) -> str:
+        stat = replay_file_path(replay_dir, "game-123").stat()
+        return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+    def test_sends_etag_from_size_and_mtime(self, setup):
+        client, replay_dir = setup
+
+        response = client.get("/api/replays/game-123")
+
+        assert response.headers["etag"] == self._etag(replay_dir)
+        assert "last-modified" in response.headers
+        assert response.headers["accept-ranges"] == "bytes"
+
+    @pytest.mark.parametrize("warm", [False, True], ids=["cold", "warm"])
+    def test_matching_if_none_match_returns_304(self, setup, warm):
+        client, replay_dir = setup
+        etag = self._etag(replay_dir)
+        if warm:
+            client.get("/api/replays/game-123")
+
+        response = client.get("/api/replays/game-123", headers={"If-None-Match": f'W/{etag}, "other"'})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+    def test_stale_etag_returns_content(self, setup):
+        client, _ = setup
+
+        response = client.get("/api/replays/game-123", headers={"If-None-Match": '"stale"'})
+
+        assert response.status_code == 200
+        assert response.text.startswith('{"version"')
+
+    def test_if_modified_since_returns_304(self, setup):
+        client, _ = setup
+        last_modified = client.get("/api/replays/game-123").headers["last-modified"]
+
+        response = client.get("/api/replays/game-123", headers={"If-Modified-Since": last_modified})
+
+        assert response.status_code == 304
+
+    def test_unparsable_if_modified_since_returns_content(self, setup):
+        client, _ = setup
+
+        response = client.get("/api/replays/game-123", headers={"If-Modified-Since": "yesterday"})
+
+        assert response.status_code == 200
+
+    def test_range_returns_partial_gzip_bytes(self, setup):
+        client, replay_dir = setup
+        gzip_bytes = replay_file_path(replay_dir, "game-123").read_bytes()
+
+        with client.stream("GET", "/api/replays/game-123", headers={"Range": "bytes=0-9"}) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 0-9/{len(gzip_bytes)}"
+        assert raw == gzip_bytes[:10]
+
+    def test_cache_serves_repeat_requests_from_memory(self, setup):
+        client, replay_dir = setup
+        client.get("/api/replays/game-123")
+        replay_file_path(replay_dir, "game-123").unlink()
+
+        response = client.get("/api/replays/game-123")
+
+        cache_enabled = client.app.state.settings.replay_cache_bytes > 0
+        assert response.status_code == (200 if cache_enabled else 404)
+
+
+def _entry(size: int) -> CachedReplay:
+    return CachedReplay(data=b"x" * size, etag='"e"', last_modified="Thu, 01 Jan 2026 00:00:00 GMT")
+
+
+class TestReplayCache:
+    def test_evicts_least_recently_used_over_budget(self):
+        cache = ReplayCache(max_bytes=100)
+        cache.put("aaaa", _entry(40))
+        cache.put("bbbb", _entry(40))
+        cache.get("aaaa")
+
+        cache.put("cccc", _entry(40))
+
+        assert cache.get("bbbb") is None
+        assert cache.get("aaaa") is not None
+        assert cache.get("cccc") is not None
+        assert cache.stats()["bytes"] == 80
+
+    def test_replacing_an_entry_updates_size(self):
+        cache = ReplayCache(max_bytes=100)
+        cache.put("aaaa", _entry(40))
+
+        cache.put("aaaa", _entry(10))
+
+        assert cache.stats() == {"entries": 1, "bytes": 10, "max_bytes": 100}
+
+    def test_entries_larger_than_budget_are_not_cached(self):
+        cache = ReplayCache(max_bytes=10)
+
+        cache.put("aaaa", _entry(11))
+
+        assert cache.get("aaaa") is None
+        assert not ReplayCache(max_bytes=0).accepts(1)
+
+
+_HEADER = '{"version":"0.3-dev"}\n{"t":8,"gid":"game-123"}'
+_ROUNDS = ['\n{"t":9,"n":0}\n{"t":4,"rt":3}', '\n{"t":9,"n":1}\n{"t":2}\n{"t":4,"rt":0}']
+
+
+def _write_indexed_replay(replay_dir, game_id):
+    """Write a replay through a replay stream, closing a header and two round segments."""
+    stream = LocalReplayStorage(str(replay_dir)).open_stream(game_id)
+    stream.write(_HEADER)
+    stream.end_segment({"kind": "header"})
+    for n, text in enumerate(_ROUNDS):
+        stream.write(text)
+        stream.end_segment({"kind": "round", "round_number": n, "dealer": n})
+    stream.write('\n{"t":10}')
+    stream.commit()
+
+
+class TestReplayRounds:
+    @pytest.fixture
+    def setup(self, tmp_path):
+        client, replay_dir = _make_client(tmp_path)
+        yield client, replay_dir
+        client.app.state.db.close()
+
+    def test_lists_round_summaries(self, setup):
+        client, replay_dir = setup
+        _write_indexed_replay(replay_dir, "game-123")
+
+        response = client.get("/api/replays/game-123/rounds")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "rounds": [
+                {"index": 0, "kind": "round", "round_number": 0, "dealer": 0},
+                {"index": 1, "kind": "round", "round_number": 1, "dealer": 1},
+            ],
+        }
+
+    def test_round_returns_header_and_round_lines(self, setup):
+        client, replay_dir = setup
+        _write_indexed_replay(replay_dir, "game-123")
+
+        response = client.get("/api/replays/game-123/rounds/1")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "immutable" in response.headers["cache-control"]
+        assert response.text == _HEADER + _ROUNDS[1]
+
+    def test_round_out_of_range_returns_404(self, setup):
+        client, replay_dir = setup
+        _write_indexed_replay(replay_dir, "game-123")
+
+        assert client.get("/api/replays/game-123/rounds/2").status_code == 404
+
+    def test_replay_without_index_returns_404(self, setup):
+        client, replay_dir = setup
+        _write_gzip_replay(replay_dir, "game-123", _HEADER + _ROUNDS[0])
+
+        assert client.get("/api/replays/game-123/rounds").status_code == 404
+        assert client.get("/api/replays/game-123/rounds/0").status_code == 404
+
+    def test_index_not_matching_replay_returns_404(self, setup):
+        client, replay_dir = setup
+        _write_indexed_replay(replay_dir, "game-123")
+        _write_gzip_replay(replay_dir, "game-123", _HEADER)
+
+        assert client.get("/api/replays/game-123/rounds/1").status_code == 404
+
+    def test_unreadable_index_returns_404(self, setup):
+        client, replay_dir = setup
+        _write_indexed_replay(replay_dir, "game-123")
+        replay_index_path(replay_dir, "game-123").write_text("{not json")
+
+        assert client.get("/api/replays/game-123/rounds").status_code == 404
+
+    def test_shard_outside_replay_dir_returns_404(self, setup, tmp_path):
+        client, replay_dir = setup
+        _write_indexed_replay(replay_dir, "game-123")
+        shard = replay_dir / "ga" / "me"
+        outside = tmp_path / "outside"
+        shard.rename(outside)
+        shard.symlink_to(outside, target_is_directory=True)
+
+        assert client.get("/api/replays/game-123/rounds").status_code == 404
+
+    def test_invalid_game_id_returns_404(self, setup):
+        client, _ = setup
+
+        assert client.get("/api/replays/bad.id/rounds").status_code == 404
+        assert client.get("/api/replays/bad.id/rounds/0").status_code == 404
+
+
+# 2026-01-15, well past any compaction cutoff used here.
+_PACKED_MTIME = 1_768_435_200
+
+
+class TestPackedReplays:
+    """Replays moved into cold-storage packs are served as if they were still loose files."""
+
+    @pytest.fixture
+    def setup(self, tmp_path):
+        client, replay_dir = _make_client(tmp_path)
+        _write_indexed_replay(replay_dir, "game-123")
+        _write_gzip_replay(replay_dir, "game-456", '{"version":"0.3-dev"}')
+        for game_id in ("game-123", "game-456"):
+            os.utime(replay_file_path(replay_dir, game_id), (_PACKED_MTIME, _PACKED_MTIME))
+        yield client, replay_dir
+        client.app.state.db.close()
+
+    def _pack(self, replay_dir):
+        report = compact_replays(replay_dir, older_than_days=1)
+        assert report.packed == 2
+        assert not replay_file_path(replay_dir, "game-123").exists()
+
+    def test_serves_packed_replay_with_unchanged_validators(self, setup):
+        client, replay_dir = setup
+        gzip_bytes = replay_file_path(replay_dir, "game-123").read_bytes()
+        before = client.get("/api/replays/game-123")
+        client.app.state.replay_cache = ReplayCache(0)
+        self._pack(replay_dir)
+
+        response = client.get("/api/replays/game-123")
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "accept-ranges" not in response.headers
+        assert response.text == gzip.decompress(gzip_bytes).decode("utf-8")
+        assert response.headers["etag"] == before.headers["etag"]
+        assert response.headers["last-modified"] == before.headers["last-modified"]
+
+    def test_matching_if_none_match_returns_304(self, setup):
+        client, replay_dir = setup
+        etag = client.get("/api/replays/game-456").headers["etag"]
+        client.app.state.replay_cache = ReplayCache(0)
+        self._pack(replay_dir)
+
+        response = client.get("/api/replays/game-456", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+
+    def test_packed_replay_is_cached(self, setup):
+        client, replay_dir = setup
+        self._pack(replay_dir)
+        client.get("/api/replays/game-456")
+
+        assert client.app.state.replay_cache.get("game-456") is not None
+
+    def test_serves_rounds_from_pack(self, setup):
+        client, replay_dir = setup
+        self._pack(replay_dir)
+
+        rounds = client.get("/api/replays/game-123/rounds")
+        round_1 = client.get("/api/replays/game-123/rounds/1")
+
+        assert [summary["round_number"] for summary in rounds.json()["rounds"]] == [0, 1]
+        assert round_1.text == _HEADER + _ROUNDS[1]
+
+    @pytest.mark.parametrize("headers", [{}, {"Range": "bytes=0-"}], ids=["cached_read", "file_response"])
+    def test_replay_packed_after_stat_is_served_from_pack(self, setup, monkeypatch, headers):
+        client, replay_dir = setup
+        gzip_bytes = replay_file_path(replay_dir, "game-123").read_bytes()
+        stale = _stat_replay(str(replay_dir), "game-123")
+        self._pack(replay_dir)
+        monkeypatch.setattr(replay_handlers, "_stat_replay", lambda _replay_dir, _game_id: stale)
+
+        response = client.get("/api/replays/game-123", headers=headers)
+
+        assert response.status_code == 200
+        assert response.text == gzip.decompress(gzip_bytes).decode("utf-8")
+
+    def test_unknown_game_in_packed_shard_returns_404(self, setup):
+        client, replay_dir = setup
+        self._pack(replay_dir)
+
+        assert client.get("/api/replays/game-789").status_code == 404
+        assert client.get("/api/replays/game-456/rounds").status_code == 404
+
+    def test_truncated_pack_returns_404(self, setup):
+        client, replay_dir = setup
+        self._pack(replay_dir)
+        packed = find_packed_replay(replay_dir, "game-456")
+        assert packed is not None
+        packed.pack.write_bytes(b"")
+
+        assert client.get("/api/replays/game-456").status_code == 404
+
+    def test_unreadable_pack_index_returns_404(self, setup, monkeypatch):
+        client, replay_dir = setup
+        self._pack(replay_dir)
+
+        def failing_find(_replay_dir, _game_id):
+            raise PermissionError("denied")
+
+        monkeypatch.setattr(replay_handlers, "find_packed_replay", failing_find)
+
+        assert client.get("/api/replays/game-456").status_code == 404
+
+    def test_shard_outside_replay_dir_returns_404(self, setup, tmp_path):
+        client, replay_dir = setup
+        self._pack(replay_dir)
+        shard = replay_dir / "ga" / "me"
+        outside = tmp_path / "outside"
+        shard.rename(outside)
+        shard.symlink_to(outside, target_is_directory=True)
+
+        assert client.get("/api/replays/game-456").status_code == 404
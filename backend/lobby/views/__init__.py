@@ -28,5 +28,10 @@ from lobby.views.handlers import (
 from lobby.views.handlers import (
     room_page as room_page,
 )
+from lobby.views.history_handlers import HistoryPageCache as HistoryPageCache
+from lobby.views.history_handlers import history_api as history_api
 from lobby.views.history_handlers import history_page as history_page
+from lobby.views.replay_handlers import ReplayCache as ReplayCache
 from lobby.views.replay_handlers import replay_content as replay_content
+from lobby.views.replay_handlers import replay_round as replay_round
+from lobby.views.replay_handlers import replay_rounds as replay_rounds
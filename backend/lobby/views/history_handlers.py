@@ -1,23 +1,89 @@
-"""History page handler and game data transformation."""
+"""History page and history API handlers, keyset pagination, and game data transformation."""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import base64
+import binascii
+import json
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from starlette.responses import JSONResponse, Response
 
 from lobby.server.csrf import get_or_create_csrf_token, set_csrf_cookie
 
 if TYPE_CHECKING:
-    from datetime import datetime
-
     from starlette.requests import Request
-    from starlette.responses import Response
     from starlette.templating import Jinja2Templates
 
+    from shared.dal.game_repository import GameRepository
     from shared.dal.models import PlayedGame
+    from shared.db import Database
 
 SECONDS_PER_HOUR = 3600
 SECONDS_PER_MINUTE = 60
 
+HISTORY_PAGE_SIZE = 20
+HISTORY_API_MAX_LIMIT = 100
+
+
+def encode_cursor(game: PlayedGame) -> str:
+    """Opaque pagination cursor for the page after `game` (its (started_at, game_id) key)."""
+    raw = json.dumps([game.started_at.isoformat(), game.game_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a cursor from encode_cursor(). Raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        started_at, game_id = json.loads(raw)
+        return datetime.fromisoformat(started_at), str(game_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise ValueError("invalid history cursor") from exc
+
+
+class HistoryPageCache:
+    """Short-lived cache of the first history page, keyed on the database data_version.
+
+    The first page is what every visit to /history loads, so a busy lobby
+    would otherwise repeat the same query and validation per request. An
+    entry is served while it is younger than ttl seconds and no commit has
+    landed since it was built (Database.data_version() is unchanged), so a
+    finished game shows up on the next request after its commit.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self._ttl = ttl
+        self._entry: tuple[float, int, list[dict], str | None] | None = None
+
+    def get(self, data_version: int) -> tuple[list[dict], str | None] | None:
+        if self._entry is None:
+            return None
+        built_at, version, games, next_cursor = self._entry
+        if version != data_version or time.monotonic() - built_at >= self._ttl:
+            self._entry = None
+            return None
+        return games, next_cursor
+
+    def put(self, data_version: int, games: list[dict], next_cursor: str | None) -> None:
+        if self._ttl > 0:
+            self._entry = (time.monotonic(), data_version, games, next_cursor)
+
+
+async def _load_completed_page(
+    game_repo: GameRepository,
+    limit: int,
+    before: tuple[datetime, str] | None,
+) -> tuple[list[PlayedGame], str | None]:
+    """Fetch one page of completed games and the cursor for the next page (None on the last page)."""
+    games = await game_repo.get_completed_games(limit=limit + 1, before=before)
+    if len(games) <= limit:
+        return games, None
+    games = games[:limit]
+    return games, encode_cursor(games[-1])
+
 
 def _format_duration(started_at: datetime, ended_at: datetime) -> str:
     """Format game duration as a human-readable string (e.g. '5m 30s', '1h 12m', '45s')."""
@@ -67,14 +133,35 @@ def _prepare_history_for_display(games: list[PlayedGame]) -> list[dict]:
     return result
 
 
+async def _history_page_games(request: Request, before: tuple[datetime, str] | None) -> tuple[list[dict], str | None]:
+    """Display models and next cursor for a history page; the first page goes through the cache."""
+    game_repo = request.app.state.game_repo
+    if before is not None:
+        games, next_cursor = await _load_completed_page(game_repo, HISTORY_PAGE_SIZE, before)
+        return _prepare_history_for_display(games), next_cursor
+
+    db: Database = request.app.state.db
+    cache: HistoryPageCache = request.app.state.history_cache
+    data_version = db.data_version()
+    cached = cache.get(data_version)
+    if cached is not None:
+        return cached
+    games, next_cursor = await _load_completed_page(game_repo, HISTORY_PAGE_SIZE, None)
+    display_games = _prepare_history_for_display(games)
+    cache.put(data_version, display_games, next_cursor)
+    return display_games, next_cursor
+
+
 async def history_page(request: Request) -> Response:
-    """GET /history - render the history page with recent played games."""
+    """GET /history - render the history page with completed games, newest first, one page per cursor."""
     templates: Jinja2Templates = request.app.state.templates
-    game_repo = request.app.state.game_repo
 
-    games = await game_repo.get_recent_games(limit=20)
-    completed_games = [g for g in games if g.end_reason == "completed"]
-    display_games = _prepare_history_for_display(completed_games)
+    cursor = request.query_params.get("cursor")
+    try:
+        before = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return Response("Invalid cursor", status_code=400, media_type="text/plain")
+    display_games, next_cursor = await _history_page_games(request, before)
 
     csrf_token, is_new = get_or_create_csrf_token(request)
     response = templates.TemplateResponse(
@@ -82,6 +169,7 @@ async def history_page(request: Request) -> Response:
         "history.html",
         {
             "games": display_games,
+            "next_cursor": next_cursor,
             "username": request.user.username,
             "csrf_token": csrf_token,
         },
@@ -90,3 +178,22 @@ async def history_page(request: Request) -> Response:
         auth_settings = request.app.state.auth_settings
         set_csrf_cookie(response, csrf_token, cookie_secure=auth_settings.cookie_secure)
     return response
+
+
+async def history_api(request: Request) -> JSONResponse:
+    """GET /api/history?cursor=&limit= - completed games as JSON, newest first."""
+    cursor = request.query_params.get("cursor")
+    try:
+        before = decode_cursor(cursor) if cursor else None
+        limit = int(request.query_params.get("limit", HISTORY_PAGE_SIZE))
+    except ValueError:
+        return JSONResponse({"error": "Invalid cursor or limit"}, status_code=400)
+    if not 1 <= limit <= HISTORY_API_MAX_LIMIT:
+        return JSONResponse({"error": f"limit must be between 1 and {HISTORY_API_MAX_LIMIT}"}, status_code=400)
+
+    games, next_cursor = await _load_completed_page(request.app.state.game_repo, limit, before)
+    body: dict[str, Any] = {
+        "games": [game.model_dump(mode="json") for game in games],
+        "next_cursor": next_cursor,
+    }
+    return JSONResponse(body)
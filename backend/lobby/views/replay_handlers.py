@@ -1,17 +1,43 @@
-"""Replay API handler for serving gzip-compressed replay files."""
+"""Replay API handlers for serving gzip-compressed replay files and single rounds.
+
+Whole replays are served with an ETag (file size and mtime) and Last-Modified,
+answer conditional requests with 304, and support Range requests. Recently
+served files are kept in a size-bounded in-memory LRU (ReplayCache); files
+that do not fit, and Range requests, are streamed from disk by FileResponse.
+
+Replays written with a segment index (``{game_id}.index.json``) can be served
+one round at a time: the handler seeks to the header and round segments and
+inflates only those bytes.
+
+Replays moved into cold-storage packs (shared.replay_packs) are found through
+their shard's pack indexes when the loose file is gone. They keep the ETag and
+Last-Modified of the original file, are read into memory and cached like a
+loose file, and are always served whole (Range is ignored). Their rounds are
+served from the pack, using the segment offsets stored in the pack index.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import json
 import re
+import stat
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from starlette.responses import Response
+from starlette.responses import FileResponse, JSONResponse, Response
 
-from shared.storage import _MIN_GAME_ID_LEN, replay_file_path
+from shared.replay_packs import PackedReplay, find_packed_replay, read_packed_replay
+from shared.storage import _MIN_GAME_ID_LEN, read_replay_segment, replay_file_path, replay_index_path
 
 if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable
+
+    from starlette.datastructures import Headers
     from starlette.requests import Request
 
 # Game ID must be alphanumeric with hyphens/underscores, max 50 chars.
@@ -23,53 +49,317 @@ _MAX_FILE_SIZE = 1_048_576
 
 _NOT_FOUND = Response("Not found", status_code=404, media_type="text/plain")
 
+_IMMUTABLE = "public, max-age=31536000, immutable"
+
+_REPLAY_MEDIA_TYPE = "application/x-ndjson"
+
 
-def _load_replay(replay_dir_str: str, game_id: str) -> bytes | None:
-    """Resolve paths and read a gzip-compressed replay file.
+@dataclass(frozen=True, slots=True)
+class CachedReplay:
+    """A replay file's gzip bytes with the validators it was served with.
 
-    Return the raw gzip bytes, or None if the file is missing, too large,
-    or the game_id resolves outside the replay directory.
+    packed marks a replay read from a pack, which is always served whole.
     """
+
+    data: bytes
+    etag: str
+    last_modified: str
+    packed: bool = False
+
+
+class ReplayCache:
+    """Size-bounded LRU of recently served replay files, keyed by game ID.
+
+    Replay files are written once and never modified, so entries are not
+    revalidated against the disk. A replay that is shared and opened by many
+    viewers is read once and then served from memory until less recently
+    requested replays push it past max_bytes. max_bytes=0 disables the cache.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, CachedReplay] = OrderedDict()
+        self._size = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "bytes": self._size, "max_bytes": self._max_bytes}
+
+    def accepts(self, size: int) -> bool:
+        return 0 < size <= self._max_bytes
+
+    def get(self, game_id: str) -> CachedReplay | None:
+        entry = self._entries.get(game_id)
+        if entry is not None:
+            self._entries.move_to_end(game_id)
+        return entry
+
+    def put(self, game_id: str, entry: CachedReplay) -> None:
+        if not self.accepts(len(entry.data)):
+            return
+        previous = self._entries.pop(game_id, None)
+        if previous is not None:
+            self._size -= len(previous.data)
+        self._entries[game_id] = entry
+        self._size += len(entry.data)
+        while self._size > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.data)
+
+
+def _valid_game_id(game_id: str) -> bool:
+    return _MIN_GAME_ID_LEN <= len(game_id) <= _GAME_ID_MAX_LEN and _GAME_ID_RE.match(game_id) is not None
+
+
+def _resolve(replay_dir_str: str, path_for: Callable[[Path, str], Path], game_id: str) -> Path | None:
+    """Resolve a replay-owned path, or None if it falls outside the replay directory."""
     replay_dir = Path(replay_dir_str).resolve()
-    target = replay_file_path(replay_dir, game_id).resolve()
+    target = path_for(replay_dir, game_id).resolve()
+    return target if target.is_relative_to(replay_dir) else None
+
 
-    if not target.is_relative_to(replay_dir):
+def _stat_replay(replay_dir_str: str, game_id: str) -> tuple[Path, os.stat_result] | None:
+    """Resolve and stat a gzip-compressed replay file.
+
+    Return the path and its stat result, or None if the file is missing,
+    not a regular file, too large, or the game_id resolves outside the
+    replay directory.
+    """
+    target = _resolve(replay_dir_str, replay_file_path, game_id)
+    if target is None:
         return None
+    try:
+        stat_result = target.stat()
+    except OSError:
+        return None
+    if not stat.S_ISREG(stat_result.st_mode) or stat_result.st_size > _MAX_FILE_SIZE:
+        return None
+    return target, stat_result
 
+
+def _read_replay(path: Path, size: int) -> bytes | None:
+    """Read a replay file whose stat reported size bytes, or None if that no longer holds."""
     try:
-        with target.open("rb") as f:
-            data = f.read(_MAX_FILE_SIZE + 1)
+        with path.open("rb") as f:
+            data = f.read(size + 1)
     except OSError:
         return None
+    return data if len(data) == size else None
+
+
+def _find_packed(replay_dir_str: str, game_id: str) -> PackedReplay | None:
+    """Look up a replay in its shard's packs.
+
+    Return None if it is not packed, too large, or its shard or pack
+    resolves outside the replay directory.
+    """
+    if _resolve(replay_dir_str, replay_file_path, game_id) is None:
+        return None
+    replay_dir = Path(replay_dir_str).resolve()
+    try:
+        packed = find_packed_replay(replay_dir, game_id)
+        if packed is None or not packed.pack.resolve().is_relative_to(replay_dir):
+            return None
+    except OSError:
+        return None
+    return packed if packed.length <= _MAX_FILE_SIZE else None
+
+
+def _read_packed(packed: PackedReplay) -> bytes | None:
+    try:
+        return read_packed_replay(packed)
+    except (OSError, ValueError):  # fmt: skip
+        return None
+
+
+def _etag(size: int, mtime_ns: int) -> str:
+    return f'"{size:x}-{mtime_ns:x}"'
+
+
+def _is_not_modified(request_headers: Headers, etag: str, last_modified: str) -> bool:
+    """Evaluate If-None-Match, or If-Modified-Since when no If-None-Match is sent."""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):  # fmt: skip
+        return False
 
-    if len(data) > _MAX_FILE_SIZE:
+
+def _validator_headers(etag: str, last_modified: str) -> dict[str, str]:
+    return {"ETag": etag, "Last-Modified": last_modified, "Cache-Control": _IMMUTABLE}
+
+
+def _cached_response(request: Request, entry: CachedReplay) -> Response:
+    headers = _validator_headers(entry.etag, entry.last_modified)
+    if _is_not_modified(request.headers, entry.etag, entry.last_modified):
+        return Response(status_code=304, headers=headers)
+    headers["Content-Encoding"] = "gzip"
+    if not entry.packed:
+        headers["Accept-Ranges"] = "bytes"
+    return Response(content=entry.data, media_type=_REPLAY_MEDIA_TYPE, headers=headers)
+
+
+def _load_index(replay_dir_str: str, game_id: str) -> tuple[Path, dict[str, Any], list[dict[str, Any]]] | None:
+    """Read a replay's segment index and split it into the header and round segments.
+
+    Return the file the segment offsets point into (the replay, or its pack
+    when the replay has been packed), the header and the rounds. Return None
+    if the index is missing, unreadable, or has no header segment.
+    """
+    replay = _resolve(replay_dir_str, replay_file_path, game_id)
+    target = _resolve(replay_dir_str, replay_index_path, game_id)
+    if replay is None or target is None:
+        return None
+    try:
+        with target.open("rb") as f:
+            index = json.loads(f.read(_MAX_FILE_SIZE + 1))
+    except FileNotFoundError:
+        packed = _find_packed(replay_dir_str, game_id)
+        if packed is None:
+            return None
+        replay, segments = packed.pack, packed.segments
+    except (OSError, ValueError):  # fmt: skip
+        return None
+    else:
+        segments = index.get("segments", []) if isinstance(index, dict) else []
+    header = next((segment for segment in segments if segment["meta"]["kind"] == "header"), None)
+    if header is None:
         return None
+    return replay, header, [segment for segment in segments if segment["meta"]["kind"] == "round"]
+
 
-    return data
+def _load_round(replay_dir_str: str, game_id: str, round_index: int) -> str | None:
+    """Inflate the header and one round of an indexed replay into NDJSON.
+
+    Return None if the replay has no index, the round is out of range, or
+    the segments do not match the replay file.
+    """
+    index = _load_index(replay_dir_str, game_id)
+    if index is None:
+        return None
+    target, header, rounds = index
+    if not 0 <= round_index < len(rounds):
+        return None
+    try:
+        with target.open("rb") as f:
+            return read_replay_segment(f, header) + read_replay_segment(f, rounds[round_index])
+    except (OSError, ValueError):  # fmt: skip
+        return None
 
 
 async def replay_content(request: Request) -> Response:
-    """GET /api/replays/{game_id} — serve a gzip-compressed replay file."""
+    """GET /api/replays/{game_id} — serve a gzip-compressed replay file.
+
+    Serve from the in-memory cache when possible. On a miss, answer a
+    matching conditional request with 304 without reading the file, cache
+    files that fit, and stream the rest (and all Range requests) from disk.
+    Replays without a loose file are looked up in the shard's packs.
+    """
     game_id = request.path_params["game_id"]
+    if not _valid_game_id(game_id):
+        return _NOT_FOUND
+
+    cached = request.app.state.replay_cache.get(game_id)
+    if cached is not None and "range" not in request.headers:
+        return _cached_response(request, cached)
 
-    if (
-        not game_id
-        or len(game_id) < _MIN_GAME_ID_LEN
-        or len(game_id) > _GAME_ID_MAX_LEN
-        or not _GAME_ID_RE.match(game_id)
-    ):
+    replay_dir_str: str = request.app.state.settings.replay_dir
+    found = await asyncio.to_thread(_stat_replay, replay_dir_str, game_id)
+    if found is not None:
+        response = await _serve_from_disk(request, game_id, *found)
+        if response is not None:
+            return response
+    # Not loose, or packed and unlinked by compact_replays() since the stat
+    # (the pack index is fsynced before the loose file is removed).
+    packed = await asyncio.to_thread(_find_packed, replay_dir_str, game_id)
+    if packed is None:
+        return _NOT_FOUND
+    return await _serve_packed(request, game_id, packed)
+
+
+async def _serve_from_disk(
+    request: Request,
+    game_id: str,
+    path: Path,
+    stat_result: os.stat_result,
+) -> Response | None:
+    """Serve a loose replay file, or return None if it has gone since it was stat'd."""
+    etag = _etag(stat_result.st_size, stat_result.st_mtime_ns)
+    last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+    headers = _validator_headers(etag, last_modified)
+    if _is_not_modified(request.headers, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    cache: ReplayCache = request.app.state.replay_cache
+    if "range" not in request.headers and cache.accepts(stat_result.st_size):
+        data = await asyncio.to_thread(_read_replay, path, stat_result.st_size)
+        if data is None:
+            return None
+        entry = CachedReplay(data=data, etag=etag, last_modified=last_modified)
+        cache.put(game_id, entry)
+        return _cached_response(request, entry)
+
+    # FileResponse opens the path only after sending headers, so check it is still there first.
+    if not await asyncio.to_thread(path.is_file):
+        return None
+    return FileResponse(
+        path,
+        media_type=_REPLAY_MEDIA_TYPE,
+        headers={**headers, "Content-Encoding": "gzip"},
+        stat_result=stat_result,
+    )
+
+
+async def _serve_packed(request: Request, game_id: str, packed: PackedReplay) -> Response:
+    etag = _etag(packed.length, packed.mtime_ns)
+    last_modified = formatdate(packed.mtime_ns / 1_000_000_000, usegmt=True)
+    if _is_not_modified(request.headers, etag, last_modified):
+        return Response(status_code=304, headers=_validator_headers(etag, last_modified))
+
+    data = await asyncio.to_thread(_read_packed, packed)
+    if data is None:
+        return _NOT_FOUND
+    entry = CachedReplay(data=data, etag=etag, last_modified=last_modified, packed=True)
+    request.app.state.replay_cache.put(game_id, entry)
+    return _cached_response(request, entry)
+
+
+async def replay_rounds(request: Request) -> Response:
+    """GET /api/replays/{game_id}/rounds — list the round summaries of an indexed replay."""
+    game_id = request.path_params["game_id"]
+    if not _valid_game_id(game_id):
+        return _NOT_FOUND
+
+    replay_dir_str: str = request.app.state.settings.replay_dir
+    index = await asyncio.to_thread(_load_index, replay_dir_str, game_id)
+    if index is None:
+        return _NOT_FOUND
+
+    _, _, rounds = index
+    return JSONResponse(
+        {"rounds": [{"index": n, **segment["meta"]} for n, segment in enumerate(rounds)]},
+        headers={"Cache-Control": _IMMUTABLE},
+    )
+
+
+async def replay_round(request: Request) -> Response:
+    """GET /api/replays/{game_id}/rounds/{n} — serve the header and round n (0-based) as NDJSON."""
+    game_id = request.path_params["game_id"]
+    if not _valid_game_id(game_id):
         return _NOT_FOUND
 
     replay_dir_str: str = request.app.state.settings.replay_dir
-    gzip_bytes = await asyncio.to_thread(_load_replay, replay_dir_str, game_id)
-    if gzip_bytes is None:
+    content = await asyncio.to_thread(_load_round, replay_dir_str, game_id, request.path_params["n"])
+    if content is None:
         return _NOT_FOUND
 
     return Response(
-        content=gzip_bytes,
-        media_type="application/x-ndjson",
-        headers={
-            "Content-Encoding": "gzip",
-            "Cache-Control": "public, max-age=31536000, immutable",
-        },
+        content=content,
+        media_type=_REPLAY_MEDIA_TYPE,
+        headers={"Cache-Control": _IMMUTABLE},
     )
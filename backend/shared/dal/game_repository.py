@@ -8,7 +8,7 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from datetime import datetime
 
-    from shared.dal.models import PlayedGame, PlayedGameStanding
+    from shared.dal.models import PlayedGame, PlayedGameStanding, PlayerStats
 
 
 class GameRepository(ABC):
@@ -31,4 +31,14 @@ class GameRepository(ABC):
     async def get_game(self, game_id: str) -> PlayedGame | None: ...
 
     @abstractmethod
-    async def get_recent_games(self, limit: int = 20) -> list[PlayedGame]: ...
+    async def get_completed_games(
+        self,
+        limit: int = 20,
+        before: tuple[datetime, str] | None = None,
+    ) -> list[PlayedGame]: ...
+
+    @abstractmethod
+    async def get_games_for_player(self, user_id: str, limit: int = 20) -> list[PlayedGame]: ...
+
+    @abstractmethod
+    async def get_player_stats(self, user_id: str) -> PlayerStats: ...
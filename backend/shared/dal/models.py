@@ -26,3 +26,13 @@ class PlayedGame(BaseModel, frozen=True):
     num_rounds_played: int | None = None  # total rounds played (only set at game end)
     # at start: seat order with names/seats/user_ids; at end: placement order with scores
     standings: list[PlayedGameStanding] = Field(default_factory=list)
+
+
+class PlayerStats(BaseModel, frozen=True):
+    """Aggregate results of a player's completed games."""
+
+    user_id: str
+    games_played: int = 0
+    first_places: int = 0
+    average_placement: float | None = None  # None until the player has a completed game
+    average_final_score: float | None = None
@@ -1,11 +1,12 @@
 """SQLite database layer: connection management and repository implementations."""
 
 from shared.db.connection import Database
-from shared.db.game_repository import SqliteGameRepository
+from shared.db.game_repository import GroupCommitGameRepository, SqliteGameRepository
 from shared.db.player_repository import SqlitePlayerRepository
 
 __all__ = [
     "Database",
+    "GroupCommitGameRepository",
     "SqliteGameRepository",
     "SqlitePlayerRepository",
 ]
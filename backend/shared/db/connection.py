@@ -3,9 +3,15 @@
 import os
 import sqlite3
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import structlog
 
+from shared.db.executor import DatabaseExecutor
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 logger = structlog.get_logger()
 
 _DB_FILE_PERMISSIONS = 0o600
@@ -34,15 +40,93 @@ CREATE TABLE IF NOT EXISTS played_games (
 
 CREATE INDEX IF NOT EXISTS idx_played_games_started_at
     ON played_games (started_at DESC);
+
+-- Keyset pagination of completed games on (started_at, id).
+CREATE INDEX IF NOT EXISTS idx_played_games_completed
+    ON played_games (started_at DESC, id DESC) WHERE end_reason = 'completed';
+
+-- One row per seat of a played game, mirrored from played_games.data standings
+-- so per-player history and stats are index lookups instead of JSON scans.
+-- started_at is copied from played_games to keep (user_id, started_at) in one index.
+CREATE TABLE IF NOT EXISTS played_game_standings (
+    game_id TEXT NOT NULL REFERENCES played_games (id) ON DELETE CASCADE,
+    seat INTEGER NOT NULL,
+    user_id TEXT,
+    started_at TEXT NOT NULL,
+    score INTEGER,
+    final_score INTEGER,
+    placement INTEGER,
+    PRIMARY KEY (game_id, seat)
+);
+
+CREATE INDEX IF NOT EXISTS idx_played_game_standings_user_started_at
+    ON played_game_standings (user_id, started_at DESC) WHERE user_id IS NOT NULL;
+
+-- Per-player aggregates over archived replays, maintained by game.replay.stats.
+-- Rates are derived from the counts (wins / rounds, placement_sum / completed_games).
+CREATE TABLE IF NOT EXISTS replay_player_stats (
+    player_name TEXT PRIMARY KEY,
+    games INTEGER NOT NULL,
+    completed_games INTEGER NOT NULL,
+    placement_sum INTEGER NOT NULL,
+    rounds INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    deal_ins INTEGER NOT NULL,
+    riichis INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS replay_player_yaku (
+    player_name TEXT NOT NULL,
+    yaku_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (player_name, yaku_id)
+) WITHOUT ROWID;
+
+-- Replays already folded into the aggregates, and the newest shard-directory
+-- mtime the last aggregation run saw.
+CREATE TABLE IF NOT EXISTS replay_stats_games (
+    game_id TEXT PRIMARY KEY
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS replay_stats_watermark (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    mtime_ns INTEGER NOT NULL
+);
 """
 
+# Data migrations applied in order on connect; PRAGMA user_version records how many ran.
+# The schema script above creates missing tables, migrations fill them from existing rows.
+_MIGRATIONS = (
+    # 1: backfill played_game_standings from the standings JSON of existing games.
+    # Standings are stored in placement order once a game has scores.
+    """INSERT OR IGNORE INTO played_game_standings
+    (game_id, seat, user_id, started_at, score, final_score, placement)
+SELECT
+    g.id,
+    json_extract(s.value, '$.seat'),
+    NULLIF(json_extract(s.value, '$.user_id'), ''),
+    g.started_at,
+    json_extract(s.value, '$.score'),
+    json_extract(s.value, '$.final_score'),
+    CASE WHEN json_extract(s.value, '$.score') IS NOT NULL THEN s.key + 1 END
+FROM played_games AS g, json_each(g.data, '$.standings') AS s;
+""",
+)
+
 
 class Database:
-    """SQLite database wrapper with schema management."""
+    """SQLite database wrapper with schema management.
 
-    def __init__(self, path: str | Path) -> None:
+    connect() opens a setup connection for the schema and starts a
+    DatabaseExecutor; repositories go through read()/write(), which run on the
+    executor's threads and never block the event loop.
+    """
+
+    def __init__(self, path: str | Path, *, readers: int = 4) -> None:
         self._path = str(path)
+        self._readers = readers
         self._conn: sqlite3.Connection | None = None
+        self._executor: DatabaseExecutor | None = None
 
     @property
     def connection(self) -> sqlite3.Connection:
@@ -61,15 +145,55 @@ class Database:
         self._conn.execute("PRAGMA foreign_keys=ON")
         self._conn.execute("PRAGMA busy_timeout=5000")
         self._conn.executescript(_SCHEMA_SQL)
+        self._migrate()
 
         self._harden_permissions()
 
+        self._executor = DatabaseExecutor(self._path, readers=self._readers)
+        self._executor.start()
+
     def close(self) -> None:
-        """Close the database connection."""
+        """Flush queued writes, stop the executor, and close the database connection."""
+        if self._executor is not None:
+            self._executor.close()
+            self._executor = None
         if self._conn is not None:
             self._conn.close()
             self._conn = None
 
+    async def write[T](self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run fn on the writer thread inside a batched transaction (see DatabaseExecutor)."""
+        return await self._require_executor().write(fn)
+
+    async def read[T](self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run fn on a pooled read-only connection."""
+        return await self._require_executor().read(fn)
+
+    def data_version(self) -> int:
+        """Return a counter that changes whenever another connection commits.
+
+        Reads PRAGMA data_version on the setup connection, which never writes
+        after connect(), so any commit (from the writer thread or another
+        process) changes the value. It is a shared-memory read with no I/O;
+        callers use it to invalidate caches of query results.
+        """
+        return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def _require_executor(self) -> DatabaseExecutor:
+        if self._executor is None:
+            raise RuntimeError("Database is not connected")
+        return self._executor
+
+    def _migrate(self) -> None:
+        """Run the migrations newer than the database's user_version, each in its own transaction."""
+        conn = self.connection
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, sql in enumerate(_MIGRATIONS[version:], start=version + 1):
+            with conn:
+                conn.execute(sql)
+                conn.execute(f"PRAGMA user_version = {number}")
+            logger.info("applied database migration", version=number)
+
     def _harden_permissions(self) -> None:
         """Set restrictive file permissions on POSIX systems (best effort).
 
@@ -0,0 +1,168 @@
+"""Off-loop SQLite execution: one writer thread and a pool of read-only connections."""
+
+import asyncio
+import contextlib
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = structlog.get_logger()
+
+# Upper bound on jobs committed together in one writer transaction.
+_MAX_WRITE_BATCH = 64
+
+_BUSY_TIMEOUT_MS = 5000
+
+type _WriteJob = tuple[Callable[[sqlite3.Connection], Any], asyncio.Future[Any]]
+
+
+class DatabaseExecutor:
+    """Run SQLite work on threads so async callers never block the event loop.
+
+    Writes are queued to a single writer thread that owns the only write
+    connection. The writer drains whatever is queued (up to _MAX_WRITE_BATCH
+    jobs) into one transaction and commits once, so one fsync covers the whole
+    batch. Each job runs inside its own SAVEPOINT: a job that raises is rolled
+    back alone and its exception is delivered to its caller, while the rest of
+    the batch commits. A write's future resolves only after the commit. If the
+    batch itself fails (a SQLite error outside a job, or a BaseException), it
+    is rolled back, every write in it fails, and the writer moves on to the
+    next batch.
+
+    Reads run on a thread pool; each pool thread lazily opens its own
+    read-only connection, which in WAL mode sees every committed write without
+    waiting on the writer.
+    """
+
+    def __init__(self, path: str, *, readers: int = 4) -> None:
+        self._path = path
+        self._writes: queue.Queue[_WriteJob | None] = queue.Queue()
+        self._writer: threading.Thread | None = None
+        self._read_pool = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="sqlite-reader")
+        self._reader_local = threading.local()
+        self._reader_conns: list[sqlite3.Connection] = []
+        self._reader_conns_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the writer thread. The database schema must already exist."""
+        if self._writer is not None:
+            return
+        self._writer = threading.Thread(target=self._run_writer, name="sqlite-writer", daemon=True)
+        self._writer.start()
+
+    def close(self) -> None:
+        """Finish queued writes, stop the writer, and close every connection."""
+        if self._writer is not None:
+            self._writes.put(None)
+            self._writer.join()
+            self._writer = None
+        self._read_pool.shutdown(wait=True)
+        with self._reader_conns_lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
+
+    async def write[T](self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run fn(connection) on the writer thread and return its result once committed.
+
+        fn must not commit or roll back; the writer owns the transaction.
+        """
+        if self._writer is None:
+            raise RuntimeError("Database is not connected")
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._writes.put((fn, future))
+        return await future
+
+    async def read[T](self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run fn(connection) on a pooled read-only connection and return its result."""
+        if self._writer is None:
+            raise RuntimeError("Database is not connected")
+        return await asyncio.get_running_loop().run_in_executor(self._read_pool, self._run_read, fn)
+
+    def _run_read[T](self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        conn: sqlite3.Connection | None = getattr(self._reader_local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self._path}?mode=ro", uri=True, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout={_BUSY_TIMEOUT_MS}")
+            self._reader_local.conn = conn
+            with self._reader_conns_lock:
+                self._reader_conns.append(conn)
+        return fn(conn)
+
+    def _run_writer(self) -> None:
+        # isolation_level=None: the writer issues BEGIN/SAVEPOINT/COMMIT itself.
+        conn = sqlite3.connect(self._path, isolation_level=None)
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute(f"PRAGMA busy_timeout={_BUSY_TIMEOUT_MS}")
+        try:
+            stopping = False
+            while not stopping:
+                job = self._writes.get()
+                if job is None:
+                    break
+                batch = [job]
+                while len(batch) < _MAX_WRITE_BATCH:
+                    try:
+                        job = self._writes.get_nowait()
+                    except queue.Empty:
+                        break
+                    if job is None:
+                        stopping = True
+                        break
+                    batch.append(job)
+                self._commit_batch(conn, batch)
+        finally:
+            conn.close()
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: list[_WriteJob]) -> None:
+        outcomes: list[tuple[asyncio.Future[Any], Any, BaseException | None]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for fn, future in batch:
+                conn.execute("SAVEPOINT job")
+                try:
+                    result = fn(conn)
+                except Exception as exc:  # noqa: BLE001 -- delivered to the awaiting caller
+                    conn.execute("ROLLBACK TO job")
+                    conn.execute("RELEASE job")
+                    outcomes.append((future, None, exc))
+                else:
+                    conn.execute("RELEASE job")
+                    outcomes.append((future, result, None))
+            conn.execute("COMMIT")
+        except BaseException as exc:
+            # The writer keeps serving later batches; SystemExit and the like must not reach the callers' loop.
+            error = exc if isinstance(exc, Exception) else RuntimeError(f"write batch aborted: {exc!r}")
+            outcomes = [(future, None, error) for _, future in batch]
+            logger.exception("sqlite write batch failed", batch_size=len(batch))
+            _rollback(conn)
+        finally:
+            for future, result, exc in outcomes:
+                # The loop may already be closed during shutdown; nobody is waiting then.
+                with contextlib.suppress(RuntimeError):
+                    future.get_loop().call_soon_threadsafe(_resolve, future, result, exc)
+
+
+def _rollback(conn: sqlite3.Connection) -> None:
+    if not conn.in_transaction:
+        return
+    try:
+        conn.execute("ROLLBACK")
+    except sqlite3.Error:
+        logger.exception("sqlite rollback failed")
+
+
+def _resolve(future: asyncio.Future[Any], result: object, exc: BaseException | None) -> None:
+    if future.done():
+        return
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
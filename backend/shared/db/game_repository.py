@@ -1,16 +1,18 @@
 """SQLite-backed game repository."""
 
 import asyncio
+import contextlib
 import json
-import sqlite3
 from typing import TYPE_CHECKING
 
 import structlog
 
 from shared.dal.game_repository import GameRepository
-from shared.dal.models import PlayedGame, PlayedGameStanding
+from shared.dal.models import PlayedGame, PlayedGameStanding, PlayerStats
 
 if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Callable
     from datetime import datetime
 
     from shared.db.connection import Database
@@ -22,31 +24,18 @@ class SqliteGameRepository(GameRepository):
     """SQLite implementation of GameRepository.
 
     Stores full game snapshots as JSON with indexed columns for queries.
-    Uses json_each for player-based lookups.
+    Per-seat results are mirrored into played_game_standings in the same
+    statement batch, so player-based lookups use its (user_id, started_at)
+    index. Statements run on the Database executor's threads, so no call
+    blocks the event loop.
     """
 
     def __init__(self, db: Database) -> None:
         self._db = db
-        self._lock = asyncio.Lock()
 
     async def create_game(self, game: PlayedGame) -> None:
         """Insert a game record. Logs a warning and returns on duplicate game_id."""
-        async with self._lock:
-            try:
-                self._db.connection.execute(
-                    "INSERT INTO played_games (id, started_at, ended_at, end_reason, data) VALUES (?, ?, ?, ?, ?)",
-                    (
-                        game.game_id,
-                        game.started_at.isoformat(),
-                        game.ended_at.isoformat() if game.ended_at else None,
-                        game.end_reason,
-                        game.model_dump_json(),
-                    ),
-                )
-                self._db.connection.commit()
-            except sqlite3.IntegrityError:
-                self._db.connection.rollback()
-                logger.warning("game already exists, ignoring duplicate create", game_id=game.game_id)
+        await self._db.write(_create_game_op(game))
 
     async def finish_game(
         self,
@@ -61,55 +50,309 @@ class SqliteGameRepository(GameRepository):
         When standings is None (abandoned games), preserves existing standings
         from game start (player names, seats, user_ids without scores).
         """
-        async with self._lock:
-            ended_at_iso = ended_at.isoformat()
-            if standings is not None:
-                standings_json = json.dumps([s.model_dump() for s in standings])
-                cursor = self._db.connection.execute(
-                    "UPDATE played_games SET "
-                    "ended_at = ?, "
-                    "end_reason = ?, "
-                    "data = json_set(data, "
-                    "  '$.ended_at', ?, "
-                    "  '$.end_reason', ?, "
-                    "  '$.num_rounds_played', ?, "
-                    "  '$.standings', json(?) "
-                    ") "
-                    "WHERE id = ? AND ended_at IS NULL",
-                    (ended_at_iso, end_reason, ended_at_iso, end_reason, num_rounds_played, standings_json, game_id),
-                )
-            else:
-                # Abandoned: do NOT overwrite standings -- preserve start-time player data
-                cursor = self._db.connection.execute(
-                    "UPDATE played_games SET "
-                    "ended_at = ?, "
-                    "end_reason = ?, "
-                    "data = json_set(data, "
-                    "  '$.ended_at', ?, "
-                    "  '$.end_reason', ?, "
-                    "  '$.num_rounds_played', ? "
-                    ") "
-                    "WHERE id = ? AND ended_at IS NULL",
-                    (ended_at_iso, end_reason, ended_at_iso, end_reason, num_rounds_played, game_id),
-                )
-            self._db.connection.commit()
-            if cursor.rowcount == 0:
-                logger.warning("finish_game had no effect (not found or already ended)", game_id=game_id)
+        await self._db.write(_finish_game_op(game_id, ended_at, end_reason, num_rounds_played, standings))
 
     async def get_game(self, game_id: str) -> PlayedGame | None:
         """Retrieve a single game by its id."""
-        row = self._db.connection.execute(
-            "SELECT data FROM played_games WHERE id = ?",
-            (game_id,),
-        ).fetchone()
-        if row is None:
-            return None
-        return PlayedGame.model_validate(json.loads(row[0]))
-
-    async def get_recent_games(self, limit: int = 20) -> list[PlayedGame]:
-        """Retrieve the most recent games, ordered by started_at descending."""
-        rows = self._db.connection.execute(
-            "SELECT data FROM played_games ORDER BY started_at DESC LIMIT ?",
-            (limit,),
-        ).fetchall()
-        return [PlayedGame.model_validate(json.loads(row[0])) for row in rows]
+
+        def select(conn: sqlite3.Connection) -> PlayedGame | None:
+            row = conn.execute(
+                "SELECT data FROM played_games WHERE id = ?",
+                (game_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            return PlayedGame.model_validate(json.loads(row[0]))
+
+        return await self._db.read(select)
+
+    async def get_completed_games(
+        self,
+        limit: int = 20,
+        before: tuple[datetime, str] | None = None,
+    ) -> list[PlayedGame]:
+        """Retrieve completed games newest first, continuing after the (started_at, game_id) key `before`.
+
+        Keyset pagination over the partial idx_played_games_completed index:
+        every page costs one index range scan regardless of how deep it is.
+        """
+        if before is None:
+            sql = (
+                "SELECT data FROM played_games WHERE end_reason = 'completed' ORDER BY started_at DESC, id DESC LIMIT ?"
+            )
+            params: tuple[object, ...] = (limit,)
+        else:
+            sql = (
+                "SELECT data FROM played_games WHERE end_reason = 'completed' AND (started_at, id) < (?, ?) "
+                "ORDER BY started_at DESC, id DESC LIMIT ?"
+            )
+            params = (before[0].isoformat(), before[1], limit)
+
+        def select(conn: sqlite3.Connection) -> list[PlayedGame]:
+            rows = conn.execute(sql, params).fetchall()
+            return [PlayedGame.model_validate(json.loads(row[0])) for row in rows]
+
+        return await self._db.read(select)
+
+    async def get_games_for_player(self, user_id: str, limit: int = 20) -> list[PlayedGame]:
+        """Retrieve a player's most recent games, ordered by started_at descending."""
+
+        def select(conn: sqlite3.Connection) -> list[PlayedGame]:
+            rows = conn.execute(
+                "SELECT g.data FROM played_game_standings AS s "
+                "JOIN played_games AS g ON g.id = s.game_id "
+                "WHERE s.user_id = ? "
+                "ORDER BY s.started_at DESC LIMIT ?",
+                (user_id, limit),
+            ).fetchall()
+            return [PlayedGame.model_validate(json.loads(row[0])) for row in rows]
+
+        return await self._db.read(select)
+
+    async def get_player_stats(self, user_id: str) -> PlayerStats:
+        """Aggregate a player's completed games (placement is only set for those)."""
+
+        def select(conn: sqlite3.Connection) -> PlayerStats:
+            games, first_places, average_placement, average_final_score = conn.execute(
+                "SELECT COUNT(*), COUNT(*) FILTER (WHERE placement = 1), AVG(placement), AVG(final_score) "
+                "FROM played_game_standings "
+                "WHERE user_id = ? AND placement IS NOT NULL",
+                (user_id,),
+            ).fetchone()
+            return PlayerStats(
+                user_id=user_id,
+                games_played=games,
+                first_places=first_places,
+                average_placement=average_placement,
+                average_final_score=average_final_score,
+            )
+
+        return await self._db.read(select)
+
+
+class GroupCommitGameRepository(SqliteGameRepository):
+    """Write-behind SqliteGameRepository that group-commits start/finish records.
+
+    create_game() and finish_game() queue their statement and return without
+    waiting for the database. A background task applies the queue in one
+    writer transaction once flush_interval seconds have passed since the
+    first queued record, or as soon as max_batch records are queued. Queued
+    records keep their order, so a game's finish always lands after its start.
+
+    Reads flush the queue first so they see every record written before them.
+    close() must be awaited on shutdown to flush what is still queued.
+    """
+
+    def __init__(self, db: Database, *, flush_interval: float = 0.05, max_batch: int = 64) -> None:
+        super().__init__(db)
+        self._flush_interval = flush_interval
+        self._max_batch = max_batch
+        self._queue: list[Callable[[sqlite3.Connection], None]] = []
+        self._has_pending = asyncio.Event()
+        self._full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: asyncio.Task[None] | None = None
+
+    @property
+    def pending(self) -> int:
+        """Number of queued records not yet handed to the database."""
+        return len(self._queue)
+
+    async def create_game(self, game: PlayedGame) -> None:
+        """Queue a game record insert (see SqliteGameRepository.create_game)."""
+        self._enqueue(_create_game_op(game))
+
+    async def finish_game(
+        self,
+        game_id: str,
+        ended_at: datetime,
+        end_reason: str = "completed",
+        num_rounds_played: int | None = None,
+        standings: list[PlayedGameStanding] | None = None,
+    ) -> None:
+        """Queue a game end update (see SqliteGameRepository.finish_game)."""
+        self._enqueue(_finish_game_op(game_id, ended_at, end_reason, num_rounds_played, standings))
+
+    async def get_game(self, game_id: str) -> PlayedGame | None:
+        await self.flush()
+        return await super().get_game(game_id)
+
+    async def get_completed_games(
+        self,
+        limit: int = 20,
+        before: tuple[datetime, str] | None = None,
+    ) -> list[PlayedGame]:
+        await self.flush()
+        return await super().get_completed_games(limit, before)
+
+    async def get_games_for_player(self, user_id: str, limit: int = 20) -> list[PlayedGame]:
+        await self.flush()
+        return await super().get_games_for_player(user_id, limit)
+
+    async def get_player_stats(self, user_id: str) -> PlayerStats:
+        await self.flush()
+        return await super().get_player_stats(user_id)
+
+    async def flush(self) -> None:
+        """Apply every queued record in one transaction.
+
+        If the batch fails, each record is retried on its own so one bad
+        record does not drop the others. Failures are logged, never raised.
+        """
+        async with self._flush_lock:
+            batch, self._queue = self._queue, []
+            self._has_pending.clear()
+            self._full.clear()
+            if not batch:
+                return
+            try:
+                await self._db.write(lambda conn: _apply_all(conn, batch))
+            except Exception:
+                logger.exception("group commit of game records failed, retrying individually", records=len(batch))
+                for op in batch:
+                    try:
+                        await self._db.write(op)
+                    except Exception:
+                        logger.exception("failed to persist game record")
+
+    async def close(self) -> None:
+        """Stop the background flusher and flush the remaining queue."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flusher
+            self._flusher = None
+        await self.flush()
+
+    def _enqueue(self, op: Callable[[sqlite3.Connection], None]) -> None:
+        self._queue.append(op)
+        self._has_pending.set()
+        if len(self._queue) >= self._max_batch:
+            self._full.set()
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run_flusher())
+
+    async def _run_flusher(self) -> None:
+        while True:
+            await self._has_pending.wait()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._full.wait(), timeout=self._flush_interval)
+            await self.flush()
+
+
+def _apply_all(conn: sqlite3.Connection, ops: list[Callable[[sqlite3.Connection], None]]) -> None:
+    for op in ops:
+        op(conn)
+
+
+def _create_game_op(game: PlayedGame) -> Callable[[sqlite3.Connection], None]:
+    params = (
+        game.game_id,
+        game.started_at.isoformat(),
+        game.ended_at.isoformat() if game.ended_at else None,
+        game.end_reason,
+        game.model_dump_json(),
+    )
+    started_at_iso = game.started_at.isoformat()
+    # Standings carry scores only for games created already finished; those are in placement order.
+    standings_rows = [
+        (
+            game.game_id,
+            s.seat,
+            s.user_id or None,
+            started_at_iso,
+            s.score,
+            s.final_score,
+            placement if s.score is not None else None,
+        )
+        for placement, s in enumerate(game.standings, start=1)
+    ]
+
+    def insert(conn: sqlite3.Connection) -> None:
+        # ON CONFLICT DO NOTHING rather than IntegrityError, so a duplicate
+        # does not abort the other records of a group commit.
+        cursor = conn.execute(
+            "INSERT INTO played_games (id, started_at, ended_at, end_reason, data) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO NOTHING",
+            params,
+        )
+        if cursor.rowcount == 0:
+            logger.warning("game already exists, ignoring duplicate create", game_id=game.game_id)
+            return
+        conn.executemany(
+            "INSERT INTO played_game_standings "
+            "(game_id, seat, user_id, started_at, score, final_score, placement) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            standings_rows,
+        )
+
+    return insert
+
+
+def _finish_game_op(
+    game_id: str,
+    ended_at: datetime,
+    end_reason: str,
+    num_rounds_played: int | None,
+    standings: list[PlayedGameStanding] | None,
+) -> Callable[[sqlite3.Connection], None]:
+    ended_at_iso = ended_at.isoformat()
+    if standings is not None:
+        standings_json = json.dumps([s.model_dump() for s in standings])
+        sql = (
+            "UPDATE played_games SET "
+            "ended_at = ?, "
+            "end_reason = ?, "
+            "data = json_set(data, "
+            "  '$.ended_at', ?, "
+            "  '$.end_reason', ?, "
+            "  '$.num_rounds_played', ?, "
+            "  '$.standings', json(?) "
+            ") "
+            "WHERE id = ? AND ended_at IS NULL"
+        )
+        params: tuple[object, ...] = (
+            ended_at_iso,
+            end_reason,
+            ended_at_iso,
+            end_reason,
+            num_rounds_played,
+            standings_json,
+            game_id,
+        )
+        # standings are in placement order
+        standings_rows = [
+            (game_id, s.seat, s.user_id or None, s.score, s.final_score, placement, game_id)
+            for placement, s in enumerate(standings, start=1)
+        ]
+    else:
+        # Abandoned: do NOT overwrite standings -- preserve start-time player data
+        sql = (
+            "UPDATE played_games SET "
+            "ended_at = ?, "
+            "end_reason = ?, "
+            "data = json_set(data, "
+            "  '$.ended_at', ?, "
+            "  '$.end_reason', ?, "
+            "  '$.num_rounds_played', ? "
+            ") "
+            "WHERE id = ? AND ended_at IS NULL"
+        )
+        params = (ended_at_iso, end_reason, ended_at_iso, end_reason, num_rounds_played, game_id)
+        standings_rows = []
+
+    def update(conn: sqlite3.Connection) -> None:
+        if conn.execute(sql, params).rowcount == 0:
+            logger.warning("finish_game had no effect (not found or already ended)", game_id=game_id)
+            return
+        # Upsert: seats recorded at start get their results, any seat missing is added.
+        conn.executemany(
+            "INSERT INTO played_game_standings "
+            "(game_id, seat, user_id, started_at, score, final_score, placement) "
+            "SELECT ?, ?, ?, started_at, ?, ?, ? FROM played_games WHERE id = ? "
+            "ON CONFLICT (game_id, seat) DO UPDATE SET "
+            "user_id = COALESCE(user_id, excluded.user_id), "
+            "score = excluded.score, final_score = excluded.final_score, placement = excluded.placement",
+            standings_rows,
+        )
+
+    return update
@@ -0,0 +1,375 @@
+"""
+Cold-storage packs for old replay files.
+
+LocalReplayStorage writes one small gzip file per game, so a long-running
+server accumulates files and directory entries without bound. compact_replays()
+moves replays older than a cutoff into append-only packs, one per shard
+directory per month of the replay's mtime (UTC):
+
+``{replay_dir}/{id[0:2]}/{id[2:4]}/pack-{YYYY}-{MM}.pack``
+``{replay_dir}/{id[0:2]}/{id[2:4]}/pack-{YYYY}-{MM}.pack.idx``
+
+The pack holds the replay files' gzip bytes back to back (so it is itself a
+multi-member gzip file), and the .idx file is NDJSON with one entry per
+replay: game ID, offset and length in the pack, the original file's mtime (so
+the lobby's ETag does not change when a replay is packed), and its segment
+index with compressed offsets rebased onto the pack.
+
+Both files are only appended to. Pack bytes are fsynced before their index
+entries are written, and the index is fsynced before the loose files are
+deleted, so a crash at any point leaves every replay readable: bytes at the
+end of a pack without an index entry are never referenced, a torn last index
+line is skipped, and a replay that is still a loose file is served from it
+(and deleted by the next run). A replay's binary copy (``{game_id}.bin.gz``)
+is deleted with its loose file rather than packed.
+
+Each run also deletes ``.replay_*.tmp`` files not modified for a day or more
+(--stale-tmp-hours), left in shard directories when the game server died
+before renaming a replay into place.
+
+Usage:
+    make pack-replays
+    PYTHONPATH=backend uv run python -m shared.replay_packs --replay-dir backend/data/replays --older-than-days 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import fcntl
+import functools
+import json
+import os
+import stat
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from shared.storage import REPLAY_TMP_PREFIX, REPLAY_TMP_SUFFIX, replay_file_path
+
+if TYPE_CHECKING:
+    from typing import BinaryIO
+
+logger = structlog.get_logger()
+
+REPLAYS_DIR = Path("backend/data/replays")
+
+DEFAULT_OLDER_THAN_DAYS = 30
+
+# Streamed replays rewrite their temp file every round, so a day without writes means it was abandoned.
+DEFAULT_STALE_TMP_HOURS = 24.0
+
+_PACK_PREFIX = "pack-"
+_PACK_SUFFIX = ".pack"
+_PACK_INDEX_SUFFIX = ".idx"
+_REPLAY_SUFFIX = ".txt.gz"
+_SEGMENT_INDEX_SUFFIX = ".index.json"
+_BINARY_SUFFIX = ".bin.gz"
+
+# Same owner-only modes as shared.storage.
+_PACK_FILE_MODE = 0o600
+
+# Parsed pack indexes kept in memory (a few shards' worth of months).
+_INDEX_CACHE_SIZE = 256
+
+_SECONDS_PER_DAY = 86_400
+_SECONDS_PER_HOUR = 3_600
+
+
+@dataclass(frozen=True, slots=True)
+class PackedReplay:
+    """Where one replay's gzip bytes live inside a pack file."""
+
+    game_id: str
+    pack: Path
+    offset: int
+    length: int
+    mtime_ns: int
+    segments: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def location(self) -> str:
+        """Pack path and game ID, for logs and reports."""
+        return f"{self.pack}#{self.game_id}"
+
+
+@dataclass(slots=True)
+class CompactionReport:
+    """Outcome of one compact_replays() run."""
+
+    packed: int = 0
+    packed_bytes: int = 0
+    already_packed: int = 0
+    failed: int = 0
+    removed_tmp: int = 0
+    packs: set[Path] = field(default_factory=set)
+    elapsed: float = 0.0
+
+
+def pack_index_path(pack: Path) -> Path:
+    """Build the path of a pack's offset index, next to the pack."""
+    return pack.with_name(pack.name + _PACK_INDEX_SUFFIX)
+
+
+def read_pack_index(index_path: Path) -> dict[str, PackedReplay]:
+    """Parse a pack index into entries by game ID.
+
+    Lines that are not complete entries (a torn last line after a crash) are
+    skipped. Raise OSError if the index cannot be read.
+    """
+    pack = index_path.with_name(index_path.name.removesuffix(_PACK_INDEX_SUFFIX))
+    entries: dict[str, PackedReplay] = {}
+    with index_path.open("rb") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                packed = PackedReplay(
+                    game_id=entry["id"],
+                    pack=pack,
+                    offset=entry["offset"],
+                    length=entry["length"],
+                    mtime_ns=entry["mtime_ns"],
+                    segments=entry.get("segments", []),
+                )
+            except (ValueError, TypeError, KeyError):  # fmt: skip
+                continue
+            entries[packed.game_id] = packed
+    return entries
+
+
+@functools.lru_cache(maxsize=_INDEX_CACHE_SIZE)
+def _cached_pack_index(index_path: Path, size: int, mtime_ns: int) -> dict[str, PackedReplay]:  # noqa: ARG001
+    # size and mtime_ns are part of the cache key, so an appended index is parsed again.
+    return read_pack_index(index_path)
+
+
+def find_packed_replay(replay_dir: Path, game_id: str) -> PackedReplay | None:
+    """Look up a replay in the packs of its shard directory, newest month first."""
+    shard_dir = replay_file_path(replay_dir, game_id).parent
+    for index_path in sorted(shard_dir.glob(f"{_PACK_PREFIX}*{_PACK_SUFFIX}{_PACK_INDEX_SUFFIX}"), reverse=True):
+        try:
+            stat_result = index_path.stat()
+            entries = _cached_pack_index(index_path, stat_result.st_size, stat_result.st_mtime_ns)
+        except OSError:
+            continue
+        packed = entries.get(game_id)
+        if packed is not None:
+            return packed
+    return None
+
+
+def list_packed_replays(directory: Path) -> list[PackedReplay]:
+    """Return the replays indexed by every pack under directory, sorted by game ID.
+
+    Indexes that cannot be read are skipped.
+    """
+    entries: dict[str, PackedReplay] = {}
+    for index_path in sorted(directory.rglob(f"{_PACK_PREFIX}*{_PACK_SUFFIX}{_PACK_INDEX_SUFFIX}")):
+        try:
+            entries.update(read_pack_index(index_path))
+        except OSError:
+            logger.warning("unreadable pack index", path=str(index_path))
+    return [entries[game_id] for game_id in sorted(entries)]
+
+
+def read_packed_replay(packed: PackedReplay) -> bytes:
+    """Read a packed replay's gzip bytes.
+
+    Raise OSError if the pack cannot be read and ValueError if it is shorter
+    than its index says.
+    """
+    with packed.pack.open("rb") as f:
+        f.seek(packed.offset)
+        data = f.read(packed.length)
+    if len(data) != packed.length:
+        raise ValueError(f"pack {packed.pack} is truncated at {packed.game_id}")
+    return data
+
+
+def _shard_dirs(replay_dir: Path) -> list[Path]:
+    return sorted(path for path in replay_dir.glob("??/??") if path.is_dir())
+
+
+def _old_replays_by_month(shard_dir: Path, cutoff_ns: int) -> dict[str, list[tuple[Path, os.stat_result]]]:
+    """Group the shard's loose replay files older than cutoff_ns by UTC month of their mtime."""
+    by_month: dict[str, list[tuple[Path, os.stat_result]]] = {}
+    for path in sorted(shard_dir.glob(f"*{_REPLAY_SUFFIX}")):
+        try:
+            stat_result = path.stat()
+        except OSError:
+            continue
+        if not stat.S_ISREG(stat_result.st_mode) or stat_result.st_mtime_ns >= cutoff_ns:
+            continue
+        month = time.strftime("%Y-%m", time.gmtime(stat_result.st_mtime_ns // 1_000_000_000))
+        by_month.setdefault(month, []).append((path, stat_result))
+    return by_month
+
+
+def _remove_stale_tmp_files(shard_dir: Path, cutoff_ns: int, report: CompactionReport) -> None:
+    """Delete the shard's replay temp files last modified before cutoff_ns."""
+    for path in shard_dir.glob(f"{REPLAY_TMP_PREFIX}*{REPLAY_TMP_SUFFIX}"):
+        try:
+            if path.stat().st_mtime_ns >= cutoff_ns:
+                continue
+            path.unlink()
+        except OSError:
+            continue
+        report.removed_tmp += 1
+
+
+def _read_segments(replay: Path, game_id: str, offset: int) -> list[dict[str, Any]]:
+    """Read a replay's segment index sidecar, rebased onto its offset in the pack.
+
+    Return no segments if the replay has no readable index.
+    """
+    try:
+        index = json.loads(replay.with_name(f"{game_id}{_SEGMENT_INDEX_SUFFIX}").read_bytes())
+        segments = index["segments"]
+        return [{**segment, "compressed_offset": segment["compressed_offset"] + offset} for segment in segments]
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError, TypeError, KeyError):  # fmt: skip
+        logger.warning("unreadable replay segment index, packing without it", game_id=game_id)
+        return []
+
+
+def _open_append(path: Path) -> BinaryIO:
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, _PACK_FILE_MODE)
+    try:
+        return os.fdopen(fd, "ab")
+    except BaseException:
+        os.close(fd)
+        raise
+
+
+def _ends_with_newline(path: Path) -> bool:
+    try:
+        with path.open("rb") as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    except FileNotFoundError:
+        return True
+
+
+def _append_to_pack(pack_path: Path, replays: list[tuple[Path, os.stat_result]], report: CompactionReport) -> None:
+    """Append replays to one pack, index them, then delete the loose files."""
+    index_path = pack_index_path(pack_path)
+    with _open_append(pack_path) as pack:
+        # Serializes concurrent runs; readers never lock.
+        fcntl.flock(pack.fileno(), fcntl.LOCK_EX)
+        indexed = read_pack_index(index_path) if index_path.exists() else {}
+        offset = pack.seek(0, os.SEEK_END)
+        entries: list[dict[str, Any]] = []
+        done: list[Path] = []
+        for path, stat_result in replays:
+            game_id = path.name.removesuffix(_REPLAY_SUFFIX)
+            if game_id in indexed:
+                report.already_packed += 1
+                done.append(path)
+                continue
+            try:
+                data = path.read_bytes()
+            except OSError:
+                logger.exception("failed to read replay for packing", path=str(path))
+                report.failed += 1
+                continue
+            pack.write(data)
+            entries.append(
+                {
+                    "id": game_id,
+                    "offset": offset,
+                    "length": len(data),
+                    "mtime_ns": stat_result.st_mtime_ns,
+                    "segments": _read_segments(path, game_id, offset),
+                },
+            )
+            offset += len(data)
+            done.append(path)
+            report.packed += 1
+            report.packed_bytes += len(data)
+
+        if entries:
+            pack.flush()
+            os.fsync(pack.fileno())
+            # A torn line left by a crash must not swallow the first new entry.
+            lines = b"" if _ends_with_newline(index_path) else b"\n"
+            lines += b"".join(json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n" for entry in entries)
+            with _open_append(index_path) as index:
+                index.write(lines)
+                index.flush()
+                os.fsync(index.fileno())
+            report.packs.add(pack_path)
+
+        for path in done:
+            game_id = path.name.removesuffix(_REPLAY_SUFFIX)
+            # The binary copy is not packed; encode_replay() rebuilds it from the packed replay.
+            for loose in (
+                path,
+                path.with_name(f"{game_id}{_SEGMENT_INDEX_SUFFIX}"),
+                path.with_name(f"{game_id}{_BINARY_SUFFIX}"),
+            ):
+                with contextlib.suppress(FileNotFoundError):
+                    loose.unlink()
+
+
+def compact_replays(
+    replay_dir: Path,
+    older_than_days: float = DEFAULT_OLDER_THAN_DAYS,
+    *,
+    stale_tmp_hours: float = DEFAULT_STALE_TMP_HOURS,
+    now: float | None = None,
+) -> CompactionReport:
+    """Move loose replays older than older_than_days into per-shard monthly packs.
+
+    Also delete replay temp files not modified for stale_tmp_hours.
+    """
+    start = time.perf_counter()
+    now = time.time() if now is None else now
+    cutoff_ns = int((now - older_than_days * _SECONDS_PER_DAY) * 1_000_000_000)
+    tmp_cutoff_ns = int((now - stale_tmp_hours * _SECONDS_PER_HOUR) * 1_000_000_000)
+    report = CompactionReport()
+    for shard_dir in _shard_dirs(replay_dir):
+        _remove_stale_tmp_files(shard_dir, tmp_cutoff_ns, report)
+        for month, replays in sorted(_old_replays_by_month(shard_dir, cutoff_ns).items()):
+            _append_to_pack(shard_dir / f"{_PACK_PREFIX}{month}{_PACK_SUFFIX}", replays, report)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pack old replay files into per-shard monthly archives")
+    parser.add_argument("--replay-dir", type=Path, default=REPLAYS_DIR, help=f"Replay root (default: {REPLAYS_DIR})")
+    parser.add_argument(
+        "--older-than-days",
+        type=float,
+        default=DEFAULT_OLDER_THAN_DAYS,
+        help=f"Pack replays last modified more than this many days ago (default: {DEFAULT_OLDER_THAN_DAYS})",
+    )
+    parser.add_argument(
+        "--stale-tmp-hours",
+        type=float,
+        default=DEFAULT_STALE_TMP_HOURS,
+        help=f"Delete replay temp files untouched for this many hours (default: {DEFAULT_STALE_TMP_HOURS:g})",
+    )
+    args = parser.parse_args()
+
+    report = compact_replays(args.replay_dir, args.older_than_days, stale_tmp_hours=args.stale_tmp_hours)
+    logger.info(
+        "packed replays",
+        packed=report.packed,
+        packed_bytes=report.packed_bytes,
+        already_packed=report.already_packed,
+        failed=report.failed,
+        removed_tmp=report.removed_tmp,
+        packs=len(report.packs),
+        elapsed=round(report.elapsed, 3),
+    )
+
+
+if __name__ == "__main__":
+    main()
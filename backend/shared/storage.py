@@ -8,14 +8,30 @@ directories (0o700) as a filesystem hygiene measure.
 Replay files are distributed across a two-level directory structure using
 the first 4 characters of the game ID as shard prefixes:
 ``{replay_dir}/{id[0:2]}/{id[2:4]}/{game_id}.txt.gz``
+
+Replays written through a LocalReplayStream can be split into segments (the
+game header and one segment per round). Each segment ends with a zlib full
+flush, so its compressed bytes inflate on their own as raw deflate data, and
+the segment offsets are written to a sidecar ``{game_id}.index.json`` next to
+the replay. The replay itself stays a single ordinary gzip stream.
+
+Storages can also keep a binary copy of each replay (game.replay.binary) in
+``{game_id}.bin.gz`` next to it. The NDJSON file stays the one served and
+packed; packing deletes the binary copy.
+
+Replays older than a cutoff can be moved out of their loose files into
+per-shard monthly packs by shared.replay_packs, which also deletes temp files
+left behind by writes that never reached their rename.
 """
 
 import contextlib
 import gzip
+import json
 import os
 import tempfile
+import zlib
 from pathlib import Path
-from typing import Protocol
+from typing import Any, BinaryIO, Protocol, runtime_checkable
 
 import structlog
 
@@ -30,6 +46,22 @@ _REPLAY_FILE_MODE = 0o600
 # Game IDs shorter than this cannot produce a two-level shard prefix.
 _MIN_GAME_ID_LEN = 4
 
+# Same compression level as gzip.compress(); wbits=31 selects the gzip container.
+_GZIP_LEVEL = 9
+_GZIP_WBITS = 31
+
+# zlib writes a fixed 10-byte gzip header (no file name) before the deflate data.
+_GZIP_HEADER_LEN = 10
+
+# wbits for inflating one segment's raw deflate bytes.
+_RAW_DEFLATE_WBITS = -15
+
+REPLAY_INDEX_VERSION = 1
+
+# Name pattern of the temp files replays are written to before their rename.
+REPLAY_TMP_PREFIX = ".replay_"
+REPLAY_TMP_SUFFIX = ".tmp"
+
 
 def replay_file_path(replay_dir: Path, game_id: str) -> Path:
     """Build the sharded file path for a replay.
@@ -45,12 +77,164 @@ def replay_file_path(replay_dir: Path, game_id: str) -> Path:
     return replay_dir / prefix_a / prefix_b / f"{game_id}.txt.gz"
 
 
+def replay_index_path(replay_dir: Path, game_id: str) -> Path:
+    """Build the path of a replay's segment index, next to the replay file."""
+    return replay_file_path(replay_dir, game_id).with_name(f"{game_id}.index.json")
+
+
+def binary_replay_path(replay_dir: Path, game_id: str) -> Path:
+    """Build the path of a replay's gzip-compressed binary copy, next to the replay file."""
+    return replay_file_path(replay_dir, game_id).with_name(f"{game_id}.bin.gz")
+
+
+def read_replay_segment(replay: BinaryIO, segment: dict[str, Any]) -> str:
+    """Inflate one indexed segment from an open binary replay file.
+
+    Raise ValueError if the segment's bytes do not inflate to its recorded length.
+    """
+    replay.seek(segment["compressed_offset"])
+    data = replay.read(segment["compressed_length"])
+    try:
+        text = zlib.decompressobj(_RAW_DEFLATE_WBITS).decompress(data)
+    except zlib.error as exc:
+        raise ValueError(f"corrupt replay segment: {exc}") from exc
+    if len(text) != segment["length"]:
+        raise ValueError("replay segment length does not match its index")
+    return text.decode("utf-8")
+
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    """Write data to target via an fsynced owner-only temp file and a rename."""
+    fd, tmp_path = tempfile.mkstemp(dir=str(target.parent), suffix=REPLAY_TMP_SUFFIX, prefix=REPLAY_TMP_PREFIX)
+    fd_owned = True
+    try:
+        with os.fdopen(fd, "wb") as f:
+            fd_owned = False  # os.fdopen took ownership; it will close fd
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, _REPLAY_FILE_MODE)  # noqa: PTH101
+        Path(tmp_path).replace(target)
+    except BaseException:
+        if fd_owned:
+            with contextlib.suppress(OSError):
+                os.close(fd)
+        with contextlib.suppress(OSError):
+            Path(tmp_path).unlink()
+        raise
+
+
 class ReplayStorage(Protocol):
     """Protocol for persisting replay data."""
 
     def save_replay(self, game_id: str, content: str) -> None: ...
 
 
+class ReplayStream(Protocol):
+    """Incremental replay writer: append text during the game, commit or abort at the end."""
+
+    def write(self, text: str) -> None: ...
+
+    def end_segment(self, meta: dict[str, Any]) -> None: ...
+
+    def commit(self) -> None: ...
+
+    def abort(self) -> None: ...
+
+
+@runtime_checkable
+class StreamingReplayStorage(ReplayStorage, Protocol):
+    """Replay storage that can also write a replay incrementally."""
+
+    def open_stream(self, game_id: str) -> ReplayStream: ...
+
+
+@runtime_checkable
+class BinaryReplayStorage(ReplayStorage, Protocol):
+    """Replay storage that can also keep a binary copy of each replay."""
+
+    def save_binary_replay(self, game_id: str, data: bytes) -> None: ...
+
+
+class LocalReplayStream:
+    """Gzip replay text incrementally into a temp file next to its final path.
+
+    Text is fed through a zlib compressor in gzip mode as it arrives, so only
+    the compressor window stays in memory. commit() finishes the gzip stream,
+    fsyncs, and atomically renames the temp file into place; abort() deletes
+    it. The decompressed result is the concatenation of everything written.
+
+    end_segment() closes the text written since the previous segment with a
+    full flush and records its offsets with the caller's metadata; commit()
+    writes those segments to the index sidecar before renaming the replay in.
+    """
+
+    def __init__(self, target: Path, index_target: Path) -> None:
+        self._target = target
+        self._index_target = index_target
+        self._segments: list[dict[str, Any]] = []
+        self._offset = 0
+        self._compressed_offset = 0
+        # The first segment's deflate data starts after the gzip header.
+        self._segment_start = (0, _GZIP_HEADER_LEN)
+        fd, tmp_path = tempfile.mkstemp(dir=str(target.parent), suffix=REPLAY_TMP_SUFFIX, prefix=REPLAY_TMP_PREFIX)
+        self._tmp_path = Path(tmp_path)
+        try:
+            self._file = os.fdopen(fd, "wb")
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.close(fd)
+            with contextlib.suppress(OSError):
+                self._tmp_path.unlink()
+            raise
+        self._compressor = zlib.compressobj(_GZIP_LEVEL, zlib.DEFLATED, _GZIP_WBITS)
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self._offset += len(data)
+        self._write_compressed(self._compressor.compress(data))
+
+    def end_segment(self, meta: dict[str, Any]) -> None:
+        self._write_compressed(self._compressor.flush(zlib.Z_FULL_FLUSH))
+        offset, compressed_offset = self._segment_start
+        self._segments.append(
+            {
+                "offset": offset,
+                "length": self._offset - offset,
+                "compressed_offset": compressed_offset,
+                "compressed_length": self._compressed_offset - compressed_offset,
+                "meta": meta,
+            },
+        )
+        self._segment_start = (self._offset, self._compressed_offset)
+
+    def _write_compressed(self, data: bytes) -> None:
+        self._file.write(data)
+        self._compressed_offset += len(data)
+
+    def commit(self) -> None:
+        try:
+            self._file.write(self._compressor.flush())
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.chmod(self._tmp_path, _REPLAY_FILE_MODE)  # noqa: PTH101
+            if self._segments:
+                index = {"version": REPLAY_INDEX_VERSION, "segments": self._segments}
+                _write_atomic(self._index_target, json.dumps(index, separators=(",", ":")).encode("utf-8"))
+            self._tmp_path.replace(self._target)
+        except BaseException:
+            self.abort()
+            raise
+        logger.info("saved replay", path=str(self._target), streamed=True)
+
+    def abort(self) -> None:
+        with contextlib.suppress(OSError):
+            self._file.close()
+        with contextlib.suppress(OSError):
+            self._tmp_path.unlink()
+
+
 class LocalReplayStorage:
     """Write gzip-compressed replay files to the local filesystem.
 
@@ -62,14 +246,11 @@ class LocalReplayStorage:
     def __init__(self, replay_dir: str) -> None:
         self._replay_dir = Path(replay_dir).resolve()
 
-    def save_replay(self, game_id: str, content: str) -> None:
-        """Save gzip-compressed replay content under the configured directory.
+    def _prepare_target(self, game_id: str) -> Path:
+        """Resolve the replay path for game_id and create its shard directories.
 
-        Create shard directories lazily on first write with owner-only
-        permissions (0o700). Write replay files atomically via
-        temp-file-then-rename with owner-only permissions (0o600). Reject
-        path traversal attempts that would place the file outside the replay
-        root.
+        Reject path traversal attempts that would place the file outside the
+        replay root.
         """
         target = replay_file_path(self._replay_dir, game_id).resolve()
         if not target.is_relative_to(self._replay_dir):
@@ -81,24 +262,37 @@ class LocalReplayStorage:
         # parents=True applies mode only to the leaf; umask may weaken it).
         for directory in (self._replay_dir, shard_dir.parent, shard_dir):
             directory.chmod(_REPLAY_DIR_MODE)
+        return target
 
-        compressed = gzip.compress(content.encode("utf-8"))
+    def open_stream(self, game_id: str) -> LocalReplayStream:
+        """Start an incremental gzip replay in the game's shard directory.
 
-        fd, tmp_path = tempfile.mkstemp(dir=str(shard_dir), suffix=".tmp", prefix=".replay_")
-        fd_owned = True
-        try:
-            with os.fdopen(fd, "wb") as f:
-                fd_owned = False  # os.fdopen took ownership; it will close fd
-                f.write(compressed)
-                f.flush()
-                os.fsync(f.fileno())
-            os.chmod(tmp_path, _REPLAY_FILE_MODE)  # noqa: PTH101
-            Path(tmp_path).replace(target)
-        except BaseException:
-            if fd_owned:
-                with contextlib.suppress(OSError):
-                    os.close(fd)
-            with contextlib.suppress(OSError):
-                Path(tmp_path).unlink()
-            raise
+        The temp file gets the same owner-only permissions and atomic rename
+        as save_replay() when the stream is committed.
+        """
+        target = self._prepare_target(game_id)
+        return LocalReplayStream(target, target.with_name(f"{game_id}.index.json"))
+
+    def save_replay(self, game_id: str, content: str) -> None:
+        """Save gzip-compressed replay content under the configured directory.
+
+        Create shard directories lazily on first write with owner-only
+        permissions (0o700). Write replay files atomically via
+        temp-file-then-rename with owner-only permissions (0o600). Reject
+        path traversal attempts that would place the file outside the replay
+        root.
+        """
+        target = self._prepare_target(game_id)
+
+        _write_atomic(target, gzip.compress(content.encode("utf-8")))
         logger.info("saved replay", game_id=game_id, path=str(target))
+
+    def save_binary_replay(self, game_id: str, data: bytes) -> None:
+        """Save a gzip-compressed binary replay next to the game's replay file.
+
+        Same directories, permissions and atomic rename as save_replay().
+        """
+        self._prepare_target(game_id)
+        target = binary_replay_path(self._replay_dir, game_id)
+        _write_atomic(target, gzip.compress(data))
+        logger.info("saved binary replay", game_id=game_id, path=str(target))
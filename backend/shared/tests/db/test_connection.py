@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import sqlite3
 import sys
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 from unittest.mock import patch
 
 import pytest
 
+from shared.dal.models import PlayedGame, PlayedGameStanding
 from shared.db.connection import Database
 
 if TYPE_CHECKING:
@@ -59,3 +62,66 @@ class TestPermissions:
         # connect() should succeed despite chmod failure
         assert db.connection is not None
         db.close()
+
+
+class TestMigrations:
+    def test_backfills_standings_of_existing_games(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "test.db"
+        legacy = sqlite3.connect(db_path)
+        legacy.executescript(
+            "CREATE TABLE played_games (id TEXT PRIMARY KEY, started_at TEXT NOT NULL, "
+            "ended_at TEXT, end_reason TEXT, data TEXT NOT NULL);",
+        )
+        finished = PlayedGame(
+            game_id="g1",
+            started_at=datetime(2025, 1, 15, 12, 0, 0, tzinfo=UTC),
+            ended_at=datetime(2025, 1, 15, 13, 0, 0, tzinfo=UTC),
+            end_reason="completed",
+            standings=[
+                PlayedGameStanding(name="Bob", seat=1, user_id="u2", score=40000, final_score=50),
+                PlayedGameStanding(name="AI", seat=0, score=25000, final_score=0),
+            ],
+        )
+        legacy.execute(
+            "INSERT INTO played_games (id, started_at, ended_at, end_reason, data) VALUES (?, ?, ?, ?, ?)",
+            ("g1", finished.started_at.isoformat(), None, "completed", finished.model_dump_json()),
+        )
+        legacy.commit()
+        legacy.close()
+
+        db = Database(db_path)
+        db.connect()
+
+        rows = db.connection.execute(
+            "SELECT seat, user_id, started_at, score, final_score, placement "
+            "FROM played_game_standings ORDER BY placement",
+        ).fetchall()
+        assert rows == [
+            (1, "u2", finished.started_at.isoformat(), 40000, 50, 1),
+            (0, None, finished.started_at.isoformat(), 25000, 0, 2),
+        ]
+        assert db.connection.execute("PRAGMA user_version").fetchone()[0] == 1
+        db.close()
+
+    def test_migrations_run_once(self, tmp_path: Path) -> None:
+        db = Database(tmp_path / "test.db")
+        db.connect()
+        db.close()
+
+        with patch("shared.db.connection.logger") as mock_logger:
+            db.connect()
+        mock_logger.info.assert_not_called()
+        db.close()
+
+    def test_player_history_query_uses_index(self, tmp_path: Path) -> None:
+        db = Database(tmp_path / "test.db")
+        db.connect()
+
+        plan = db.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT game_id FROM played_game_standings "
+            "WHERE user_id = ? ORDER BY started_at DESC LIMIT 20",
+            ("u1",),
+        ).fetchall()
+
+        assert any("idx_played_game_standings_user_started_at" in row[-1] for row in plan)
+        db.close()
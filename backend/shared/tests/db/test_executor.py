@@ -0,0 +1,222 @@
+"""Tests for DatabaseExecutor (writer thread and reader pool)."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from shared.db.connection import Database
+from shared.db.executor import DatabaseExecutor, _rollback
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def db(tmp_path: Path):
+    database = Database(tmp_path / "test.db")
+    database.connect()
+    database.connection.execute("CREATE TABLE kv (k TEXT PRIMARY KEY, v TEXT NOT NULL)")
+    database.connection.commit()
+    yield database
+    database.close()
+
+
+def _insert(key: str, value: str):
+    def run(conn: sqlite3.Connection) -> None:
+        conn.execute("INSERT INTO kv (k, v) VALUES (?, ?)", (key, value))
+
+    return run
+
+
+def _count(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT COUNT(*) FROM kv").fetchone()[0]
+
+
+class _Abort(BaseException):
+    pass
+
+
+def _release_own_savepoint(conn: sqlite3.Connection) -> None:
+    # Breaks the writer's RELEASE of the job's savepoint, failing the whole batch.
+    conn.execute("RELEASE job")
+
+
+def _abort(_conn: sqlite3.Connection) -> None:
+    raise _Abort
+
+
+class TestWrites:
+    async def test_write_runs_off_the_event_loop_thread(self, db: Database) -> None:
+        thread_names = await asyncio.gather(
+            db.write(lambda _conn: threading.current_thread().name),
+            db.read(lambda _conn: threading.current_thread().name),
+        )
+
+        assert thread_names[0] == "sqlite-writer"
+        assert thread_names[1].startswith("sqlite-reader")
+        assert threading.current_thread().name not in thread_names
+
+    async def test_committed_write_is_visible_to_readers(self, db: Database) -> None:
+        await db.write(_insert("a", "1"))
+
+        assert await db.read(_count) == 1
+
+    async def test_failing_job_is_rolled_back_alone(self, db: Database) -> None:
+        await db.write(_insert("a", "1"))
+
+        results = await asyncio.gather(
+            db.write(_insert("b", "2")),
+            db.write(_insert("a", "duplicate")),
+            db.write(_insert("c", "3")),
+            return_exceptions=True,
+        )
+
+        assert results[0] is None
+        assert isinstance(results[1], sqlite3.IntegrityError)
+        assert results[2] is None
+        assert await db.read(_count) == 3
+
+    async def test_queued_writes_share_one_commit(self, db: Database) -> None:
+        batch_sizes: list[int] = []
+        commit_batch = DatabaseExecutor._commit_batch
+
+        def spy(executor: DatabaseExecutor, conn: sqlite3.Connection, batch: list) -> None:
+            batch_sizes.append(len(batch))
+            commit_batch(executor, conn, batch)
+
+        release = threading.Event()
+        with patch.object(DatabaseExecutor, "_commit_batch", spy):
+            # Block the writer so the following writes queue up behind it.
+            blocker = asyncio.create_task(db.write(lambda _conn: release.wait(timeout=5)))
+            await asyncio.sleep(0.05)
+            writes = [asyncio.create_task(db.write(_insert(str(i), "v"))) for i in range(10)]
+            await asyncio.sleep(0.05)
+            release.set()
+            await asyncio.gather(blocker, *writes)
+
+        assert batch_sizes == [1, 10]
+        assert await db.read(_count) == 10
+
+    async def test_batch_failure_fails_every_write_and_rolls_back(self, db: Database) -> None:
+        release = threading.Event()
+        blocker = asyncio.create_task(db.write(lambda _conn: release.wait(timeout=5)))
+        await asyncio.sleep(0.05)
+        writes = [
+            asyncio.create_task(db.write(_insert("a", "1"))),
+            asyncio.create_task(db.write(_release_own_savepoint)),
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        await blocker
+
+        results = await asyncio.gather(*writes, return_exceptions=True)
+
+        assert all(isinstance(result, sqlite3.OperationalError) for result in results)
+        assert await db.read(_count) == 0
+        await db.write(_insert("b", "2"))
+        assert await db.read(_count) == 1
+
+    async def test_base_exception_fails_the_batch_and_keeps_the_writer(self, db: Database) -> None:
+        with pytest.raises(RuntimeError, match="write batch aborted"):
+            await db.write(_abort)
+
+        await db.write(_insert("a", "1"))
+        assert await db.read(_count) == 1
+
+    async def test_cancelled_write_is_not_resolved(self, db: Database) -> None:
+        release = threading.Event()
+        blocker = asyncio.create_task(db.write(lambda _conn: release.wait(timeout=5)))
+        await asyncio.sleep(0.05)
+        cancelled = asyncio.create_task(db.write(_insert("a", "1")))
+        await asyncio.sleep(0.05)
+        cancelled.cancel()
+        release.set()
+        await blocker
+        await asyncio.sleep(0.05)
+
+        assert cancelled.cancelled()
+        # The cancelled caller is gone, but its write still committed with the batch.
+        assert await db.read(_count) == 1
+
+    async def test_readers_cannot_write(self, db: Database) -> None:
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            await db.read(_insert("a", "1"))
+
+
+class TestLifecycle:
+    async def test_close_flushes_queued_writes(self, tmp_path: Path) -> None:
+        db = Database(tmp_path / "test.db")
+        db.connect()
+        db.connection.execute("CREATE TABLE kv (k TEXT PRIMARY KEY, v TEXT NOT NULL)")
+        db.connection.commit()
+        pending = asyncio.create_task(db.write(_insert("a", "1")))
+        await asyncio.sleep(0)
+
+        db.close()
+        await pending
+
+        reopened = sqlite3.connect(tmp_path / "test.db")
+        assert _count(reopened) == 1
+        reopened.close()
+
+    async def test_write_before_connect_raises(self, tmp_path: Path) -> None:
+        db = Database(tmp_path / "test.db")
+
+        with pytest.raises(RuntimeError, match="not connected"):
+            await db.write(_insert("a", "1"))
+        with pytest.raises(RuntimeError, match="not connected"):
+            await db.read(_count)
+
+
+class TestExecutorLifecycle:
+    async def test_use_before_start_raises(self, tmp_path: Path) -> None:
+        executor = DatabaseExecutor(str(tmp_path / "test.db"))
+
+        with pytest.raises(RuntimeError, match="not connected"):
+            await executor.write(_insert("a", "1"))
+        with pytest.raises(RuntimeError, match="not connected"):
+            await executor.read(_count)
+        executor.close()
+
+    async def test_start_is_idempotent(self, db: Database, tmp_path: Path) -> None:
+        executor = DatabaseExecutor(str(tmp_path / "test.db"))
+        executor.start()
+        writer = executor._writer
+
+        executor.start()
+
+        assert executor._writer is writer
+        executor.close()
+
+
+class TestRollback:
+    def test_failed_rollback_is_logged_not_raised(self) -> None:
+        conn = MagicMock(in_transaction=True)
+        conn.execute.side_effect = sqlite3.OperationalError("disk I/O error")
+
+        _rollback(conn)
+
+        conn.execute.assert_called_once_with("ROLLBACK")
+
+    def test_no_open_transaction_is_left_alone(self) -> None:
+        conn = MagicMock(in_transaction=False)
+
+        _rollback(conn)
+
+        conn.execute.assert_not_called()
+
+
+class TestDataVersion:
+    async def test_changes_after_a_write_commits(self, db: Database) -> None:
+        before = db.data_version()
+        assert db.data_version() == before
+
+        await db.write(_insert("a", "1"))
+
+        assert db.data_version() != before
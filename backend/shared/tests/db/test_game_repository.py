@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 
 from shared.dal.models import PlayedGame, PlayedGameStanding
 from shared.db.connection import Database
-from shared.db.game_repository import SqliteGameRepository
+from shared.db.game_repository import GroupCommitGameRepository, SqliteGameRepository
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -25,14 +27,29 @@ def _game(
     )
 
 
+@pytest.fixture(params=[SqliteGameRepository, GroupCommitGameRepository])
+async def repo(tmp_path: Path, request: pytest.FixtureRequest):
+    db = Database(tmp_path / "test.db")
+    db.connect()
+    repository = request.param(db)
+    yield repository
+    if isinstance(repository, GroupCommitGameRepository):
+        await repository.close()
+    db.close()
+
+
 @pytest.fixture
-def repo(tmp_path: Path):
+async def group_db(tmp_path: Path):
     db = Database(tmp_path / "test.db")
     db.connect()
-    yield SqliteGameRepository(db)
+    yield db
     db.close()
 
 
+def _stored_ids(db: Database) -> list[str]:
+    return [row[0] for row in db.connection.execute("SELECT id FROM played_games ORDER BY id")]
+
+
 class TestCreateAndGet:
     async def test_create_and_get_game(self, repo: SqliteGameRepository) -> None:
         game = _game()
@@ -124,23 +141,205 @@ class TestFinishGame:
         await repo.finish_game("nonexistent", ended_at=end_time)
 
 
-class TestGetRecentGames:
-    async def test_empty_returns_empty_list(self, repo: SqliteGameRepository) -> None:
-        result = await repo.get_recent_games()
-        assert result == []
+class TestGroupCommit:
+    async def test_queued_records_share_one_write(self, group_db: Database) -> None:
+        repo = GroupCommitGameRepository(group_db, flush_interval=10)
+        end_time = datetime(2025, 1, 15, 13, 0, 0, tzinfo=UTC)
+        await repo.create_game(_game("g1"))
+        await repo.create_game(_game("g2"))
+        await repo.finish_game("g1", ended_at=end_time)
+        assert repo.pending == 3
+        assert _stored_ids(group_db) == []
+
+        with patch.object(group_db, "write", wraps=group_db.write) as write:
+            await repo.close()
+
+        write.assert_called_once()
+        assert _stored_ids(group_db) == ["g1", "g2"]
+        result = await SqliteGameRepository(group_db).get_game("g1")
+        assert result is not None
+        assert result.ended_at == end_time
+
+    async def test_flushes_after_interval(self, group_db: Database) -> None:
+        repo = GroupCommitGameRepository(group_db, flush_interval=0.01)
+        await repo.create_game(_game("g1"))
+
+        await asyncio.sleep(0.2)
+
+        assert repo.pending == 0
+        assert _stored_ids(group_db) == ["g1"]
+        await repo.close()
+
+    async def test_flushes_when_batch_is_full(self, group_db: Database) -> None:
+        repo = GroupCommitGameRepository(group_db, flush_interval=10, max_batch=2)
+        await repo.create_game(_game("g1"))
+        await repo.create_game(_game("g2"))
+
+        await asyncio.sleep(0.2)
+
+        assert _stored_ids(group_db) == ["g1", "g2"]
+        await repo.close()
+
+    async def test_duplicate_does_not_drop_rest_of_batch(self, group_db: Database) -> None:
+        repo = GroupCommitGameRepository(group_db, flush_interval=10)
+        await repo.create_game(_game("g1"))
+        await repo.create_game(_game("g1"))
+        await repo.create_game(_game("g2"))
+
+        await repo.close()
+
+        assert _stored_ids(group_db) == ["g1", "g2"]
+
+    async def test_failed_batch_is_retried_record_by_record(self, group_db: Database) -> None:
+        repo = GroupCommitGameRepository(group_db, flush_interval=10)
+        await repo.create_game(_game("g1"))
+        await repo.create_game(_game("g2"))
+        original_write = group_db.write
+        calls = 0
+
+        async def fail_first(fn):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("batch failed")
+            return await original_write(fn)
+
+        with patch.object(group_db, "write", side_effect=fail_first):
+            await repo.close()
+
+        assert calls == 3
+        assert _stored_ids(group_db) == ["g1", "g2"]
+
+    async def test_failed_record_retry_does_not_drop_the_rest(self, group_db: Database) -> None:
+        repo = GroupCommitGameRepository(group_db, flush_interval=10)
+        await repo.create_game(_game("g1"))
+        await repo.create_game(_game("g2"))
+        original_write = group_db.write
+        calls = 0
+
+        async def fail_batch_and_first_record(fn):
+            nonlocal calls
+            calls += 1
+            if calls <= 2:
+                raise RuntimeError("write failed")
+            return await original_write(fn)
+
+        with patch.object(group_db, "write", side_effect=fail_batch_and_first_record):
+            await repo.close()
+
+        assert calls == 3
+        assert repo.pending == 0
+        assert _stored_ids(group_db) == ["g2"]
+
+
+def _finished_standings(*user_ids: str) -> list[PlayedGameStanding]:
+    """Standings in placement order: first user_id placed first."""
+    return [
+        PlayedGameStanding(name=f"P{seat}", seat=seat, user_id=uid, score=40000 - 5000 * i, final_score=30 - 20 * i)
+        for i, (seat, uid) in enumerate(zip((2, 0, 3, 1), user_ids, strict=False))
+    ]
+
+
+async def _play(repo: SqliteGameRepository, game_id: str, hour: int, *user_ids: str) -> None:
+    start_standings = [
+        PlayedGameStanding(name=f"P{s.seat}", seat=s.seat, user_id=s.user_id) for s in _finished_standings(*user_ids)
+    ]
+    await repo.create_game(
+        PlayedGame(
+            game_id=game_id,
+            started_at=datetime(2025, 1, 15, hour, 0, 0, tzinfo=UTC),
+            standings=start_standings,
+        ),
+    )
+    await repo.finish_game(
+        game_id,
+        ended_at=datetime(2025, 1, 15, hour, 30, 0, tzinfo=UTC),
+        standings=_finished_standings(*user_ids),
+    )
+
+
+class TestPlayerHistory:
+    async def test_games_for_player_newest_first(self, repo: SqliteGameRepository) -> None:
+        await _play(repo, "g1", 10, "alice", "bob", "", "")
+        await _play(repo, "g2", 12, "bob", "carol", "", "")
+        await _play(repo, "g3", 11, "carol", "alice", "", "")
+
+        result = await repo.get_games_for_player("alice")
+
+        assert [g.game_id for g in result] == ["g3", "g1"]
+
+    async def test_games_for_player_respects_limit(self, repo: SqliteGameRepository) -> None:
+        for hour in range(5):
+            await _play(repo, f"g{hour}", hour, "alice", "", "", "")
+
+        result = await repo.get_games_for_player("alice", limit=2)
+
+        assert [g.game_id for g in result] == ["g4", "g3"]
+
+    async def test_ai_seats_are_not_indexed(self, repo: SqliteGameRepository) -> None:
+        await _play(repo, "g1", 10, "alice", "", "", "")
+
+        assert await repo.get_games_for_player("") == []
+
+    async def test_player_stats(self, repo: SqliteGameRepository) -> None:
+        await _play(repo, "g1", 10, "alice", "bob", "", "")
+        await _play(repo, "g2", 11, "bob", "alice", "", "")
+        await _play(repo, "g3", 12, "alice", "bob", "", "")
+
+        stats = await repo.get_player_stats("alice")
+
+        assert stats.games_played == 3
+        assert stats.first_places == 2
+        assert stats.average_placement == pytest.approx(4 / 3)
+        assert stats.average_final_score == pytest.approx((30 + 10 + 30) / 3)
+
+    async def test_stats_ignore_unfinished_and_abandoned_games(self, repo: SqliteGameRepository) -> None:
+        await _play(repo, "g1", 10, "alice", "", "", "")
+        for game_id in ("g2", "g3"):
+            await repo.create_game(
+                PlayedGame(
+                    game_id=game_id,
+                    started_at=datetime(2025, 1, 15, 12, 0, 0, tzinfo=UTC),
+                    standings=[PlayedGameStanding(name="Alice", seat=0, user_id="alice")],
+                ),
+            )
+        await repo.finish_game("g3", ended_at=datetime(2025, 1, 15, 13, 0, 0, tzinfo=UTC), end_reason="abandoned")
+
+        stats = await repo.get_player_stats("alice")
+
+        assert stats.games_played == 1
+        assert len(await repo.get_games_for_player("alice")) == 3
+
+    async def test_stats_for_unknown_player(self, repo: SqliteGameRepository) -> None:
+        stats = await repo.get_player_stats("nobody")
+
+        assert stats.games_played == 0
+        assert stats.average_placement is None
+
+
+class TestCompletedGamesPagination:
+    async def _create_completed(self, repo: SqliteGameRepository, game_id: str, hour: int) -> None:
+        started_at = datetime(2025, 1, 15, hour, 0, 0, tzinfo=UTC)
+        await repo.create_game(PlayedGame(game_id=game_id, started_at=started_at))
+        await repo.finish_game(game_id, ended_at=started_at.replace(minute=30))
+
+    async def test_pages_walk_all_completed_games_once(self, repo: SqliteGameRepository) -> None:
+        # g0/g1 share a started_at; the game_id tiebreak keeps them on distinct pages.
+        for game_id, hour in (("g0", 10), ("g1", 10), ("g2", 11), ("g3", 12), ("g4", 13)):
+            await self._create_completed(repo, game_id, hour)
+        await repo.create_game(_game("active", datetime(2025, 1, 15, 14, 0, 0, tzinfo=UTC)))
 
-    async def test_returns_games_ordered_by_started_at_desc(self, repo: SqliteGameRepository) -> None:
-        await repo.create_game(_game("g1", datetime(2025, 1, 15, 10, 0, 0, tzinfo=UTC)))
-        await repo.create_game(_game("g2", datetime(2025, 1, 15, 12, 0, 0, tzinfo=UTC)))
-        await repo.create_game(_game("g3", datetime(2025, 1, 15, 11, 0, 0, tzinfo=UTC)))
+        seen = []
+        before = None
+        while page := await repo.get_completed_games(limit=2, before=before):
+            seen.extend(g.game_id for g in page)
+            before = (page[-1].started_at, page[-1].game_id)
 
-        result = await repo.get_recent_games()
-        assert [g.game_id for g in result] == ["g2", "g3", "g1"]
+        assert seen == ["g4", "g3", "g2", "g1", "g0"]
 
-    async def test_respects_limit(self, repo: SqliteGameRepository) -> None:
-        for i in range(5):
-            await repo.create_game(_game(f"g{i}", datetime(2025, 1, 15, i, 0, 0, tzinfo=UTC)))
+    async def test_excludes_abandoned_games(self, repo: SqliteGameRepository) -> None:
+        await self._create_completed(repo, "done", 10)
+        await repo.create_game(_game("left", datetime(2025, 1, 15, 11, 0, 0, tzinfo=UTC)))
+        await repo.finish_game("left", ended_at=datetime(2025, 1, 15, 12, 0, 0, tzinfo=UTC), end_reason="abandoned")
 
-        result = await repo.get_recent_games(limit=3)
-        assert len(result) == 3
-        assert result[0].game_id == "g4"
+        assert [g.game_id for g in await repo.get_completed_games()] == ["done"]
@@ -0,0 +1,306 @@
+"""Tests for packing old replays into per-shard monthly archives."""
+
+import gzip
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from shared import replay_packs
+from shared.replay_packs import (
+    compact_replays,
+    find_packed_replay,
+    list_packed_replays,
+    main,
+    pack_index_path,
+    read_pack_index,
+    read_packed_replay,
+)
+from shared.storage import (
+    LocalReplayStorage,
+    binary_replay_path,
+    read_replay_segment,
+    replay_file_path,
+    replay_index_path,
+)
+
+# 2026-01-15 and 2026-02-15 (UTC); "now" is 2026-03-15.
+JANUARY = 1_768_435_200
+FEBRUARY = 1_771_113_600
+NOW = 1_773_532_800
+
+
+def _save(replay_dir: Path, game_id: str, content: str, mtime: float) -> Path:
+    LocalReplayStorage(str(replay_dir)).save_replay(game_id, content)
+    path = replay_file_path(replay_dir, game_id)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def _save_indexed(replay_dir: Path, game_id: str, mtime: float) -> Path:
+    stream = LocalReplayStorage(str(replay_dir)).open_stream(game_id)
+    stream.write('{"version":"0.3-dev"}\n')
+    stream.end_segment({"kind": "header"})
+    stream.write('{"t":9}\n{"t":4}\n')
+    stream.end_segment({"kind": "round"})
+    stream.commit()
+    path = replay_file_path(replay_dir, game_id)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+class TestCompactReplays:
+    def test_packs_old_replays_by_shard_and_month(self, tmp_path):
+        _save(tmp_path, "aaaa0001", "jan 1", JANUARY)
+        _save(tmp_path, "aaaa0002", "jan 2", JANUARY)
+        _save(tmp_path, "aaaa0003", "feb", FEBRUARY)
+        _save(tmp_path, "bbbb0001", "other shard", JANUARY)
+
+        report = compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        assert report.packed == 4
+        assert sorted(path.relative_to(tmp_path).as_posix() for path in report.packs) == [
+            "aa/aa/pack-2026-01.pack",
+            "aa/aa/pack-2026-02.pack",
+            "bb/bb/pack-2026-01.pack",
+        ]
+        assert list(tmp_path.rglob("*.txt.gz")) == []
+        for game_id, content in [("aaaa0001", "jan 1"), ("aaaa0003", "feb"), ("bbbb0001", "other shard")]:
+            packed = find_packed_replay(tmp_path, game_id)
+            assert packed is not None
+            assert gzip.decompress(read_packed_replay(packed)) == content.encode()
+
+    def test_keeps_recent_replays_loose(self, tmp_path):
+        recent = _save(tmp_path, "aaaa0001", "recent", NOW - 3600)
+
+        report = compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        assert report.packed == 0
+        assert recent.exists()
+        assert find_packed_replay(tmp_path, "aaaa0001") is None
+
+    def test_deletes_binary_copy_of_packed_replay(self, tmp_path):
+        storage = LocalReplayStorage(str(tmp_path))
+        old = _save(tmp_path, "aaaa0001", "old", JANUARY)
+        storage.save_binary_replay("aaaa0001", b"RRPB\x01")
+        recent = _save(tmp_path, "aaaa0002", "recent", NOW - 3600)
+        storage.save_binary_replay("aaaa0002", b"RRPB\x01")
+
+        compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        assert not old.exists()
+        assert not binary_replay_path(tmp_path, "aaaa0001").exists()
+        assert recent.exists()
+        assert binary_replay_path(tmp_path, "aaaa0002").exists()
+
+    def test_removes_stale_temp_files(self, tmp_path):
+        kept = _save(tmp_path, "aaaa0001", "recent", NOW - 3600)
+        stale = kept.with_name(".replay_crashed.tmp")
+        stale.write_bytes(b"partial")
+        os.utime(stale, (NOW - 25 * 3600, NOW - 25 * 3600))
+        live = kept.with_name(".replay_streaming.tmp")
+        live.write_bytes(b"in progress")
+        os.utime(live, (NOW - 3600, NOW - 3600))
+
+        report = compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        assert report.removed_tmp == 1
+        assert not stale.exists()
+        assert live.exists()
+        assert kept.exists()
+
+    def test_pack_is_a_multi_member_gzip_file(self, tmp_path):
+        _save(tmp_path, "aaaa0001", "one\n", JANUARY)
+        _save(tmp_path, "aaaa0002", "two\n", JANUARY)
+
+        (pack,) = compact_replays(tmp_path, older_than_days=7, now=NOW).packs
+
+        assert gzip.decompress(pack.read_bytes()) == b"one\ntwo\n"
+        assert pack.stat().st_mode & 0o777 == 0o600
+
+    def test_preserves_original_mtime(self, tmp_path):
+        _save(tmp_path, "aaaa0001", "jan", JANUARY)
+
+        compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        packed = find_packed_replay(tmp_path, "aaaa0001")
+        assert packed is not None
+        assert packed.mtime_ns == JANUARY * 1_000_000_000
+
+    def test_later_runs_append_to_the_same_pack(self, tmp_path):
+        _save(tmp_path, "aaaa0001", "first", JANUARY)
+        compact_replays(tmp_path, older_than_days=7, now=NOW)
+        assert find_packed_replay(tmp_path, "aaaa0002") is None
+        _save(tmp_path, "aaaa0002", "second", JANUARY)
+
+        compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        packed = find_packed_replay(tmp_path, "aaaa0002")
+        assert packed is not None
+        assert packed.offset > 0
+        assert gzip.decompress(read_packed_replay(packed)) == b"second"
+
+    def test_segment_index_is_rebased_onto_the_pack(self, tmp_path):
+        _save(tmp_path, "aaaa0001", "before", JANUARY)
+        path = _save_indexed(tmp_path, "aaaa0002", JANUARY)
+        index = json.loads(replay_index_path(tmp_path, "aaaa0002").read_bytes())
+        with path.open("rb") as f:
+            expected = [read_replay_segment(f, segment) for segment in index["segments"]]
+
+        compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        packed = find_packed_replay(tmp_path, "aaaa0002")
+        assert packed is not None
+        assert not replay_index_path(tmp_path, "aaaa0002").exists()
+        with packed.pack.open("rb") as f:
+            assert [read_replay_segment(f, segment) for segment in packed.segments] == expected
+
+    def test_replay_left_loose_after_indexing_is_removed_not_repacked(self, tmp_path):
+        path = _save(tmp_path, "aaaa0001", "jan", JANUARY)
+        data = path.read_bytes()
+        compact_replays(tmp_path, older_than_days=7, now=NOW)
+        # A crash between indexing and unlinking leaves the loose file behind.
+        path.write_bytes(data)
+        os.utime(path, (JANUARY, JANUARY))
+
+        report = compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        assert (report.packed, report.already_packed) == (0, 1)
+        assert not path.exists()
+        (pack,) = tmp_path.rglob("*.pack")
+        assert pack.stat().st_size == len(data)
+
+    def test_torn_index_line_does_not_swallow_new_entries(self, tmp_path):
+        _save(tmp_path, "aaaa0001", "first", JANUARY)
+        (pack,) = compact_replays(tmp_path, older_than_days=7, now=NOW).packs
+        with pack_index_path(pack).open("ab") as f:
+            f.write(b'{"id":"aaaa0009","off')
+        _save(tmp_path, "aaaa0002", "second", JANUARY)
+
+        compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        assert sorted(read_pack_index(pack_index_path(pack))) == ["aaaa0001", "aaaa0002"]
+
+    def test_empty_index_gets_no_leading_newline(self, tmp_path):
+        _save(tmp_path, "aaaa0001", "jan", JANUARY)
+        index = tmp_path / "aa" / "aa" / "pack-2026-01.pack.idx"
+        index.touch()
+
+        compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        assert index.read_bytes().startswith(b'{"id":"aaaa0001"')
+
+    def test_unreadable_segment_index_is_packed_without_segments(self, tmp_path):
+        _save(tmp_path, "aaaa0001", "jan", JANUARY)
+        replay_index_path(tmp_path, "aaaa0001").write_text("{not json")
+
+        report = compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        packed = find_packed_replay(tmp_path, "aaaa0001")
+        assert report.packed == 1
+        assert packed is not None
+        assert packed.segments == []
+        assert not replay_index_path(tmp_path, "aaaa0001").exists()
+
+    def test_unreadable_replay_is_left_loose_and_counted(self, tmp_path, monkeypatch):
+        broken = _save(tmp_path, "aaaa0001", "jan 1", JANUARY)
+        _save(tmp_path, "aaaa0002", "jan 2", JANUARY)
+        read_bytes = Path.read_bytes
+
+        def failing_read_bytes(path: Path) -> bytes:
+            if path == broken:
+                raise PermissionError("denied")
+            return read_bytes(path)
+
+        monkeypatch.setattr(Path, "read_bytes", failing_read_bytes)
+        report = compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        assert (report.packed, report.failed) == (1, 1)
+        assert broken.exists()
+        assert find_packed_replay(tmp_path, "aaaa0001") is None
+
+    def test_dangling_links_are_skipped(self, tmp_path):
+        _save(tmp_path, "aaaa0001", "jan", JANUARY)
+        shard = tmp_path / "aa" / "aa"
+        (shard / "aaaa0002.txt.gz").symlink_to(tmp_path / "missing")
+        (shard / ".replay_gone.tmp").symlink_to(tmp_path / "missing")
+
+        report = compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        assert (report.packed, report.failed, report.removed_tmp) == (1, 0, 0)
+
+    def test_pack_open_failure_closes_descriptor_and_raises(self, tmp_path, monkeypatch):
+        path = _save(tmp_path, "aaaa0001", "jan", JANUARY)
+        closed: list[int] = []
+        close = os.close
+
+        def record_close(fd: int) -> None:
+            closed.append(fd)
+            close(fd)
+
+        def failing_fdopen(fd: int, mode: str) -> None:
+            raise OSError("fdopen failed")
+
+        monkeypatch.setattr(os, "fdopen", failing_fdopen)
+        monkeypatch.setattr(os, "close", record_close)
+        with pytest.raises(OSError, match="fdopen failed"):
+            compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        assert len(closed) == 1
+        assert path.exists()
+
+    def test_main_packs_old_replays(self, tmp_path, monkeypatch):
+        _save(tmp_path, "aaaa0001", "jan", JANUARY)
+        monkeypatch.setattr(sys, "argv", ["replay_packs", "--replay-dir", str(tmp_path), "--older-than-days", "7"])
+
+        main()
+
+        assert not replay_file_path(tmp_path, "aaaa0001").exists()
+        assert find_packed_replay(tmp_path, "aaaa0001") is not None
+
+
+class TestFindPackedReplay:
+    def test_skips_unreadable_index(self, tmp_path):
+        _save(tmp_path, "aaaa0001", "jan", JANUARY)
+        compact_replays(tmp_path, older_than_days=7, now=NOW)
+        (tmp_path / "aa" / "aa" / "pack-2026-02.pack.idx").mkdir()
+        replay_packs._cached_pack_index.cache_clear()
+
+        packed = find_packed_replay(tmp_path, "aaaa0001")
+
+        assert packed is not None
+        assert packed.pack.name == "pack-2026-01.pack"
+
+
+class TestReadPackedReplay:
+    def test_truncated_pack_raises(self, tmp_path):
+        _save(tmp_path, "aaaa0001", "jan", JANUARY)
+        (pack,) = compact_replays(tmp_path, older_than_days=7, now=NOW).packs
+        packed = find_packed_replay(tmp_path, "aaaa0001")
+        assert packed is not None
+        pack.write_bytes(pack.read_bytes()[:-1])
+
+        with pytest.raises(ValueError, match="truncated"):
+            read_packed_replay(packed)
+
+
+class TestListPackedReplays:
+    def test_lists_every_pack_under_the_directory(self, tmp_path):
+        _save(tmp_path, "bbbb0001", "feb", FEBRUARY)
+        _save(tmp_path, "aaaa0002", "feb", FEBRUARY)
+        _save(tmp_path, "aaaa0001", "jan", JANUARY)
+        compact_replays(tmp_path, older_than_days=7, now=NOW)
+
+        packed = list_packed_replays(tmp_path)
+
+        assert [entry.game_id for entry in packed] == ["aaaa0001", "aaaa0002", "bbbb0001"]
+        assert packed[0].location == f"{packed[0].pack}#aaaa0001"
+
+    def test_skips_unreadable_index(self, tmp_path):
+        _save(tmp_path, "aaaa0001", "jan", JANUARY)
+        compact_replays(tmp_path, older_than_days=7, now=NOW)
+        (tmp_path / "aa" / "aa" / "pack-2026-02.pack.idx").mkdir()
+
+        assert [entry.game_id for entry in list_packed_replays(tmp_path)] == ["aaaa0001"]
@@ -1,6 +1,7 @@
 """Tests for replay storage abstraction."""
 
 import gzip
+import json
 import os
 import stat
 from pathlib import Path
@@ -8,7 +9,13 @@ from unittest.mock import patch
 
 import pytest
 
-from shared.storage import LocalReplayStorage, replay_file_path
+from shared.storage import (
+    LocalReplayStorage,
+    binary_replay_path,
+    read_replay_segment,
+    replay_file_path,
+    replay_index_path,
+)
 
 
 class TestReplayFilePath:
@@ -166,3 +173,147 @@ class TestLocalReplayStoragePermissions:
         file_path = replay_dir / "ga" / "me" / "game_1234.txt.gz"
         file_mode = stat.S_IMODE(file_path.stat().st_mode)
         assert file_mode == 0o600
+
+    def test_binary_replay_written_next_to_replay_with_owner_only_permissions(self, tmp_path):
+        replay_dir = tmp_path / "replays"
+        storage = LocalReplayStorage(str(replay_dir))
+
+        storage.save_binary_replay("game_1234", b"RRPB\x01")
+
+        file_path = binary_replay_path(replay_dir, "game_1234")
+        assert file_path == replay_dir / "ga" / "me" / "game_1234.bin.gz"
+        assert gzip.decompress(file_path.read_bytes()) == b"RRPB\x01"
+        assert stat.S_IMODE(file_path.stat().st_mode) == 0o600
+
+
+class TestLocalReplayStream:
+    """Tests for the incremental gzip writer used by streaming replay collection."""
+
+    def test_commit_writes_concatenated_chunks_as_gzip(self, tmp_path):
+        storage = LocalReplayStorage(str(tmp_path))
+
+        stream = storage.open_stream("game_1234")
+        stream.write('{"version":"1"}')
+        stream.write('\n{"t":1}')
+        stream.write('\n{"t":2}')
+        stream.commit()
+
+        file_path = tmp_path / "ga" / "me" / "game_1234.txt.gz"
+        decompressed = gzip.decompress(file_path.read_bytes()).decode("utf-8")
+        assert decompressed == '{"version":"1"}\n{"t":1}\n{"t":2}'
+        assert stat.S_IMODE(file_path.stat().st_mode) == 0o600
+        assert [p.name for p in file_path.parent.iterdir()] == ["game_1234.txt.gz"]
+
+    def test_nothing_visible_until_commit(self, tmp_path):
+        storage = LocalReplayStorage(str(tmp_path))
+
+        stream = storage.open_stream("game_1234")
+        stream.write("partial")
+
+        assert not (tmp_path / "ga" / "me" / "game_1234.txt.gz").exists()
+        stream.abort()
+
+    def test_abort_removes_temp_file(self, tmp_path):
+        storage = LocalReplayStorage(str(tmp_path))
+
+        stream = storage.open_stream("game_1234")
+        stream.write("content")
+        stream.abort()
+
+        assert list((tmp_path / "ga" / "me").iterdir()) == []
+
+    def test_commit_cleans_up_temp_on_fsync_failure(self, tmp_path):
+        storage = LocalReplayStorage(str(tmp_path))
+        stream = storage.open_stream("game_1234")
+        stream.write("content")
+
+        with (
+            patch("shared.storage.os.fsync", side_effect=OSError("fsync failed")),
+            pytest.raises(OSError, match="fsync failed"),
+        ):
+            stream.commit()
+
+        assert list((tmp_path / "ga" / "me").iterdir()) == []
+
+    def test_open_stream_cleans_up_on_fdopen_failure(self, tmp_path):
+        """If os.fdopen fails, the stream's fd is closed and its temp file removed."""
+        storage = LocalReplayStorage(str(tmp_path))
+
+        with (
+            patch("os.fdopen", side_effect=OSError("fdopen failure")) as mock_fdopen,
+            patch("os.close", wraps=os.close) as mock_close,
+            pytest.raises(OSError, match="fdopen failure"),
+        ):
+            storage.open_stream("game_1234")
+
+        assert list((tmp_path / "ga" / "me").iterdir()) == []
+        mock_close.assert_called_once_with(mock_fdopen.call_args[0][0])
+
+    def test_open_stream_rejects_path_traversal(self, tmp_path):
+        storage = LocalReplayStorage(str(tmp_path / "replays"))
+
+        with pytest.raises(ValueError, match="Path traversal rejected"):
+            storage.open_stream("../../etc/passwd")
+
+
+class TestReplaySegmentIndex:
+    """Tests for segment boundaries recorded by LocalReplayStream and the index sidecar."""
+
+    def _write_segments(self, tmp_path: Path) -> None:
+        stream = LocalReplayStorage(str(tmp_path)).open_stream("game_1234")
+        stream.write('{"version":"1"}\n{"t":8}')
+        stream.end_segment({"kind": "header"})
+        stream.write('\n{"t":9}')
+        stream.write('\n{"t":4}')
+        stream.end_segment({"kind": "round", "dealer": 0})
+        stream.write('\n{"t":9}\n{"t":4}')
+        stream.end_segment({"kind": "round", "dealer": 1})
+        stream.write('\n{"t":10}')
+        stream.commit()
+
+    def test_segments_inflate_independently(self, tmp_path):
+        self._write_segments(tmp_path)
+
+        index = json.loads(replay_index_path(tmp_path, "game_1234").read_text())
+        with replay_file_path(tmp_path, "game_1234").open("rb") as replay:
+            texts = [read_replay_segment(replay, segment) for segment in reversed(index["segments"])]
+
+        assert texts == ['\n{"t":9}\n{"t":4}', '\n{"t":9}\n{"t":4}', '{"version":"1"}\n{"t":8}']
+        assert [segment["meta"] for segment in index["segments"]] == [
+            {"kind": "header"},
+            {"kind": "round", "dealer": 0},
+            {"kind": "round", "dealer": 1},
+        ]
+
+    def test_segmented_replay_is_still_one_gzip_stream(self, tmp_path):
+        self._write_segments(tmp_path)
+
+        decompressed = gzip.decompress(replay_file_path(tmp_path, "game_1234").read_bytes()).decode("utf-8")
+        assert decompressed == '{"version":"1"}\n{"t":8}\n{"t":9}\n{"t":4}\n{"t":9}\n{"t":4}\n{"t":10}'
+
+    def test_index_has_owner_only_permissions(self, tmp_path):
+        self._write_segments(tmp_path)
+
+        assert stat.S_IMODE(replay_index_path(tmp_path, "game_1234").stat().st_mode) == 0o600
+
+    def test_no_index_without_segments(self, tmp_path):
+        stream = LocalReplayStorage(str(tmp_path)).open_stream("game_1234")
+        stream.write("content")
+        stream.commit()
+
+        assert not replay_index_path(tmp_path, "game_1234").exists()
+
+    def test_mismatched_segment_raises(self, tmp_path):
+        self._write_segments(tmp_path)
+        segment = json.loads(replay_index_path(tmp_path, "game_1234").read_text())["segments"][1]
+
+        with replay_file_path(tmp_path, "game_1234").open("rb") as replay, pytest.raises(ValueError, match="length"):
+            read_replay_segment(replay, {**segment, "length": segment["length"] + 1})
+
+    def test_corrupt_segment_raises(self, tmp_path):
+        self._write_segments(tmp_path)
+        segment = json.loads(replay_index_path(tmp_path, "game_1234").read_text())["segments"][1]
+
+        # The gzip header is not a raw deflate block.
+        with replay_file_path(tmp_path, "game_1234").open("rb") as replay, pytest.raises(ValueError, match="corrupt"):
+            read_replay_segment(replay, {**segment, "compressed_offset": 0})
@@ -0,0 +1,104 @@
+"""Benchmark wire encoding of game events.
+
+Compare the dict + key-walk path (service_event_payload -> encode) against the
+direct path (encode_service_event) on every event emitted by a replay, and
+report events/sec and bytes/sec for each.
+
+Usage:
+    make bench-encode
+    uv run python bin/bench_encode.py --iterations 50
+    uv run python bin/bench_encode.py --replay path/to/replay.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from game.logic.events import CallPromptEvent
+from game.logic.mahjong_service import MahjongGameService
+from game.messaging.encoder import encode
+from game.messaging.event_payload import encode_service_event, service_event_payload, shape_call_prompt_payload
+from game.replay import load_replay_from_file, run_replay
+from shared.logging import setup_logging
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from game.logic.events import ServiceEvent
+
+DEFAULT_REPLAY = (
+    Path(__file__).resolve().parent.parent
+    / "backend"
+    / "game"
+    / "tests"
+    / "integration"
+    / "replays"
+    / "fixtures"
+    / "full_round"
+    / "full_game.txt"
+)
+
+
+def _encode_via_dict(event: ServiceEvent) -> bytes:
+    payload = service_event_payload(event)
+    if isinstance(event.data, CallPromptEvent):
+        payload = shape_call_prompt_payload(payload)
+    return encode(payload)
+
+
+def _time_encoder(
+    encoder: Callable[[ServiceEvent], bytes],
+    events: list[ServiceEvent],
+    iterations: int,
+) -> tuple[float, int]:
+    """Return (median seconds per pass, bytes per pass) for encoding every event once per pass."""
+    total_bytes = sum(len(encoder(event)) for event in events)  # warmup
+    elapsed_times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        for event in events:
+            encoder(event)
+        elapsed_times.append(time.perf_counter() - start)
+    return statistics.median(elapsed_times), total_bytes
+
+
+def bench_encode(replay_path: Path, iterations: int) -> None:
+    setup_logging(level=logging.CRITICAL)
+    trace = run_replay(
+        load_replay_from_file(replay_path),
+        service_factory=lambda: MahjongGameService(auto_cleanup=False),
+    )
+    events = [*trace.startup_events, *(e for step in trace.steps for e in step.emitted_events)]
+
+    print(f"Replay: {replay_path.name}")
+    print(f"Events per pass: {len(events)}")
+    print(f"Iterations: {iterations}")
+    print()
+    print(f"{'encoder':<24}  {'median':>10}  {'events/sec':>12}  {'MB/sec':>8}")
+    results = {}
+    for name, encoder in (("dict + _stringify_keys", _encode_via_dict), ("encode_service_event", encode_service_event)):
+        median, total_bytes = _time_encoder(encoder, events, iterations)
+        results[name] = median
+        print(
+            f"{name:<24}  {median * 1000:>8.2f}ms  {len(events) / median:>12.0f}  {total_bytes / median / 1e6:>8.2f}",
+        )
+    baseline, direct = results.values()
+    print()
+    print(f"Speedup: {baseline / direct:.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark wire encoding of game events")
+    parser.add_argument("--replay", type=Path, default=DEFAULT_REPLAY, help="Path to replay file")
+    parser.add_argument("--iterations", type=int, default=20, help="Number of timed passes (default: 20)")
+    args = parser.parse_args()
+    bench_encode(args.replay, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
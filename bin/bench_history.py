@@ -0,0 +1,164 @@
+"""Benchmark per-player history queries on a synthetic played_games database.
+
+Build (or reuse) a database of completed 4-player games through the real
+schema and migrations, then time the indexed played_game_standings queries
+(get_games_for_player, get_player_stats) against the equivalent json_each
+scan over played_games.data that they replace.
+
+Usage:
+    make bench-history
+    uv run python bin/bench_history.py --games 100000
+    uv run python bin/bench_history.py --db /tmp/history.db --players 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from shared.dal.models import PlayedGame, PlayedGameStanding
+from shared.db import Database, SqliteGameRepository
+from shared.logging import setup_logging
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+_SCAN_GAMES_SQL = """\
+SELECT g.data FROM played_games AS g, json_each(g.data, '$.standings') AS s
+WHERE json_extract(s.value, '$.user_id') = ?
+ORDER BY g.started_at DESC LIMIT 20
+"""
+
+_SCAN_STATS_SQL = """\
+SELECT COUNT(*), AVG(s.key + 1), AVG(json_extract(s.value, '$.final_score'))
+FROM played_games AS g, json_each(g.data, '$.standings') AS s
+WHERE g.end_reason = 'completed' AND json_extract(s.value, '$.user_id') = ?
+"""
+
+_INSERT_BATCH = 10_000
+
+
+def _populate(db: Database, games: int, players: int, seed: int) -> None:
+    """Insert completed games with random 4-player tables, in placement order."""
+    rng = random.Random(seed)
+    conn = db.connection
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    for batch_start in range(0, games, _INSERT_BATCH):
+        game_rows = []
+        standing_rows = []
+        for n in range(batch_start, min(batch_start + _INSERT_BATCH, games)):
+            game_id = f"{n:032x}"
+            started_at = start + timedelta(minutes=n)
+            seats = rng.sample(range(4), 4)
+            user_ids = [f"user-{rng.randrange(players)}" for _ in range(4)]
+            standings = [
+                PlayedGameStanding(
+                    name=uid,
+                    seat=seat,
+                    user_id=uid,
+                    score=40000 - 10000 * place,
+                    final_score=45 - 30 * place,
+                )
+                for place, (seat, uid) in enumerate(zip(seats, user_ids, strict=True))
+            ]
+            game = PlayedGame(
+                game_id=game_id,
+                started_at=started_at,
+                ended_at=started_at + timedelta(minutes=40),
+                end_reason="completed",
+                num_rounds_played=8,
+                standings=standings,
+            )
+            game_rows.append(
+                (game_id, started_at.isoformat(), game.ended_at.isoformat(), "completed", game.model_dump_json()),
+            )
+            standing_rows.extend(
+                (game_id, s.seat, s.user_id, started_at.isoformat(), s.score, s.final_score, place)
+                for place, s in enumerate(standings, start=1)
+            )
+        with conn:
+            conn.executemany(
+                "INSERT INTO played_games (id, started_at, ended_at, end_reason, data) VALUES (?, ?, ?, ?, ?)",
+                game_rows,
+            )
+            conn.executemany(
+                "INSERT INTO played_game_standings "
+                "(game_id, seat, user_id, started_at, score, final_score, placement) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                standing_rows,
+            )
+        print(f"\r  inserted {min(batch_start + _INSERT_BATCH, games):>9,} / {games:,} games", end="", flush=True)
+    print()
+
+
+async def _time_async(fn: Callable[[], Awaitable[object]], iterations: int) -> float:
+    await fn()  # warmup
+    elapsed = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        elapsed.append(time.perf_counter() - start)
+    return statistics.median(elapsed)
+
+
+async def bench_history(db_path: Path, games: int, players: int, iterations: int, scan_iterations: int) -> None:
+    setup_logging(level=logging.CRITICAL)
+    db = Database(db_path)
+    db.connect()
+    try:
+        existing = db.connection.execute("SELECT COUNT(*) FROM played_games").fetchone()[0]
+        if existing < games:
+            print(f"Populating {db_path} ({existing:,} games present)...")
+            _populate(db, games - existing, players, seed=existing)
+        total = db.connection.execute("SELECT COUNT(*) FROM played_games").fetchone()[0]
+        repo = SqliteGameRepository(db)
+        user_id = "user-0"
+
+        async def scan_games() -> object:
+            return await db.read(lambda conn: conn.execute(_SCAN_GAMES_SQL, (user_id,)).fetchall())
+
+        async def scan_stats() -> object:
+            return await db.read(lambda conn: conn.execute(_SCAN_STATS_SQL, (user_id,)).fetchone())
+
+        print(f"Database: {db_path} ({total:,} games, ~{players:,} players)")
+        print()
+        print(f"{'query':<34}  {'median':>12}")
+        cases = (
+            ("get_games_for_player (index)", lambda: repo.get_games_for_player(user_id), iterations),
+            ("get_player_stats (index)", lambda: repo.get_player_stats(user_id), iterations),
+            ("games for player (json_each scan)", scan_games, scan_iterations),
+            ("player stats (json_each scan)", scan_stats, scan_iterations),
+        )
+        for name, fn, n in cases:
+            median = await _time_async(fn, n)
+            print(f"{name:<34}  {median * 1000:>10.2f}ms")
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark per-player history queries")
+    parser.add_argument("--db", type=Path, default=None, help="Database path (default: a temp file)")
+    parser.add_argument("--games", type=int, default=1_000_000, help="Games to generate (default: 1,000,000)")
+    parser.add_argument("--players", type=int, default=50_000, help="Distinct player ids (default: 50,000)")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed passes per indexed query (default: 50)")
+    parser.add_argument("--scan-iterations", type=int, default=3, help="Timed passes per JSON scan (default: 3)")
+    args = parser.parse_args()
+    if args.db is not None:
+        asyncio.run(bench_history(args.db, args.games, args.players, args.iterations, args.scan_iterations))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(
+            bench_history(Path(tmp) / "history.db", args.games, args.players, args.iterations, args.scan_iterations),
+        )
+
+
+if __name__ == "__main__":
+    main()
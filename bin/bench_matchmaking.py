@@ -0,0 +1,163 @@
+"""Simulate the matchmaking queue and report queue times and table rating spread.
+
+Players with normally distributed ratings join a MatchmakingManager over
+--arrival-seconds of simulated time; each joining player is matched
+immediately if possible, and a match round runs every --round-seconds, as in
+the lobby. With --arrival-seconds 0 all players are queued before the first
+round and only the rounds match them (a full queue of --players). Report the distribution of time spent in the
+queue, the rating spread (max - min) of the tables formed, and the wall time
+of queue operations and match rounds.
+
+Usage:
+    make bench-matchmaking
+    uv run python bin/bench_matchmaking.py --players 10000 --arrival-seconds 0
+    uv run python bin/bench_matchmaking.py --rating-stddev 400 --window-growth 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from typing import TYPE_CHECKING, cast
+
+from lobby.matchmaking.manager import MatchmakingManager
+from lobby.matchmaking.models import (
+    DEFAULT_RATING,
+    INITIAL_RATING_WINDOW,
+    MATCHMAKING_SEATS,
+    RATING_WINDOW_GROWTH,
+    QueueEntry,
+)
+
+if TYPE_CHECKING:
+    from starlette.websockets import WebSocket
+
+
+def _percentiles(values: list[float]) -> str:
+    if not values:
+        return "n/a"
+    ordered = sorted(values)
+
+    def at(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return (
+        f"p50 {at(0.5):>7.1f}  p90 {at(0.9):>7.1f}  p99 {at(0.99):>7.1f}  "
+        f"max {ordered[-1]:>7.1f}  mean {statistics.fmean(ordered):>7.1f}"
+    )
+
+
+def simulate(  # noqa: PLR0913
+    players: int,
+    arrival_seconds: float,
+    round_seconds: float,
+    rating_stddev: float,
+    initial_window: float,
+    window_growth: float,
+    seed: int,
+) -> None:
+    rng = random.Random(seed)
+    manager = MatchmakingManager(initial_window=initial_window, window_growth=window_growth)
+    arrivals = sorted(rng.uniform(0, arrival_seconds) for _ in range(players))
+    websocket = cast("WebSocket", None)
+
+    queue_times: list[float] = []
+    spreads: list[float] = []
+    add_seconds = 0.0
+    round_timings: list[float] = []
+    peak_queue = 0
+
+    def record(table: list[QueueEntry], now: float) -> None:
+        queue_times.extend(now - entry.queued_at for entry in table)
+        spreads.append(max(e.rating for e in table) - min(e.rating for e in table))
+
+    join_match = arrival_seconds > 0
+    now = 0.0
+    next_arrival = 0
+    while next_arrival < players or manager.queue_size >= MATCHMAKING_SEATS:
+        # Joins up to the next round, each matched around the joining player.
+        while next_arrival < players and arrivals[next_arrival] <= now:
+            n = next_arrival
+            entry = QueueEntry(
+                connection_id=f"c{n}",
+                user_id=f"u{n}",
+                username=f"player{n}",
+                websocket=websocket,
+                rating=rng.gauss(DEFAULT_RATING, rating_stddev),
+                queued_at=arrivals[n],
+            )
+            start = time.perf_counter()
+            manager.add_player(entry)
+            matched = manager.try_match(entry.connection_id, now=arrivals[n]) if join_match else None
+            add_seconds += time.perf_counter() - start
+            if matched is not None:
+                record(matched, arrivals[n])
+            next_arrival += 1
+        peak_queue = max(peak_queue, manager.queue_size)
+
+        start = time.perf_counter()
+        tables = manager.match_round(now=now)
+        round_timings.append(time.perf_counter() - start)
+        for table in tables:
+            record(table, now)
+        now += round_seconds
+
+    remove_start = time.perf_counter()
+    for entry in manager.get_queue_entries():
+        manager.remove_player(entry.connection_id)
+    remove_seconds = time.perf_counter() - remove_start
+
+    print(
+        f"Players: {players:,} over {arrival_seconds:g}s, rating stddev {rating_stddev:g}, "
+        f"window {initial_window:g} + {window_growth:g}/s, round every {round_seconds:g}s",
+    )
+    print(f"Matched: {len(queue_times):,} players in {len(spreads):,} tables, peak queue {peak_queue:,}")
+    print(f"Simulated time to drain: {now:,.0f}s over {len(round_timings):,} rounds")
+    print()
+    print(f"{'queue time (s)':<22}  {_percentiles(queue_times)}")
+    print(f"{'table rating spread':<22}  {_percentiles(spreads)}")
+    print(f"{'round wall time (ms)':<22}  {_percentiles([t * 1000 for t in round_timings])}")
+    print(f"{'join + match (us/op)':<22}  {add_seconds / players * 1e6:>11.1f}")
+    print(f"{'left unmatched':<22}  {manager.queue_size:>11,}  (removed in {remove_seconds * 1000:.2f}ms)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate the rating-aware matchmaking queue")
+    parser.add_argument("--players", type=int, default=10_000, help="Players to queue (default: 10,000)")
+    parser.add_argument(
+        "--arrival-seconds",
+        type=float,
+        default=600.0,
+        help="Spread joins over this many simulated seconds; 0 queues everyone before the first round (default: 600)",
+    )
+    parser.add_argument("--round-seconds", type=float, default=1.0, help="Match round interval (default: 1)")
+    parser.add_argument("--rating-stddev", type=float, default=300.0, help="Rating standard deviation (default: 300)")
+    parser.add_argument(
+        "--initial-window",
+        type=float,
+        default=INITIAL_RATING_WINDOW,
+        help=f"Initial rating window (default: {INITIAL_RATING_WINDOW:g})",
+    )
+    parser.add_argument(
+        "--window-growth",
+        type=float,
+        default=RATING_WINDOW_GROWTH,
+        help=f"Rating window growth per second waited (default: {RATING_WINDOW_GROWTH:g})",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+    simulate(
+        args.players,
+        args.arrival_seconds,
+        args.round_seconds,
+        args.rating_stddev,
+        args.initial_window,
+        args.window_growth,
+        args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark the binary replay format against gzip-compressed NDJSON.
+
+Convert each replay to the binary record format (game.replay.binary), then
+report the stored size of .txt.gz against the binary format, raw and
+gzip-compressed, and time two loads from the compressed bytes: decoding the
+lines into event dicts, and the full load_replay_from_bytes() into a
+ReplayInput.
+
+Usage:
+    make bench-replay-format
+    uv run python bin/bench_replay_format.py backend/data/replays --iterations 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from game.replay.binary import decode_replay, encode_replay
+from game.replay.loader import load_replay_from_bytes, read_replay_file
+from game.replay.verify import find_replay_files
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DEFAULT_REPLAYS = Path(__file__).resolve().parent.parent / "backend" / "game" / "tests" / "integration" / "replays"
+
+
+def _decode_text(data: bytes) -> list[dict]:
+    return [json.loads(line) for line in gzip.decompress(data).decode("utf-8").splitlines() if line]
+
+
+def _decode_binary(data: bytes) -> list[dict]:
+    return decode_replay(gzip.decompress(data))
+
+
+def _load_replay(data: bytes) -> object:
+    return load_replay_from_bytes(gzip.decompress(data))
+
+
+def _time_pass(load: Callable[[bytes], object], blobs: list[bytes], iterations: int) -> float:
+    """Return the median seconds to load every blob once."""
+    for blob in blobs:  # warmup
+        load(blob)
+    elapsed_times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        for blob in blobs:
+            load(blob)
+        elapsed_times.append(time.perf_counter() - start)
+    return statistics.median(elapsed_times)
+
+
+def bench_replay_format(paths: list[Path], iterations: int) -> None:
+    texts = [read_replay_file(path) for path in find_replay_files(paths)]
+    binaries = [encode_replay(text) for text in texts]
+    text_gz = [gzip.compress(text.encode("utf-8")) for text in texts]
+    binary_gz = [gzip.compress(binary) for binary in binaries]
+
+    print(f"Replays: {len(texts)}")
+    print(f"Iterations: {iterations}")
+    print()
+    text_raw_size = sum(len(text.encode("utf-8")) for text in texts)
+    print(f"{'format':<16}  {'raw bytes':>12}  {'gzip bytes':>12}  {'vs .txt.gz':>10}")
+    for name, raw, compressed in (
+        ("ndjson", text_raw_size, sum(map(len, text_gz))),
+        ("binary", sum(map(len, binaries)), sum(map(len, binary_gz))),
+    ):
+        print(f"{name:<16}  {raw:>12}  {compressed:>12}  {compressed / sum(map(len, text_gz)):>9.2f}x")
+
+    print()
+    print(f"{'load (from gzip)':<28}  {'ndjson':>10}  {'binary':>10}  {'speedup':>8}")
+    for name, text_load, binary_load in (
+        ("decode events", _decode_text, _decode_binary),
+        ("load_replay_from_bytes", _load_replay, _load_replay),
+    ):
+        text_time = _time_pass(text_load, text_gz, iterations)
+        binary_time = _time_pass(binary_load, binary_gz, iterations)
+        print(f"{name:<28}  {text_time * 1000:>8.2f}ms  {binary_time * 1000:>8.2f}ms  {text_time / binary_time:>7.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark binary replay size and load time against .txt.gz")
+    parser.add_argument("paths", nargs="*", type=Path, default=[DEFAULT_REPLAYS], help="Replay files or directories")
+    parser.add_argument("--iterations", type=int, default=20, help="Number of timed passes (default: 20)")
+    args = parser.parse_args()
+    bench_replay_format(args.paths, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ Usage:
     make profile
     uv run python bin/profile_replay.py --iterations 5
     uv run python bin/profile_replay.py --replay path/to/replay.txt
+    uv run python bin/profile_replay.py --engine mutable
     uv run python bin/profile_replay.py --load
     uv run python bin/profile_replay.py --load path/to/replay.prof
 """
@@ -22,6 +23,8 @@ import sys
 import time
 from pathlib import Path
 
+from game.logic.enums import StateEngine
+from game.logic.mahjong_service import MahjongGameService
 from game.replay import load_replay_from_file, run_replay
 from game.replay.models import ReplayInput, ReplayTrace
 from shared.logging import setup_logging
@@ -40,13 +43,18 @@ DEFAULT_REPLAY = (
 PROFILE_DIR = Path(__file__).resolve().parent.parent / "backend" / "profiles"
 
 
-def profile_replay(replay_path: Path, iterations: int) -> None:
+def profile_replay(replay_path: Path, iterations: int, engine: StateEngine = StateEngine.FROZEN) -> None:
     """Profile a replay file with cProfile and timed iterations."""
     replay = load_replay_from_file(replay_path)
+
+    def service_factory() -> MahjongGameService:
+        return MahjongGameService(auto_cleanup=False, engine=engine)
+
     print(f"Loaded replay: {replay_path.name}")
     print(f"  Seed: {replay.seed[:16]}...")
     print(f"  Players: {', '.join(replay.player_names)}")
     print(f"  Events: {len(replay.events)}")
+    print(f"  State engine: {engine}")
     print()
 
     # Suppress logging during profiling to keep output clean
@@ -55,14 +63,14 @@ def profile_replay(replay_path: Path, iterations: int) -> None:
     # Warmup + profile (separate from timing to avoid cProfile overhead)
     profiler = cProfile.Profile()
     profiler.enable()
-    trace = run_replay(replay)
+    trace = run_replay(replay, service_factory=service_factory)
     profiler.disable()
 
     # Timed iterations (no profiler overhead)
     elapsed_times = []
     for _ in range(iterations):
         start = time.perf_counter()
-        run_replay(replay)
+        run_replay(replay, service_factory=service_factory)
         elapsed_times.append(time.perf_counter() - start)
 
     # Save profile
@@ -236,6 +244,13 @@ def main() -> None:
         default=3,
         help="number of timed iterations (default: 3)",
     )
+    parser.add_argument(
+        "--engine",
+        type=StateEngine,
+        choices=list(StateEngine),
+        default=StateEngine.FROZEN,
+        help="state engine to run the replay on (default: frozen)",
+    )
     parser.add_argument(
         "--load",
         nargs="?",
@@ -264,7 +279,7 @@ def main() -> None:
         print("Iterations must be at least 1", file=sys.stderr)
         sys.exit(1)
 
-    profile_replay(args.replay, args.iterations)
+    profile_replay(args.replay, args.iterations, args.engine)
 
 
 if __name__ == "__main__":
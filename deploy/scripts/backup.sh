@@ -28,6 +28,15 @@ else
   exit 1
 fi
 
+# Pack replays older than 30 days into per-shard monthly archives, so the
+# number of replay files restic has to scan stays bounded. Packs are only
+# appended to, so restic deduplicates their existing bytes. A failed
+# run leaves the replays loose and is retried by the next backup.
+if ! (cd "${RONIN_DIR}" && docker compose exec -T game \
+  python -m shared.replay_packs --replay-dir /app/data/replays --older-than-days 30); then
+  echo "WARNING: replay packing failed, backing up loose replays"
+fi
+
 # Run restic backup: staged DBs + replays
 restic backup \
   "${STAGING}/db" \